@@ -0,0 +1,147 @@
+"""
+Планировщик предзагрузки свечей по сигналам.
+
+До запуска BacktestRunner известны все пары (контракт, время сигнала) и окно
+[ts - before_minutes, ts + after_minutes]. Планировщик группирует сигналы по контракту
+и объединяет пересекающиеся окна: каждый участок истории токена загружается один раз,
+а не по разу на сигнал.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..domain.models import Signal
+from ..infrastructure.candle_store import load_candle_arrays
+from ..infrastructure.price_loader import PriceLoader
+
+
+@dataclass(frozen=True)
+class PrefetchInterval:
+    """Объединенный интервал загрузки одного контракта."""
+    contract_address: str
+    start_time: datetime
+    end_time: datetime
+    signal_count: int
+
+    @property
+    def minutes(self) -> int:
+        return int((self.end_time - self.start_time).total_seconds() // 60)
+
+
+@dataclass
+class PrefetchPlan:
+    """План предзагрузки: интервалы по контрактам + объем исходных окон для сравнения."""
+    intervals: List[PrefetchInterval] = field(default_factory=list)
+    window_count: int = 0       # Количество окон сигналов
+    window_minutes: int = 0     # Суммарная длина окон без объединения
+
+    @property
+    def contracts(self) -> int:
+        return len({i.contract_address for i in self.intervals})
+
+    @property
+    def total_minutes(self) -> int:
+        return sum(i.minutes for i in self.intervals)
+
+    def windows(self) -> List[Tuple[str, datetime, datetime]]:
+        """Интервалы в формате (contract_address, start_time, end_time)."""
+        return [(i.contract_address, i.start_time, i.end_time) for i in self.intervals]
+
+    def cache_coverage(self, price_loader: PriceLoader) -> Optional[float]:
+        """
+        Доля минут плана, уже покрытых кешем загрузчика (0..1).
+
+        :param price_loader: Загрузчик с методом cached_range(contract) (GeckoTerminalPriceLoader)
+        :return: None, если загрузчик не сообщает диапазон кеша
+        """
+        cached_range = getattr(price_loader, "cached_range", None)
+        if cached_range is None or not self.intervals:
+            return None
+        covered = 0.0
+        ranges: Dict[str, Optional[Tuple[datetime, datetime]]] = {}
+        for interval in self.intervals:
+            if interval.contract_address not in ranges:
+                ranges[interval.contract_address] = cached_range(interval.contract_address)
+            span = ranges[interval.contract_address]
+            if span is None:
+                continue
+            overlap_start = max(interval.start_time, span[0])
+            overlap_end = min(interval.end_time, span[1])
+            if overlap_end > overlap_start:
+                covered += (overlap_end - overlap_start).total_seconds() / 60
+        total = self.total_minutes
+        return covered / total if total else 1.0
+
+    def summary(self, price_loader: Optional[PriceLoader] = None) -> str:
+        """Строка-сводка плана (контракты, минуты свечей, экономия, покрытие кешем)."""
+        saved = 1.0 - self.total_minutes / self.window_minutes if self.window_minutes else 0.0
+        coverage = self.cache_coverage(price_loader) if price_loader is not None else None
+        coverage_str = f"{coverage:.1%}" if coverage is not None else "n/a"
+        return (
+            f"[prefetch] Plan: {self.contracts} contracts, {len(self.intervals)} intervals "
+            f"for {self.window_count} signal windows, {self.total_minutes} candle minutes "
+            f"({self.window_minutes} without merging, -{saved:.1%}), cache coverage {coverage_str}"
+        )
+
+
+def build_prefetch_plan(
+    signals: Iterable[Signal],
+    before_minutes: int,
+    after_minutes: int,
+    merge_gap_minutes: int = 0,
+) -> PrefetchPlan:
+    """
+    Группирует окна сигналов по контракту и объединяет пересекающиеся.
+
+    :param signals: Сигналы бэктеста
+    :param before_minutes: Минут до сигнала (data.before_minutes)
+    :param after_minutes: Минут после сигнала (data.after_minutes)
+    :param merge_gap_minutes: Объединять и интервалы, разделенные разрывом не длиннее N минут
+    """
+    before = timedelta(minutes=before_minutes)
+    after = timedelta(minutes=after_minutes)
+    max_gap = timedelta(minutes=max(0, merge_gap_minutes))
+
+    by_contract: Dict[str, List[Tuple[datetime, datetime]]] = {}
+    plan = PrefetchPlan()
+    for sig in signals:
+        by_contract.setdefault(sig.contract_address, []).append((sig.timestamp - before, sig.timestamp + after))
+        plan.window_count += 1
+        plan.window_minutes += before_minutes + after_minutes
+
+    for contract_address, windows in by_contract.items():
+        windows.sort()
+        start, end = windows[0]
+        count = 1
+        for w_start, w_end in windows[1:]:
+            if w_start <= end + max_gap:
+                end = max(end, w_end)
+                count += 1
+                continue
+            plan.intervals.append(PrefetchInterval(contract_address, start, end, count))
+            start, end, count = w_start, w_end, 1
+        plan.intervals.append(PrefetchInterval(contract_address, start, end, count))
+    return plan
+
+
+def execute_prefetch_plan(plan: PrefetchPlan, price_loader: PriceLoader) -> Dict[str, int]:
+    """
+    Загружает интервалы плана, прогревая кеш загрузчика.
+
+    Загрузчик с методом prefetch (AsyncGeckoTerminalPriceLoader) получает все интервалы
+    сразу и грузит контракты конкурентно; остальные - одна загрузка на интервал
+    (колоночная, если загрузчик умеет load_arrays: CachingPriceLoader оставляет ряд в памяти).
+
+    :return: {contract_address: количество загруженных свечей}
+    """
+    prefetch = getattr(price_loader, "prefetch", None)
+    if prefetch is not None:
+        return prefetch(plan.windows())
+
+    loaded: Dict[str, int] = {}
+    for interval in plan.intervals:
+        candles = load_candle_arrays(price_loader, interval.contract_address, interval.start_time, interval.end_time)
+        loaded[interval.contract_address] = loaded.get(interval.contract_address, 0) + len(candles)
+    return loaded
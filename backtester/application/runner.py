@@ -1,19 +1,76 @@
 from __future__ import annotations  # Позволяет использовать аннотации типов для классов, объявленных ниже по коду
 
+import pickle
+import sys
+import threading
 from datetime import timedelta, datetime, timezone
-from typing import Any, Dict, List, Sequence, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from typing import Any, Callable, Container, Deque, Dict, Iterable, Iterator, List, Sequence, Optional, Tuple, cast
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait
 
 # Импорты компонентов системы
 from ..infrastructure.signal_loader import SignalLoader  # Интерфейс загрузки торговых сигналов
-from ..infrastructure.price_loader import PriceLoader    # Интерфейс загрузки свечей (цен)
+from ..infrastructure.price_loader import PriceLoader, GeckoTerminalPriceLoader  # Интерфейс загрузки свечей (цен)
+from ..infrastructure.candle_cache import CachingPriceLoader  # LRU-кеш свечей по контрактам
+from ..infrastructure.candle_store import load_candle_arrays  # Загрузка окна свечей колоночным рядом
+from ..infrastructure.result_sink import ResultSink  # Приемники результатов потокового режима
+from ..infrastructure.result_cache import ResultCache, candles_fingerprint, source_code_version, strategy_fingerprint  # Кеш StrategyOutput
+from ..infrastructure.feature_store import FeatureStore, feature_set_version, signal_key  # Хранилище признаков сигналов
 from ..domain.strategy_base import Strategy              # Базовый класс стратегий
+from ..domain.runner_strategy import RunnerStrategy      # Runner стратегия (батч-оценка конфигов)
 from ..domain.models import StrategyInput, StrategyOutput, Signal, Candle  # Общие модели
+from ..domain.candle_series import CandleSeries  # Колоночный ряд свечей (struct-of-arrays)
+from ..domain.trade_features import FEATURE_WINDOWS_MIN  # Окна trade features
 from ..domain.portfolio import PortfolioConfig, PortfolioEngine, FeeModel, PortfolioResult  # Портфельный слой
 from ..domain.execution_model import ExecutionProfileConfig  # Execution profiles
 from ..utils.warn_dedup import WarnDedup  # Потокобезопасный класс для дедупликации предупреждений
 from ..utils.typing_utils import safe_float
 
+# Набор признаков BacktestRunner в FeatureStore (window features сигнала)
+TRADE_FEATURES_SET = "trade_features"
+
+def required_candle_window(
+    strategies: Sequence[Strategy],
+    before_minutes: int,
+    after_minutes: int,
+) -> Tuple[int, int]:
+    """
+    Окно свечей вокруг сигнала, достаточное всем стратегиям (Strategy.required_window_minutes),
+    ограниченное настроенными data.before_minutes / data.after_minutes.
+
+    Если хотя бы одна стратегия не знает своего окна - возвращается настроенное окно.
+
+    :return: (минут до сигнала, минут после сигнала)
+    """
+    windows: List[Tuple[int, int]] = []
+    for strategy in strategies:
+        required_window = getattr(strategy, "required_window_minutes", None)
+        window = required_window() if callable(required_window) else None
+        if not isinstance(window, tuple):
+            return before_minutes, after_minutes
+        windows.append(window)
+    if not windows:
+        return before_minutes, after_minutes
+    required_before = max(int(window[0]) for window in windows)
+    required_after = max(int(window[1]) for window in windows)
+    return min(before_minutes, required_before), min(after_minutes, required_after)
+
+
+def candle_window_for_config(strategies: Sequence[Strategy], data_cfg: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    Окно свечей запуска по секции data: before_minutes / after_minutes, суженные
+    required_candle_window при data.auto_window (по умолчанию выключено).
+    Одна функция для BacktestRunner и main.py (план prefetch): окна не расходятся.
+
+    :return: (минут до сигнала, минут после сигнала)
+    """
+    before_minutes = int(data_cfg.get("before_minutes", 60))
+    after_minutes = int(data_cfg.get("after_minutes", 360))
+    if BacktestRunner._parse_bool(data_cfg.get("auto_window"), default=False):
+        return required_candle_window(strategies, before_minutes, after_minutes)
+    return before_minutes, after_minutes
+
+
 class BacktestRunner:
     """
     Класс, отвечающий за запуск бэктестов:
@@ -31,6 +88,7 @@ class BacktestRunner:
         global_config: Dict[str, Any] | None = None,  # Глобальная конфигурация из YAML
         parallel: bool = False,             # Включить параллельную обработку сигналов
         max_workers: int = 1,               # Максимальное количество потоков для параллельной обработки
+        executor: str = "thread",           # Режим параллельной обработки: "thread" или "process"
     ) -> None:
         self.signal_loader = signal_loader
         self.price_loader = price_loader
@@ -40,12 +98,53 @@ class BacktestRunner:
         self.results: List[Dict[str, Any]] = []
         self.parallel = parallel
         self.max_workers = max_workers
+        if executor not in ("thread", "process"):
+            raise ValueError(f"runtime.executor must be 'thread' or 'process', got {executor!r}")
+        self.executor = executor
 
         # Считываем параметры временного окна вокруг сигнала
         data_cfg = self.global_config.get("data", {})
         self.before_minutes = int(data_cfg.get("before_minutes", 60))  # сколько минут до сигнала загружать
         self.after_minutes = int(data_cfg.get("after_minutes", 360))   # сколько минут после сигнала загружать
         
+        # Окно, которого достаточно загруженным стратегиям (data.auto_window): не шире настроенного
+        self.window_before_minutes, self.window_after_minutes = candle_window_for_config(self.strategies, data_cfg)
+        
+        # Кеш свечей по контрактам (data.cache_max_mb): повторные контракты обслуживаются срезом
+        cache_max_mb = data_cfg.get("cache_max_mb")
+        if cache_max_mb is not None and float(cache_max_mb) > 0 and not isinstance(self.price_loader, CachingPriceLoader):
+            self.price_loader = CachingPriceLoader(
+                self.price_loader,
+                max_bytes=int(float(cache_max_mb) * 1024 * 1024),
+                # Для API-лоадера не запрашиваем всю историю - кешируем объединение запрошенных окон
+                full_history=not isinstance(self.price_loader, GeckoTerminalPriceLoader),
+            )
+        
+        # Персистентный кеш результатов (result_cache.enabled): пересчитываются только новые ключи
+        result_cache_cfg = self.global_config.get("result_cache") or {}
+        self.result_cache: Optional[ResultCache] = None
+        self._strategy_fingerprints: List[str] = []
+        if self._parse_bool(result_cache_cfg.get("enabled"), default=False):
+            self.result_cache = ResultCache(
+                result_cache_cfg.get("dir", "data/result_cache"),
+                code_version=result_cache_cfg.get("code_version"),
+            )
+            self._strategy_fingerprints = [strategy_fingerprint(s) for s in self.strategies]
+        
+        # Хранилище признаков сигналов (feature_store.enabled): trade features, общие для стратегий
+        # (StrategyInput.feature_cache), сохраняются между прогонами и не пересчитываются
+        feature_store_cfg = self.global_config.get("feature_store") or {}
+        self.feature_store: Optional[FeatureStore] = None
+        self._feature_store_version = ""
+        if self._parse_bool(feature_store_cfg.get("enabled"), default=False):
+            self.feature_store = FeatureStore(feature_store_cfg.get("dir", "data/feature_store"))
+            # Признаки зависят от кода domain, окон и того, сколько свечей до сигнала загружается
+            self._feature_store_version = feature_set_version(
+                source_code_version(),
+                windows=list(FEATURE_WINDOWS_MIN),
+                before_minutes=self.window_before_minutes,
+            )
+        
         # Добавляем price_loader в global_params для использования стратегиями
         self.global_config["_price_loader"] = self.price_loader
         
@@ -53,7 +152,8 @@ class BacktestRunner:
         self.warn_dedup = WarnDedup()
         self.global_config["_warn_dedup"] = self.warn_dedup
         
-        # Счетчики пропущенных сигналов (BC для тестов)
+        # Счетчики пропущенных сигналов (BC для тестов); в thread-режиме меняются под локом
+        self._counters_lock = threading.Lock()
         self.signals_skipped_no_candles: int = 0
         self.signals_skipped_corrupt_candles: int = 0
         self.signals_processed: int = 0  # BC: количество реально обработанных сигналов
@@ -83,64 +183,40 @@ class BacktestRunner:
         contract = sig.contract_address
         ts = sig.timestamp
 
-        # Определяем диапазон загрузки свечей вокруг сигнала
-        start_time = ts - timedelta(minutes=self.before_minutes)
-        end_time = ts + timedelta(minutes=self.after_minutes)
+        # Определяем диапазон загрузки свечей вокруг сигнала (окно стратегий, см. required_candle_window)
+        start_time = ts - timedelta(minutes=self.window_before_minutes)
+        end_time = ts + timedelta(minutes=self.window_after_minutes)
 
-        # Загружаем свечи из ценового лоадера
-        candles: List[Candle] = self.price_loader.load_prices(
-            contract_address=contract,
+        # Загружаем свечи колоночным рядом: timestamps в UTC (naive считаются UTC),
+        # сортировка по возрастанию и дедупликация (остается первая свеча) - важно для выбора
+        # exit candle (min timestamp >= exit_time). Лоадеры с load_arrays (хранилище, кеш)
+        # отдают срез без создания Candle-объектов.
+        candles: CandleSeries = load_candle_arrays(
+            self.price_loader,
+            contract,
             start_time=start_time,
             end_time=end_time,
         )
-
-        # Сортируем свечи по timestamp (ascending) и дедуплицируем по timestamp
-        # Важно: гарантируем сортировку для правильного выбора exit candle (min timestamp >= exit_time)
-        if candles:
-            # Нормализуем timestamps к UTC (timezone-aware) и дедуплицируем
-            normalized_candles = []
-            seen_timestamps = {}
-            
-            for candle in candles:
-                # Нормализуем timestamp к UTC
-                if candle.timestamp.tzinfo is None:
-                    # Если timestamp naive, считаем его UTC
-                    normalized_ts = candle.timestamp.replace(tzinfo=timezone.utc)
-                elif candle.timestamp.tzinfo != timezone.utc:
-                    # Конвертируем в UTC
-                    normalized_ts = candle.timestamp.astimezone(timezone.utc)
-                else:
-                    normalized_ts = candle.timestamp
-                
-                # Дедупликация: оставляем первую свечу с каждым timestamp
-                if normalized_ts not in seen_timestamps:
-                    seen_timestamps[normalized_ts] = True
-                    # Создаем новую свечу с нормализованным timestamp
-                    normalized_candles.append(Candle(
-                        timestamp=normalized_ts,
-                        open=candle.open,
-                        high=candle.high,
-                        low=candle.low,
-                        close=candle.close,
-                        volume=candle.volume
-                    ))
-            
-            # Сортировка по timestamp (ascending) - гарантируем правильный порядок
-            candles = sorted(normalized_candles, key=lambda c: c.timestamp)
+        if self.window_after_minutes < self.after_minutes and not self._window_covers_exits(candles, ts):
+            # Вход позже сигнала или разрыв в данных: окна до time stop не хватило - грузим настроенное окно
+            end_time = ts + timedelta(minutes=self.after_minutes)
+            candles = load_candle_arrays(self.price_loader, contract, start_time=start_time, end_time=end_time)
 
         # Логируем диагностику по свечам
-        if candles:
+        if len(candles):
             print(f"[time] Candle range requested: {start_time} to {end_time}")
             print(f"[candles] Candles available: {len(candles)}")
-            if candles[0].timestamp > ts:
-                print(f"[WARNING] WARNING: Signal time {ts} is earlier than first candle {candles[0].timestamp}")
+            first_ts = candles.timestamp_at(0)
+            if first_ts > ts:
+                print(f"[WARNING] WARNING: Signal time {ts} is earlier than first candle {first_ts}")
         else:
             print(f"[WARNING] No candles found for signal at {ts}")
 
         # Проверяем, были ли свечи валидными для обработки
-        if not candles:
+        if not len(candles):
             # Нет свечей - сигнал пропущен, инкрементируем счётчик (BC)
-            self.signals_skipped_no_candles += 1
+            with self._counters_lock:
+                self.signals_skipped_no_candles += 1
             
             # v1.9: создаём placeholder результаты только если включен флаг include_skipped_attempts
             # Это позволяет PortfolioEngine эмитить ATTEMPT_REJECTED_NO_CANDLES события,
@@ -173,10 +249,41 @@ class BacktestRunner:
             global_params=self.global_config,
         )
 
+        # Признаки сигнала из прошлых прогонов: стратегии возьмут их из data.feature_cache
+        store_key = None
+        stored_features: Dict[Any, Any] = {}
+        if self.feature_store is not None:
+            # Признаки считаются по свечам до входа (первая свеча >= сигнала) включительно:
+            # их отпечаток в ключе - исправленные или дозагруженные свечи окна дают промах
+            entry_hi = min(candles.index_at_or_after(ts) + 1, len(candles))
+            store_key = signal_key(sig.id, contract, ts, candles_fingerprint(candles[:entry_hi]))
+            stored_features = self.feature_store.get_many(
+                TRADE_FEATURES_SET, self._feature_store_version, [store_key]
+            ).get(store_key) or {}
+            data.feature_cache.update(stored_features)
+
+        # Результаты из кеша: ключ учитывает конфиг стратегии, окно свечей и версию кода
+        cache_keys: List[str] = []
+        cached_outputs: Dict[int, StrategyOutput] = {}
+        if self.result_cache is not None:
+            candles_fp = candles_fingerprint(candles)
+            cache_keys = [self.result_cache.make_key(sig, fp, candles_fp) for fp in self._strategy_fingerprints]
+            found = self.result_cache.get_many(cache_keys)
+            cached_outputs = {idx: found[key] for idx, key in enumerate(cache_keys) if key in found}
+
+        # Runner-стратегии оцениваются одним проходом по окну свечей
+        batch_outputs = self._evaluate_runner_batch(data, skip=cached_outputs)
+        fresh_outputs: List[Tuple[str, StrategyOutput]] = []
+
         # Применяем каждую стратегию к данным
-        for strategy in self.strategies:
+        for idx, strategy in enumerate(self.strategies):
             try:
-                out: StrategyOutput = strategy.on_signal(data)
+                if idx in cached_outputs:
+                    out: StrategyOutput = cached_outputs[idx]
+                elif idx in batch_outputs:
+                    out = batch_outputs[idx]
+                else:
+                    out = strategy.on_signal(data)
             except Exception as e:
                 # Если ошибка — фиксируем результат с reason="error"
                 out = StrategyOutput(
@@ -189,20 +296,25 @@ class BacktestRunner:
                     canonical_reason="error",
                     meta={"exception": str(e)},
                 )
+            if cache_keys and idx not in cached_outputs:
+                fresh_outputs.append((cache_keys[idx], out))
             
             # BC: инкрементируем счетчики (v1.9 семантика)
             # signals_processed: стратегия была вызвана и вернула результат (любой: entry или no_entry)
             # Инкрементируем только один раз на сигнал (не на каждую стратегию)
             if len(results) == 0:  # Первая стратегия для этого сигнала
-                self.signals_processed += 1
+                with self._counters_lock:
+                    self.signals_processed += 1
             
             # Счетчики пропущенных сигналов (детализация) - канонические значения v1.9
             if out.entry_time is None and out.reason == "no_entry":
                 meta_detail = out.meta.get("detail", "") if out.meta else ""
                 if meta_detail == "corrupt_candles":
-                    self.signals_skipped_corrupt_candles += 1
+                    with self._counters_lock:
+                        self.signals_skipped_corrupt_candles += 1
                 elif meta_detail == "no_candles":
-                    self.signals_skipped_no_candles += 1
+                    with self._counters_lock:
+                        self.signals_skipped_no_candles += 1
 
             # Добавляем результат в список
             results.append(
@@ -215,8 +327,53 @@ class BacktestRunner:
                 }
             )
 
+        if self.result_cache is not None and fresh_outputs:
+            self.result_cache.put_many(fresh_outputs)
+        if store_key is not None and data.feature_cache.keys() - stored_features.keys():
+            self.feature_store.put_many(  # type: ignore[union-attr]
+                TRADE_FEATURES_SET, self._feature_store_version, [(store_key, dict(data.feature_cache))]
+            )
+
         return results
 
+    def _window_covers_exits(self, candles: CandleSeries, signal_time: datetime) -> bool:
+        """
+        Хватает ли сокращенного окна: есть свеча не раньше входа + window_after_minutes.
+        Тогда каждая стратегия закрывает позицию (или доходит до time stop) внутри окна,
+        и свечи дальше не меняют ее результат.
+        """
+        entry_idx = candles.index_at_or_after(signal_time)
+        if entry_idx >= len(candles):
+            return False
+        exits_by = candles.timestamp_at(entry_idx) + timedelta(minutes=self.window_after_minutes)
+        return candles.timestamp_at(len(candles) - 1) >= exits_by
+
+    def _evaluate_runner_batch(self, data: StrategyInput, skip: Container[int] = ()) -> Dict[int, StrategyOutput]:
+        """
+        Оценивает все RunnerStrategy (без переопределенного on_signal) одним батчем.
+
+        :param skip: Индексы стратегий, которые не нужно оценивать (например, уже есть в кеше результатов)
+
+        :return: {индекс стратегии в self.strategies: StrategyOutput}. Пустой словарь,
+                 если батчить нечего или батч упал (тогда стратегии вызываются по одной,
+                 чтобы ошибка была привязана к конкретной стратегии).
+        """
+        runner_indices = [
+            idx for idx, strategy in enumerate(self.strategies)
+            if idx not in skip
+            and isinstance(strategy, RunnerStrategy) and type(strategy).on_signal is RunnerStrategy.on_signal
+        ]
+        if len(runner_indices) < 2:
+            return {}
+        try:
+            outputs = RunnerStrategy.on_signal_batch(
+                [cast(RunnerStrategy, self.strategies[idx]) for idx in runner_indices],
+                data,
+            )
+        except Exception:
+            return {}
+        return dict(zip(runner_indices, outputs))
+
     def run(self, include_skipped_attempts: bool = False) -> List[Dict[str, Any]]:
         """
         Основной метод запуска бэктеста.
@@ -228,7 +385,10 @@ class BacktestRunner:
         """
         signals: List[Signal] = self._load_signals()
         
-        if self.parallel and len(signals) > 1:
+        if self.executor == "process" and len(signals) > 1 and self._can_use_process_pool():
+            # Параллельная обработка в процессах: единица работы - все сигналы одного контракта
+            self.results.extend(self._run_process_pool(signals, include_skipped_attempts))
+        elif self.parallel and len(signals) > 1:
             # Параллельная обработка сигналов
             print(f"[processing] Processing {len(signals)} signals in parallel (max_workers={self.max_workers})")
             
@@ -245,23 +405,7 @@ class BacktestRunner:
                     except Exception as e:
                         print(f"[ERROR] Error processing signal {sig.id}: {e}")
                         # Добавляем ошибку для всех стратегий этого сигнала
-                        for strategy in self.strategies:
-                            self.results.append({
-                                "signal_id": sig.id,
-                                "contract_address": sig.contract_address,
-                                "strategy": strategy.config.name,
-                                "timestamp": sig.timestamp,
-                                "result": StrategyOutput(
-                                    entry_time=None,
-                                    entry_price=None,
-                                    exit_time=None,
-                                    exit_price=None,
-                                    pnl=0.0,
-                                    reason="error",
-                                    canonical_reason="error",
-                                    meta={"exception": str(e)},
-                                ),
-                            })
+                        self.results.extend(self._error_results(sig, e))
             
             # Сортируем результаты по signal_id и timestamp для консистентности
             self.results.sort(key=lambda x: (x["signal_id"], x["timestamp"]))
@@ -274,10 +418,219 @@ class BacktestRunner:
                 signal_results = self._process_signal(sig, include_skipped_attempts)
                 self.results.extend(signal_results)
 
-        # Выводим summary по rate limit, если используется GeckoTerminalPriceLoader
-        from ..infrastructure.price_loader import GeckoTerminalPriceLoader
-        if isinstance(self.price_loader, GeckoTerminalPriceLoader):
-            summary = self.price_loader.get_rate_limit_summary()
+        self._print_price_loader_summary()
+        self._print_result_cache_summary()
+        
+        return self.results
+
+    def _error_results(self, sig: Signal, error: Exception) -> List[Dict[str, Any]]:
+        """Результаты с reason="error" для всех стратегий сигнала (обработка сигнала упала целиком)."""
+        return [
+            {
+                "signal_id": sig.id,
+                "contract_address": sig.contract_address,
+                "strategy": strategy.config.name,
+                "timestamp": sig.timestamp,
+                "result": StrategyOutput(
+                    entry_time=None,
+                    entry_price=None,
+                    exit_time=None,
+                    exit_price=None,
+                    pnl=0.0,
+                    reason="error",
+                    canonical_reason="error",
+                    meta={"exception": str(error)},
+                ),
+            }
+            for strategy in self.strategies
+        ]
+
+    def _base_price_loader(self) -> PriceLoader:
+        """Исходный price loader (без обертки кеша свечей)."""
+        loader = self.price_loader
+        if isinstance(loader, CachingPriceLoader):
+            return loader.inner
+        return loader
+
+    def _can_use_process_pool(self) -> bool:
+        """
+        Проверяет, что price loader и стратегии можно передать в процессы-воркеры.
+        Иначе (например, GeckoTerminalPriceLoader с общим rate limiter) - fallback на потоки.
+        """
+        try:
+            pickle.dumps(self._base_price_loader())
+            pickle.dumps([(type(s), s.config) for s in self.strategies])
+        except Exception as e:
+            print(f"[WARNING] runtime.executor=process is not available ({e}), falling back to threads")
+            self.parallel = True
+            return False
+        return True
+
+    def _run_process_pool(self, signals: List[Signal], include_skipped_attempts: bool) -> List[Dict[str, Any]]:
+        """Обрабатывает сигналы в ProcessPoolExecutor и возвращает все строки результатов (см. _iter_process_pool)."""
+        return list(self._iter_process_pool(signals, include_skipped_attempts))
+
+    def _iter_process_pool(self, signals: List[Signal], include_skipped_attempts: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Обрабатывает сигналы в ProcessPoolExecutor, отдавая строки результатов по мере готовности.
+
+        Сигналы группируются по контракту (воркер грузит свечи контракта один раз),
+        воркеры получают price loader и конфиги стратегий, возвращают компактные результаты
+        (индекс сигнала, StrategyOutput по стратегиям, приращения счетчиков).
+        Строки отдаются в исходном порядке сигналов - как в последовательном режиме,
+        счетчики суммируются в том же порядке. В работе одновременно не больше
+        max_workers * 2 групп: готовые результаты, ожидающие своей очереди, буферизуются.
+        """
+        groups: Dict[str, List[Tuple[int, Signal]]] = {}
+        for idx, sig in enumerate(signals):
+            groups.setdefault(sig.contract_address, []).append((idx, sig))
+
+        print(
+            f"[processing] Processing {len(signals)} signals ({len(groups)} contracts) "
+            f"in process pool (max_workers={self.max_workers})"
+        )
+
+        # Приватные ключи (_price_loader, _warn_dedup) воркер создает сам
+        worker_config = {k: v for k, v in self.global_config.items() if not str(k).startswith("_")}
+        strategy_specs = [(type(s), s.config) for s in self.strategies]
+
+        # Группы идут в порядке первого сигнала - ранние сигналы готовы раньше
+        pending_groups = deque(groups.values())
+        max_in_flight = max(1, self.max_workers) * 2
+        per_signal: Dict[int, Tuple[List[StrategyOutput], Tuple[int, int, int]]] = {}
+        next_idx = 0
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_process_worker,
+            initargs=(self._base_price_loader(), strategy_specs, worker_config),
+        ) as executor:
+            future_to_group: Dict[Future, List[Tuple[int, Signal]]] = {}
+            while pending_groups or future_to_group:
+                while pending_groups and len(future_to_group) < max_in_flight:
+                    group = pending_groups.popleft()
+                    future_to_group[executor.submit(_process_contract_group, group, include_skipped_attempts)] = group
+
+                done, _ = wait(future_to_group, return_when=FIRST_COMPLETED)
+                for future in done:
+                    group = future_to_group.pop(future)
+                    try:
+                        group_results, cache_stats = future.result()
+                        for idx, outputs, deltas in group_results:
+                            per_signal[idx] = (outputs, deltas)
+                        if cache_stats and self.result_cache is not None:
+                            self.result_cache.record_stats(**cache_stats)
+                    except Exception as e:
+                        print(f"[ERROR] Error processing contract {group[0][1].contract_address}: {e}")
+                        for idx, sig in group:
+                            per_signal[idx] = (
+                                [row["result"] for row in self._error_results(sig, e)],
+                                (0, 0, 0),
+                            )
+
+                # Детерминированная выдача: порядок сигналов и стратегий как в последовательном режиме
+                while next_idx in per_signal:
+                    outputs, (processed, no_candles, corrupt) = per_signal.pop(next_idx)
+                    sig = signals[next_idx]
+                    next_idx += 1
+                    self.signals_processed += processed
+                    self.signals_skipped_no_candles += no_candles
+                    self.signals_skipped_corrupt_candles += corrupt
+                    for strategy, out in zip(self.strategies, outputs):
+                        yield {
+                            "signal_id": sig.id,
+                            "contract_address": sig.contract_address,
+                            "strategy": strategy.config.name,
+                            "timestamp": sig.timestamp,
+                            "result": out,
+                        }
+
+    def _iter_thread_pool(self, signals: List[Signal], include_skipped_attempts: bool) -> Iterator[Dict[str, Any]]:
+        """
+        Обрабатывает сигналы в ThreadPoolExecutor, отдавая строки результатов в порядке сигналов.
+        В работе одновременно не больше max_workers * 2 сигналов (скользящее окно futures).
+        """
+        print(f"[processing] Streaming {len(signals)} signals in parallel (max_workers={self.max_workers})")
+        max_in_flight = max(1, self.max_workers) * 2
+        in_flight: Deque[Tuple[Signal, Future]] = deque()
+        signal_iter = iter(signals)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for sig in signal_iter:
+                in_flight.append((sig, executor.submit(self._process_signal, sig, include_skipped_attempts)))
+                if len(in_flight) < max_in_flight:
+                    continue
+                yield from self._drain_thread_future(*in_flight.popleft())
+            while in_flight:
+                yield from self._drain_thread_future(*in_flight.popleft())
+
+    def _drain_thread_future(self, sig: Signal, future: Future) -> List[Dict[str, Any]]:
+        """Результаты сигнала из future (или reason="error" для всех стратегий, если обработка упала)."""
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"[ERROR] Error processing signal {sig.id}: {e}")
+            return self._error_results(sig, e)
+
+    def iter_results(self, include_skipped_attempts: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Потоковый вариант run(): отдает строки результатов (формат как в self.results)
+        по мере обработки сигналов, в порядке сигналов, не накапливая их в self.results.
+
+        В thread/process режимах одновременно обрабатывается ограниченное окно сигналов,
+        поэтому пиковая память определяется окном, а не числом сигналов.
+
+        :param include_skipped_attempts: См. run()
+        """
+        signals: List[Signal] = self._load_signals()
+
+        if self.executor == "process" and len(signals) > 1 and self._can_use_process_pool():
+            yield from self._iter_process_pool(signals, include_skipped_attempts)
+        elif self.parallel and len(signals) > 1:
+            yield from self._iter_thread_pool(signals, include_skipped_attempts)
+        else:
+            for sig in signals:
+                yield from self._process_signal(sig, include_skipped_attempts)
+
+        self._print_price_loader_summary()
+        self._print_result_cache_summary()
+
+    def run_streaming(self, sink: ResultSink, include_skipped_attempts: bool = False) -> ResultSink:
+        """
+        Запускает бэктест в потоковом режиме: строки результатов пишутся в sink
+        (например, SpillResultSink - колоночные батчи на диске по стратегиям).
+        self.results не заполняется; портфель - run_portfolio(sink=sink).
+
+        :param sink: Приемник результатов
+        :param include_skipped_attempts: См. run()
+        :return: Тот же sink (после flush)
+        """
+        for row in self.iter_results(include_skipped_attempts):
+            sink.write(row)
+        sink.flush()
+        return sink
+
+    def _print_price_loader_summary(self) -> None:
+        """
+        Выводит summary по загрузке свечей: кеш свечей (если включен)
+        и rate limit (если используется GeckoTerminalPriceLoader).
+        """
+        loader = self.price_loader
+        if isinstance(loader, CachingPriceLoader):
+            cache_summary = loader.get_cache_summary()
+            print("\n" + "="*60)
+            print("=== Candle Cache Summary ===")
+            print("="*60)
+            print(f"hits: {cache_summary['hits']}")
+            print(f"misses: {cache_summary['misses']}")
+            print(f"evictions: {cache_summary['evictions']}")
+            print(f"entries: {cache_summary['entries']}")
+            print(f"memory_mb: {cache_summary['bytes'] / (1024 * 1024):.2f} / {cache_summary['max_bytes'] / (1024 * 1024):.2f}")
+            print("="*60)
+            loader = loader.inner
+        
+        if isinstance(loader, GeckoTerminalPriceLoader):
+            summary = loader.get_rate_limit_summary()
             if summary.get("total_requests", 0) > 0:
                 print("\n" + "="*60)
                 print("=== GeckoTerminal Rate Limit Summary ===")
@@ -290,10 +643,25 @@ class BacktestRunner:
                 if summary.get('rate_limit_failures', 0) > 0:
                     print(f"rate_limit_failures: {summary.get('rate_limit_failures', 0)}")
                 print("="*60)
-        
-        return self.results
 
-    def _parse_bool(self, v: Any, default: bool = False) -> bool:
+    def _print_result_cache_summary(self) -> None:
+        """Выводит summary по кешу результатов (если включен)."""
+        if self.result_cache is None:
+            return
+        stats = self.result_cache.get_stats()
+        lookups = stats["hits"] + stats["misses"]
+        print("\n" + "="*60)
+        print("=== Result Cache Summary ===")
+        print("="*60)
+        print(f"hits: {stats['hits']}")
+        print(f"misses: {stats['misses']}")
+        print(f"hit_rate: {stats['hits'] / lookups:.1%}" if lookups else "hit_rate: n/a")
+        print(f"writes: {stats['writes']}")
+        print(f"path: {self.result_cache.db_path}")
+        print("="*60)
+
+    @staticmethod
+    def _parse_bool(v: Any, default: bool = False) -> bool:
         """
         Парсит значение в bool с поддержкой различных форматов.
         
@@ -318,7 +686,8 @@ class BacktestRunner:
             raise ValueError(f"Cannot parse bool from string: {v}")
         raise TypeError(f"Cannot parse bool from type: {type(v)}")
 
-    def _parse_int_optional(self, v: Any) -> Optional[int]:
+    @staticmethod
+    def _parse_int_optional(v: Any) -> Optional[int]:
         """
         Парсит значение в Optional[int] с поддержкой различных форматов.
         
@@ -347,160 +716,65 @@ class BacktestRunner:
         """
         Строит конфигурацию портфеля из global_config.
         """
-        portfolio_cfg = self.global_config.get("portfolio", {}) or {}
-        backtest_cfg = self.global_config.get("backtest", {}) or {}
-        
-        # Парсим даты backtest window
-        backtest_start: Optional[datetime] = None
-        backtest_end: Optional[datetime] = None
-        
-        if backtest_cfg and backtest_cfg.get("start_at"):
-            try:
-                backtest_start = datetime.fromisoformat(backtest_cfg["start_at"].replace("Z", "+00:00"))
-            except (ValueError, AttributeError) as e:
-                print(f"[WARNING] Warning: Invalid backtest.start_at format: {backtest_cfg.get('start_at')}, ignoring")
-                backtest_start = None
-        if backtest_cfg and backtest_cfg.get("end_at"):
-            try:
-                backtest_end = datetime.fromisoformat(backtest_cfg["end_at"].replace("Z", "+00:00"))
-            except (ValueError, AttributeError) as e:
-                print(f"[WARNING] Warning: Invalid backtest.end_at format: {backtest_cfg.get('end_at')}, ignoring")
-                backtest_end = None
-        
-        # Парсим fee model
-        fee_cfg = portfolio_cfg.get("fee", {})
-        
-        # Парсим execution profiles если есть
-        profiles = None
-        if "profiles" in fee_cfg:
-            profiles_dict = {}
-            for profile_name, profile_data in fee_cfg["profiles"].items():
-                profiles_dict[profile_name] = ExecutionProfileConfig(
-                    base_slippage_pct=float(profile_data.get("base_slippage_pct", 0.03)),
-                    slippage_multipliers={
-                        "entry": float(profile_data.get("slippage_multipliers", {}).get("entry", 1.0)),
-                        "exit_tp": float(profile_data.get("slippage_multipliers", {}).get("exit_tp", 1.0)),
-                        "exit_sl": float(profile_data.get("slippage_multipliers", {}).get("exit_sl", 1.0)),
-                        "exit_timeout": float(profile_data.get("slippage_multipliers", {}).get("exit_timeout", 1.0)),
-                        "exit_manual": float(profile_data.get("slippage_multipliers", {}).get("exit_manual", 1.0)),
-                    }
-                )
-            profiles = profiles_dict
-        
-        # Legacy slippage_pct (используется если profiles отсутствует)
-        slippage_pct = None
-        if "slippage_pct" in fee_cfg:
-            slippage_pct = safe_float(fee_cfg.get("slippage_pct"), default=0.0)
-        
-        fee_model = FeeModel(
-            swap_fee_pct=float(fee_cfg.get("swap_fee_pct", 0.003)),
-            lp_fee_pct=float(fee_cfg.get("lp_fee_pct", 0.001)),
-            slippage_pct=slippage_pct,
-            network_fee_sol=float(fee_cfg.get("network_fee_sol", 0.0005)),
-            profiles=profiles,
-        )
-        
-        # Execution profile (по умолчанию realistic)
-        execution_profile = portfolio_cfg.get("execution_profile", "realistic")
-        
-        # Profit reset конфигурация
-        profit_reset_enabled = portfolio_cfg.get("profit_reset_enabled")
-        profit_reset_multiple = portfolio_cfg.get("profit_reset_multiple")
-        profit_reset_trigger_basis = portfolio_cfg.get("profit_reset_trigger_basis", "equity_peak")
-        
-        # Capacity reset конфигурация
-        capacity_reset_cfg = portfolio_cfg.get("capacity_reset", {}) or {}
-        capacity_reset_enabled = capacity_reset_cfg.get("enabled", True)
-        capacity_window_type = capacity_reset_cfg.get("window_type", "time")
-        capacity_window_size = capacity_reset_cfg.get("window_size", 7)
-        capacity_max_blocked_ratio = capacity_reset_cfg.get("max_blocked_ratio", 0.4)
-        capacity_max_avg_hold_days = capacity_reset_cfg.get("max_avg_hold_days", 10.0)
-        
-        # Capacity prune конфигурация (v1.7)
-        capacity_reset_mode = capacity_reset_cfg.get("mode", "close_all")  # По умолчанию close_all для backward compatibility
-        prune_fraction = capacity_reset_cfg.get("prune_fraction", 0.5)
-        prune_min_hold_days = capacity_reset_cfg.get("prune_min_hold_days", 1.0)
-        prune_max_mcap_usd = capacity_reset_cfg.get("prune_max_mcap_usd", 20000.0)
-        prune_max_current_pnl_pct = capacity_reset_cfg.get("prune_max_current_pnl_pct", -0.30)
-        
-        # Capacity prune hardening (v1.7.1)
-        prune_cooldown_signals = capacity_reset_cfg.get("prune_cooldown_signals", 0)
-        prune_cooldown_days = capacity_reset_cfg.get("prune_cooldown_days")
-        prune_min_candidates = capacity_reset_cfg.get("prune_min_candidates", 3)
-        prune_protect_min_max_xn = capacity_reset_cfg.get("prune_protect_min_max_xn", 2.0)
-        
-        # PortfolioReplay конфигурация (ЭТАП 2)
-        use_replay_mode = self._parse_bool(
-            portfolio_cfg.get("use_replay_mode"),
-            default=False,
-        )
-        max_hold_minutes = self._parse_int_optional(
-            portfolio_cfg.get("max_hold_minutes")
-        )
-        
-        return PortfolioConfig(
-            initial_balance_sol=float(portfolio_cfg.get("initial_balance_sol", 10.0)),
-            allocation_mode=portfolio_cfg.get("allocation_mode", "dynamic"),
-            percent_per_trade=float(portfolio_cfg.get("percent_per_trade", 0.1)),
-            max_exposure=float(portfolio_cfg.get("max_exposure", 0.5)),
-            max_open_positions=int(portfolio_cfg.get("max_open_positions", 10)),
-            fee_model=fee_model,
-            execution_profile=execution_profile,
-            backtest_start=backtest_start,
-            backtest_end=backtest_end,
-            runner_reset_enabled=portfolio_cfg.get("runner_reset_enabled"),
-            runner_reset_multiple=(
-                safe_float(portfolio_cfg.get("runner_reset_multiple"), default=0.0)
-                if portfolio_cfg.get("runner_reset_multiple") is not None
-                else None
-            ),
-            profit_reset_enabled=profit_reset_enabled,
-            profit_reset_multiple=float(profit_reset_multiple) if profit_reset_multiple is not None else None,
-            profit_reset_trigger_basis=profit_reset_trigger_basis,
-            capacity_reset_enabled=capacity_reset_enabled,
-            capacity_window_type=capacity_window_type,
-            capacity_window_size=capacity_window_size,
-            capacity_max_blocked_ratio=float(capacity_max_blocked_ratio),
-            capacity_max_avg_hold_days=float(capacity_max_avg_hold_days),
-            capacity_reset_mode=capacity_reset_mode,
-            prune_fraction=float(prune_fraction),
-            prune_min_hold_days=float(prune_min_hold_days),
-            prune_max_mcap_usd=float(prune_max_mcap_usd),
-            prune_max_current_pnl_pct=float(prune_max_current_pnl_pct),
-            prune_cooldown_signals=int(prune_cooldown_signals),
-            prune_cooldown_days=float(prune_cooldown_days) if prune_cooldown_days is not None else None,
-            prune_min_candidates=int(prune_min_candidates),
-            prune_protect_min_max_xn=float(prune_protect_min_max_xn) if prune_protect_min_max_xn is not None else None,
-            use_replay_mode=use_replay_mode,
-            max_hold_minutes=max_hold_minutes,
-        )
+        return build_portfolio_config(self.global_config)
 
-    def run_portfolio(self) -> Dict[str, PortfolioResult]:
+    def run_portfolio(self, sink: Optional[ResultSink] = None) -> Dict[str, PortfolioResult]:
         """
         Запускает портфельную симуляцию для всех стратегий.
-        Должен вызываться после run().
+        Должен вызываться после run() (или run_streaming() с передачей sink).
+
+        Результаты один раз разбиваются по стратегиям (simulate получает только строки своей стратегии).
+        При runtime.parallel / runtime.executor=process и max_workers > 1 стратегии симулируются
+        параллельно в ProcessPoolExecutor; portfolio_results заполняется в порядке имен стратегий.
         
+        :param sink: Sink потокового режима: строки каждой стратегии читаются из него по очереди
         :return: Словарь {strategy_name: PortfolioResult}
         """
-        if not self.results:
+        if sink is None and not self.results:
             print("[WARNING] No strategy results available. Run run() first.")
             return {}
         
         portfolio_cfg = self._build_portfolio_config()
-        engine = PortfolioEngine(portfolio_cfg)
         
-        # Получаем уникальные имена стратегий
-        strategy_names = sorted({r["strategy"] for r in self.results})
+        # Разбиваем результаты по стратегиям один раз
+        if sink is not None:
+            strategy_names = sink.strategy_names()
+            if not strategy_names:
+                print("[WARNING] No strategy results available in result sink.")
+                return {}
+        else:
+            by_strategy: Dict[str, List[Dict[str, Any]]] = {}
+            for r in self.results:
+                by_strategy.setdefault(r["strategy"], []).append(r)
+            strategy_names = sorted(by_strategy)
+
+        def strategy_rows(name: str) -> Iterable[Dict[str, Any]]:
+            return sink.iter_strategy(name) if sink is not None else by_strategy[name]
         
         print(f"\n[portfolio] Running portfolio simulation for {len(strategy_names)} strategies...")
-        
+
+        use_pool = (
+            (self.parallel or self.executor == "process")
+            and self.max_workers > 1
+            and len(strategy_names) > 1
+            and self._can_pickle_portfolio_config(portfolio_cfg)
+        )
+        if use_pool:
+            results = self._run_portfolio_pool(portfolio_cfg, strategy_names, strategy_rows)
+        else:
+            engine = PortfolioEngine(portfolio_cfg)
+            results = {}
+            for name in strategy_names:
+                print(f"  [processing] Processing portfolio for strategy: {name}")
+                results[name] = engine.simulate(strategy_rows(name), strategy_name=name)
+
         for name in strategy_names:
-            print(f"  [processing] Processing portfolio for strategy: {name}")
-            p_result = engine.simulate(self.results, strategy_name=name)
+            p_result = results[name]
             self.portfolio_results[name] = p_result
             
             # Выводим краткую статистику
             stats = p_result.stats
+            print(f"  [portfolio] {name}:")
             print(f"    [OK] Final balance: {stats.final_balance_sol:.4f} SOL")
             print(f"    [return] Total return: {stats.total_return_pct:.2%}")
             print(f"    [drawdown] Max drawdown: {stats.max_drawdown_pct:.2%}")
@@ -508,3 +782,261 @@ class BacktestRunner:
             print(f"    [skipped] Trades skipped: {stats.trades_skipped_by_risk}")
         
         return self.portfolio_results
+
+    def _can_pickle_portfolio_config(self, portfolio_cfg: PortfolioConfig) -> bool:
+        """Проверяет, что PortfolioConfig можно передать в процессы-воркеры (иначе - последовательно)."""
+        try:
+            pickle.dumps(portfolio_cfg)
+        except Exception as e:
+            print(f"[WARNING] Parallel portfolio simulation is not available ({e}), running sequentially")
+            return False
+        return True
+
+    def _run_portfolio_pool(
+        self,
+        portfolio_cfg: PortfolioConfig,
+        strategy_names: List[str],
+        strategy_rows: Callable[[str], Iterable[Dict[str, Any]]],
+    ) -> Dict[str, PortfolioResult]:
+        """
+        Симулирует стратегии в ProcessPoolExecutor.
+        В работе одновременно не больше max_workers * 2 стратегий: строки стратегии
+        материализуются только при отправке в воркер (важно для потокового режима).
+        """
+        print(f"[portfolio] Simulating {len(strategy_names)} strategies in process pool (max_workers={self.max_workers})")
+        results: Dict[str, PortfolioResult] = {}
+        pending = deque(strategy_names)
+        max_in_flight = self.max_workers * 2
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_portfolio_worker,
+            initargs=(portfolio_cfg,),
+        ) as executor:
+            future_to_name: Dict[Future, str] = {}
+            while pending or future_to_name:
+                while pending and len(future_to_name) < max_in_flight:
+                    name = pending.popleft()
+                    future_to_name[executor.submit(_simulate_portfolio_strategy, name, list(strategy_rows(name)))] = name
+                done, _ = wait(future_to_name, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[future_to_name.pop(future)] = future.result()
+        return results
+
+
+def build_portfolio_config(global_config: Dict[str, Any]) -> PortfolioConfig:
+    """
+    Строит конфигурацию портфеля из глобального конфига (секции portfolio и backtest).
+    Используется BacktestRunner и портфельным sweep (backtester/research/portfolio_sweep).
+    """
+    portfolio_cfg = global_config.get("portfolio", {}) or {}
+    backtest_cfg = global_config.get("backtest", {}) or {}
+    
+    # Парсим даты backtest window
+    backtest_start: Optional[datetime] = None
+    backtest_end: Optional[datetime] = None
+    
+    if backtest_cfg and backtest_cfg.get("start_at"):
+        try:
+            backtest_start = datetime.fromisoformat(backtest_cfg["start_at"].replace("Z", "+00:00"))
+        except (ValueError, AttributeError) as e:
+            print(f"[WARNING] Warning: Invalid backtest.start_at format: {backtest_cfg.get('start_at')}, ignoring")
+            backtest_start = None
+    if backtest_cfg and backtest_cfg.get("end_at"):
+        try:
+            backtest_end = datetime.fromisoformat(backtest_cfg["end_at"].replace("Z", "+00:00"))
+        except (ValueError, AttributeError) as e:
+            print(f"[WARNING] Warning: Invalid backtest.end_at format: {backtest_cfg.get('end_at')}, ignoring")
+            backtest_end = None
+    
+    # Парсим fee model
+    fee_cfg = portfolio_cfg.get("fee", {})
+    
+    # Парсим execution profiles если есть
+    profiles = None
+    if "profiles" in fee_cfg:
+        profiles_dict = {}
+        for profile_name, profile_data in fee_cfg["profiles"].items():
+            profiles_dict[profile_name] = ExecutionProfileConfig(
+                base_slippage_pct=float(profile_data.get("base_slippage_pct", 0.03)),
+                slippage_multipliers={
+                    "entry": float(profile_data.get("slippage_multipliers", {}).get("entry", 1.0)),
+                    "exit_tp": float(profile_data.get("slippage_multipliers", {}).get("exit_tp", 1.0)),
+                    "exit_sl": float(profile_data.get("slippage_multipliers", {}).get("exit_sl", 1.0)),
+                    "exit_timeout": float(profile_data.get("slippage_multipliers", {}).get("exit_timeout", 1.0)),
+                    "exit_manual": float(profile_data.get("slippage_multipliers", {}).get("exit_manual", 1.0)),
+                }
+            )
+        profiles = profiles_dict
+    
+    # Legacy slippage_pct (используется если profiles отсутствует)
+    slippage_pct = None
+    if "slippage_pct" in fee_cfg:
+        slippage_pct = safe_float(fee_cfg.get("slippage_pct"), default=0.0)
+    
+    fee_model = FeeModel(
+        swap_fee_pct=float(fee_cfg.get("swap_fee_pct", 0.003)),
+        lp_fee_pct=float(fee_cfg.get("lp_fee_pct", 0.001)),
+        slippage_pct=slippage_pct,
+        network_fee_sol=float(fee_cfg.get("network_fee_sol", 0.0005)),
+        profiles=profiles,
+    )
+    
+    # Execution profile (по умолчанию realistic)
+    execution_profile = portfolio_cfg.get("execution_profile", "realistic")
+    
+    # Profit reset конфигурация
+    profit_reset_enabled = portfolio_cfg.get("profit_reset_enabled")
+    profit_reset_multiple = portfolio_cfg.get("profit_reset_multiple")
+    profit_reset_trigger_basis = portfolio_cfg.get("profit_reset_trigger_basis", "equity_peak")
+    
+    # Capacity reset конфигурация
+    capacity_reset_cfg = portfolio_cfg.get("capacity_reset", {}) or {}
+    capacity_reset_enabled = capacity_reset_cfg.get("enabled", True)
+    capacity_window_type = capacity_reset_cfg.get("window_type", "time")
+    capacity_window_size = capacity_reset_cfg.get("window_size", 7)
+    capacity_max_blocked_ratio = capacity_reset_cfg.get("max_blocked_ratio", 0.4)
+    capacity_max_avg_hold_days = capacity_reset_cfg.get("max_avg_hold_days", 10.0)
+    
+    # Capacity prune конфигурация (v1.7)
+    capacity_reset_mode = capacity_reset_cfg.get("mode", "close_all")  # По умолчанию close_all для backward compatibility
+    prune_fraction = capacity_reset_cfg.get("prune_fraction", 0.5)
+    prune_min_hold_days = capacity_reset_cfg.get("prune_min_hold_days", 1.0)
+    prune_max_mcap_usd = capacity_reset_cfg.get("prune_max_mcap_usd", 20000.0)
+    prune_max_current_pnl_pct = capacity_reset_cfg.get("prune_max_current_pnl_pct", -0.30)
+    
+    # Capacity prune hardening (v1.7.1)
+    prune_cooldown_signals = capacity_reset_cfg.get("prune_cooldown_signals", 0)
+    prune_cooldown_days = capacity_reset_cfg.get("prune_cooldown_days")
+    prune_min_candidates = capacity_reset_cfg.get("prune_min_candidates", 3)
+    prune_protect_min_max_xn = capacity_reset_cfg.get("prune_protect_min_max_xn", 2.0)
+    
+    # PortfolioReplay конфигурация (ЭТАП 2)
+    use_replay_mode = BacktestRunner._parse_bool(
+        portfolio_cfg.get("use_replay_mode"),
+        default=False,
+    )
+    max_hold_minutes = BacktestRunner._parse_int_optional(
+        portfolio_cfg.get("max_hold_minutes")
+    )
+    
+    return PortfolioConfig(
+        initial_balance_sol=float(portfolio_cfg.get("initial_balance_sol", 10.0)),
+        allocation_mode=portfolio_cfg.get("allocation_mode", "dynamic"),
+        percent_per_trade=float(portfolio_cfg.get("percent_per_trade", 0.1)),
+        max_exposure=float(portfolio_cfg.get("max_exposure", 0.5)),
+        max_open_positions=int(portfolio_cfg.get("max_open_positions", 10)),
+        fee_model=fee_model,
+        execution_profile=execution_profile,
+        backtest_start=backtest_start,
+        backtest_end=backtest_end,
+        runner_reset_enabled=portfolio_cfg.get("runner_reset_enabled"),
+        runner_reset_multiple=(
+            safe_float(portfolio_cfg.get("runner_reset_multiple"), default=0.0)
+            if portfolio_cfg.get("runner_reset_multiple") is not None
+            else None
+        ),
+        profit_reset_enabled=profit_reset_enabled,
+        profit_reset_multiple=float(profit_reset_multiple) if profit_reset_multiple is not None else None,
+        profit_reset_trigger_basis=profit_reset_trigger_basis,
+        capacity_reset_enabled=capacity_reset_enabled,
+        capacity_window_type=capacity_window_type,
+        capacity_window_size=capacity_window_size,
+        capacity_max_blocked_ratio=float(capacity_max_blocked_ratio),
+        capacity_max_avg_hold_days=float(capacity_max_avg_hold_days),
+        capacity_reset_mode=capacity_reset_mode,
+        prune_fraction=float(prune_fraction),
+        prune_min_hold_days=float(prune_min_hold_days),
+        prune_max_mcap_usd=float(prune_max_mcap_usd),
+        prune_max_current_pnl_pct=float(prune_max_current_pnl_pct),
+        prune_cooldown_signals=int(prune_cooldown_signals),
+        prune_cooldown_days=float(prune_cooldown_days) if prune_cooldown_days is not None else None,
+        prune_min_candidates=int(prune_min_candidates),
+        prune_protect_min_max_xn=float(prune_protect_min_max_xn) if prune_protect_min_max_xn is not None else None,
+        use_replay_mode=use_replay_mode,
+        max_hold_minutes=max_hold_minutes,
+    )
+
+
+# --- Process-pool воркеры (module-level, чтобы передаваться в ProcessPoolExecutor) ---
+
+_WORKER_RUNNER: Optional[BacktestRunner] = None
+
+
+_WORKER_PORTFOLIO_ENGINE: Optional[PortfolioEngine] = None
+
+
+def _init_portfolio_worker(portfolio_cfg: PortfolioConfig) -> None:
+    """Создает PortfolioEngine воркера (конфиг передается один раз на процесс)."""
+    global _WORKER_PORTFOLIO_ENGINE
+    _WORKER_PORTFOLIO_ENGINE = PortfolioEngine(portfolio_cfg)
+
+
+def _simulate_portfolio_strategy(strategy_name: str, rows: List[Dict[str, Any]]) -> PortfolioResult:
+    """Портфельная симуляция одной стратегии в воркере."""
+    if _WORKER_PORTFOLIO_ENGINE is None:
+        raise RuntimeError("Portfolio worker is not initialized")
+    return _WORKER_PORTFOLIO_ENGINE.simulate(rows, strategy_name=strategy_name)
+
+
+def _init_process_worker(price_loader: PriceLoader, strategy_specs: List[Tuple[type, Any]], global_config: Dict[str, Any]) -> None:
+    """Создает BacktestRunner воркера: стратегии восстанавливаются из (класс, конфиг)."""
+    global _WORKER_RUNNER
+    worker_config = dict(global_config)
+    # Кеш свечей в воркере - на группу контракта (см. _process_contract_group)
+    worker_config["data"] = {k: v for k, v in (global_config.get("data") or {}).items() if k != "cache_max_mb"}
+    _WORKER_RUNNER = BacktestRunner(
+        signal_loader=None,  # type: ignore[arg-type]
+        price_loader=price_loader,
+        reporter=None,
+        strategies=[strategy_cls(config) for strategy_cls, config in strategy_specs],
+        global_config=worker_config,
+    )
+
+
+def _process_contract_group(
+    group: List[Tuple[int, Signal]],
+    include_skipped_attempts: bool,
+) -> Tuple[List[Tuple[int, List[StrategyOutput], Tuple[int, int, int]]], Optional[Dict[str, int]]]:
+    """
+    Обрабатывает все сигналы одного контракта в воркере.
+
+    Свечи контракта загружаются один раз на объединение окон всех сигналов группы,
+    остальные окна - срезы из памяти.
+
+    :return: ([(индекс сигнала, StrategyOutput по стратегиям,
+               (signals_processed, signals_skipped_no_candles, signals_skipped_corrupt_candles) приращения)],
+              статистика кеша результатов воркера за группу или None)
+    """
+    runner = _WORKER_RUNNER
+    if runner is None:
+        raise RuntimeError("Process worker is not initialized")
+
+    base_loader = runner.price_loader
+    group_loader = CachingPriceLoader(base_loader, max_bytes=sys.maxsize, full_history=False)
+    contract = group[0][1].contract_address
+    group_start = min(sig.timestamp for _, sig in group) - timedelta(minutes=runner.window_before_minutes)
+    group_end = max(sig.timestamp for _, sig in group) + timedelta(minutes=runner.window_after_minutes)
+    try:
+        group_loader.load_arrays(contract, group_start, group_end)
+    except Exception:
+        # Предзагрузка best-effort: ошибки загрузки проявятся в _process_signal, как в последовательном режиме
+        pass
+
+    out: List[Tuple[int, List[StrategyOutput], Tuple[int, int, int]]] = []
+    # Лоадер группы подменяется в обоих местах: стратегии и портфель берут его из global_config
+    runner.price_loader = group_loader
+    runner.global_config["_price_loader"] = group_loader
+    try:
+        for idx, sig in group:
+            before = (runner.signals_processed, runner.signals_skipped_no_candles, runner.signals_skipped_corrupt_candles)
+            rows = runner._process_signal(sig, include_skipped_attempts)
+            after = (runner.signals_processed, runner.signals_skipped_no_candles, runner.signals_skipped_corrupt_candles)
+            deltas = (after[0] - before[0], after[1] - before[1], after[2] - before[2])
+            out.append((idx, [row["result"] for row in rows], deltas))
+    finally:
+        runner.price_loader = base_loader
+        runner.global_config["_price_loader"] = base_loader
+    cache_stats = runner.result_cache.get_stats() if runner.result_cache is not None else None
+    if runner.result_cache is not None:
+        runner.result_cache.reset_stats()
+    return out, cache_stats
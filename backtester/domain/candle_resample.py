@@ -0,0 +1,69 @@
+"""
+Векторная агрегация свечей в старший таймфрейм (1m -> 5m/15m/1h/4h/...).
+
+Корзина свечи - floor(ts / step) * step (метка = начало интервала, как у GeckoTerminal).
+Одна сегментация по границам корзин и reduceat по каждой колонке:
+    open - первая свеча корзины, close - последняя,
+    high - максимум, low - минимум, volume - сумма.
+Корзины без исходных свечей не создаются (минуты без сделок GeckoTerminal тоже не отдает).
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Union
+
+import numpy as np
+
+from .candle_series import CandleSeries
+
+# Таймфреймы, которые обычно строятся из 1m
+TIMEFRAME_SECONDS: Dict[str, int] = {
+    "1m": 60,
+    "5m": 5 * 60,
+    "15m": 15 * 60,
+    "1h": 60 * 60,
+    "4h": 4 * 60 * 60,
+    "1d": 24 * 60 * 60,
+}
+
+_TIMEFRAME_RE = re.compile(r"^(\d+)([mhd])$")
+_UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """
+    Длительность таймфрейма в секундах: "1m", "5m", "1h", "4h", "1d" (и любые "<N>m|h|d").
+
+    :raises ValueError: Неизвестный формат таймфрейма
+    """
+    if timeframe in TIMEFRAME_SECONDS:
+        return TIMEFRAME_SECONDS[timeframe]
+    match = _TIMEFRAME_RE.match(timeframe)
+    if match is None or int(match.group(1)) <= 0:
+        raise ValueError(f"Unsupported timeframe: {timeframe!r} (expected e.g. '5m', '1h', '4h')")
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+def resample_series(series: CandleSeries, timeframe: Union[str, int]) -> CandleSeries:
+    """
+    Агрегирует ряд в таймфрейм timeframe.
+
+    :param series: Исходный ряд (обычно 1m), отсортирован, без дублей
+    :param timeframe: Целевой таймфрейм ("15m", "1h") или его длительность в секундах
+    :return: Новый ряд; метка свечи - начало интервала (UTC, кратно длительности)
+    """
+    step = timeframe if isinstance(timeframe, int) else timeframe_seconds(timeframe)
+    if len(series) == 0:
+        return CandleSeries.empty()
+
+    buckets = (np.asarray(series.ts, dtype=np.int64) // step) * step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], buckets.shape[0]] - 1
+    return CandleSeries(
+        ts=buckets[starts],
+        open=np.asarray(series.open, dtype=np.float64)[starts],
+        high=np.maximum.reduceat(np.asarray(series.high, dtype=np.float64), starts),
+        low=np.minimum.reduceat(np.asarray(series.low, dtype=np.float64), starts),
+        close=np.asarray(series.close, dtype=np.float64)[ends],
+        volume=np.add.reduceat(np.asarray(series.volume, dtype=np.float64), starts),
+    )
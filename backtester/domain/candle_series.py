@@ -0,0 +1,274 @@
+"""
+CandleSeries - колоночное (struct-of-arrays) представление ряда свечей.
+
+Вместо List[Candle] ряд хранится непрерывными NumPy-массивами:
+    ts                               - int64, epoch seconds (UTC), по возрастанию, без дублей
+    open / high / low / close / volume - float64 той же длины
+
+Срезы по времени - две бинарные выборки и zero-copy view, поэтому окно сигнала
+стоит несколько массивов-представлений вместо десятков тысяч объектов.
+Для обратной совместимости ряд ведет себя как Sequence[Candle]: итерация и
+индексация создают Candle лениво, по одной.
+"""
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple, Union, overload
+
+import numpy as np
+import pandas as pd
+
+from .models import Candle
+
+# Порядок строк в ohlcv-матрице
+OHLCV_COLUMNS: Tuple[str, ...] = ("open", "high", "low", "close", "volume")
+
+
+def to_epoch_seconds(dt: datetime) -> int:
+    """
+    Переводит datetime в epoch seconds (UTC), дробные секунды отбрасываются.
+    Naive datetime считается UTC (как и в BacktestRunner).
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _ceil_epoch_seconds(dt: datetime) -> int:
+    """Epoch seconds с округлением вверх: ts >= dt  <=>  ts >= _ceil_epoch_seconds(dt)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return math.ceil(dt.timestamp())
+
+
+def is_strictly_increasing(ts: np.ndarray) -> bool:
+    """Отсортирован ли ts по возрастанию без дублей (контракт CandleSeries) - O(n) без сортировки."""
+    return ts.shape[0] < 2 or bool(np.all(ts[1:] > ts[:-1]))
+
+
+@dataclass(frozen=True, eq=False)
+class CandleSeries(Sequence):
+    """
+    Ряд свечей одного контракта в колоночном виде.
+
+    ts - int64 epoch seconds (UTC), отсортирован по возрастанию, без дублей.
+    Остальные поля - float64 массивы той же длины (могут быть view на memmap).
+    """
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.ts.shape[0])
+
+    @overload
+    def __getitem__(self, idx: int) -> Candle: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> "CandleSeries": ...
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Candle, "CandleSeries"]:
+        """Свеча по индексу (создается на лету) или срез ряда (view для шага 1)."""
+        if isinstance(idx, slice):
+            lo, hi, step = idx.indices(len(self))
+            if step == 1:
+                return self.slice_index(lo, max(lo, hi))
+            order = np.arange(lo, hi, step)
+            return type(self)(
+                ts=self.ts[order], open=self.open[order], high=self.high[order],
+                low=self.low[order], close=self.close[order], volume=self.volume[order],
+            )
+        n = len(self)
+        i = int(idx)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("CandleSeries index out of range")
+        return Candle(
+            timestamp=datetime.fromtimestamp(int(self.ts[i]), tz=timezone.utc),
+            open=float(self.open[i]),
+            high=float(self.high[i]),
+            low=float(self.low[i]),
+            close=float(self.close[i]),
+            volume=float(self.volume[i]),
+        )
+
+    def __iter__(self) -> Iterator[Candle]:
+        """Ленивая итерация по Candle (обратная совместимость с List[Candle])."""
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return f"{type(self).__name__}(n=0)"
+        return f"{type(self).__name__}(n={len(self)}, {self.timestamp_at(0)} .. {self.timestamp_at(-1)})"
+
+    @property
+    def nbytes(self) -> int:
+        """Суммарный размер массивов в байтах."""
+        return int(
+            self.ts.nbytes + self.open.nbytes + self.high.nbytes
+            + self.low.nbytes + self.close.nbytes + self.volume.nbytes
+        )
+
+    def timestamp_at(self, idx: int) -> datetime:
+        """Timestamp свечи idx (UTC datetime) без создания Candle."""
+        return datetime.fromtimestamp(int(self.ts[idx]), tz=timezone.utc)
+
+    def index_at_or_after(self, t: datetime) -> int:
+        """Индекс первой свечи с timestamp >= t (len, если такой нет). O(log n)."""
+        return int(np.searchsorted(self.ts, _ceil_epoch_seconds(t), side="left"))
+
+    def index_after(self, t: datetime) -> int:
+        """Индекс первой свечи с timestamp > t (len, если такой нет). O(log n)."""
+        return int(np.searchsorted(self.ts, to_epoch_seconds(t), side="right"))
+
+    def slice_index(self, lo: int, hi: int) -> "CandleSeries":
+        """Zero-copy срез по индексам [lo, hi)."""
+        return type(self)(
+            ts=self.ts[lo:hi],
+            open=self.open[lo:hi],
+            high=self.high[lo:hi],
+            low=self.low[lo:hi],
+            close=self.close[lo:hi],
+            volume=self.volume[lo:hi],
+        )
+
+    def slice_time(self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> "CandleSeries":
+        """
+        Срез по времени [start_time, end_time] (обе границы включительно, как в CsvPriceLoader).
+        Две бинарные выборки + zero-copy view.
+        """
+        lo = 0
+        hi = len(self)
+        if start_time is not None:
+            lo = self.index_at_or_after(start_time)
+        if end_time is not None:
+            hi = self.index_after(end_time)
+        if hi < lo:
+            hi = lo
+        return self.slice_index(lo, hi)
+
+    def to_candles(self) -> List[Candle]:
+        """Материализует список Candle (timestamp в UTC)."""
+        ts_list = self.ts.tolist()
+        open_list = self.open.tolist()
+        high_list = self.high.tolist()
+        low_list = self.low.tolist()
+        close_list = self.close.tolist()
+        volume_list = self.volume.tolist()
+        return [
+            Candle(
+                timestamp=datetime.fromtimestamp(ts_list[i], tz=timezone.utc),
+                open=open_list[i],
+                high=high_list[i],
+                low=low_list[i],
+                close=close_list[i],
+                volume=volume_list[i],
+            )
+            for i in range(len(ts_list))
+        ]
+
+    def timestamps_utc(self) -> pd.Series:
+        """Timestamps как pd.Series datetime64 (UTC), индекс 0..n-1."""
+        return pd.Series(pd.to_datetime(self.ts, unit="s", utc=True))
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame с колонками timestamp/open/high/low/close/volume (timestamp в UTC)."""
+        return pd.DataFrame({
+            "timestamp": self.timestamps_utc(),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        })
+
+    @classmethod
+    def empty(cls) -> "CandleSeries":
+        """Пустой ряд."""
+        empty_f = np.empty(0, dtype=np.float64)
+        return cls(
+            ts=np.empty(0, dtype=np.int64),
+            open=empty_f, high=empty_f, low=empty_f, close=empty_f, volume=empty_f,
+        )
+
+    @classmethod
+    def from_candles(cls, candles: Iterable[Candle]) -> "CandleSeries":
+        """
+        Строит колоночный ряд из свечей.
+        Timestamp приводится к UTC (naive считается UTC), свечи сортируются по времени,
+        дубли timestamp удаляются (остается первая).
+        """
+        candles = candles if isinstance(candles, list) else list(candles)
+        if not candles:
+            return cls.empty()
+        ts = np.fromiter((to_epoch_seconds(c.timestamp) for c in candles), dtype=np.int64, count=len(candles))
+        ohlcv = np.array(
+            [[c.open, c.high, c.low, c.close, c.volume] for c in candles],
+            dtype=np.float64,
+        ).T
+        return cls._sorted_unique(ts, ohlcv)
+
+    @classmethod
+    def from_arrays(cls, ts: np.ndarray, ohlcv: np.ndarray) -> "CandleSeries":
+        """
+        Строит ряд из сырых массивов: ts (epoch seconds) и ohlcv shape (5, n), порядок любой.
+        Сортировка по времени, дубли timestamp удаляются (остается первая).
+        """
+        return cls._sorted_unique(np.asarray(ts, dtype=np.int64), np.asarray(ohlcv, dtype=np.float64))
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "CandleSeries":
+        """
+        Строит колоночный ряд из DataFrame с колонками timestamp/open/high/low/close/volume.
+        Timestamp приводится к UTC; дробные секунды отбрасываются.
+        """
+        if df.empty:
+            return cls.empty()
+        timestamps = pd.to_datetime(df["timestamp"], utc=True)
+        ts = ((timestamps - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+        ohlcv = np.vstack([df[col].to_numpy(dtype=np.float64) for col in OHLCV_COLUMNS])
+        return cls._sorted_unique(ts, ohlcv)
+
+    @classmethod
+    def _sorted_unique(cls, ts: np.ndarray, ohlcv: np.ndarray) -> "CandleSeries":
+        """
+        Стабильная сортировка по ts и дедупликация (keep-first).
+        Уже строго возрастающий ts (обычный случай для лоадеров) проверяется за O(n)
+        и не сортируется и не копируется.
+        """
+        if is_strictly_increasing(ts):
+            ohlcv = np.ascontiguousarray(ohlcv)
+            return cls(
+                ts=np.ascontiguousarray(ts),
+                open=ohlcv[0], high=ohlcv[1], low=ohlcv[2], close=ohlcv[3], volume=ohlcv[4],
+            )
+        order = np.argsort(ts, kind="stable")
+        ts = ts[order]
+        ohlcv = ohlcv[:, order]
+        if ts.shape[0] > 1:
+            keep = np.empty(ts.shape[0], dtype=bool)
+            keep[0] = True
+            np.not_equal(ts[1:], ts[:-1], out=keep[1:])
+            if not keep.all():
+                ts = ts[keep]
+                ohlcv = ohlcv[:, keep]
+        ohlcv = np.ascontiguousarray(ohlcv)
+        return cls(
+            ts=np.ascontiguousarray(ts),
+            open=ohlcv[0], high=ohlcv[1], low=ohlcv[2], close=ohlcv[3], volume=ohlcv[4],
+        )
+
+
+def as_candle_series(candles: Union[CandleSeries, Iterable[Candle]]) -> CandleSeries:
+    """Возвращает CandleSeries как есть, список Candle - конвертирует (сортировка, дедупликация, UTC)."""
+    if isinstance(candles, CandleSeries):
+        return candles
+    return CandleSeries.from_candles(candles)
@@ -3,7 +3,7 @@ from __future__ import annotations  # Позволяет использоват
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, Literal, Optional, Sequence
 
 @dataclass
 class Signal:
@@ -34,8 +34,10 @@ class StrategyInput:
     - глобальные параметры теста (баланс, комиссии и т.п.)
     """
     signal: Signal                    # Исходный сигнал
-    candles: List[Candle]            # Свечи, доступные для анализа стратегии
+    candles: Sequence[Candle]        # Свечи для анализа: CandleSeries (колоночный ряд) или List[Candle]
     global_params: Dict[str, Any]    # Глобальные параметры (настройки теста, price loader и т.д.)
+    # Вычисления по сигналу, общие для всех стратегий (например, window features) - см. shared_window_features
+    feature_cache: Dict[Any, Any] = field(default_factory=dict, repr=False, compare=False)
 
 
 @dataclass
@@ -7,7 +7,7 @@ import math
 import os
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Literal, Optional, Union, TYPE_CHECKING
+from typing import Any, Dict, Iterable, List, Literal, Optional, Union, TYPE_CHECKING
 from enum import Enum
 from uuid import uuid4
 
@@ -2234,7 +2234,7 @@ class PortfolioEngine:
 
     def simulate(
         self,
-        all_results: List[Dict[str, Any]],
+        all_results: Iterable[Dict[str, Any]],
         strategy_name: str,
         blueprints: Optional[List['StrategyTradeBlueprint']] = None,
     ) -> PortfolioResult:
@@ -2248,6 +2248,7 @@ class PortfolioEngine:
             "timestamp": datetime (время сигнала),
             "result": StrategyOutput
         }
+        Может быть любым итерируемым (например, строки стратегии из ResultSink) - проходится один раз.
         
         blueprints: опциональный список StrategyTradeBlueprint для Replay режима (ЭТАП 2)
         """
@@ -2273,12 +2274,13 @@ class PortfolioEngine:
         # Legacy path (без изменений)
         # 1. Отфильтровать по стратегии (Runner-only: только исполненные сделки)
         trades: List[Dict[str, Any]] = []
-        total_results = len(all_results)
+        total_results = 0
         filtered_by_strategy = 0
         filtered_by_entry = 0
         filtered_by_window = 0
         
         for r in all_results:
+            total_results += 1
             if r.get("strategy") != strategy_name:
                 filtered_by_strategy += 1
                 continue
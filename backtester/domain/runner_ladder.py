@@ -8,10 +8,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from .candle_series import CandleSeries
 from .runner_config import RunnerConfig
 from ..utils.typing_utils import as_utc_datetime
 
@@ -32,18 +34,114 @@ class RunnerTradeResult:
     time_stop_triggered: bool = False  # Сработал ли time_stop (даже если был hit TP)
 
 
+class LadderPath:
+    """
+    Подготовленный ценовой путь для симуляции лестницы (отсортированные свечи в виде массивов).
+
+    Хранит кумулятивный максимум high, поэтому "первая свеча, где high >= target"
+    находится бинарным поиском. Результаты поиска мемоизируются: один путь можно
+    переиспользовать для нескольких конфигов (одинаковые цели считаются один раз).
+    """
+
+    def __init__(self, timestamps: pd.Series, high: np.ndarray, close: np.ndarray):
+        """
+        :param timestamps: Отсортированные timestamps свечей (pd.Series datetime, индекс 0..n-1)
+        :param high: Массив high той же длины
+        :param close: Массив close той же длины
+        """
+        self.timestamps = timestamps
+        self.high = high
+        self.close = close
+        self.n = int(len(timestamps))
+        # NaN в high никогда не достигает цели (как сравнение NaN >= target в построчной версии)
+        self.high_cummax = np.fmax.accumulate(np.where(np.isnan(high), -np.inf, high)) if self.n else high
+        self._hit_index_cache: Dict[float, int] = {}
+        self._hold_cap_cache: Dict[tuple, int] = {}
+        self._hold_minutes_cache: Dict[datetime, np.ndarray] = {}
+
+    @classmethod
+    def from_dataframe(cls, candles_df: pd.DataFrame) -> "LadderPath":
+        """Строит путь из DataFrame со свечами (колонки: timestamp, high, close, ...)."""
+        # Уже отсортированный DataFrame (обычный случай) не сортируется повторно
+        if not candles_df['timestamp'].is_monotonic_increasing:
+            candles_df = candles_df.sort_values('timestamp')
+        candles_df = candles_df.reset_index(drop=True)
+        timestamps = pd.to_datetime(candles_df['timestamp'])
+        return cls(
+            timestamps=timestamps,
+            high=candles_df['high'].to_numpy(dtype=np.float64),
+            close=candles_df['close'].to_numpy(dtype=np.float64),
+        )
+
+    @classmethod
+    def from_series(cls, series: CandleSeries) -> "LadderPath":
+        """Строит путь из CandleSeries (уже отсортирован): массивы high/close берутся без копирования."""
+        return cls(timestamps=series.timestamps_utc(), high=series.high, close=series.close)
+
+    def first_hit_index(self, target_price: float) -> int:
+        """Индекс первой свечи с high >= target_price (n, если цель не достигнута)."""
+        idx = self._hit_index_cache.get(target_price)
+        if idx is None:
+            idx = int(np.searchsorted(self.high_cummax, target_price, side='left'))
+            self._hit_index_cache[target_price] = idx
+        return idx
+
+    def prime_first_hits(self, target_prices: Iterable[float]) -> None:
+        """
+        Заполняет кеш first_hit_index для набора целей одним векторным searchsorted
+        (объединение уровней нескольких конфигов считается за один проход).
+        """
+        if not self.n:
+            return
+        targets = np.unique(np.asarray(list(target_prices), dtype=np.float64))
+        targets = targets[~np.isnan(targets)]
+        if not len(targets):
+            return
+        indices = np.searchsorted(self.high_cummax, targets, side='left')
+        for target, idx in zip(targets.tolist(), indices.tolist()):
+            self._hit_index_cache.setdefault(target, int(idx))
+
+    def hold_cap_index(self, entry_time: datetime, max_hold_minutes) -> int:
+        """
+        Индекс первой свечи, на которой время удержания превышает max_hold_minutes
+        (n, если time stop внутри пути не наступает). Свечи начиная с этого индекса
+        не участвуют в поиске уровней.
+        """
+        if not max_hold_minutes:
+            return self.n
+        key = (entry_time, max_hold_minutes)
+        idx = self._hold_cap_cache.get(key)
+        if idx is None:
+            # Время удержания считается один раз на entry_time и общее для всех time stop
+            hold_minutes = self._hold_minutes_cache.get(entry_time)
+            if hold_minutes is None:
+                hold_minutes = (self.timestamps - entry_time).dt.total_seconds().to_numpy() / 60
+                self._hold_minutes_cache[entry_time] = hold_minutes
+            idx = int(np.searchsorted(hold_minutes, max_hold_minutes, side='right'))
+            self._hold_cap_cache[key] = idx
+        return idx
+
+    def first_index_at_or_after(self, t) -> int:
+        """Индекс первой свечи с timestamp >= t (n, если такой нет)."""
+        return int(self.timestamps.searchsorted(t, side='left'))
+
+    def timestamp_at(self, idx: int) -> pd.Timestamp:
+        return self.timestamps.iloc[idx]
+
+
 class RunnerLadderEngine:
     """
     Движок для симуляции Runner Ladder стратегии.
     
     Симулирует частичное закрытие позиций на разных уровнях прибыли.
+    Поиск достижения уровней векторизован (см. LadderPath).
     """
     
     @staticmethod
     def simulate(
         entry_time: datetime,
         entry_price: float,
-        candles_df: pd.DataFrame,
+        candles_df: pd.DataFrame | CandleSeries,
         config: RunnerConfig,
     ) -> RunnerTradeResult:
         """
@@ -53,26 +151,45 @@ class RunnerLadderEngine:
             entry_time: Время входа в позицию
             entry_price: Цена входа
             candles_df: DataFrame со свечами (колонки: timestamp, open, high, low, close, volume)
+                        или CandleSeries
             config: Конфигурация Runner стратегии
             
         Returns:
             RunnerTradeResult с результатами симуляции
         """
-        if candles_df.empty:
-            return RunnerTradeResult(
-                entry_time=entry_time,
-                entry_price=entry_price,
-                exit_time=None,
-                exit_price=None,
-                realized_pnl_pct=0.0,
-                reason="no_data",
-                levels_hit={},
-                fractions_exited={},
-                realized_multiple=1.0,
-                time_stop_triggered=False,
-            )
-        
-        # Получаем уровни из конфига
+        if isinstance(candles_df, CandleSeries):
+            if not len(candles_df):
+                return RunnerLadderEngine._no_data_result(entry_time, entry_price)
+            path = LadderPath.from_series(candles_df)
+        else:
+            if candles_df.empty:
+                return RunnerLadderEngine._no_data_result(entry_time, entry_price)
+            path = LadderPath.from_dataframe(candles_df)
+        return RunnerLadderEngine.simulate_path(
+            entry_time=entry_time,
+            entry_price=entry_price,
+            path=path,
+            config=config,
+        )
+
+    @staticmethod
+    def _no_data_result(entry_time: datetime, entry_price: float) -> RunnerTradeResult:
+        return RunnerTradeResult(
+            entry_time=entry_time,
+            entry_price=entry_price,
+            exit_time=None,
+            exit_price=None,
+            realized_pnl_pct=0.0,
+            reason="no_data",
+            levels_hit={},
+            fractions_exited={},
+            realized_multiple=1.0,
+            time_stop_triggered=False,
+        )
+
+    @staticmethod
+    def ladder_levels(config: RunnerConfig) -> Tuple[List[float], List[float]]:
+        """Возвращает (xn уровней, доли) из конфига в порядке симуляции."""
         if hasattr(config, 'take_profit_levels') and config.take_profit_levels:
             levels = [level.xn for level in config.take_profit_levels]
             fractions = [level.fraction for level in config.take_profit_levels]
@@ -81,20 +198,43 @@ class RunnerLadderEngine:
             levels = [2.0, 5.0, 10.0]
             fraction_per_level = 1.0 / len(levels)
             fractions = [fraction_per_level] * len(levels)
-        
-        # Получаем max_hold_minutes из конфига (time_stop_minutes или max_hold_minutes)
+        return levels, fractions
+
+    @staticmethod
+    def max_hold_minutes(config: RunnerConfig):
+        """Возвращает max_hold_minutes из конфига (time_stop_minutes или max_hold_minutes)."""
         max_hold_minutes = getattr(config, 'time_stop_minutes', None)
         if max_hold_minutes is None:
             max_hold_minutes = getattr(config, 'max_hold_minutes', None)
         if max_hold_minutes is None:
             max_hold_minutes = 432000  # 30 дней по умолчанию
+        return max_hold_minutes
+
+    @staticmethod
+    def simulate_path(
+        entry_time: datetime,
+        entry_price: float,
+        path: LadderPath,
+        config: RunnerConfig,
+    ) -> RunnerTradeResult:
+        """
+        Симулирует Runner Ladder на подготовленном пути.
+
+        Семантика совпадает с построчным проходом по свечам: уровень считается достигнутым
+        на первой свече с high >= entry_price * xn, если до нее не наступил time stop.
+        """
+        if path.n == 0:
+            return RunnerLadderEngine._no_data_result(entry_time, entry_price)
+        
+        levels, fractions = RunnerLadderEngine.ladder_levels(config)
+        max_hold_minutes = RunnerLadderEngine.max_hold_minutes(config)
         
         # Получаем exit_on_first_tp и allow_partial_fills из конфига
         exit_on_first_tp = getattr(config, 'exit_on_first_tp', False)
         allow_partial_fills = getattr(config, 'allow_partial_fills', True)
         
-        # Сортируем свечи по времени
-        candles_df = candles_df.sort_values('timestamp').reset_index(drop=True)
+        # Свечи с индексом >= hold_cap лежат за time stop и не участвуют в поиске уровней
+        hold_cap = path.hold_cap_index(entry_time, max_hold_minutes)
         
         # Инициализация
         levels_hit: Dict[float, datetime] = {}
@@ -112,69 +252,45 @@ class RunnerLadderEngine:
             
             # Если exit_on_first_tp=True и уже достигнут первый уровень, закрываем всё
             if exit_on_first_tp and i > 0 and levels_hit:
-                # Первый уровень уже достигнут, закрываем всё на нём
                 break
             
-            # Если allow_partial_fills=False, не делаем частичных выходов
-            # В этом случае закрываем всё на первом достигнутом уровне
+            # Если allow_partial_fills=False и уже достигнут уровень, закрываем всё на нём
             if not allow_partial_fills and levels_hit:
-                # Уже достигнут хотя бы один уровень, закрываем всё на нём
                 break
             
-            # Ищем первую свечу, где high >= entry_price * xn
-            target_price = entry_price * xn
-            hit_time: Optional[datetime] = None
-            
-            for _, row in candles_df.iterrows():
-                candle_time = pd.to_datetime(row['timestamp'])
-                
-                # Проверка max_hold_minutes (если превышен до достижения уровня)
-                if max_hold_minutes:
-                    hold_minutes = (candle_time - entry_time).total_seconds() / 60
-                    if hold_minutes > max_hold_minutes:
-                        # Time stop сработал до достижения этого уровня
-                        break
-                
-                # Проверяем, достигнут ли уровень
-                if row['high'] >= target_price:
-                    hit_time_raw = candle_time
-                    # Нормализуем к pd.Timestamp, затем к datetime
-                    hit_time_ts = as_utc_datetime(hit_time_raw)
-                    if hit_time_ts is not None:
-                        hit_time = hit_time_ts.to_pydatetime() if isinstance(hit_time_ts, pd.Timestamp) else hit_time_ts
-                        levels_hit[xn] = hit_time
-                    
-                    # Вычисляем долю для закрытия (от initial size)
-                    # Если exit_on_first_tp=True, закрываем всё на первом уровне
-                    if exit_on_first_tp and i == 0:
-                        # Закрываем всё на первом уровне
-                        actual_fraction = 1.0 - total_fraction_exited
-                        fractions_exited[xn] = actual_fraction
-                        total_fraction_exited = 1.0
-                        realized_multiple += xn * actual_fraction
-                    elif not allow_partial_fills:
-                        # Если allow_partial_fills=False, закрываем всё на первом достигнутом уровне
-                        actual_fraction = 1.0 - total_fraction_exited
-                        fractions_exited[xn] = actual_fraction
-                        total_fraction_exited = 1.0
-                        realized_multiple += xn * actual_fraction
-                    else:
-                        # Частичный выход: закрываем fraction от initial size
-                        # Ограничиваем, чтобы не превысить 1.0
-                        actual_fraction = min(fraction, 1.0 - total_fraction_exited)
-                        if actual_fraction > 0:
-                            fractions_exited[xn] = actual_fraction
-                            total_fraction_exited += actual_fraction
-                            realized_multiple += xn * actual_fraction
-                    break
-            
-            if hit_time is None:
+            # Первая свеча, где high >= entry_price * xn (до time stop)
+            hit_idx = path.first_hit_index(entry_price * xn)
+            if hit_idx >= hold_cap:
                 # Уровень не достигнут (либо time_stop, либо цена не достигла)
                 # Продолжаем проверять следующие уровни, если позиция не закрыта полностью
-                if total_fraction_exited >= 1.0:
-                    break
                 continue
             
+            hit_time_ts = as_utc_datetime(path.timestamp_at(hit_idx))
+            if hit_time_ts is not None:
+                levels_hit[xn] = hit_time_ts.to_pydatetime()
+            
+            # Вычисляем долю для закрытия (от initial size)
+            if exit_on_first_tp and i == 0:
+                # Закрываем всё на первом уровне
+                actual_fraction = 1.0 - total_fraction_exited
+                fractions_exited[xn] = actual_fraction
+                total_fraction_exited = 1.0
+                realized_multiple += xn * actual_fraction
+            elif not allow_partial_fills:
+                # Если allow_partial_fills=False, закрываем всё на первом достигнутом уровне
+                actual_fraction = 1.0 - total_fraction_exited
+                fractions_exited[xn] = actual_fraction
+                total_fraction_exited = 1.0
+                realized_multiple += xn * actual_fraction
+            else:
+                # Частичный выход: закрываем fraction от initial size
+                # Ограничиваем, чтобы не превысить 1.0
+                actual_fraction = min(fraction, 1.0 - total_fraction_exited)
+                if actual_fraction > 0:
+                    fractions_exited[xn] = actual_fraction
+                    total_fraction_exited += actual_fraction
+                    realized_multiple += xn * actual_fraction
+            
             # Если exit_on_first_tp=True и достигнут первый уровень, прекращаем обработку
             if exit_on_first_tp and i == 0:
                 break
@@ -183,10 +299,6 @@ class RunnerLadderEngine:
             if not allow_partial_fills:
                 break
         
-        # Определяем exit_time и exit_price
-        exit_time: Optional[datetime] = None
-        exit_price: Optional[float] = None
-        
         # Главное правило:
         # - Если позиция закрыта полностью на уровнях (total_fraction_exited >= 1.0) → reason = "ladder_tp"
         # - Если позиция НЕ закрыта полностью и сработал time_stop → reason = "time_stop", time_stop_triggered = True
@@ -194,125 +306,76 @@ class RunnerLadderEngine:
         has_levels_hit = bool(levels_hit)
         is_fully_closed = total_fraction_exited >= 1.0
         
-        # Определяем exit_time для случаев, когда он еще не установлен
+        # Позиция полностью закрыта на уровнях - берем время последнего достигнутого уровня
         exit_time_from_levels = None
         if is_fully_closed and has_levels_hit:
-            # Позиция полностью закрыта на уровнях - берем время последнего достигнутого уровня
-            exit_times = list(levels_hit.values())
-            if exit_times:
-                exit_time_from_levels = max(exit_times)
+            exit_time_from_levels = max(levels_hit.values())
         
-        # A) Исправляем определение time_stop_triggered
-        # time_stop_triggered должен быть True только если финальный exit произошёл по time_stop
-        # То есть: если позиция закрылась по TP (полностью или на последнем уровне) → time_stop_triggered=False
-        # Если позиция дожила до таймстопа и остаток закрыт по таймстопу → True
+        # Время последней свечи и time stop (нужны для time_stop_triggered и fallback exit_time)
+        last_candle_time: Optional[datetime] = None
+        last_candle_time_ts = as_utc_datetime(path.timestamp_at(path.n - 1))
+        if last_candle_time_ts is not None:
+            last_candle_time = last_candle_time_ts.to_pydatetime()
+        time_stop_dt: Optional[datetime] = None
+        if max_hold_minutes:
+            time_stop_ts = as_utc_datetime(entry_time + pd.Timedelta(minutes=max_hold_minutes))
+            if time_stop_ts is not None:
+                time_stop_dt = time_stop_ts.to_pydatetime()
+        
+        # time_stop_triggered = True только если финальный exit произошёл по time_stop:
+        # позиция не закрылась полностью на уровнях и данные дошли до момента time stop.
+        # Если данные закончились до time_stop - это НЕ time_stop_triggered.
         time_stop_triggered = False
         time_stop_time_dt: Optional[datetime] = None
+        if (
+            max_hold_minutes and not is_fully_closed
+            and last_candle_time is not None and time_stop_dt is not None
+            and last_candle_time >= time_stop_dt
+        ):
+            time_stop_triggered = True
+            time_stop_time_dt = time_stop_dt
         
-        # Проверяем time_stop только если позиция НЕ закрылась полностью на уровнях
-        if max_hold_minutes and not is_fully_closed:
-            # Вычисляем время time_stop
-            time_stop_time_calc = entry_time + pd.Timedelta(minutes=max_hold_minutes)
-            # Проверяем, не превысили ли мы time_stop
-            last_candle_time_raw = pd.to_datetime(candles_df.iloc[-1]['timestamp'])
-            last_candle_time_ts = as_utc_datetime(last_candle_time_raw)
-            if last_candle_time_ts is not None and isinstance(last_candle_time_ts, pd.Timestamp):
-                last_candle_time = last_candle_time_ts.to_pydatetime()
-                time_stop_ts = as_utc_datetime(time_stop_time_calc)
-                if time_stop_ts is not None and isinstance(time_stop_ts, pd.Timestamp):
-                    time_stop_dt = time_stop_ts.to_pydatetime()
-                    if last_candle_time >= time_stop_dt:
-                        # Финальный exit произошёл по time_stop (позиция не закрылась полностью на уровнях)
-                        time_stop_triggered = True
-                        time_stop_time_dt = time_stop_dt
-                    # Если данные закончились до time_stop, но позиция не закрылась полностью,
-                    # это НЕ считается time_stop_triggered (данные просто закончились)
-                    # time_stop_triggered остается False
-        
-        # B) Исправляем выбор ladder_reason
         # ladder_reason отражает финальную причину закрытия позиции, а не факт достижения уровней
-        # Правило:
-        # - если time_stop_triggered == True → ladder_reason = "time_stop" (финальный exit по time_stop)
-        # - иначе если позиция закрыта через ladder TP (полностью/последний уровень) → ladder_reason = "ladder_tp"
-        # - иначе (fallback) → ladder_reason = "time_stop" или "ladder_tp" в зависимости от контекста
         if time_stop_triggered:
-            # Финальный exit произошёл по time_stop (позиция не закрылась полностью на уровнях)
             ladder_reason = "time_stop"
-        elif is_fully_closed and has_levels_hit:
-            # Позиция закрылась полностью через ladder TP (все уровни достигнуты или exit_on_first_tp)
-            ladder_reason = "ladder_tp"
         elif has_levels_hit:
-            # Достигнут хотя бы один уровень, но позиция не закрылась полностью
-            # (данные закончились до time_stop или нет max_hold_minutes)
-            # Это edge case - считаем ladder_tp для BC (частичный exit, но не time_stop)
+            # Позиция закрылась через ladder TP, либо данные закончились до time_stop
+            # с достигнутыми уровнями (edge case - ladder_tp для BC)
             ladder_reason = "ladder_tp"
         else:
             # Ни один уровень не достигнут - fallback (данные закончились или нет уровней)
             ladder_reason = "time_stop"
         
-        # Определяем reason и exit_time (для внутренней логики)
+        # Определяем exit_time (для внутренней логики)
+        exit_time: Optional[datetime]
         if is_fully_closed and has_levels_hit:
-            # Позиция полностью закрыта на уровнях - это ladder take profit
-            reason = "ladder_tp"
             exit_time = exit_time_from_levels
         elif time_stop_triggered:
-            # FIX 1: Time stop сработал (даже если был hit TP, но позиция не закрыта полностью)
-            reason = "time_stop"
+            # Time stop сработал (даже если был hit TP, но позиция не закрыта полностью)
             exit_time = time_stop_time_dt
         elif has_levels_hit:
-            # Достигнут хотя бы один уровень, но позиция не закрыта полностью и time_stop не сработал
-            # (данные закончились до time_stop или нет max_hold_minutes) - это ladder_tp для обратной совместимости
-            reason = "ladder_tp"
-            exit_time = exit_time_from_levels if exit_time_from_levels else None
+            exit_time = exit_time_from_levels
         else:
-            # Ни один уровень не достигнут - проверяем time_stop
-            reason = "time_stop"
             exit_time = time_stop_time_dt
         
-        # Если exit_time еще не установлен, определяем его
+        # Если exit_time еще не установлен: time stop, если данные до него дошли, иначе последняя свеча
         if exit_time is None:
-            if max_hold_minutes:
-                # Вычисляем время time_stop
-                time_stop_calc = entry_time + pd.Timedelta(minutes=max_hold_minutes)
-                # Проверяем, не превысили ли мы time_stop
-                last_candle_time_raw = pd.to_datetime(candles_df.iloc[-1]['timestamp'])
-                last_candle_time_ts = as_utc_datetime(last_candle_time_raw)
-                if last_candle_time_ts is not None and isinstance(last_candle_time_ts, pd.Timestamp):
-                    last_candle_time = last_candle_time_ts.to_pydatetime()
-                    time_stop_ts = as_utc_datetime(time_stop_calc)
-                    if time_stop_ts is not None and isinstance(time_stop_ts, pd.Timestamp):
-                        time_stop_dt = time_stop_ts.to_pydatetime()
-                        if last_candle_time >= time_stop_dt:
-                            exit_time = time_stop_dt
-                        else:
-                            # Данные закончились до time_stop - закрываемся по последней свече
-                            exit_time = last_candle_time
-                    else:
-                        exit_time = last_candle_time
-                else:
-                    exit_time = None
+            if last_candle_time is None:
+                exit_time = None
+            elif time_stop_dt is not None and last_candle_time >= time_stop_dt:
+                exit_time = time_stop_dt
             else:
-                # Нет max_hold_minutes - закрываемся по последней свече
-                last_candle_time_raw = pd.to_datetime(candles_df.iloc[-1]['timestamp'])
-                last_candle_time_ts = as_utc_datetime(last_candle_time_raw)
-                if last_candle_time_ts is not None and isinstance(last_candle_time_ts, pd.Timestamp):
-                    exit_time = last_candle_time_ts.to_pydatetime()
-                else:
-                    exit_time = None
+                exit_time = last_candle_time
         
-        # Находим цену на момент exit_time
-        # Важно: выбираем свечу с минимальным timestamp >= exit_time
-        # candles_df уже отсортирован по timestamp (строка 97), поэтому можно использовать первый цикл
-        # Но для дополнительной гарантии, используем min() для защиты от несортированных данных
+        # Находим цену на момент exit_time: свеча с минимальным timestamp >= exit_time
+        exit_price: Optional[float] = None
         if exit_time:
-            matching_rows = candles_df[pd.to_datetime(candles_df['timestamp']) >= exit_time]
-            if not matching_rows.empty:
-                # Выбираем свечу с минимальным timestamp >= exit_time
-                exit_row = matching_rows.iloc[0]  # Первая строка уже минимальная после сортировки
-                exit_price = float(exit_row['close'])
+            exit_idx = path.first_index_at_or_after(exit_time)
+            if exit_idx < path.n:
+                exit_price = float(path.close[exit_idx])
             else:
                 # Fallback: используем последнюю доступную цену
-                exit_price = float(candles_df.iloc[-1]['close'])
+                exit_price = float(path.close[-1])
         
         # Вычисляем realized_pnl_pct
         if realized_multiple > 0:
@@ -324,25 +387,13 @@ class RunnerLadderEngine:
             else:
                 realized_pnl_pct = 0.0
         
-        # Нормализуем exit_time к datetime
-        exit_time_dt: Optional[datetime] = None
-        if exit_time is not None:
-            if isinstance(exit_time, pd.Timestamp):
-                exit_time_dt = exit_time.to_pydatetime()
-            elif isinstance(exit_time, datetime):
-                exit_time_dt = exit_time
-            else:
-                exit_time_ts = as_utc_datetime(exit_time)
-                if exit_time_ts is not None and isinstance(exit_time_ts, pd.Timestamp):
-                    exit_time_dt = exit_time_ts.to_pydatetime()
-        
         # BC FIX: Используем ladder_reason для обратной совместимости
         # ladder_reason = "ladder_tp" если достигнут хотя бы один уровень (независимо от total_fraction_exited)
         # ladder_reason = "time_stop" если сработал time_stop и НЕ было levels_hit
         return RunnerTradeResult(
             entry_time=entry_time,
             entry_price=entry_price,
-            exit_time=exit_time_dt,
+            exit_time=exit_time,
             exit_price=exit_price,
             realized_pnl_pct=realized_pnl_pct,
             reason=ladder_reason,  # BC: используем ladder_reason для обратной совместимости
@@ -354,4 +405,4 @@ class RunnerLadderEngine:
 
 
 # Алиас для обратной совместимости
-__all__ = ['RunnerLadderEngine', 'RunnerTradeResult']
+__all__ = ['RunnerLadderEngine', 'RunnerTradeResult', 'LadderPath']
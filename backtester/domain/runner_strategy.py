@@ -1,11 +1,13 @@
 from __future__ import annotations
-from typing import List, Literal, cast, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal, Sequence, Tuple, cast, Optional
 
-import pandas as pd
+import numpy as np
 
+from .candle_series import CandleSeries, as_candle_series
 from .models import StrategyInput, StrategyOutput, Candle
 from .strategy_base import Strategy
-from .runner_ladder import RunnerLadderEngine
+from .runner_ladder import LadderPath, RunnerLadderEngine
 from .runner_config import RunnerConfig
 from .strategy_trade_blueprint import (
     StrategyTradeBlueprint,
@@ -13,12 +15,58 @@ from .strategy_trade_blueprint import (
     FinalExitBlueprint,
 )
 from .trade_features import (
+    FEATURE_WINDOWS_MIN,
     get_total_supply,
-    calc_window_features,
+    shared_window_features,
     calc_trade_mcap_features,
 )
 
 
+@dataclass
+class RunnerSignalContext:
+    """
+    Данные сигнала, общие для всех Runner-конфигов: готовятся один раз на сигнал
+    (срез свечей после сигнала, путь для лестницы, window features).
+    """
+    data: StrategyInput
+    candles: CandleSeries  # Свечи начиная с момента сигнала (view на колоночный ряд), отсортированы
+    path: Optional[LadderPath]
+    window_features: Dict[str, Any]
+
+    @property
+    def entry_candle(self) -> Optional[Candle]:
+        """Первая доступная свеча после сигнала — вход."""
+        return self.candles[0] if len(self.candles) else None
+
+    @classmethod
+    def build(cls, data: StrategyInput) -> "RunnerSignalContext":
+        signal_time = data.signal.timestamp
+        series = as_candle_series(data.candles)
+
+        # Отбираем свечи, начиная с момента сигнала (или позже) - бинарный поиск + view
+        candles = series.slice_time(signal_time, None)
+        if not len(candles):
+            return cls(data=data, candles=candles, path=None, window_features={})
+
+        entry_candle = candles[0]
+        # Путь для RunnerLadderEngine строится прямо из массивов ряда
+        path = LadderPath.from_series(candles)
+
+        # Trade features не зависят от конфига - считаем один раз на сигнал (общий кеш StrategyInput)
+        window_features = shared_window_features(
+            data,
+            entry_time=entry_candle.timestamp,
+            entry_price=entry_candle.close,
+            candles=series,
+        )
+        return cls(
+            data=data,
+            candles=candles,
+            path=path,
+            window_features=window_features,
+        )
+
+
 class RunnerStrategy(Strategy):
     """
     Runner стратегия с лестницей тейк-профитов.
@@ -34,21 +82,49 @@ class RunnerStrategy(Strategy):
             raise ValueError(f"RunnerStrategy requires RunnerConfig, got {type(config)}")
 
     def on_signal(self, data: StrategyInput) -> StrategyOutput:
-        signal_time = data.signal.timestamp
-        
+        return self.on_context(RunnerSignalContext.build(data))
+
+    def required_window_minutes(self) -> Optional[Tuple[int, int]]:
+        """
+        До сигнала нужны окна trade features, после входа - свечи до time stop:
+        после него лестница уровни не ищет.
+        """
+        config = cast(RunnerConfig, self.config)
+        return max(FEATURE_WINDOWS_MIN), int(RunnerLadderEngine.max_hold_minutes(config))
+
+    @staticmethod
+    def on_signal_batch(strategies: Sequence["RunnerStrategy"], data: StrategyInput) -> List[StrategyOutput]:
+        """
+        Оценивает несколько Runner-конфигов на одном окне свечей за один проход.
+
+        Свечи фильтруются и сортируются один раз, window features считаются один раз,
+        а первые достижения уровней ищутся одним векторным поиском по объединению
+        xn всех конфигов. Результат для каждой стратегии идентичен strategy.on_signal(data).
+
+        :param strategies: Runner стратегии (порядок сохраняется)
+        :param data: StrategyInput с сигналом и свечами
+        :return: Список StrategyOutput в порядке strategies
+        """
+        context = RunnerSignalContext.build(data)
+        entry_candle = context.entry_candle
+        if context.path is not None and entry_candle is not None:
+            targets = []
+            for strategy in strategies:
+                levels, _ = RunnerLadderEngine.ladder_levels(cast(RunnerConfig, strategy.config))
+                targets.extend(entry_candle.close * xn for xn in levels)
+            context.path.prime_first_hits(targets)
+        return [strategy.on_context(context) for strategy in strategies]
+
+    def on_context(self, context: RunnerSignalContext) -> StrategyOutput:
+        """Оценивает конфиг стратегии на подготовленном контексте сигнала."""
         # Проверяем, что config является RunnerConfig
         if not isinstance(self.config, RunnerConfig):
             raise ValueError(f"RunnerStrategy requires RunnerConfig, got {type(self.config)}")
         config = self.config
 
-        # Отбираем свечи, начиная с момента сигнала (или позже)
-        candles: List[Candle] = sorted(
-            [c for c in data.candles if c.timestamp >= signal_time],
-            key=lambda c: c.timestamp
-        )
-
         # Если свечей нет — невозможно войти в позицию
-        if not candles:
+        entry_candle = context.entry_candle
+        if entry_candle is None or context.path is None:
             return StrategyOutput(
                 entry_time=None, entry_price=None,
                 exit_time=None, exit_price=None,
@@ -57,61 +133,29 @@ class RunnerStrategy(Strategy):
                 meta={"detail": "no candles after signal"}
             )
 
-        # Первая доступная свеча после сигнала — вход
-        entry_candle = candles[0]
-        entry_time = entry_candle.timestamp
-        entry_price = entry_candle.close
-
-        # Преобразуем List[Candle] в DataFrame для RunnerLadderEngine
-        candles_df = self._candles_to_dataframe(candles)
-
         # Запускаем симуляцию Runner Ladder
-        ladder_result = RunnerLadderEngine.simulate(
-            entry_time=entry_time,
-            entry_price=entry_price,
-            candles_df=candles_df,
+        ladder_result = RunnerLadderEngine.simulate_path(
+            entry_time=entry_candle.timestamp,
+            entry_price=entry_candle.close,
+            path=context.path,
             config=config
         )
 
         # Преобразуем RunnerTradeResult в StrategyOutput
         return self._ladder_result_to_strategy_output(
             ladder_result=ladder_result,
-            data=data,
-            entry_candle=entry_candle,
-            candles=candles
+            context=context,
         )
 
-    def _candles_to_dataframe(self, candles: List[Candle]) -> pd.DataFrame:
-        """
-        Преобразует List[Candle] в DataFrame для RunnerLadderEngine.
-        
-        Важно: гарантирует сортировку по timestamp для правильного выбора exit candle.
-        Свечи уже отсортированы в on_signal (строка 45-48), но для дополнительной гарантии
-        сортируем DataFrame перед возвратом.
-        """
-        candles_data = []
-        for candle in candles:
-            candles_data.append({
-                "timestamp": candle.timestamp,
-                "open": candle.open,
-                "high": candle.high,
-                "low": candle.low,
-                "close": candle.close,
-                "volume": candle.volume
-            })
-        df = pd.DataFrame(candles_data)
-        # Гарантируем сортировку по timestamp (ascending) для правильного выбора exit candle
-        df = df.sort_values("timestamp").reset_index(drop=True)
-        return df
-
     def _ladder_result_to_strategy_output(
         self,
         ladder_result,
-        data: StrategyInput,
-        entry_candle: Candle,
-        candles: List[Candle]
+        context: RunnerSignalContext,
     ) -> StrategyOutput:
         """Преобразует RunnerTradeResult в StrategyOutput."""
+        data = context.data
+        candles = context.candles
+        entry_candle = cast(Candle, context.entry_candle)
         # config уже проверен в on_signal, используем cast для типизации
         config = cast(RunnerConfig, self.config)
 
@@ -156,35 +200,26 @@ class RunnerStrategy(Strategy):
         # Это важно для time_stop и ladder_tp случаев
         if ladder_result.exit_time:
             # Ищем свечу на момент exit_time (минимальный timestamp >= exit_time)
-            # Важно: выбираем свечу с минимальным timestamp >= exit_time (первая свеча на момент или после закрытия)
-            # Свечи уже отсортированы по timestamp (в runner.py и в on_signal), поэтому можно использовать min()
-            # Но для дополнительной гарантии, находим min() для защиты от несортированных данных
-            matching_candles = [c for c in candles if c.timestamp >= ladder_result.exit_time]
-            if matching_candles:
-                # Выбираем свечу с минимальным timestamp >= exit_time
-                exit_candle = min(matching_candles, key=lambda c: c.timestamp)
-                exit_price = exit_candle.close  # Market close цена на момент закрытия
+            # Свечи контекста отсортированы по timestamp, поэтому это бинарный поиск
+            exit_idx = candles.index_at_or_after(ladder_result.exit_time)
+            if exit_idx < len(candles):
+                exit_price = float(candles.close[exit_idx])  # Market close цена на момент закрытия
             else:
                 # Если не нашли свечу >= exit_time, берем последнюю доступную (fallback)
-                if candles:
-                    exit_price = candles[-1].close
+                if len(candles):
+                    exit_price = float(candles.close[-1])
         elif not has_levels_hit:
             # Если exit_time не установлен и уровни не достигнуты - закрываемся по последней доступной свече
             # Это edge case (данные закончились до time_stop)
-            if candles:
-                exit_price = candles[-1].close
+            if len(candles):
+                exit_price = float(candles.close[-1])
 
         # PnL уже рассчитан в ladder_result.realized_pnl_pct (в процентах)
         # Преобразуем в десятичную форму
         pnl = ladder_result.realized_pnl_pct / 100.0
 
-        # Вычисляем trade features
-        all_candles = sorted(data.candles, key=lambda c: c.timestamp)
-        window_features = calc_window_features(
-            candles=all_candles,
-            entry_time=entry_candle.timestamp,
-            entry_price=entry_candle.close,
-        )
+        # Trade features посчитаны в контексте (один раз на сигнал)
+        window_features = context.window_features
         
         # Вычисляем mcap features
         total_supply = get_total_supply(data.signal)
@@ -258,14 +293,11 @@ class RunnerStrategy(Strategy):
             raise ValueError(f"RunnerStrategy requires RunnerConfig, got {type(self.config)}")
         config = self.config
         
-        # Отбираем свечи, начиная с момента сигнала (или позже)
-        candles: List[Candle] = sorted(
-            [c for c in data.candles if c.timestamp >= signal_time],
-            key=lambda c: c.timestamp
-        )
+        # Отбираем свечи, начиная с момента сигнала (или позже) - срез колоночного ряда
+        candles = as_candle_series(data.candles).slice_time(signal_time, None)
         
         # Если свечей нет — возвращаем blueprint с no_entry
-        if not candles:
+        if not len(candles):
             return StrategyTradeBlueprint(
                 signal_id=data.signal.id,
                 strategy_id=config.name,
@@ -306,54 +338,44 @@ class RunnerStrategy(Strategy):
         # Сортируем уровни по xn (от меньшего к большему)
         sorted_levels = sorted(levels, key=lambda l: l.xn)
         
-        # Проходим по свечам и проверяем достижение уровней
-        partial_exits: List[PartialExitBlueprint] = []
-        max_xn_reached = 1.0  # Минимум 1.0 (entry price)
+        # Первое достижение каждого уровня - бинарный поиск по кумулятивному максимуму
+        # (high или close), как в LadderPath; NaN цели не достигает
+        prices = candles.high if config.use_high_for_targets else candles.close
+        running_max = np.fmax.accumulate(np.where(np.isnan(prices), -np.inf, prices))
+        first_hits = []  # (индекс свечи, уровень); повторный xn учитывается один раз
+        seen_xn = set()
+        for level in sorted_levels:
+            if level.xn in seen_xn:
+                continue
+            seen_xn.add(level.xn)
+            hit_idx = int(np.searchsorted(running_max, entry_price_raw * level.xn, side='left'))
+            if hit_idx < len(candles):
+                first_hits.append((hit_idx, level))
+        # Порядок как у построчного прохода: по свече, внутри свечи - по возрастанию xn
+        first_hits.sort(key=lambda hit: hit[0])
+
+        partial_exits: List[PartialExitBlueprint] = [
+            PartialExitBlueprint(
+                timestamp=candles.timestamp_at(hit_idx),
+                xn=level.xn,
+                fraction=level.fraction,
+            )
+            for hit_idx, level in first_hits
+        ]
+        levels_hit = {level.xn: hit_idx for hit_idx, level in first_hits}
+        max_xn_reached = max([1.0] + list(levels_hit))  # Минимум 1.0 (entry price)
         final_exit: Optional[FinalExitBlueprint] = None
         reason = "no_entry"
-        
-        # Отслеживаем, какие уровни уже достигнуты
-        levels_hit = set()
-        
-        for candle in candles:
-            # Проверяем достижение каждого уровня
-            for level in sorted_levels:
-                if level.xn in levels_hit:
-                    continue  # Уровень уже достигнут
-                
-                # Проверяем, достигнут ли уровень (используем high если use_high_for_targets, иначе close)
-                price_to_check = candle.high if config.use_high_for_targets else candle.close
-                if price_to_check >= entry_price_raw * level.xn:
-                    # Уровень достигнут
-                    levels_hit.add(level.xn)
-                    max_xn_reached = max(max_xn_reached, level.xn)
-                    
-                    # Создаем partial exit для этого уровня
-                    partial_exits.append(PartialExitBlueprint(
-                        timestamp=candle.timestamp,
-                        xn=level.xn,
-                        fraction=level.fraction,
-                    ))
-        
-        # Проверяем, достигнут ли последний уровень (это будет final exit)
-        if sorted_levels and sorted_levels[-1].xn in levels_hit:
-            # Все уровни достигнуты, создаем final exit
-            last_level = sorted_levels[-1]
-            # Находим свечу, где был достигнут последний уровень
-            final_exit_candle = None
-            for candle in candles:
-                price_to_check = candle.high if config.use_high_for_targets else candle.close
-                if price_to_check >= entry_price_raw * last_level.xn:
-                    final_exit_candle = candle
-                    break
-            
-            if final_exit_candle:
-                final_exit = FinalExitBlueprint(
-                    timestamp=final_exit_candle.timestamp,
-                    reason="all_levels_hit",
-                )
-                reason = "all_levels_hit"
-        
+
+        # Достигнут последний уровень - это final exit (на свече его первого достижения)
+        last_level = sorted_levels[-1]
+        if last_level.xn in levels_hit:
+            final_exit = FinalExitBlueprint(
+                timestamp=candles.timestamp_at(levels_hit[last_level.xn]),
+                reason="all_levels_hit",
+            )
+            reason = "all_levels_hit"
+
         # Рассчитываем realized_multiple: Σ(fraction * xn) по всем partial_exits
         # В тесте все уровни (включая последний) должны быть в partial_exits
         realized_multiple = 0.0
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from .models import StrategyInput, StrategyOutput  # Импортируем модели, используемые в стратегиях
 
@@ -40,3 +40,12 @@ class Strategy(ABC):
         :return: StrategyOutput — структура с результатами работы стратегии
         """
         raise NotImplementedError  # Обязательно к реализации в наследниках
+
+    def required_window_minutes(self) -> Optional[Tuple[int, int]]:
+        """
+        Минимальное окно свечей, которого достаточно стратегии:
+        (минут до сигнала, минут после входа, за которые позиция гарантированно закрыта).
+
+        :return: None - окно неизвестно, используется окно из конфига (data.before_minutes / data.after_minutes)
+        """
+        return None
@@ -5,10 +5,17 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-import statistics
+from typing import Dict, Any, Optional, Sequence
+import math
 
-from .models import Signal, Candle
+import numpy as np
+
+from .candle_series import as_candle_series
+from .models import Signal, Candle, StrategyInput
+
+
+# Окна trade features до входа (минуты): самое длинное задает, сколько свечей нужно до сигнала
+FEATURE_WINDOWS_MIN: tuple[int, ...] = (5, 15, 60)
 
 
 def get_total_supply(signal: Signal, default: float = 1_000_000_000.0) -> float:
@@ -37,89 +44,147 @@ def calc_mcap_proxy(price: float, supply: float) -> float:
     return price * supply
 
 
+class WindowFeatureEngine:
+    """
+    Фичи окон до входа (vol_sum / range_pct / volat) для любого набора окон за O(1) на окно.
+
+    Все окна заканчиваются на свече входа, поэтому достаточно одного прохода по самому длинному
+    окну [entry - max_window, entry) и суффиксных накоплений от свечи входа назад:
+    - суммы объёмов;
+    - число, сумма и сумма квадратов доходностей (для стандартного отклонения);
+    - максимум high и минимум low (скользящий экстремум, окно растет назад от входа).
+    Окно w минут - это суффикс, начинающийся с первой свечи >= entry - w (бинарный поиск).
+    """
+
+    def __init__(self, candles: Sequence[Candle], entry_time: datetime, max_window_min: int):
+        """
+        :param candles: CandleSeries или список свечей
+        :param entry_time: Время входа (свечи строго до него)
+        :param max_window_min: Самое длинное окно в минутах, для которого будут запросы
+        """
+        self.series = as_candle_series(candles)
+        self.entry_time = entry_time
+        self.max_window_min = int(max_window_min)
+        self.entry_idx = self.series.index_at_or_after(entry_time)
+        self.start_idx = min(
+            self.series.index_at_or_after(entry_time - timedelta(minutes=self.max_window_min)),
+            self.entry_idx,
+        )
+
+        series = self.series
+        region = slice(self.start_idx, self.entry_idx)
+        # Суффиксные накопления: [k] - по свечам [start_idx + k, entry_idx); последний элемент - пустой суффикс
+        self._vol_sum = _suffix(np.add.accumulate, series.volume[region], 0.0)
+        self._max_high = _suffix(np.maximum.accumulate, series.high[region], -np.inf)
+        self._min_low = _suffix(np.minimum.accumulate, series.low[region], np.inf)
+
+        # Доходность k - пара свечей (k, k + 1) региона; пары с prev_close <= 0 пропускаются
+        closes = series.close[region]
+        prev_close = closes[:-1]
+        valid = prev_close > 0
+        returns = np.zeros(prev_close.shape[0], dtype=np.float64)
+        np.divide(closes[1:] - prev_close, prev_close, out=returns, where=valid)
+        # Сдвиг на среднее снижает потерю точности в sum(r^2) - sum(r)^2 / n
+        self._shift = float(returns[valid].mean()) if valid.any() else 0.0
+        centered = np.where(valid, returns - self._shift, 0.0)
+        self._ret_count = _suffix(np.add.accumulate, valid.astype(np.float64), 0.0)
+        self._ret_sum = _suffix(np.add.accumulate, centered, 0.0)
+        self._ret_sumsq = _suffix(np.add.accumulate, centered * centered, 0.0)
+
+    def window_start(self, w: int) -> int:
+        """Индекс первой свечи окна w минут в ряду (entry_idx для пустого окна)."""
+        if w > self.max_window_min:
+            raise ValueError(f"Window {w}m exceeds engine max window {self.max_window_min}m")
+        return min(self.series.index_at_or_after(self.entry_time - timedelta(minutes=w)), self.entry_idx)
+
+    def window(self, w: int, entry_price: float) -> Dict[str, float]:
+        """Фичи одного окна w минут."""
+        lo = self.window_start(w)
+        if lo == self.entry_idx:
+            return {f"vol_sum_{w}m": 0.0, f"range_pct_{w}m": 0.0, f"volat_{w}m": 0.0}
+
+        k = lo - self.start_idx
+        features: Dict[str, float] = {}
+        # vol_sum_{w}m: сумма объёмов за окно
+        features[f"vol_sum_{w}m"] = float(self._vol_sum[k])
+
+        # range_pct_{w}m: (max_high - min_low) / entry_price
+        if entry_price > 0:
+            features[f"range_pct_{w}m"] = float(self._max_high[k] - self._min_low[k]) / entry_price
+        else:
+            features[f"range_pct_{w}m"] = 0.0
+
+        # volat_{w}m: выборочное стандартное отклонение доходностей между последовательными свечами окна
+        n = self._ret_count[k]
+        if n < 2:
+            features[f"volat_{w}m"] = 0.0
+        else:
+            s = self._ret_sum[k]
+            variance = (self._ret_sumsq[k] - s * s / n) / (n - 1)
+            features[f"volat_{w}m"] = math.sqrt(max(float(variance), 0.0))
+        return features
+
+    def features(self, windows_min: Sequence[int], entry_price: float) -> Dict[str, Any]:
+        """Фичи для всех окон windows_min (ключи в порядке окон)."""
+        features: Dict[str, Any] = {}
+        for w in windows_min:
+            features.update(self.window(w, entry_price))
+        return features
+
+
+def _suffix(accumulate, values: np.ndarray, empty: float) -> np.ndarray:
+    """Суффиксное накопление values (от конца к началу) с нейтральным элементом empty в конце."""
+    out = np.empty(values.shape[0] + 1, dtype=np.float64)
+    out[-1] = empty
+    if values.shape[0]:
+        out[:-1] = accumulate(values[::-1])[::-1]
+    return out
+
+
 def calc_window_features(
-    candles: List[Candle],
+    candles: Sequence[Candle],
     entry_time: datetime,
     entry_price: float,
-    windows_min: tuple[int, ...] = (5, 15, 60),
+    windows_min: tuple[int, ...] = FEATURE_WINDOWS_MIN,
 ) -> Dict[str, Any]:
     """
     Вычисляет фичи объёма и волатильности для окон до точки входа.
     Важно: окна берутся ДО entry_time, чтобы избежать data leakage.
+    Считается через WindowFeatureEngine: один проход по самому длинному окну.
     
-    :param candles: Список свечей (должны быть отсортированы по времени)
+    :param candles: CandleSeries или список свечей (список конвертируется: сортировка, UTC)
     :param entry_time: Время входа в позицию
     :param entry_price: Цена входа (используется для нормализации range_pct)
     :param windows_min: Кортеж с размерами окон в минутах (5, 15, 60)
     :return: Словарь с фичами для каждого окна
     """
-    features: Dict[str, Any] = {}
-    
-    # Фильтруем свечи до входа (строго до entry_time, чтобы не подглядывать)
-    candles_before_entry = [
-        c for c in candles
-        if c.timestamp < entry_time
-    ]
-    
-    # Сортируем по времени (на случай, если не были отсортированы)
-    candles_before_entry.sort(key=lambda c: c.timestamp)
-    
-    if not candles_before_entry:
-        # Если нет свечей до входа, заполняем нулями
-        for w in windows_min:
-            features[f"vol_sum_{w}m"] = 0.0
-            features[f"range_pct_{w}m"] = 0.0
-            features[f"volat_{w}m"] = 0.0
-        return features
-    
-    # Для каждого окна вычисляем фичи
-    for w in windows_min:
-        window_start = entry_time - timedelta(minutes=w)
-        window_candles = [
-            c for c in candles_before_entry
-            if c.timestamp >= window_start
-        ]
-        
-        if not window_candles:
-            features[f"vol_sum_{w}m"] = 0.0
-            features[f"range_pct_{w}m"] = 0.0
-            features[f"volat_{w}m"] = 0.0
-            continue
-        
-        # vol_sum_{w}m: сумма объёмов за окно
-        vol_sum = sum(c.volume for c in window_candles)
-        features[f"vol_sum_{w}m"] = vol_sum
-        
-        # range_pct_{w}m: (max_high - min_low) / entry_price
-        max_high = max(c.high for c in window_candles)
-        min_low = min(c.low for c in window_candles)
-        if entry_price > 0:
-            range_pct = (max_high - min_low) / entry_price
-        else:
-            range_pct = 0.0
-        features[f"range_pct_{w}m"] = range_pct
-        
-        # volat_{w}m: стандартное отклонение доходностей (returns)
-        # Вычисляем returns между последовательными свечами
-        if len(window_candles) < 2:
-            features[f"volat_{w}m"] = 0.0
-        else:
-            returns = []
-            for i in range(1, len(window_candles)):
-                prev_close = window_candles[i - 1].close
-                curr_close = window_candles[i].close
-                if prev_close > 0:
-                    ret = (curr_close - prev_close) / prev_close
-                    returns.append(ret)
-            
-            if len(returns) < 2:
-                features[f"volat_{w}m"] = 0.0
-            else:
-                volat = statistics.stdev(returns) if len(returns) > 1 else 0.0
-                # Возвращаем волатильность в абсолютных единицах (можно умножить на 100 для процентов)
-                features[f"volat_{w}m"] = volat
-    
-    return features
+    if not windows_min:
+        return {}
+    engine = WindowFeatureEngine(candles, entry_time, max(windows_min))
+    return engine.features(windows_min, entry_price)
+
+
+def shared_window_features(
+    data: StrategyInput,
+    entry_time: datetime,
+    entry_price: float,
+    windows_min: tuple[int, ...] = FEATURE_WINDOWS_MIN,
+    candles: Optional[Sequence[Candle]] = None,
+) -> Dict[str, Any]:
+    """
+    calc_window_features по свечам data, посчитанные один раз на сигнал: результат кешируется
+    в data.feature_cache, и остальные стратегии того же сигнала получают его без пересчета.
+
+    :param candles: Уже построенный CandleSeries свечей data (чтобы не конвертировать список повторно)
+    :return: Новый словарь с фичами (кеш не изменяется вызывающим кодом)
+    """
+    key = ("window_features", entry_time, float(entry_price), tuple(windows_min))
+    features = data.feature_cache.get(key)
+    if features is None:
+        features = data.feature_cache[key] = calc_window_features(
+            data.candles if candles is None else candles, entry_time, entry_price, tuple(windows_min)
+        )
+    return dict(features)
 
 
 def calc_trade_mcap_features(
@@ -0,0 +1,355 @@
+"""
+Асинхронная предзагрузка свечей GeckoTerminal для многих контрактов.
+
+GeckoTerminalPriceLoader грузит контракты строго по одному (внутри обработки сигнала),
+открывая новое соединение на каждый запрос и простаивая, пока RateLimiter ждет слот.
+AsyncGeckoTerminalPriceLoader прогревает кеш заранее:
+- HTTP через общий requests.Session с пулом keep-alive соединений;
+- до max_concurrency контрактов загружаются одновременно (asyncio, блокирующий GET - в пуле потоков);
+- AsyncRateLimiter делит окно RateLimiter загрузчика: prefetch и load_prices держат один max_calls_per_minute;
+- 429 обрабатывается как в retry_on_failure: on_429="wait" - пауза по Retry-After, "fail" - RateLimitExceededError.
+
+После prefetch() обычный load_prices() обслуживается из кеша (и тоже использует пул соединений).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, cast
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError, RequestException
+
+from ..domain.models import Candle
+from .candle_validation import CandleValidationReport
+from .pool_cache import PoolNotFoundError
+from .price_loader import GeckoTerminalPriceLoader, RateLimiter, RateLimitExceededError
+
+# Окно загрузки: (contract_address, start_time, end_time)
+PrefetchWindow = Tuple[str, Optional[datetime], Optional[datetime]]
+
+_RETRYABLE_STATUS_CODES = (500, 502, 503, 504)
+
+
+class AsyncRateLimiter:
+    """
+    Rate limiter для asyncio поверх RateLimiter (sliding window).
+    Окно (timestamps + lock) принадлежит RateLimiter: если передан limiter синхронного
+    загрузчика, prefetch и последующие load_prices расходуют один бюджет запросов.
+    """
+
+    def __init__(self, max_calls: int = 30, period_seconds: float = 60, limiter: Optional[RateLimiter] = None):
+        """
+        :param max_calls: Максимальное количество запросов (если limiter не передан)
+        :param period_seconds: Период времени в секундах (если limiter не передан)
+        :param limiter: Общий RateLimiter синхронного пути
+        """
+        self._limiter = limiter if limiter is not None else RateLimiter(max_calls=max_calls, period_seconds=period_seconds)  # type: ignore[arg-type]
+        self.max_calls = self._limiter.max_calls
+        self.period_seconds = self._limiter.period_seconds
+        self._blocked_events = 0
+        self._total_wait_time = 0.0
+
+    async def acquire(self, cost: int = 1) -> None:
+        """Ждет свободный слот (не блокируя event loop) и занимает его."""
+        while True:
+            wait_time = self._limiter.try_acquire(cost)
+            if wait_time <= 0:
+                return
+            self._blocked_events += 1
+            print(f"[RL] Waiting {wait_time:.2f}s (limit {self.max_calls}/{self.period_seconds}s) before request...")
+            self._total_wait_time += wait_time
+            await asyncio.sleep(wait_time)
+
+    def get_stats(self) -> dict:
+        return {
+            "blocked_events": self._blocked_events,
+            "total_wait_time_seconds": self._total_wait_time,
+        }
+
+
+class AsyncGeckoTerminalPriceLoader(GeckoTerminalPriceLoader):
+    """
+    GeckoTerminalPriceLoader с пулом соединений и конкурентной предзагрузкой контрактов (prefetch).
+    """
+
+    def __init__(self, *args: Any, max_concurrency: int = 8, **kwargs: Any):
+        """
+        Параметры - как у GeckoTerminalPriceLoader, плюс:
+
+        :param max_concurrency: Максимум одновременно загружаемых контрактов
+                                (не больше max_calls_per_minute при включенном rate limit)
+        """
+        super().__init__(*args, **kwargs)
+        max_concurrency = max(1, int(max_concurrency))
+        if self.rate_limit_enabled:
+            max_concurrency = min(max_concurrency, max(1, int(self.rate_limit_max_calls)))
+        self.max_concurrency = max_concurrency
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Общее окно с self.rate_limiter: синхронные запросы после prefetch не превышают лимит API
+        self.async_rate_limiter: Optional[AsyncRateLimiter] = (
+            AsyncRateLimiter(limiter=self.rate_limiter) if self.rate_limiter is not None else None
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _send(self, url: str, headers: dict) -> requests.Response:
+        return self.session.get(url, headers=headers)
+
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _http_get_async(self, url: str, headers: dict) -> requests.Response:
+        """Асинхронный аналог _http_get: async rate limit + GET через пул соединений."""
+        if self.async_rate_limiter:
+            await self.async_rate_limiter.acquire()
+
+        self._total_requests += 1
+        print(f"[HTTP] GET {url}")
+        response = await self._run_blocking(self._send, url, headers)
+        if response.status_code == 429:
+            self._total_429_responses += 1
+            print(f"[429] Rate limit response received (total: {self._total_429_responses})")
+        return response
+
+    async def _get_json_async(self, url: str, headers: dict) -> dict:
+        """
+        GET с повторными попытками (семантика retry_on_failure):
+        429 - on_429="fail" -> RateLimitExceededError, "wait" -> пауза по Retry-After;
+        5xx и сетевые ошибки - экспоненциальная задержка; прочие HTTP ошибки пробрасываются сразу.
+        """
+        for attempt in range(self.max_retries):
+            is_last = attempt == self.max_retries - 1
+            try:
+                response = await self._http_get_async(url, headers)
+                response.raise_for_status()
+                return response.json()
+            except HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status == 429:
+                    if self.on_429_mode == "fail":
+                        print(f"[429 ❌] Rate limit exceeded, failing fast (on_429=fail)")
+                        self._rate_limit_failures += 1
+                        raise RateLimitExceededError(f"Rate limit exceeded: {e}")
+                    if is_last:
+                        raise
+                    retry_after = e.response.headers.get("Retry-After")
+                    try:
+                        wait_time = float(retry_after) if retry_after else max(2.0, self.retry_backoff_factor ** attempt)
+                    except (ValueError, TypeError):
+                        wait_time = max(2.1, self.retry_backoff_factor ** attempt)
+                    print(f"[429 ⏳] Rate limit exceeded, waiting {wait_time:.2f}s (Retry-After: {retry_after if retry_after else 'N/A'})... (attempt {attempt + 1}/{self.max_retries})")
+                    await asyncio.sleep(wait_time)
+                elif status in _RETRYABLE_STATUS_CODES and not is_last:
+                    wait_time = self.retry_backoff_factor ** attempt
+                    print(f"[WARNING] API request failed (status {status}), retrying in {wait_time:.1f}s... (attempt {attempt + 1}/{self.max_retries})")
+                    await asyncio.sleep(wait_time)
+                else:
+                    raise
+            except RequestException as e:
+                if is_last:
+                    raise
+                wait_time = self.retry_backoff_factor ** attempt
+                print(f"[WARNING] API request failed ({type(e).__name__}), retrying in {wait_time:.1f}s... (attempt {attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(wait_time)
+        raise RuntimeError("Unexpected end of retry loop")
+
+    async def _fetch_range_async(
+        self,
+        pool_id: str,
+        tf_endpoint: str,
+        aggregate: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        headers: dict,
+        report: Optional[CandleValidationReport] = None,
+    ) -> List[Candle]:
+        """Асинхронный аналог _fetch_range: батчи по 1000 свечей от end_time в прошлое."""
+        now_ts = int(datetime.now(timezone.utc).timestamp())
+        before_ts = min(int(end_time.timestamp()), now_ts) if end_time else now_ts
+
+        candles: List[Candle] = []
+        seen: set = set()
+        while True:
+            query = f"limit=1000&before_timestamp={before_ts}"
+            if aggregate:
+                query += f"&aggregate={aggregate}"
+            data = await self._get_json_async(
+                f"{self.base_url}/networks/solana/pools/{pool_id}/ohlcv/{tf_endpoint}?{query}", headers
+            )
+            if "data" not in data:
+                print(f"[WARNING] Unexpected response structure: {data}")
+                break
+            candles_raw = data["data"]["attributes"].get("ohlcv_list", [])
+            if not candles_raw:
+                break
+
+            batch = self._parse_ohlcv_rows(candles_raw, seen, report)
+            candles.extend(batch)
+            if not batch:
+                break  # только дубликаты - данных больше нет
+
+            oldest = min(c.timestamp for c in batch)
+            if start_time and oldest <= start_time:
+                break
+            before_ts = int(oldest.timestamp())
+        return candles
+
+    async def _resolve_pool_id_async(self, contract_address: str, headers: dict) -> str:
+        """Асинхронный аналог _resolve_pool_id: кеш pool_ids.sqlite, при промахе - запрос к API."""
+        if self.pool_cache is not None:
+            entry = self.pool_cache.get(contract_address)
+            if entry is not None:
+                if entry.is_negative:
+                    raise PoolNotFoundError(f"No pool for token {contract_address} (cached: {entry.detail})")
+                return cast(str, entry.pool_id)
+        print(f"[fetch] Fetching pools for token: {contract_address}")
+        try:
+            pools = await self._get_json_async(
+                f"{self.base_url}/networks/solana/tokens/{contract_address}/pools", headers
+            )
+            pool_id = self._select_pool_id(contract_address, pools)
+        except HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                self._remember_missing_pool(contract_address, "pools 404")
+                raise PoolNotFoundError(f"Token {contract_address} not found (HTTP 404)") from e
+            raise
+        except PoolNotFoundError as e:
+            self._remember_missing_pool(contract_address, str(e))
+            raise
+        if self.pool_cache is not None:
+            self.pool_cache.put(contract_address, pool_id)
+        return pool_id
+
+    async def load_prices_async(
+        self,
+        contract_address: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> List[Candle]:
+        """
+        Асинхронный аналог load_prices: дозагружает недостающие диапазоны и обновляет кеш.
+        RateLimitExceededError (on_429="fail") пробрасывается, прочие ошибки - fallback на кеш.
+        """
+        def in_range(candles: List[Candle]) -> List[Candle]:
+            return [
+                c for c in candles
+                if (start_time is None or c.timestamp >= start_time) and
+                   (end_time is None or c.timestamp <= end_time)
+            ]
+
+        entry, cache_path, _ = await self._run_blocking(self._find_cache_entry, contract_address)
+        cached_candles: Optional[List[Candle]] = None
+        if entry is not None and cache_path is not None:
+            if self.prefer_cache_if_exists:
+                return await self._run_blocking(self._load_from_cache, cache_path, start_time, end_time) or []
+            missing_ranges, cached_candles = await self._run_blocking(
+                self._cache_coverage, entry, cache_path, start_time, end_time
+            )
+            if not missing_ranges:
+                if cached_candles is not None:
+                    return in_range(cached_candles)
+                return await self._run_blocking(self._load_from_cache, cache_path, start_time, end_time) or []
+            if cached_candles is None:
+                cached_candles = await self._run_blocking(self._load_from_cache, cache_path) or None
+            if cached_candles is None:
+                missing_ranges = [(start_time, end_time)]
+        else:
+            missing_ranges = [(start_time, end_time)]
+
+        try:
+            headers = {"User-Agent": "Mozilla/5.0 GeckoLoader"}
+            tf_map = {"1m": ("minute", None), "15m": ("minute", "15")}
+            tf_endpoint, aggregate = tf_map[self.timeframe]
+
+            pool_id = await self._resolve_pool_id_async(contract_address, headers)
+
+            fetched: List[Candle] = []
+            report = CandleValidationReport(contract=contract_address)
+            for gap_start, gap_end in missing_ranges:
+                fetched.extend(
+                    await self._fetch_range_async(pool_id, tf_endpoint, aggregate, gap_start, gap_end, headers, report)
+                )
+            self._emit_validation_report(report)
+            candles = self._merge_candles(cached_candles or [], fetched)
+            await self._run_blocking(self._update_cache, contract_address, cache_path, cached_candles, fetched, candles)
+        except RateLimitExceededError:
+            raise
+        except PoolNotFoundError as e:
+            print(f"[WARNING] {e}")
+            return in_range(cached_candles or [])
+        except HTTPError as e:
+            # 404 на OHLCV не кешируется отрицательно: пул жив, данных нет только для этого диапазона
+            print(f"[ERROR] Error prefetching candles for {contract_address}: {e}")
+            return in_range(cached_candles or [])
+        except Exception as e:
+            print(f"[ERROR] Error prefetching candles for {contract_address}: {e}")
+            return in_range(cached_candles or [])
+
+        return in_range(candles)
+
+    async def prefetch_async(self, windows: Iterable[PrefetchWindow]) -> Dict[str, int]:
+        """
+        Конкурентно загружает окна (до max_concurrency контрактов одновременно).
+        Окна одного контракта обрабатываются последовательно (общий файл кеша).
+
+        :return: {contract_address: количество свечей в его окнах}
+        """
+        by_contract: Dict[str, List[Tuple[Optional[datetime], Optional[datetime]]]] = {}
+        for contract_address, start_time, end_time in windows:
+            by_contract.setdefault(contract_address, []).append((start_time, end_time))
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        loaded: Dict[str, int] = {}
+
+        async def load_contract(contract_address: str, contract_windows: list) -> None:
+            async with semaphore:
+                total = 0
+                for start_time, end_time in contract_windows:
+                    total += len(await self.load_prices_async(contract_address, start_time, end_time))
+                loaded[contract_address] = total
+
+        await asyncio.gather(*(load_contract(c, w) for c, w in by_contract.items()))
+        return loaded
+
+    def prefetch(self, windows: Iterable[PrefetchWindow]) -> Dict[str, int]:
+        """
+        Синхронная обертка над prefetch_async (запускает собственный event loop).
+
+        :param windows: Окна (contract_address, start_time, end_time)
+        :return: {contract_address: количество свечей в его окнах}
+        """
+        started = time.perf_counter()
+        requests_before = self._total_requests
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="gecko-prefetch") as executor:
+            self._executor = executor
+            try:
+                loaded = asyncio.run(self.prefetch_async(windows))
+            finally:
+                self._executor = None
+        elapsed = time.perf_counter() - started
+        print(
+            f"[prefetch] {len(loaded)} contracts, {sum(loaded.values())} candles, "
+            f"{self._total_requests - requests_before} requests in {elapsed:.2f}s "
+            f"(concurrency {self.max_concurrency})"
+        )
+        return loaded
+
+    def get_rate_limit_summary(self) -> dict:
+        stats = super().get_rate_limit_summary()
+        if self.async_rate_limiter:
+            limiter_stats = self.async_rate_limiter.get_stats()
+            stats["requests_blocked_by_rate_limiter"] += limiter_stats["blocked_events"]
+            stats["total_wait_time_seconds"] += limiter_stats["total_wait_time_seconds"]
+        return stats
+
+    def close(self) -> None:
+        """Закрывает пул соединений."""
+        self.session.close()
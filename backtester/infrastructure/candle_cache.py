@@ -0,0 +1,171 @@
+"""
+Потокобезопасный кеш свечей поверх любого PriceLoader.
+
+Хранит распарсенные колоночные ряды (CandleArrays) по контрактам и вытесняет
+наименее используемые (LRU), когда суммарный размер превышает бюджет памяти.
+Повторный запрос того же контракта обслуживается срезом, без повторного парсинга файла.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..domain.models import Candle
+from .candle_store import CandleArrays, load_candle_arrays, to_epoch_seconds
+from .price_loader import PriceLoader
+
+
+@dataclass
+class _CacheEntry:
+    """Запись кеша: ряд и покрытый им диапазон (None = без ограничения)."""
+    arrays: CandleArrays
+    covered_start: Optional[datetime]
+    covered_end: Optional[datetime]
+
+    def covers(self, start_time: Optional[datetime], end_time: Optional[datetime]) -> bool:
+        if self.covered_start is not None:
+            if start_time is None or to_epoch_seconds(start_time) < to_epoch_seconds(self.covered_start):
+                return False
+        if self.covered_end is not None:
+            if end_time is None or to_epoch_seconds(end_time) > to_epoch_seconds(self.covered_end):
+                return False
+        return True
+
+
+class CachingPriceLoader(PriceLoader):
+    """
+    Кеширующая обертка над PriceLoader с LRU-вытеснением по бюджету памяти.
+
+    Режимы:
+    - full_history=True: при промахе у inner запрашивается вся история контракта
+      (подходит для локальных CSV / колоночного хранилища), дальше любые окна - срезы.
+    - full_history=False: запрашивается объединение нужного и уже закешированного диапазона
+      (для API-лоадеров, где "вся история" означает лишние запросы).
+    """
+
+    def __init__(self, inner: PriceLoader, max_bytes: int, full_history: bool = True):
+        """
+        :param inner: Оборачиваемый загрузчик
+        :param max_bytes: Бюджет памяти на ряды в байтах
+        :param full_history: Загружать при промахе всю историю контракта
+        """
+        self.inner = inner
+        self.max_bytes = int(max_bytes)
+        self.full_history = full_history
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._contract_locks: Dict[str, threading.Lock] = {}
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _contract_lock(self, contract_address: str) -> threading.Lock:
+        with self._lock:
+            lock = self._contract_locks.get(contract_address)
+            if lock is None:
+                lock = threading.Lock()
+                self._contract_locks[contract_address] = lock
+            return lock
+
+    def _lookup(self, contract_address: str, start_time: Optional[datetime], end_time: Optional[datetime]) -> Optional[CandleArrays]:
+        """Возвращает закешированный ряд, если он покрывает диапазон (и отмечает использование)."""
+        with self._lock:
+            entry = self._entries.get(contract_address)
+            if entry is None or not entry.covers(start_time, end_time):
+                return None
+            self._entries.move_to_end(contract_address)
+            self._hits += 1
+            return entry.arrays
+
+    def _load_from_inner(
+        self,
+        contract_address: str,
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+    ) -> CandleArrays:
+        return load_candle_arrays(self.inner, contract_address, start_time, end_time)
+
+    def _store(self, contract_address: str, entry: _CacheEntry) -> None:
+        with self._lock:
+            old = self._entries.pop(contract_address, None)
+            if old is not None:
+                self._total_bytes -= old.arrays.nbytes
+            self._entries[contract_address] = entry
+            self._total_bytes += entry.arrays.nbytes
+            # LRU-вытеснение до попадания в бюджет (включая только что добавленный ряд,
+            # если он один больше бюджета - вызывающий код все равно получит данные)
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.arrays.nbytes
+                self._evictions += 1
+
+    def load_arrays(
+        self,
+        contract_address: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> CandleArrays:
+        """Возвращает колоночный срез [start_time, end_time] из кеша, загружая ряд при промахе."""
+        arrays = self._lookup(contract_address, start_time, end_time)
+        if arrays is not None:
+            return arrays.slice_time(start_time, end_time)
+
+        # Один поток грузит контракт, остальные ждут и получают hit
+        with self._contract_lock(contract_address):
+            arrays = self._lookup(contract_address, start_time, end_time)
+            if arrays is not None:
+                return arrays.slice_time(start_time, end_time)
+
+            with self._lock:
+                self._misses += 1
+                previous = self._entries.get(contract_address)
+
+            if self.full_history:
+                load_start: Optional[datetime] = None
+                load_end: Optional[datetime] = None
+            else:
+                load_start, load_end = start_time, end_time
+                if previous is not None:
+                    # Расширяем уже закешированный диапазон, чтобы не терять покрытие
+                    if load_start is not None and previous.covered_start is not None:
+                        load_start = min(load_start, previous.covered_start)
+                    else:
+                        load_start = None
+                    if load_end is not None and previous.covered_end is not None:
+                        load_end = max(load_end, previous.covered_end)
+                    else:
+                        load_end = None
+
+            arrays = self._load_from_inner(contract_address, load_start, load_end)
+            self._store(contract_address, _CacheEntry(arrays=arrays, covered_start=load_start, covered_end=load_end))
+            return arrays.slice_time(start_time, end_time)
+
+    def load_prices(
+        self,
+        contract_address: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> List[Candle]:
+        return self.load_arrays(contract_address, start_time, end_time).to_candles()
+
+    def clear(self) -> None:
+        """Очищает кеш (счетчики сохраняются)."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_cache_summary(self) -> dict:
+        """Возвращает статистику кеша."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,277 @@
+"""
+Манифест покрытия CSV-кеша свечей (candles index).
+
+Для каждой пары (contract, timeframe) хранит: min/max timestamp, число строк, список
+разрывов длиннее gap_minutes, размер/mtime файла и хеш содержимого.
+Проверки покрытия и свежести кеша становятся поиском по индексу без чтения CSV.
+
+Запись валидна, пока суммарный размер и mtime файла и его сегментов (см. candle_segments)
+совпадают с сохраненными; иначе (кеш изменен в обход загрузчика) вызывающий код
+перечитывает timestamp-ы и обновляет запись.
+
+Хранилище - SQLite {cache_dir}/candles_index.sqlite (WAL), как у ResultCache.
+Пересборка: python -m backtester.tools.candles_index rebuild --cache-dir data/candles/cached
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .candle_segments import cache_digest, cache_signature, read_cache_frame
+
+
+INDEX_FILENAME = "candles_index.sqlite"
+# Разрывы короче порога не записываются (GeckoTerminal не отдает минуты без сделок)
+DEFAULT_GAP_MINUTES = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles_index (
+    contract TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    path TEXT NOT NULL,
+    min_ts INTEGER NOT NULL,
+    max_ts INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    gaps TEXT NOT NULL,
+    file_size INTEGER NOT NULL,
+    file_mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (contract, timeframe)
+)
+"""
+
+
+@dataclass
+class CandleIndexEntry:
+    """Запись манифеста: покрытие одного файла кеша (timestamps - epoch seconds UTC)."""
+    contract: str
+    timeframe: str
+    path: str
+    min_ts: int
+    max_ts: int
+    rows: int
+    gaps: List[Tuple[int, int]] = field(default_factory=list)
+    file_size: int = 0
+    file_mtime_ns: int = 0
+    content_hash: str = ""
+
+    @property
+    def min_time(self) -> datetime:
+        return datetime.fromtimestamp(self.min_ts, tz=timezone.utc)
+
+    @property
+    def max_time(self) -> datetime:
+        return datetime.fromtimestamp(self.max_ts, tz=timezone.utc)
+
+    def matches_file(self, path: Path) -> bool:
+        """Запись описывает текущее состояние кеша (размер и mtime файла и сегментов совпадают)."""
+        try:
+            size, mtime_ns = cache_signature(path)
+        except OSError:
+            return False
+        return size == self.file_size and mtime_ns == self.file_mtime_ns
+
+
+def summarize_timestamps(
+    contract: str,
+    timeframe: str,
+    path: Path,
+    epoch_seconds: Sequence[int],
+    digest: Optional[str] = None,
+    gap_minutes: int = DEFAULT_GAP_MINUTES,
+) -> Optional[CandleIndexEntry]:
+    """
+    Строит запись манифеста по timestamp-ам кеша.
+
+    :param epoch_seconds: Timestamps свечей (epoch seconds, любой порядок)
+    :param digest: Хеш содержимого (если известен); иначе считается по файлам (cache_digest)
+    :return: None для пустого кеша
+    """
+    ts = np.unique(np.asarray(epoch_seconds, dtype=np.int64))
+    if ts.size == 0:
+        return None
+    diffs = np.diff(ts)
+    gap_idx = np.nonzero(diffs > gap_minutes * 60)[0]
+    gaps = [(int(ts[i]), int(ts[i + 1])) for i in gap_idx]
+    if digest is None:
+        digest = cache_digest(path)
+    size, mtime_ns = cache_signature(path)
+    return CandleIndexEntry(
+        contract=contract,
+        timeframe=timeframe,
+        path=str(path),
+        min_ts=int(ts[0]),
+        max_ts=int(ts[-1]),
+        rows=int(ts.size),
+        gaps=gaps,
+        file_size=size,
+        file_mtime_ns=mtime_ns,
+        content_hash=digest,
+    )
+
+
+def summarize_csv(contract: str, timeframe: str, path: Path, gap_minutes: int = DEFAULT_GAP_MINUTES) -> Optional[CandleIndexEntry]:
+    """Строит запись манифеста по CSV-кешу (база + сегменты; читается только колонка timestamp)."""
+    if cache_signature(path)[0] == 0:
+        return None
+    df = read_cache_frame(path, usecols=["timestamp"])
+    stamps = pd.to_datetime(df["timestamp"], utc=True)
+    epoch = (stamps - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    return summarize_timestamps(contract, timeframe, path, epoch.to_numpy(dtype=np.int64), None, gap_minutes)
+
+
+class CandleCacheIndex:
+    """Манифест покрытия CSV-кеша свечей (SQLite, потокобезопасный)."""
+
+    def __init__(self, cache_dir: str | Path, gap_minutes: int = DEFAULT_GAP_MINUTES):
+        """
+        :param cache_dir: Директория кеша свечей (GeckoTerminalPriceLoader.cache_dir)
+        :param gap_minutes: Минимальная длина разрыва, попадающего в список gaps
+        """
+        self.cache_dir = Path(cache_dir)
+        self.gap_minutes = gap_minutes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def db_path(self) -> Path:
+        return self.cache_dir / INDEX_FILENAME
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _row_to_entry(row: tuple) -> CandleIndexEntry:
+        contract, timeframe, path, min_ts, max_ts, rows, gaps, size, mtime_ns, digest = row
+        return CandleIndexEntry(
+            contract=contract,
+            timeframe=timeframe,
+            path=path,
+            min_ts=int(min_ts),
+            max_ts=int(max_ts),
+            rows=int(rows),
+            gaps=[(int(a), int(b)) for a, b in json.loads(gaps)],
+            file_size=int(size),
+            file_mtime_ns=int(mtime_ns),
+            content_hash=digest,
+        )
+
+    def get(self, contract: str, timeframe: str) -> Optional[CandleIndexEntry]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT contract, timeframe, path, min_ts, max_ts, rows, gaps, file_size, file_mtime_ns, content_hash "
+                "FROM candles_index WHERE contract = ? AND timeframe = ?",
+                (contract, timeframe),
+            ).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def put(self, entry: CandleIndexEntry) -> None:
+        """Записывает (заменяет) запись одной транзакцией."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO candles_index VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        entry.contract, entry.timeframe, entry.path, entry.min_ts, entry.max_ts, entry.rows,
+                        json.dumps(entry.gaps), entry.file_size, entry.file_mtime_ns, entry.content_hash, time.time(),
+                    ),
+                )
+
+    def delete(self, contract: str, timeframe: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM candles_index WHERE contract = ? AND timeframe = ?", (contract, timeframe))
+
+    def entries(self, timeframe: Optional[str] = None) -> List[CandleIndexEntry]:
+        query = (
+            "SELECT contract, timeframe, path, min_ts, max_ts, rows, gaps, file_size, file_mtime_ns, content_hash "
+            "FROM candles_index"
+        )
+        params: tuple = ()
+        if timeframe is not None:
+            query += " WHERE timeframe = ?"
+            params = (timeframe,)
+        with self._lock:
+            rows = self._connection().execute(query + " ORDER BY timeframe, contract", params).fetchall()
+        return [self._row_to_entry(row) for row in rows]
+
+    def scan_cache_files(self, timeframes: Optional[Iterable[str]] = None) -> List[Tuple[str, str, Path]]:
+        """
+        Файлы кеша: (contract, timeframe, path).
+        Новый формат {cache_dir}/{timeframe}/{contract}.csv приоритетнее legacy {cache_dir}/{contract}_{timeframe}.csv.
+        """
+        wanted = set(timeframes) if timeframes is not None else None
+        found: Dict[Tuple[str, str], Path] = {}
+        if not self.cache_dir.exists():
+            return []
+        for tf_dir in sorted(p for p in self.cache_dir.iterdir() if p.is_dir()):
+            if wanted is not None and tf_dir.name not in wanted:
+                continue
+            for path in sorted(tf_dir.glob("*.csv")):
+                found[(path.stem, tf_dir.name)] = path
+        for path in sorted(self.cache_dir.glob("*_*.csv")):
+            contract, _, timeframe = path.stem.rpartition("_")
+            if wanted is not None and timeframe not in wanted:
+                continue
+            found.setdefault((contract, timeframe), path)
+        return [(contract, timeframe, path) for (contract, timeframe), path in sorted(found.items())]
+
+    def rebuild(self, timeframes: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Пересобирает манифест по файлам кеша (записи без файлов удаляются).
+
+        :return: {"indexed", "empty", "failed", "removed"}
+        """
+        files = self.scan_cache_files(timeframes)
+        stats = {"indexed": 0, "empty": 0, "failed": 0, "removed": 0}
+        present = set()
+        for contract, timeframe, path in files:
+            present.add((contract, timeframe))
+            try:
+                entry = summarize_csv(contract, timeframe, path, self.gap_minutes)
+            except Exception as e:
+                print(f"[candles_index] Failed to index {path}: {e}")
+                stats["failed"] += 1
+                continue
+            if entry is None:
+                self.delete(contract, timeframe)
+                stats["empty"] += 1
+                continue
+            self.put(entry)
+            stats["indexed"] += 1
+
+        wanted = set(timeframes) if timeframes is not None else None
+        for entry in self.entries():
+            if (entry.contract, entry.timeframe) in present:
+                continue
+            if wanted is not None and entry.timeframe not in wanted:
+                continue
+            self.delete(entry.contract, entry.timeframe)
+            stats["removed"] += 1
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,196 @@
+"""
+Сегментный append-only формат CSV-кеша свечей.
+
+Кеш контракта = базовый файл {contract}.csv + неизменяемые сегменты
+{contract}.csv.segments/{seq:06d}-*.csv с дозагруженными свечами.
+- Дозагрузка пишет только новые свечи отдельным сегментом (O(новых данных), а не O(истории)).
+- Любая запись - временный файл + os.replace: упавшая запись не портит кеш.
+- Читатели (read_cache_frame) объединяют базу и сегменты; при совпадении timestamp
+  побеждает более поздний сегмент.
+- Компакция (compact_segments) переписывает базу с учетом сегментов и удаляет их;
+  повторное применение сегментов идемпотентно, поэтому сбой между шагами безопасен.
+- append_segment и compact_segments выполняются под блокировкой контракта (cache_lock:
+  файл {contract}.csv.lock + flock/msvcrt и lock потоков): писатели из пулов потоков
+  и процессов не получают один номер сегмента и не теряют сегменты при компакции.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+
+SEGMENTS_SUFFIX = ".segments"
+LOCK_SUFFIX = ".lock"
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+def segments_dir(path: Path) -> Path:
+    return path.with_name(path.name + SEGMENTS_SUFFIX)
+
+
+def list_segments(path: Path) -> List[Path]:
+    """Сегменты файла кеша в порядке записи."""
+    directory = segments_dir(path)
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob("*.csv"))
+
+
+@contextmanager
+def cache_lock(path: Path) -> Iterator[None]:
+    """
+    Эксклюзивная блокировка файла кеша контракта между потоками и процессами.
+    Межпроцессная часть - блокировка файла {path}.lock (fcntl.flock / msvcrt.locking).
+    """
+    key = str(path.resolve())
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(key, threading.Lock())
+    with thread_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path.with_name(path.name + LOCK_SUFFIX), "a+b") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                else:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Пишет файл через временный файл в той же директории и os.replace."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def append_segment(path: Path, data: bytes) -> Path:
+    """
+    Добавляет неизменяемый сегмент к файлу кеша.
+    Имя: {seq:06d}-{pid}-{thread}.csv; номер выбирается под cache_lock, поэтому он уникален
+    и порядок сегментов совпадает с порядком записи.
+    """
+    directory = segments_dir(path)
+    with cache_lock(path):
+        directory.mkdir(parents=True, exist_ok=True)
+        existing = list_segments(path)
+        seq = int(existing[-1].name.split("-", 1)[0]) + 1 if existing else 1
+        segment = directory / f"{seq:06d}-{os.getpid()}-{threading.get_ident()}.csv"
+        write_atomic(segment, data)
+    return segment
+
+
+def rewrite_cache(path: Path, data: bytes) -> None:
+    """Переписывает базовый файл целиком и удаляет сегменты (их свечи входят в data) под cache_lock."""
+    with cache_lock(path):
+        write_atomic(path, data)
+        drop_segments(path)
+
+
+def drop_segments(path: Path, segments: Optional[List[Path]] = None) -> None:
+    """Удаляет сегменты (по умолчанию все) и пустую директорию сегментов."""
+    for segment in list_segments(path) if segments is None else segments:
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+    try:
+        segments_dir(path).rmdir()
+    except OSError:
+        pass  # директории нет или в ней появились новые сегменты
+
+
+def read_cache_frame(path: Path, usecols: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Читает кеш контракта: базовый файл + сегменты (дедупликация по timestamp, сортировка).
+    Без сегментов - обычный pd.read_csv(path) (и те же исключения).
+    """
+    segments = list_segments(path)
+    if not segments:
+        return pd.read_csv(path, usecols=usecols)
+
+    frames = []
+    if path.exists() and path.stat().st_size > 0:
+        frames.append(pd.read_csv(path, usecols=usecols))
+    frames.extend(pd.read_csv(segment, usecols=usecols) for segment in segments)
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.read_csv(segments[-1], usecols=usecols)
+    df = pd.concat(frames, ignore_index=True)
+
+    key = pd.to_datetime(df["timestamp"], utc=True)
+    keep = ~key.duplicated(keep="last").to_numpy()
+    df = df[keep]
+    order = key[keep].to_numpy().argsort(kind="stable")
+    return df.iloc[order].reset_index(drop=True)
+
+
+def compact_segments(path: Path) -> int:
+    """
+    Вливает сегменты в базовый файл.
+
+    :return: Количество строк после компакции (0, если сегментов нет)
+    """
+    with cache_lock(path):
+        segments = list_segments(path)
+        if not segments:
+            return 0
+        df = read_cache_frame(path)
+        write_atomic(path, df.to_csv(index=False).encode("utf-8"))
+        drop_segments(path, segments)
+    return len(df)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def chain_hash(previous: str, data: bytes) -> str:
+    """Хеш цепочки: хеш кеша после добавления сегмента data."""
+    return hashlib.blake2b(previous.encode("ascii") + data, digest_size=16).hexdigest()
+
+
+def cache_digest(path: Path) -> str:
+    """Хеш содержимого кеша: хеш базового файла, затем цепочка по сегментам."""
+    digest = content_hash(path.read_bytes() if path.exists() else b"")
+    for segment in list_segments(path):
+        digest = chain_hash(digest, segment.read_bytes())
+    return digest
+
+
+def cache_signature(path: Path) -> Tuple[int, int]:
+    """
+    Дешевая подпись состояния кеша без чтения данных: (суммарный размер, максимальный mtime_ns)
+    базового файла и сегментов.
+    """
+    size, mtime_ns = 0, 0
+    for file in ([path] if path.exists() else []) + list_segments(path):
+        stat = file.stat()
+        size += stat.st_size
+        mtime_ns = max(mtime_ns, stat.st_mtime_ns)
+    return size, mtime_ns
@@ -0,0 +1,295 @@
+"""
+Колоночное бинарное хранилище свечей с memory-mapped доступом.
+
+Формат хранения (на один контракт):
+    {root}/{timeframe}/{contract}.candles.npy - float64, shape (6, n): строка 0 - ts (int64 epoch seconds UTC,
+                                                 хранится побитово, view как int64), строки 1..5 - open/high/low/close/volume
+
+Все колонки - в одном файле, поэтому запись заменяет ряд одним os.replace: reader (или прерванная
+запись) никогда не увидит ts и цены разной длины. Каждая строка матрицы лежит в памяти непрерывно
+(C-order), поэтому срез по времени - это две бинарные выборки по ts и zero-copy view на memmap.
+Старый формат из двух файлов ({contract}.ts.npy + {contract}.ohlcv.npy) читается, если нового файла нет;
+несогласованная пара (разная длина) считается промахом.
+
+CSV-кеш конвертируется в хранилище через CLI:
+    python -m backtester.tools.build_candle_store --csv-dir data/candles --store-dir data/candles/store
+"""
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..domain.candle_series import OHLCV_COLUMNS, CandleSeries, to_epoch_seconds
+from ..domain.models import Candle
+from .candle_segments import read_cache_frame
+from .candle_validation import validate_candle_frame
+from .price_loader import PriceLoader
+
+_CANDLES_SUFFIX = ".candles.npy"
+# Старый формат: колонки в двух файлах
+_TS_SUFFIX = ".ts.npy"
+_OHLCV_SUFFIX = ".ohlcv.npy"
+
+# Колоночный ряд хранилища - это доменный CandleSeries (zero-copy срезы memmap)
+CandleArrays = CandleSeries
+
+
+class ColumnarCandleStore:
+    """
+    Хранилище свечей в колоночном бинарном формате (.npy), читаемое через memmap.
+
+    Потокобезопасно: открытые memmap кешируются и переиспользуются между потоками.
+    """
+
+    def __init__(self, root: str = "data/candles/store", timeframe: str = "1m"):
+        self.root = Path(root)
+        self.timeframe = timeframe
+        self._lock = threading.Lock()
+        self._opened: Dict[str, Tuple[Tuple[int, int], CandleArrays]] = {}  # contract -> ((mtime_ns, size), arrays)
+
+    def __getstate__(self) -> dict:
+        # Для передачи в процессы-воркеры: memmap и lock не сериализуются, воркер откроет файлы сам
+        return {"root": self.root, "timeframe": self.timeframe}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(root=str(state["root"]), timeframe=state["timeframe"])
+
+    @property
+    def timeframe_dir(self) -> Path:
+        return self.root / self.timeframe
+
+    def _path(self, contract_address: str) -> Path:
+        return self.timeframe_dir / f"{contract_address}{_CANDLES_SUFFIX}"
+
+    def _legacy_paths(self, contract_address: str) -> Tuple[Path, Path]:
+        base = self.timeframe_dir
+        return base / f"{contract_address}{_TS_SUFFIX}", base / f"{contract_address}{_OHLCV_SUFFIX}"
+
+    def data_path(self, contract_address: str) -> Path:
+        """Файл, по которому определяется версия ряда (новый формат или ts-файл старого)."""
+        path = self._path(contract_address)
+        if path.exists():
+            return path
+        return self._legacy_paths(contract_address)[0]
+
+    def has(self, contract_address: str) -> bool:
+        if self._path(contract_address).exists():
+            return True
+        ts_path, ohlcv_path = self._legacy_paths(contract_address)
+        return ts_path.exists() and ohlcv_path.exists()
+
+    def contracts(self) -> List[str]:
+        """Список контрактов, присутствующих в хранилище."""
+        if not self.timeframe_dir.exists():
+            return []
+        names = {p.name[: -len(_CANDLES_SUFFIX)] for p in self.timeframe_dir.glob(f"*{_CANDLES_SUFFIX}")}
+        names.update(p.name[: -len(_TS_SUFFIX)] for p in self.timeframe_dir.glob(f"*{_TS_SUFFIX}"))
+        return sorted(names)
+
+    def write(self, contract_address: str, arrays: CandleArrays) -> None:
+        """
+        Атомарно записывает ряд контракта: все колонки в один temp-файл + один os.replace.
+        Файлы старого формата контракта удаляются.
+        """
+        path = self._path(contract_address)
+        os.makedirs(self.timeframe_dir, exist_ok=True)
+        block = np.empty((1 + len(OHLCV_COLUMNS), len(arrays)), dtype=np.float64)
+        block[0].view(np.int64)[:] = np.asarray(arrays.ts, dtype=np.int64)
+        for row, column in enumerate((arrays.open, arrays.high, arrays.low, arrays.close, arrays.volume), start=1):
+            block[row] = column
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, block)
+        os.replace(tmp_path, path)
+        for legacy_path in self._legacy_paths(contract_address):
+            try:
+                legacy_path.unlink()
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._opened.pop(contract_address, None)
+
+    def read(self, contract_address: str) -> Optional[CandleArrays]:
+        """
+        Открывает ряд контракта через memmap. Возвращает None, если контракта нет
+        или файлы несогласованы (поврежденный файл, пара старого формата разной длины).
+        """
+        path = self.data_path(contract_address)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._opened.get(contract_address)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+        try:
+            if path.name.endswith(_CANDLES_SUFFIX):
+                block = np.load(path, mmap_mode="r")
+                if block.ndim != 2 or block.shape[0] != 1 + len(OHLCV_COLUMNS) or block.dtype != np.float64:
+                    print(f"[ERROR] Inconsistent candle store file: contract={contract_address}, timeframe={self.timeframe}, shape={block.shape}")
+                    return None
+                ts = block[0].view(np.int64)
+                ohlcv = block[1:]
+            else:
+                ts = np.load(path, mmap_mode="r")
+                ohlcv = np.load(self._legacy_paths(contract_address)[1], mmap_mode="r")
+                if ts.ndim != 1 or ohlcv.ndim != 2 or ohlcv.shape != (len(OHLCV_COLUMNS), ts.shape[0]):
+                    print(f"[ERROR] Inconsistent candle store files: contract={contract_address}, timeframe={self.timeframe}, ts={ts.shape}, ohlcv={ohlcv.shape}")
+                    return None
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Failed to open candle store files: contract={contract_address}, timeframe={self.timeframe}, error={e}")
+            return None
+
+        arrays = CandleArrays(
+            ts=ts, open=ohlcv[0], high=ohlcv[1], low=ohlcv[2], close=ohlcv[3], volume=ohlcv[4],
+        )
+        with self._lock:
+            self._opened[contract_address] = (version, arrays)
+        return arrays
+
+
+class ColumnarPriceLoader(PriceLoader):
+    """
+    PriceLoader поверх ColumnarCandleStore.
+    Drop-in замена CsvPriceLoader: диапазон по времени отдается срезом memmap без парсинга CSV.
+    """
+
+    def __init__(self, store_dir: str = "data/candles/store", timeframe: str = "1m"):
+        self.store = ColumnarCandleStore(root=store_dir, timeframe=timeframe)
+        self.timeframe = timeframe
+
+    def load_arrays(
+        self,
+        contract_address: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> CandleArrays:
+        """Возвращает zero-copy срез колоночного ряда (пустой, если контракта нет в хранилище)."""
+        arrays = self.store.read(contract_address)
+        if arrays is None:
+            return CandleArrays.empty()
+        return arrays.slice_time(start_time, end_time)
+
+    def load_prices(
+        self,
+        contract_address: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> List[Candle]:
+        return self.load_arrays(contract_address, start_time, end_time).to_candles()
+
+    def source_fingerprint(self, contract_address: str) -> Optional[str]:
+        """Отпечаток ряда контракта (размер и mtime файла ряда) или None, если контракта нет."""
+        path = self.store.data_path(contract_address)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def load_candle_arrays(
+    loader: PriceLoader,
+    contract_address: str,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+) -> CandleArrays:
+    """
+    Загружает диапазон свечей в колоночном виде через любой PriceLoader.
+    Лоадеры с load_arrays (хранилище, кеш) отдают срез без создания Candle-объектов.
+    """
+    load_arrays = getattr(loader, "load_arrays", None)
+    if callable(load_arrays):
+        arrays = load_arrays(contract_address, start_time, end_time)
+        if isinstance(arrays, CandleArrays):
+            return arrays
+    candles = loader.load_prices(contract_address, start_time=start_time, end_time=end_time)
+    return CandleArrays.from_candles(candles)
+
+
+def discover_csv_contracts(csv_base_dir: str, timeframe: str) -> List[str]:
+    """
+    Находит контракты в CSV-кеше по форматам, которые понимает CsvPriceLoader.resolve_candles_path:
+        {base}/cached/{timeframe}/{contract}.csv
+        {base}/{contract}_{timeframe}.csv
+        {base}/cached/{contract}_{timeframe}.csv
+        {base}/{timeframe}/{contract}.csv
+
+    Формат {base}/{contract}.csv (без таймфрейма) не сканируется: его нельзя отличить от файлов
+    других таймфреймов. Такие контракты можно передать явно.
+    """
+    base = Path(csv_base_dir)
+    suffix = f"_{timeframe}.csv"
+    found = set()
+    for directory in (base / "cached" / timeframe, base / timeframe):
+        if directory.is_dir():
+            found.update(p.stem for p in directory.glob("*.csv"))
+    for directory in (base, base / "cached"):
+        if directory.is_dir():
+            found.update(p.name[: -len(suffix)] for p in directory.glob(f"*{suffix}"))
+    return sorted(c for c in found if c)
+
+
+def convert_csv_to_store(
+    csv_base_dir: str,
+    store: ColumnarCandleStore,
+    contracts: Optional[List[str]] = None,
+    overwrite: bool = False,
+) -> Dict[str, int]:
+    """
+    Конвертирует CSV-свечи в колоночное хранилище.
+
+    Файлы ищутся через CsvPriceLoader.resolve_candles_path (тот же приоритет форматов).
+    Невалидные свечи отбрасываются той же векторной валидацией, что и в CsvPriceLoader (candle_validation).
+
+    :param csv_base_dir: Базовая директория CSV-кеша
+    :param store: Целевое хранилище (таймфрейм берется из него)
+    :param contracts: Список контрактов (по умолчанию - все найденные в csv_base_dir)
+    :param overwrite: Перезаписывать контракты, уже присутствующие в хранилище
+    :return: {contract: количество записанных свечей} (-1 для пропущенных/битых файлов)
+    """
+    from .price_loader import CsvPriceLoader
+
+    csv_loader = CsvPriceLoader(candles_dir=csv_base_dir, timeframe=store.timeframe, base_dir=csv_base_dir)
+    if contracts is None:
+        contracts = discover_csv_contracts(csv_base_dir, store.timeframe)
+
+    written: Dict[str, int] = {}
+    for contract in contracts:
+        if not overwrite and store.has(contract):
+            print(f"[store] Skip existing: {contract}")
+            written[contract] = -1
+            continue
+
+        path = csv_loader.resolve_candles_path(contract, store.timeframe)
+        if path is None:
+            print(f"[WARNING] CSV not found for contract={contract}, timeframe={store.timeframe}")
+            written[contract] = -1
+            continue
+
+        try:
+            df = read_cache_frame(path)
+            missing = [col for col in ("timestamp",) + OHLCV_COLUMNS if col not in df.columns]
+            if missing:
+                raise ValueError(f"missing columns {missing}")
+            arrays, report = validate_candle_frame(df, contract=contract)
+        except Exception as e:
+            print(f"[ERROR] Failed to convert CSV: contract={contract}, path={path}, error={type(e).__name__}: {e}")
+            written[contract] = -1
+            continue
+        report.emit()
+
+        store.write(contract, arrays)
+        written[contract] = len(arrays)
+        print(f"[store] {contract}: {len(arrays)} candles <- {path}")
+
+    return written
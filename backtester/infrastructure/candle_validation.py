@@ -0,0 +1,194 @@
+"""
+Векторная валидация и нормализация свечей при загрузке.
+
+Один проход по массивам вместо validate_candle на каждую строку:
+- строки с некорректными значениями отбрасываются, каждая учитывается по первому
+  нарушенному правилу (VALIDATION_RULES);
+- timestamp приводится к UTC epoch seconds;
+- ряд сортируется по времени, дубли timestamp удаляются (остается первая строка).
+
+Результат - CandleSeries и отчет CandleValidationReport (сколько строк отброшено
+по каждому правилу). В strict-режиме некорректные значения (но не дубли) - InvalidCandlesError.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..domain.candle_series import OHLCV_COLUMNS, CandleSeries, to_epoch_seconds
+
+# Правила в порядке проверки: строка учитывается по первому нарушенному
+VALIDATION_RULES: Tuple[str, ...] = (
+    "bad_timestamp",          # timestamp не распознан
+    "non_finite",             # NaN/inf в OHLCV (в т.ч. нечисловые значения)
+    "non_positive_price",     # open/high/low/close <= 0
+    "high_below_low",         # high < low
+    "high_below_open_close",  # high < open или high < close
+    "low_above_open_close",   # low > open или low > close
+    "negative_volume",        # volume < 0
+)
+DUPLICATE_RULE = "duplicate_timestamp"
+
+
+class InvalidCandlesError(ValueError):
+    """Некорректные свечи в strict-режиме валидации."""
+    pass
+
+
+@dataclass
+class CandleValidationReport:
+    """Отчет валидации свечей одного контракта: сколько строк отброшено по каждому правилу."""
+    contract: str
+    rows_in: int = 0
+    rows_out: int = 0
+    dropped: Dict[str, int] = field(default_factory=dict)
+    first_issue: Optional[str] = None  # Описание первой отброшенной некорректной строки
+
+    @property
+    def rows_dropped(self) -> int:
+        return sum(self.dropped.values())
+
+    @property
+    def rows_invalid(self) -> int:
+        """Строки с некорректными значениями (без дублей timestamp)."""
+        return sum(n for rule, n in self.dropped.items() if rule != DUPLICATE_RULE)
+
+    def merge(self, other: "CandleValidationReport") -> None:
+        """Добавляет счетчики другого отчета (например, следующего батча API)."""
+        self.rows_in += other.rows_in
+        self.rows_out += other.rows_out
+        for rule, n in other.dropped.items():
+            self.dropped[rule] = self.dropped.get(rule, 0) + n
+        if self.first_issue is None:
+            self.first_issue = other.first_issue
+
+    def summary(self) -> str:
+        rules = ", ".join(f"{rule}={n}" for rule, n in self.dropped.items())
+        text = f"contract={self.contract}: dropped {self.rows_dropped} of {self.rows_in} candles"
+        if rules:
+            text += f" ({rules})"
+        if self.first_issue:
+            text += f"; first: {self.first_issue}"
+        return text
+
+    def emit(self) -> None:
+        """Печатает отчет одной строкой, если были отброшены некорректные свечи."""
+        if self.rows_invalid:
+            print(f"[WARNING] [validation] {self.summary()}")
+
+
+def _rule_masks(ts: np.ndarray, ohlcv: np.ndarray) -> List[np.ndarray]:
+    """Маски нарушений в порядке VALIDATION_RULES (True = правило нарушено)."""
+    o, h, l, c, v = ohlcv
+    with np.errstate(invalid="ignore"):
+        return [
+            np.isnan(ts),
+            ~np.isfinite(ohlcv).all(axis=0),
+            (o <= 0) | (h <= 0) | (l <= 0) | (c <= 0),
+            h < l,
+            (h < o) | (h < c),
+            (l > o) | (l > c),
+            v < 0,
+        ]
+
+
+def _describe_row(ts: float, ohlcv: np.ndarray, rule: str) -> str:
+    when = "NaT" if np.isnan(ts) else datetime.fromtimestamp(int(ts), tz=timezone.utc).isoformat()
+    values = ", ".join(f"{name}={value}" for name, value in zip(OHLCV_COLUMNS, ohlcv.tolist()))
+    return f"{rule} at {when} ({values})"
+
+
+def validate_candle_arrays(
+    ts: np.ndarray,
+    ohlcv: np.ndarray,
+    contract: str = "",
+    strict_validation: bool = False,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+) -> Tuple[CandleSeries, CandleValidationReport]:
+    """
+    Валидирует и нормализует сырые массивы свечей.
+
+    :param ts: float64 epoch seconds (UTC), NaN - нераспознанный timestamp; порядок любой
+    :param ohlcv: float64 shape (5, n): open/high/low/close/volume
+    :param contract: Контракт (для отчета и сообщений)
+    :param strict_validation: Если True, некорректные значения - InvalidCandlesError (дубли timestamp - нет)
+    :param start_time: Начало диапазона (включительно); строки вне [start_time, end_time]
+                       отбрасываются до валидации и в отчет не попадают
+    :param end_time: Конец диапазона (включительно)
+    :return: (CandleSeries, CandleValidationReport)
+    """
+    ts = np.asarray(ts, dtype=np.float64)
+    ohlcv = np.asarray(ohlcv, dtype=np.float64).reshape(len(OHLCV_COLUMNS), -1)
+
+    if start_time is not None or end_time is not None:
+        in_range = np.ones(ts.shape[0], dtype=bool)
+        with np.errstate(invalid="ignore"):
+            if start_time is not None:
+                in_range &= ts >= to_epoch_seconds(start_time) + (1 if start_time.microsecond else 0)
+            if end_time is not None:
+                in_range &= ts <= to_epoch_seconds(end_time)
+        in_range |= np.isnan(ts)  # нераспознанные timestamps учитываются в отчете
+        ts, ohlcv = ts[in_range], ohlcv[:, in_range]
+
+    report = CandleValidationReport(contract=contract, rows_in=int(ts.shape[0]))
+    bad = np.zeros(ts.shape[0], dtype=bool)
+    first_bad: Optional[Tuple[int, str]] = None
+    for rule, mask in zip(VALIDATION_RULES, _rule_masks(ts, ohlcv)):
+        hits = mask & ~bad
+        count = int(hits.sum())
+        if count:
+            report.dropped[rule] = count
+            idx = int(np.argmax(hits))
+            if first_bad is None or idx < first_bad[0]:
+                first_bad = (idx, rule)
+            bad |= hits
+    if first_bad is not None:
+        report.first_issue = _describe_row(ts[first_bad[0]], ohlcv[:, first_bad[0]], first_bad[1])
+        if strict_validation:
+            raise InvalidCandlesError(f"Invalid candles: {report.summary()}")
+
+    if bad.any():
+        keep = ~bad
+        ts, ohlcv = ts[keep], ohlcv[:, keep]
+    series = CandleSeries.from_arrays(ts.astype(np.int64), ohlcv)
+    duplicates = int(ts.shape[0]) - len(series)
+    if duplicates:
+        report.dropped[DUPLICATE_RULE] = duplicates
+    report.rows_out = len(series)
+    return series, report
+
+
+def validate_candle_frame(
+    df: pd.DataFrame,
+    contract: str = "",
+    strict_validation: bool = False,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+) -> Tuple[CandleSeries, CandleValidationReport]:
+    """
+    Валидирует DataFrame с колонками timestamp/open/high/low/close/volume (см. validate_candle_arrays).
+    Timestamp приводится к UTC (naive считается UTC); ошибка разбора timestamp - исключение pandas.
+    """
+    stamps = pd.to_datetime(df["timestamp"], utc=True)
+    seconds = (stamps - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    ts = seconds.to_numpy(dtype=np.float64, na_value=np.nan)
+    ohlcv = np.vstack([
+        pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        for col in OHLCV_COLUMNS
+    ]) if len(df) else np.empty((len(OHLCV_COLUMNS), 0), dtype=np.float64)
+    return validate_candle_arrays(ts, ohlcv, contract, strict_validation, start_time, end_time)
+
+
+def validate_ohlcv_rows(
+    rows: Sequence[Sequence[float]],
+    contract: str = "",
+    strict_validation: bool = False,
+) -> Tuple[CandleSeries, CandleValidationReport]:
+    """Валидирует строки ohlcv_list GeckoTerminal: [timestamp, open, high, low, close, volume]."""
+    raw = np.asarray(rows, dtype=np.float64).reshape(-1, 1 + len(OHLCV_COLUMNS))
+    return validate_candle_arrays(raw[:, 0], raw[:, 1:].T, contract, strict_validation)
@@ -0,0 +1,179 @@
+"""
+Производные таймфреймы из 1m-свечей с кешированием агрегатов.
+
+ResampledPriceLoader оборачивает любой 1m-лоадер (CSV, GeckoTerminal, колоночное хранилище)
+и отдает свечи произвольного таймфрейма ("5m", "15m", "1h", "4h", ...), агрегируя 1m-ряд
+векторно (domain.candle_resample). Отдельные файлы и загрузки на каждый таймфрейм не нужны.
+
+Агрегат строится по всему сохраненному 1m-ряду контракта и кешируется в .npy
+(формат ColumnarCandleStore) вместе с отпечатком источника:
+    {root}/{timeframe}/{contract}.candles.npy   - агрегат
+    {root}/{timeframe}/{contract}.source        - отпечаток 1m-источника
+Отпечаток - content_hash манифеста candles_index (GeckoTerminal) или source_fingerprint
+лоадера (CSV, хранилище). Изменился 1m-кеш - агрегат пересчитывается при следующем запросе.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..domain.candle_resample import resample_series, timeframe_seconds
+from ..domain.candle_series import CandleSeries, to_epoch_seconds
+from ..domain.models import Candle
+from .candle_segments import read_cache_frame, write_atomic
+from .candle_store import ColumnarCandleStore, load_candle_arrays
+from .candle_validation import validate_candle_frame
+from .price_loader import PriceLoader
+
+_SOURCE_SUFFIX = ".source"
+
+
+class DerivedCandleCache:
+    """Кеш агрегатов: ряд контракта в таймфрейме + отпечаток 1m-источника, из которого он построен."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self._stores: Dict[str, ColumnarCandleStore] = {}
+
+    def _store(self, timeframe: str) -> ColumnarCandleStore:
+        store = self._stores.get(timeframe)
+        if store is None:
+            store = self._stores[timeframe] = ColumnarCandleStore(root=str(self.root), timeframe=timeframe)
+        return store
+
+    def _source_path(self, contract: str, timeframe: str) -> Path:
+        return self.root / timeframe / f"{contract}{_SOURCE_SUFFIX}"
+
+    def get(self, contract: str, timeframe: str, fingerprint: str) -> Optional[CandleSeries]:
+        """Агрегат, если он построен из источника с тем же отпечатком; иначе None."""
+        try:
+            stored = self._source_path(contract, timeframe).read_text(encoding="utf-8")
+        except OSError:
+            return None
+        if stored != fingerprint:
+            return None
+        return self._store(timeframe).read(contract)
+
+    def put(self, contract: str, timeframe: str, fingerprint: str, series: CandleSeries) -> None:
+        """
+        Сохраняет агрегат. Отпечаток удаляется до записи массивов и пишется последним:
+        прерванная запись не оставит агрегат с чужим отпечатком.
+        """
+        source_path = self._source_path(contract, timeframe)
+        source_path.unlink(missing_ok=True)
+        self._store(timeframe).write(contract, series)
+        write_atomic(source_path, fingerprint.encode("utf-8"))
+
+
+class ResampledPriceLoader(PriceLoader):
+    """
+    PriceLoader таймфрейма timeframe поверх 1m-лоадера.
+
+    Срез по времени совпадает с CSV-файлом этого таймфрейма: свечи с меткой в [start_time, end_time].
+    Для GeckoTerminal недостающий 1m-диапазон (с выравниванием по корзинам) сначала дозагружается,
+    покрытие проверяется по манифесту без чтения CSV.
+    """
+
+    def __init__(
+        self,
+        source: PriceLoader,
+        timeframe: str,
+        cache_dir: Optional[str | Path] = "data/candles/derived",
+        source_timeframe: str = "1m",
+    ):
+        """
+        :param source: Лоадер исходного таймфрейма (обычно 1m)
+        :param timeframe: Целевой таймфрейм ("5m", "15m", "1h", "4h", ...)
+        :param cache_dir: Директория кеша агрегатов (None - без кеша, агрегация на каждый запрос)
+        :param source_timeframe: Таймфрейм source (для выравнивания дозагрузки)
+        """
+        self.source = source
+        self.timeframe = timeframe
+        self.step = timeframe_seconds(timeframe)
+        self.source_step = timeframe_seconds(source_timeframe)
+        if self.step % self.source_step:
+            raise ValueError(f"Timeframe {timeframe} is not a multiple of source timeframe {source_timeframe}")
+        self.cache = DerivedCandleCache(cache_dir) if cache_dir is not None else None
+        self.rebuilds = 0  # Сколько агрегатов пересчитано (для статистики и тестов)
+
+    def _aligned_range(
+        self, start_time: Optional[datetime], end_time: Optional[datetime]
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """1m-диапазон, полностью покрывающий корзины запрошенного окна."""
+        aligned_start = aligned_end = None
+        if start_time is not None:
+            aligned_start = datetime.fromtimestamp(to_epoch_seconds(start_time) // self.step * self.step, tz=timezone.utc)
+        if end_time is not None:
+            bucket = to_epoch_seconds(end_time) // self.step * self.step
+            aligned_end = datetime.fromtimestamp(bucket + self.step - self.source_step, tz=timezone.utc)
+        return aligned_start, aligned_end
+
+    def _ensure_source_range(self, contract_address: str, start_time: Optional[datetime], end_time: Optional[datetime]) -> None:
+        """Дозагружает 1m-диапазон у лоадеров с API (есть cache_entry), если манифест его не покрывает."""
+        cache_entry = getattr(self.source, "cache_entry", None)
+        if not callable(cache_entry):
+            return
+        aligned_start, aligned_end = self._aligned_range(start_time, end_time)
+        entry = cache_entry(contract_address)
+        if entry is not None:
+            covers_start = aligned_start is None or entry.min_time <= aligned_start
+            covers_end = aligned_end is None or entry.max_time >= aligned_end
+            if covers_start and covers_end:
+                return
+        self.source.load_prices(contract_address, start_time=aligned_start, end_time=aligned_end)
+
+    def _fingerprint(self, contract_address: str) -> Optional[str]:
+        """Отпечаток 1m-ряда: хеш манифеста (GeckoTerminal) или source_fingerprint лоадера."""
+        cache_entry = getattr(self.source, "cache_entry", None)
+        if callable(cache_entry):
+            entry = cache_entry(contract_address)
+            return entry.content_hash if entry is not None else None
+        source_fingerprint = getattr(self.source, "source_fingerprint", None)
+        if callable(source_fingerprint):
+            return source_fingerprint(contract_address)
+        return None
+
+    def _load_source(self, contract_address: str) -> CandleSeries:
+        """Весь сохраненный 1m-ряд контракта (кеш GeckoTerminal читается напрямую, без API)."""
+        cache_entry = getattr(self.source, "cache_entry", None)
+        if callable(cache_entry):
+            entry = cache_entry(contract_address)
+            if entry is None:
+                return CandleSeries.empty()
+            series, _ = validate_candle_frame(read_cache_frame(Path(entry.path)), contract=contract_address)
+            return series
+        return load_candle_arrays(self.source, contract_address)
+
+    def _derived(self, contract_address: str) -> CandleSeries:
+        fingerprint = self._fingerprint(contract_address)
+        if self.cache is not None and fingerprint is not None:
+            cached = self.cache.get(contract_address, self.timeframe, fingerprint)
+            if cached is not None:
+                return cached
+        derived = resample_series(self._load_source(contract_address), self.step)
+        self.rebuilds += 1
+        if self.cache is not None and fingerprint is not None:
+            try:
+                self.cache.put(contract_address, self.timeframe, fingerprint, derived)
+            except OSError as e:
+                print(f"[WARNING] Failed to cache derived candles: contract={contract_address}, timeframe={self.timeframe}, error={e}")
+        return derived
+
+    def load_arrays(
+        self,
+        contract_address: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> CandleSeries:
+        """Свечи таймфрейма timeframe с меткой в [start_time, end_time] (колоночный ряд)."""
+        self._ensure_source_range(contract_address, start_time, end_time)
+        return self._derived(contract_address).slice_time(start_time, end_time)
+
+    def load_prices(
+        self,
+        contract_address: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> List[Candle]:
+        return self.load_arrays(contract_address, start_time, end_time).to_candles()
@@ -0,0 +1,226 @@
+"""
+Персистентное хранилище признаков уровня сигнала (feature store).
+
+Признаки сигнала (window features бэктеста, max_xn / time_to_Nx пайплайна фильтрации, результаты
+XN-анализа) зависят только от сигнала, свечей контракта и параметров расчета. Хранилище позволяет
+посчитать их один раз и переиспользовать между прогонами и этапами пайплайна:
+- ключ строки - (feature_set, version, signal_id, contract_address); timestamp сигнала хранится
+  рядом и сверяется при чтении (сдвинутый сигнал - промах, строка перезаписывается). К timestamp
+  можно добавить отпечаток свечей, из которых посчитаны признаки: исправленные свечи - тоже промах;
+- version включает параметры расчета (feature_set_version), смена параметров - новые строки;
+- потребители досчитывают только отсутствующие сигналы (incremental), повторный прогон
+  исследования не читает свечи.
+
+Хранилище - один SQLite-файл {store_dir}/features.sqlite (WAL), безопасно для потоков и процессов.
+read_frame отдает набор признаков целиком колоночной таблицей (pandas.DataFrame).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+DB_FILENAME = "features.sqlite"
+_SQL_CHUNK = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    feature_set TEXT NOT NULL,
+    version TEXT NOT NULL,
+    signal_id TEXT NOT NULL,
+    contract_address TEXT NOT NULL,
+    signal_ts TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (feature_set, version, signal_id, contract_address)
+)
+"""
+
+# (signal_id, contract_address, timestamp сигнала в ISO [+ "|" + отпечаток свечей])
+SignalKey = Tuple[str, str, str]
+
+
+def signal_key(
+    signal_id: Any,
+    contract_address: Any,
+    signal_ts: datetime,
+    fingerprint: Optional[str] = None,
+) -> SignalKey:
+    """
+    Ключ сигнала в хранилище.
+
+    :param fingerprint: Отпечаток свечей, от которых зависят признаки (candles_fingerprint);
+                        сверяется при чтении вместе с timestamp
+    """
+    stamp = signal_ts.isoformat()
+    return str(signal_id), str(contract_address), f"{stamp}|{fingerprint}" if fingerprint else stamp
+
+
+def feature_set_version(version: str, **params: Any) -> str:
+    """
+    Версия набора признаков с учетом параметров расчета: "{version}-{hash(params)}".
+
+    :param version: Версия кода расчета (меняется вручную при изменении логики)
+    :param params: Параметры, от которых зависят значения (горизонт, режим входа, окна и т.д.)
+    """
+    if not params:
+        return str(version)
+    payload = json.dumps(params, sort_keys=True, default=repr)
+    return f"{version}-{hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()}"
+
+
+class FeatureStore:
+    """
+    Признаки сигналов по (feature_set, version, signal_id, contract_address).
+
+    Значение строки - произвольный picklable объект (обычно dict признаков).
+    """
+
+    def __init__(self, store_dir: str | Path):
+        """
+        :param store_dir: Директория хранилища (создается при необходимости)
+        """
+        self.store_dir = Path(store_dir)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @property
+    def db_path(self) -> Path:
+        return self.store_dir / DB_FILENAME
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, feature_set: str, version: str, keys: Sequence[SignalKey]) -> Dict[SignalKey, Any]:
+        """
+        Возвращает сохраненные признаки сигналов.
+
+        :param keys: signal_key(...) сигналов
+        :return: {key: значение} только для найденных ключей с совпавшим timestamp сигнала
+        """
+        if not keys:
+            return {}
+        wanted: Dict[Tuple[str, str], List[SignalKey]] = {}
+        for key in dict.fromkeys(keys):
+            wanted.setdefault((key[0], key[1]), []).append(key)
+        found: Dict[SignalKey, Any] = {}
+        pairs = list(wanted)
+        with self._lock:
+            conn = self._connection()
+            # Чанки: ограничение SQLite на число параметров запроса
+            for i in range(0, len(pairs), _SQL_CHUNK):
+                chunk = pairs[i:i + _SQL_CHUNK]
+                placeholders = ",".join("(?, ?)" for _ in chunk)
+                rows = conn.execute(
+                    "SELECT signal_id, contract_address, signal_ts, payload FROM features "
+                    f"WHERE feature_set = ? AND version = ? AND (signal_id, contract_address) IN (VALUES {placeholders})",
+                    [feature_set, version, *(value for pair in chunk for value in pair)],
+                ).fetchall()
+                for signal_id, contract, signal_ts, payload in rows:
+                    for key in wanted[(signal_id, contract)]:
+                        if key[2] == signal_ts:
+                            found[key] = pickle.loads(payload)
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, feature_set: str, version: str, items: Sequence[Tuple[SignalKey, Any]]) -> None:
+        """Сохраняет (перезаписывает) признаки сигналов одной транзакцией."""
+        if not items:
+            return
+        now = time.time()
+        rows = [
+            (feature_set, version, signal_id, contract, signal_ts,
+             pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now)
+            for (signal_id, contract, signal_ts), value in items
+        ]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.commit()
+            self.writes += len(rows)
+
+    def read_frame(self, feature_set: str, version: str) -> pd.DataFrame:
+        """
+        Весь набор признаков одной версии колоночной таблицей.
+        Значения-словари раскладываются по колонкам; колонки signal_id, contract_address, signal_ts - ключ.
+        """
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(
+                "SELECT signal_id, contract_address, signal_ts, payload FROM features "
+                "WHERE feature_set = ? AND version = ? ORDER BY signal_ts, signal_id",
+                (feature_set, version),
+            ).fetchall()
+        records: List[Dict[str, Any]] = []
+        for signal_id, contract, signal_ts, payload in rows:
+            value = pickle.loads(payload)
+            record = dict(value) if isinstance(value, dict) else {"value": value}
+            record.update({"signal_id": signal_id, "contract_address": contract, "signal_ts": signal_ts})
+            records.append(record)
+        return pd.DataFrame(records)
+
+    def delete(self, feature_set: Optional[str] = None, keep_version: Optional[str] = None) -> int:
+        """
+        Удаляет строки набора признаков (или все).
+
+        :param feature_set: Набор признаков (None - все наборы)
+        :param keep_version: Оставить строки этой версии (удалить только устаревшие)
+        :return: Количество удаленных строк
+        """
+        clauses, params = [], []
+        if feature_set is not None:
+            clauses.append("feature_set = ?")
+            params.append(feature_set)
+        if keep_version is not None:
+            clauses.append("version != ?")
+            params.append(keep_version)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            conn = self._connection()
+            removed = conn.execute(f"DELETE FROM features{where}", params).rowcount
+            conn.commit()
+        return int(removed)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Статистика обращений текущего процесса."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+    def describe(self) -> Dict[str, Any]:
+        """Состояние хранилища: число строк по (feature_set, version)."""
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(
+                "SELECT feature_set, version, COUNT(*) FROM features GROUP BY feature_set, version"
+            ).fetchall()
+        return {
+            "sets": {f"{feature_set}@{version}": int(count) for feature_set, version, count in rows},
+            "file_bytes": self.db_path.stat().st_size if self.db_path.exists() else 0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
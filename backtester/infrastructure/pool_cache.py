@@ -0,0 +1,165 @@
+"""
+Персистентный кеш соответствия контракт -> pool_id для GeckoTerminal.
+
+Пул токена почти никогда не меняется, поэтому запрос /tokens/{contract}/pools
+нужен один раз, а не на каждом промахе кеша свечей.
+- Найденный пул хранится ttl_days (по умолчанию 30 дней).
+- Отрицательный результат (404 на /pools / у токена нет пулов) хранится negative_ttl_hours:
+  мертвые контракты не тратят запросы под rate limit на каждом запуске. 404 на OHLCV живого
+  пула (разрыв, дозагрузка) отрицательно не кешируется.
+
+Хранилище - SQLite {cache_dir}/pool_ids.sqlite (WAL), рядом с кешем свечей.
+Массовое разрешение по файлу сигналов:
+    python -m backtester.tools.resolve_pools resolve --signals signals/example_signals.csv
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+POOL_CACHE_FILENAME = "pool_ids.sqlite"
+DEFAULT_POOL_TTL_DAYS = 30.0
+DEFAULT_NEGATIVE_TTL_HOURS = 24.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pool_ids (
+    contract TEXT PRIMARY KEY,
+    pool_id TEXT,
+    detail TEXT NOT NULL,
+    resolved_at REAL NOT NULL
+)
+"""
+
+
+class PoolNotFoundError(ValueError):
+    """У контракта нет пула с OHLCV (в т.ч. закешированный отрицательный результат)."""
+    pass
+
+
+@dataclass
+class PoolIdEntry:
+    """Запись кеша: pool_id (None - отрицательный результат) и время разрешения (epoch seconds)."""
+    contract: str
+    pool_id: Optional[str]
+    detail: str
+    resolved_at: float
+
+    @property
+    def is_negative(self) -> bool:
+        return self.pool_id is None
+
+
+class PoolIdCache:
+    """Кеш contract -> pool_id (SQLite, потокобезопасный) с TTL и отрицательным кешированием."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        ttl_days: Optional[float] = DEFAULT_POOL_TTL_DAYS,
+        negative_ttl_hours: Optional[float] = DEFAULT_NEGATIVE_TTL_HOURS,
+    ):
+        """
+        :param cache_dir: Директория кеша свечей (GeckoTerminalPriceLoader.cache_dir)
+        :param ttl_days: Срок жизни найденного пула (None - бессрочно)
+        :param negative_ttl_hours: Срок жизни отрицательного результата (None - бессрочно, 0 - не кешировать)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = None if ttl_days is None else float(ttl_days) * 86400
+        self.negative_ttl_seconds = None if negative_ttl_hours is None else float(negative_ttl_hours) * 3600
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @property
+    def db_path(self) -> Path:
+        return self.cache_dir / POOL_CACHE_FILENAME
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def is_expired(self, entry: PoolIdEntry, now: float) -> bool:
+        ttl = self.negative_ttl_seconds if entry.is_negative else self.ttl_seconds
+        return ttl is not None and now - entry.resolved_at > ttl
+
+    def _read(self, contract: str) -> Optional[PoolIdEntry]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT contract, pool_id, detail, resolved_at FROM pool_ids WHERE contract = ?",
+                (contract,),
+            ).fetchone()
+        return PoolIdEntry(*row) if row else None
+
+    def get(self, contract: str) -> Optional[PoolIdEntry]:
+        """Действующая запись (просроченная считается отсутствующей) и учет hit/miss."""
+        entry = self._read(contract)
+        if entry is None or self.is_expired(entry, time.time()):
+            self.misses += 1
+            return None
+        if entry.is_negative:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def _write(self, contract: str, pool_id: Optional[str], detail: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pool_ids VALUES (?, ?, ?, ?)",
+                    (contract, pool_id, detail, time.time()),
+                )
+
+    def put(self, contract: str, pool_id: str, detail: str = "") -> None:
+        """Запоминает найденный пул."""
+        self._write(contract, pool_id, detail)
+
+    def put_missing(self, contract: str, detail: str) -> None:
+        """Запоминает отрицательный результат (если отрицательное кеширование не выключено)."""
+        if self.negative_ttl_seconds == 0:
+            return
+        self._write(contract, None, detail)
+
+    def delete(self, contract: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM pool_ids WHERE contract = ?", (contract,))
+
+    def entries(self) -> List[PoolIdEntry]:
+        """Все записи (включая просроченные), по контракту."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT contract, pool_id, detail, resolved_at FROM pool_ids ORDER BY contract"
+            ).fetchall()
+        return [PoolIdEntry(*row) for row in rows]
+
+    def forget_missing(self) -> int:
+        """Удаляет все отрицательные записи. :return: сколько удалено"""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                return conn.execute("DELETE FROM pool_ids WHERE pool_id IS NULL").rowcount
+
+    def summary(self) -> Dict[str, int]:
+        return {"hits": self.hits, "negative_hits": self.negative_hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -3,7 +3,8 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Optional, List, Callable, TypeVar
+from typing import Dict, Optional, List, Callable, Tuple, TypeVar, cast
+import bisect
 import os
 import time
 import requests
@@ -13,9 +14,26 @@ import threading
 from collections import deque
 
 from ..domain.models import Candle  # Импорт структуры свечи
+from .candle_index import DEFAULT_GAP_MINUTES, CandleCacheIndex, CandleIndexEntry, summarize_csv, summarize_timestamps
+from ..domain.candle_series import CandleSeries
+from .pool_cache import DEFAULT_NEGATIVE_TTL_HOURS, DEFAULT_POOL_TTL_DAYS, PoolIdCache, PoolNotFoundError
+from .candle_validation import CandleValidationReport, InvalidCandlesError, validate_candle_frame, validate_ohlcv_rows
+from .candle_segments import (
+    append_segment,
+    cache_signature,
+    chain_hash,
+    compact_segments,
+    content_hash,
+    list_segments,
+    read_cache_frame,
+    rewrite_cache,
+)
 
 T = TypeVar('T')
 
+# Базовый URL GeckoTerminal API (переопределяется для тестов / прокси)
+GECKO_API_BASE_URL = "https://api.geckoterminal.com/api/v2"
+
 
 def _format_datetime(dt: Optional[datetime]) -> str:
     """
@@ -102,6 +120,24 @@ class RateLimiter:
             
             # После ожидания цикл повторится и снова проверит лимит
     
+    def try_acquire(self, cost: int = 1) -> float:
+        """
+        Неблокирующая попытка занять слот в том же окне, что и acquire
+        (используется AsyncRateLimiter: синхронные и асинхронные запросы делят один лимит).
+
+        :param cost: Стоимость запроса (по умолчанию 1)
+        :return: 0.0, если слот занят; иначе - сколько секунд ждать до освобождения слота
+        """
+        with self._lock:
+            now = time.time()
+            while self._timestamps and self._timestamps[0] < now - self.period_seconds:
+                self._timestamps.popleft()
+            if len(self._timestamps) + cost <= self.max_calls:
+                for _ in range(cost):
+                    self._timestamps.append(now)
+                return 0.0
+            return max(0.01, (self._timestamps[0] + self.period_seconds) - now + 0.1)
+
     def get_stats(self) -> dict:
         """Возвращает статистику по rate limiter."""
         with self._lock:
@@ -278,6 +314,8 @@ class CsvPriceLoader(PriceLoader):
         self.timeframe = timeframe
         self.strict_validation = strict_validation
         self.base_dir = Path(base_dir)
+        # Последний отчет валидации по контракту (строки, отброшенные по правилам)
+        self.validation_reports: Dict[str, CandleValidationReport] = {}
 
     def resolve_candles_path(self, contract: str, timeframe: str, base_dir: Optional[str] = None) -> Optional[Path]:
         """
@@ -330,11 +368,32 @@ class CsvPriceLoader(PriceLoader):
         
         При обнаружении пустого или поврежденного файла логирует ошибку и возвращает пустой список.
         """
+        return self.load_arrays(contract_address, start_time, end_time).to_candles()
+
+    def source_fingerprint(self, contract_address: str) -> Optional[str]:
+        """
+        Отпечаток CSV контракта без чтения данных: путь, суммарный размер и mtime файла и сегментов.
+        None, если файла нет. Используется кешем производных таймфреймов (derived_candles).
+        """
+        path = self.resolve_candles_path(contract_address, self.timeframe)
+        if path is None:
+            return None
+        size, mtime_ns = cache_signature(path)
+        return f"{path}:{size}:{mtime_ns}"
+
+    def load_arrays(self, contract_address: str, start_time=None, end_time=None) -> CandleSeries:
+        """
+        Загружает диапазон свечей колоночным рядом (CandleSeries) без создания Candle-объектов.
+
+        Невалидные строки отбрасываются векторно (см. candle_validation); отчет по правилам
+        сохраняется в validation_reports[contract] и печатается одной строкой.
+        При обнаружении пустого или поврежденного файла логирует ошибку и возвращает пустой ряд.
+        """
         # Используем resolve_candles_path для поиска файла
         path = self.resolve_candles_path(contract_address, self.timeframe)
         if path is None:
-            # Файл не найден - возвращаем пустой список (не поднимаем исключение)
-            return []
+            # Файл не найден - возвращаем пустой ряд (не поднимаем исключение)
+            return CandleSeries.empty()
         
         # Получаем размер файла для логирования
         try:
@@ -345,71 +404,55 @@ class CsvPriceLoader(PriceLoader):
         # Проверяем, что файл не пустой
         if file_size_bytes == 0:
             print(f"[ERROR] Empty CSV file: contract={contract_address}, timeframe={self.timeframe}, path={path}, file_size_bytes=0")
-            return []
+            return CandleSeries.empty()
         
-        # Пытаемся прочитать CSV с обработкой различных ошибок
+        # Пытаемся прочитать CSV (+ сегменты дозагрузки) с обработкой различных ошибок
         try:
-            df = pd.read_csv(path)
+            df = read_cache_frame(path)
         except pd.errors.EmptyDataError as e:
             print(f"[ERROR] EmptyDataError parsing CSV: contract={contract_address}, timeframe={self.timeframe}, path={path}, file_size_bytes={file_size_bytes}, error={e}")
-            return []
+            return CandleSeries.empty()
         except pd.errors.ParserError as e:
             print(f"[ERROR] ParserError parsing CSV: contract={contract_address}, timeframe={self.timeframe}, path={path}, file_size_bytes={file_size_bytes}, error={e}")
-            return []
+            return CandleSeries.empty()
         except UnicodeDecodeError as e:
             print(f"[ERROR] UnicodeDecodeError parsing CSV: contract={contract_address}, timeframe={self.timeframe}, path={path}, file_size_bytes={file_size_bytes}, error={e}")
-            return []
+            return CandleSeries.empty()
         except Exception as e:
             # Ловим любые другие ошибки при чтении CSV
             print(f"[ERROR] Unexpected error reading CSV: contract={contract_address}, timeframe={self.timeframe}, path={path}, file_size_bytes={file_size_bytes}, error={type(e).__name__}: {e}")
-            return []
+            return CandleSeries.empty()
         
         # Проверяем, что DataFrame не пустой
         if df.empty:
             print(f"[ERROR] CSV file contains no rows: contract={contract_address}, timeframe={self.timeframe}, path={path}, file_size_bytes={file_size_bytes}")
-            return []
+            return CandleSeries.empty()
         
         # Проверяем наличие обязательных колонок
         required_columns = ["timestamp", "open", "high", "low", "close", "volume"]
         missing_columns = [col for col in required_columns if col not in df.columns]
         if missing_columns:
             print(f"[ERROR] CSV file missing required columns: contract={contract_address}, timeframe={self.timeframe}, path={path}, file_size_bytes={file_size_bytes}, missing={missing_columns}")
-            return []
+            return CandleSeries.empty()
         
+        # Валидация, приведение к UTC, сортировка и дедупликация - один векторный проход
         try:
-            df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
-            df = df.sort_values("timestamp")
+            series, report = validate_candle_frame(
+                df,
+                contract=contract_address,
+                strict_validation=self.strict_validation,
+                start_time=start_time,
+                end_time=end_time,
+            )
+        except InvalidCandlesError:
+            raise  # strict_validation: некорректные свечи - ошибка, а не пропуск
         except Exception as e:
             print(f"[ERROR] Error parsing timestamps: contract={contract_address}, timeframe={self.timeframe}, path={path}, file_size_bytes={file_size_bytes}, error={e}")
-            return []
-
-        # Фильтрация по времени (если указано)
-        if start_time is not None:
-            df = df[df["timestamp"] >= start_time]
-        if end_time is not None:
-            df = df[df["timestamp"] <= end_time]
+            return CandleSeries.empty()
 
-        # Преобразуем строки в объекты Candle с валидацией
-        candles = []
-        for row in df.itertuples(index=False):  # type: ignore[attr-defined]
-            try:
-                candle = Candle(
-                    timestamp=row.timestamp.to_pydatetime(),  # type: ignore[attr-defined]
-                    open=row.open,  # type: ignore[attr-defined]
-                    high=row.high,  # type: ignore[attr-defined]
-                    low=row.low,  # type: ignore[attr-defined]
-                    close=row.close,  # type: ignore[attr-defined]
-                    volume=row.volume,  # type: ignore[attr-defined]
-                )
-                if validate_candle(candle, strict_validation=self.strict_validation):
-                    candles.append(candle)
-            except Exception as e:
-                # Пропускаем битые строки, но логируем только первую
-                if len(candles) == 0:
-                    print(f"[WARNING] Error parsing candle row: contract={contract_address}, timeframe={self.timeframe}, path={path}, error={e}")
-                continue
-        
-        return candles
+        self.validation_reports[contract_address] = report
+        report.emit()
+        return series
 
 
 # Загрузчик свечей с API GeckoTerminal с кешированием и историческим бэктрекингом
@@ -423,16 +466,46 @@ class GeckoTerminalPriceLoader(PriceLoader):
         max_retries: int = 3,
         retry_backoff_factor: float = 2.0,
         rate_limit_config: Optional[dict] = None,
-        prefer_cache_if_exists: bool = False
+        prefer_cache_if_exists: bool = False,
+        base_url: str = GECKO_API_BASE_URL,
+        internal_gap_minutes: Optional[int] = None,
+        use_index: bool = True,
+        max_cache_segments: int = 16,
+        use_pool_cache: bool = True,
+        pool_cache_ttl_days: Optional[float] = DEFAULT_POOL_TTL_DAYS,
+        pool_negative_ttl_hours: Optional[float] = DEFAULT_NEGATIVE_TTL_HOURS,
     ):
+        """
+        :param base_url: Базовый URL API (по умолчанию - публичный GeckoTerminal)
+        :param internal_gap_minutes: Дозагружать разрывы внутри кеша длиннее N минут (None = только края).
+                                     GeckoTerminal не отдает минуты без сделок, поэтому порог должен
+                                     быть заметно больше таймфрейма.
+        :param use_index: Вести манифест покрытия кеша (candles_index.sqlite в cache_dir)
+        :param max_cache_segments: После скольких сегментов дозагрузки кеш контракта компактируется
+        :param use_pool_cache: Хранить соответствие contract -> pool_id (pool_ids.sqlite в cache_dir)
+        :param pool_cache_ttl_days: Срок жизни найденного пула (None - бессрочно)
+        :param pool_negative_ttl_hours: Срок жизни отрицательного результата (404 / нет пулов; 0 - не кешировать)
+        """
         # Папка для кеша, целевой таймфрейм, допустимая свежесть кеша
         self.cache_dir = Path(cache_dir)
         self.timeframe = timeframe
         self.max_cache_age_days = max_cache_age_days
         self.strict_validation = strict_validation
+        # Последний отчет валидации по контракту (строки ответа API, отброшенные по правилам)
+        self.validation_reports: Dict[str, CandleValidationReport] = {}
         self.max_retries = max_retries
         self.retry_backoff_factor = retry_backoff_factor
         self.prefer_cache_if_exists = prefer_cache_if_exists
+        self.base_url = base_url.rstrip("/")
+        self.internal_gap_minutes = internal_gap_minutes
+        # Манифест покрытия: проверки диапазона/свежести без чтения CSV
+        self.cache_index: Optional[CandleCacheIndex] = CandleCacheIndex(self.cache_dir) if use_index else None
+        self.max_cache_segments = max(1, int(max_cache_segments))
+        # Кеш contract -> pool_id: запрос /tokens/{contract}/pools один раз, а не на каждом промахе
+        self.pool_cache: Optional[PoolIdCache] = (
+            PoolIdCache(self.cache_dir, ttl_days=pool_cache_ttl_days, negative_ttl_hours=pool_negative_ttl_hours)
+            if use_pool_cache else None
+        )
         
         # Настройки rate limit
         rate_limit_config = rate_limit_config or {}
@@ -494,21 +567,69 @@ class GeckoTerminalPriceLoader(PriceLoader):
         if not path.exists():
             return False
         try:
-            df = pd.read_csv(path)
-            df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
-            last_ts = df["timestamp"].max()
-            age = datetime.now(timezone.utc) - last_ts
+            entry = self._index_entry(self._contract_from_cache_path(path), path)
+            if entry is None:
+                return False
+            age = datetime.now(timezone.utc) - entry.max_time
             return age <= timedelta(days=self.max_cache_age_days)
         except Exception:
             return False
 
-    def _load_from_cache(self, path: Path) -> Optional[List[Candle]]:
+    def _contract_from_cache_path(self, path: Path) -> str:
+        """Адрес контракта по пути кеша (новый формат - имя файла, старый - {contract}_{timeframe})."""
+        if path.parent == self.cache_dir / self.timeframe:
+            return path.stem
+        return path.stem[: -len(f"_{self.timeframe}")] if path.stem.endswith(f"_{self.timeframe}") else path.stem
+
+    def _index_entry(self, contract_address: str, path: Path) -> Optional[CandleIndexEntry]:
         """
-        Загружает свечи из кеша. Возвращает None в случае ошибки.
+        Запись манифеста для файла кеша. Если записи нет или файл изменился в обход загрузчика,
+        читается только колонка timestamp и запись обновляется.
         """
+        if self.cache_index is not None:
+            entry = self.cache_index.get(contract_address, self.timeframe)
+            if entry is not None and entry.path == str(path) and entry.matches_file(path):
+                return entry
         try:
-            df = pd.read_csv(path)
+            entry = summarize_csv(contract_address, self.timeframe, path, self._index_gap_minutes)
+        except Exception as e:
+            print(f"[WARNING] Failed to index cache {path}: {e}")
+            return None
+        if entry is not None and self.cache_index is not None:
+            self.cache_index.put(entry)
+        return entry
+
+    def cache_entry(self, contract_address: str) -> Optional[CandleIndexEntry]:
+        """Запись манифеста для кеша контракта (новый формат приоритетнее старого) или None."""
+        for path in self._get_cache_paths(contract_address):
+            if path.exists():
+                entry = self._index_entry(contract_address, path)
+                if entry is not None:
+                    return entry
+        return None
+
+    @property
+    def _index_gap_minutes(self) -> int:
+        """Минимальная длина разрыва (минуты), попадающего в gaps записей манифеста."""
+        return self.cache_index.gap_minutes if self.cache_index is not None else DEFAULT_GAP_MINUTES
+
+    def _load_from_cache(
+        self,
+        path: Path,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> Optional[List[Candle]]:
+        """
+        Загружает свечи из кеша (базовый файл + сегменты). Возвращает None в случае ошибки.
+        С границами start_time/end_time объекты Candle создаются только для строк окна.
+        """
+        try:
+            df = read_cache_frame(path)
             df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+            if start_time is not None:
+                df = df[df["timestamp"] >= start_time]
+            if end_time is not None:
+                df = df[df["timestamp"] <= end_time]
             candles = []
             for row in df.itertuples(index=False):  # type: ignore[attr-defined]
                 candles.append(Candle(
@@ -519,30 +640,210 @@ class GeckoTerminalPriceLoader(PriceLoader):
                     close=row.close,  # type: ignore[attr-defined]
                     volume=row.volume,  # type: ignore[attr-defined]
                 ))
+            candles.sort(key=lambda c: c.timestamp)
             return candles
         except Exception as e:
             print(f"⚠️ Failed to load cache from {path}: {e}")
             return None
 
+    def _find_cache(self, contract_address: str) -> Tuple[Optional[List[Candle]], Optional[Path], bool]:
+        """
+        Ищет кэш контракта в обоих форматах.
+
+        :return: (свечи или None, путь к найденному файлу, is_legacy_format)
+        """
+        cache_paths = self._get_cache_paths(contract_address)
+        cache_path: Optional[Path] = None
+        cached_candles: Optional[List[Candle]] = None
+        is_legacy_format = False
+        for path in cache_paths:
+            if path.exists():
+                cache_path = path
+                # Определяем, это старый формат или новый
+                is_legacy_format = (path == cache_paths[1])  # Второй путь - старый формат
+                cached_candles = self._load_from_cache(path)
+                if cached_candles is not None:
+                    break
+        return cached_candles, cache_path, is_legacy_format
+
+    def _find_cache_entry(self, contract_address: str) -> Tuple[Optional[CandleIndexEntry], Optional[Path], bool]:
+        """
+        Как _find_cache, но без чтения свечей: покрытие кеша берется из манифеста.
+
+        :return: (запись манифеста или None, путь к найденному файлу, is_legacy_format)
+        """
+        cache_paths = self._get_cache_paths(contract_address)
+        cache_path: Optional[Path] = None
+        entry: Optional[CandleIndexEntry] = None
+        is_legacy_format = False
+        for path in cache_paths:
+            if path.exists():
+                cache_path = path
+                is_legacy_format = (path == cache_paths[1])
+                entry = self._index_entry(contract_address, path)
+                if entry is not None:
+                    break
+        return entry, cache_path, is_legacy_format
+
+    def _cache_coverage(
+        self,
+        entry: CandleIndexEntry,
+        path: Path,
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+    ) -> Tuple[List[Tuple[Optional[datetime], Optional[datetime]]], Optional[List[Candle]]]:
+        """
+        Недостающие диапазоны окна по записи манифеста (min_ts/max_ts/gaps) - CSV не читается.
+        Если internal_gap_minutes короче разрывов, которые хранит манифест, покрытие считается
+        по полному кешу (как раньше) - тогда вторым элементом возвращаются прочитанные свечи.
+
+        :return: (недостающие диапазоны, свечи кеша или None, если файл не читался)
+        """
+        if self.internal_gap_minutes is not None and self.internal_gap_minutes < self._index_gap_minutes:
+            cached_candles = self._load_from_cache(path)
+            if not cached_candles:
+                return [(start_time, end_time)], None
+            return self._missing_ranges(cached_candles, start_time, end_time), cached_candles
+        return self._missing_ranges_from_entry(entry, start_time, end_time), None
+
+    def _missing_ranges_from_entry(
+        self,
+        entry: CandleIndexEntry,
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+    ) -> List[Tuple[Optional[datetime], Optional[datetime]]]:
+        """
+        То же, что _missing_ranges, но по записи манифеста: края - min_ts/max_ts,
+        внутренние разрывы - entry.gaps длиннее internal_gap_minutes, задевающие окно.
+        """
+        cache_min = entry.min_time
+        cache_max = entry.max_time
+        ranges: List[Tuple[Optional[datetime], Optional[datetime]]] = []
+
+        if start_time is not None and start_time < cache_min:
+            ranges.append((start_time, min(cache_min, end_time) if end_time is not None else cache_min))
+
+        if self.internal_gap_minutes is not None:
+            max_gap = self.internal_gap_minutes * 60
+            lo = start_time.timestamp() if start_time is not None else None
+            hi = end_time.timestamp() if end_time is not None else None
+            for prev_ts, next_ts in entry.gaps:
+                if next_ts - prev_ts <= max_gap:
+                    continue
+                # Разрыв на границе окна тоже считается (соседние свечи за пределами окна)
+                if (lo is None or next_ts >= lo) and (hi is None or prev_ts <= hi):
+                    ranges.append((
+                        datetime.fromtimestamp(prev_ts, tz=timezone.utc),
+                        datetime.fromtimestamp(next_ts, tz=timezone.utc),
+                    ))
+
+        if end_time is not None and end_time > cache_max:
+            ranges.append((max(cache_max, start_time) if start_time is not None else cache_max, end_time))
+
+        return ranges
+
+    def cached_range(self, contract_address: str) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Диапазон свечей контракта в кеше (первая и последняя свеча) или None, если кеша нет.
+        Внутренние разрывы не учитываются - как и при проверке покрытия в load_prices.
+        """
+        entry = self.cache_entry(contract_address)
+        if entry is None:
+            return None
+        return entry.min_time, entry.max_time
+
+    def _migrate_legacy_cache(self, cache_path: Path, new_cache_path: Path, is_legacy_format: bool) -> None:
+        """Переносит кеш старого формата в новый (полное чтение - только при миграции)."""
+        if not is_legacy_format or new_cache_path.exists():
+            return
+        cached_candles = self._load_from_cache(cache_path)
+        if cached_candles:
+            print(f"[CACHE] Migrating cache from legacy format: {cache_path} -> {new_cache_path}")
+            self._save_to_cache(new_cache_path, cached_candles)
+
+    @staticmethod
+    def _candles_to_csv(candles: List[Candle]) -> bytes:
+        """CSV кеша (timestamp,open,high,low,close,volume) без промежуточного DataFrame."""
+        lines = ["timestamp,open,high,low,close,volume"]
+        lines.extend(
+            f"{c.timestamp.isoformat()},{c.open!r},{c.high!r},{c.low!r},{c.close!r},{c.volume!r}"
+            for c in candles
+        )
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    def _index_cache(self, path: Path, candles: List[Candle], digest: Optional[str]) -> None:
+        """Обновляет запись манифеста по полному ряду свечей кеша."""
+        if self.cache_index is None:
+            return
+        contract_address = self._contract_from_cache_path(path)
+        entry = summarize_timestamps(
+            contract_address, self.timeframe, path,
+            [int(c.timestamp.timestamp()) for c in candles], digest, self._index_gap_minutes,
+        )
+        if entry is None:
+            self.cache_index.delete(contract_address, self.timeframe)
+        else:
+            self.cache_index.put(entry)
+
     def _save_to_cache(self, path: Path, candles: List[Candle]):
         """
-        Сохраняет свечи в кешированный CSV-файл.
+        Полностью переписывает кеш контракта (базовый файл) и обновляет манифест покрытия.
+        Файл пишется атомарно (временный файл + os.replace); сегменты дозагрузки удаляются -
+        их свечи уже входят в candles.
         """
         try:
-            os.makedirs(path.parent, exist_ok=True)
-            df = pd.DataFrame([{
-                "timestamp": c.timestamp.isoformat(),
-                "open": c.open,
-                "high": c.high,
-                "low": c.low,
-                "close": c.close,
-                "volume": c.volume,
-            } for c in candles])
-            df.to_csv(path, index=False)
+            data = self._candles_to_csv(candles)
+            rewrite_cache(path, data)
+            self._index_cache(path, candles, content_hash(data))
             print(f"[cache] Saved {len(candles)} candles to cache: {path}")
         except Exception as e:
             print(f"[WARNING] Failed to save cache: {e}")
 
+    def _append_to_cache(self, path: Path, new_candles: List[Candle], merged: List[Candle]) -> None:
+        """
+        Дописывает новые свечи неизменяемым сегментом (O(новых данных)).
+        При превышении max_cache_segments сегменты вливаются в базовый файл.
+
+        :param new_candles: Новые/измененные свечи
+        :param merged: Полный ряд кеша после дозагрузки (для манифеста)
+        """
+        if not new_candles:
+            return
+        try:
+            previous = self.cache_index.get(self._contract_from_cache_path(path), self.timeframe) if self.cache_index else None
+            previous_valid = previous is not None and previous.path == str(path) and previous.matches_file(path)
+            data = self._candles_to_csv(new_candles)
+            append_segment(path, data)
+            digest = chain_hash(previous.content_hash, data) if previous_valid else None
+            if len(list_segments(path)) > self.max_cache_segments:
+                rows = compact_segments(path)
+                digest = None
+                print(f"[cache] Compacted cache segments: {path} ({rows} candles)")
+            self._index_cache(path, merged, digest)
+            print(f"[cache] Appended {len(new_candles)} candles to cache: {path}")
+        except Exception as e:
+            print(f"[WARNING] Failed to append cache segment: {e}")
+
+    def _update_cache(
+        self,
+        contract_address: str,
+        cache_path: Optional[Path],
+        cached_candles: Optional[List[Candle]],
+        fetched: List[Candle],
+        merged: List[Candle],
+    ) -> None:
+        """
+        Сохраняет результат дозагрузки: сегментом к существующему кешу нового формата,
+        иначе (нет кеша / старый формат) - полной записью базового файла.
+        """
+        new_cache_path = self._get_cache_path(contract_address)
+        if cached_candles and cache_path == new_cache_path:
+            cached_by_ts = {c.timestamp: c for c in cached_candles}
+            changed = [c for c in sorted(fetched, key=lambda c: c.timestamp) if cached_by_ts.get(c.timestamp) != c]
+            self._append_to_cache(new_cache_path, changed, merged)
+        else:
+            self._save_to_cache(new_cache_path, merged)
+
     def _http_get(self, url: str, headers: dict) -> requests.Response:
         """
         Единая точка отправки HTTP запросов с rate limiting.
@@ -559,7 +860,7 @@ class GeckoTerminalPriceLoader(PriceLoader):
         print(f"[HTTP] GET {url}")
         
         try:
-            response = requests.get(url, headers=headers)
+            response = self._send(url, headers)
             
             # Отслеживаем 429 ответы
             if response.status_code == 429:
@@ -571,22 +872,86 @@ class GeckoTerminalPriceLoader(PriceLoader):
             print(f"[HTTP ERROR] Request failed: {e}")
             raise
 
+    def _send(self, url: str, headers: dict) -> requests.Response:
+        """Отправка GET без учета лимитов (переопределяется для пула соединений)."""
+        return requests.get(url, headers=headers)
+
     @retry_on_failure(max_retries=3, backoff_factor=2.0)
     def _fetch_pool_id(self, contract_address: str, headers: dict) -> str:
         """
         Получает идентификатор пула по адресу контракта с retry-логикой.
         Выбирает пул с наибольшей ликвидностью (reserve_in_usd).
         """
-        pools_url = f"https://api.geckoterminal.com/api/v2/networks/solana/tokens/{contract_address}/pools"
+        pools_url = f"{self.base_url}/networks/solana/tokens/{contract_address}/pools"
         print(f"[fetch] Fetching pools for token: {contract_address}")
         r = self._http_get(pools_url, headers)
         r.raise_for_status()
-        
-        data = r.json()
+        return self._select_pool_id(contract_address, r.json())
+
+    def _resolve_pool_id(self, contract_address: str, headers: dict, refresh: bool = False) -> str:
+        """
+        pool_id контракта: из кеша pool_ids.sqlite, при промахе - запрос к API с записью в кеш.
+        404 и "нет пулов" кешируются отрицательно (PoolNotFoundError без запроса до истечения TTL).
+
+        :param refresh: Игнорировать кеш (результат все равно записывается)
+        """
+        if self.pool_cache is not None and not refresh:
+            entry = self.pool_cache.get(contract_address)
+            if entry is not None:
+                if entry.is_negative:
+                    raise PoolNotFoundError(f"No pool for token {contract_address} (cached: {entry.detail})")
+                return cast(str, entry.pool_id)
+        try:
+            pool_id = self._fetch_pool_id(contract_address, headers)
+        except HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                self._remember_missing_pool(contract_address, "pools 404")
+                raise PoolNotFoundError(f"Token {contract_address} not found (HTTP 404)") from e
+            raise
+        except PoolNotFoundError as e:
+            # _select_pool_id: у токена нет пулов
+            self._remember_missing_pool(contract_address, str(e))
+            raise
+        if self.pool_cache is not None:
+            self.pool_cache.put(contract_address, pool_id)
+        return pool_id
+
+    def _remember_missing_pool(self, contract_address: str, detail: str) -> None:
+        if self.pool_cache is not None:
+            self.pool_cache.put_missing(contract_address, detail)
+
+    def resolve_pool_ids(self, contracts: List[str], refresh: bool = False) -> Dict[str, Optional[str]]:
+        """
+        Массово разрешает pool_id (например, все контракты файла сигналов до запуска бэктеста).
+
+        :param contracts: Адреса контрактов (дубли игнорируются)
+        :param refresh: Запрашивать API даже для контрактов из кеша
+        :return: {contract: pool_id или None (пул не найден / ошибка API)}
+        """
+        headers = {"User-Agent": "Mozilla/5.0 GeckoLoader"}
+        resolved: Dict[str, Optional[str]] = {}
+        for contract in dict.fromkeys(contracts):
+            try:
+                resolved[contract] = self._resolve_pool_id(contract, headers, refresh=refresh)
+            except RateLimitExceededError:
+                raise
+            except PoolNotFoundError as e:
+                print(f"[pools] {e}")
+                resolved[contract] = None
+            except Exception as e:
+                print(f"[ERROR] Failed to resolve pool for {contract}: {type(e).__name__}: {e}")
+                resolved[contract] = None
+        return resolved
+
+    @staticmethod
+    def _select_pool_id(contract_address: str, data: dict) -> str:
+        """
+        Выбирает пул из ответа /tokens/{contract}/pools: пул с наибольшей ликвидностью (reserve_in_usd).
+        """
         pools = data.get("data", [])
         
         if not pools:
-            raise ValueError(f"No pools found for token {contract_address}")
+            raise PoolNotFoundError(f"No pools found for token {contract_address}")
         
         # Выбираем пул с наибольшей ликвидностью (reserve_in_usd)
         # Если reserve_in_usd нет, берем первый пул
@@ -645,7 +1010,7 @@ class GeckoTerminalPriceLoader(PriceLoader):
         if aggregate:
             query += f"&aggregate={aggregate}"
         
-        ohlcv_url = f"https://api.geckoterminal.com/api/v2/networks/solana/pools/{pool_id}/ohlcv/{tf_endpoint}?{query}"
+        ohlcv_url = f"{self.base_url}/networks/solana/pools/{pool_id}/ohlcv/{tf_endpoint}?{query}"
         print(f"[fetch] Fetching: {ohlcv_url}")
         res = self._http_get(ohlcv_url, headers)
         
@@ -686,35 +1051,19 @@ class GeckoTerminalPriceLoader(PriceLoader):
         :param end_time: Конец временного диапазона (опционально)
         :return: Список свечей в указанном диапазоне
         """
-        # Ищем кэш в обоих форматах
+        # Ищем кэш в обоих форматах; покрытие берется из манифеста, CSV читается только для ответа
         cache_paths = self._get_cache_paths(contract_address)
-        cache_path: Optional[Path] = None
+        entry, cache_path, is_legacy_format = self._find_cache_entry(contract_address)
         cached_candles: Optional[List[Candle]] = None
-        is_legacy_format = False
         
-        # Пытаемся найти существующий кэш
-        for path in cache_paths:
-            if path.exists():
-                cache_path = path
-                # Определяем, это старый формат или новый
-                is_legacy_format = (path == cache_paths[1])  # Второй путь - старый формат
-                cached_candles = self._load_from_cache(path)
-                if cached_candles is not None:
-                    break
-        
-        # Если кеш найден и успешно загружен
-        if cached_candles and len(cached_candles) > 0:
-            cached_candles.sort(key=lambda c: c.timestamp)
-            cache_min = cached_candles[0].timestamp
-            cache_max = cached_candles[-1].timestamp
+        # Если кеш найден и проиндексирован
+        if entry is not None and cache_path is not None:
+            cache_min = entry.min_time
+            cache_max = entry.max_time
             
             # Если включен режим prefer_cache_if_exists - используем кэш без API запросов
             if self.prefer_cache_if_exists:
-                filtered = [
-                    c for c in cached_candles
-                    if (start_time is None or c.timestamp >= start_time) and
-                       (end_time is None or c.timestamp <= end_time)
-                ]
+                filtered = self._load_from_cache(cache_path, start_time, end_time) or []
                 
                 # Проверяем покрытие диапазона для логирования
                 covers_start = (start_time is None) or (cache_min <= start_time)
@@ -731,51 +1080,44 @@ class GeckoTerminalPriceLoader(PriceLoader):
                     print(f"[CACHE WARNING] cache-hit but incomplete range (cache-only) {contract_address} have={_format_datetime(cache_min)} to {_format_datetime(cache_max)} need={' to '.join(missing_info) if missing_info else 'full range'}")
                 
                 # Миграция из старого формата в новый (если нужно)
-                if is_legacy_format and cache_path:
-                    new_cache_path = cache_paths[0]  # Новый формат
-                    if not new_cache_path.exists():
-                        print(f"[CACHE] Migrating cache from legacy format: {cache_path} -> {new_cache_path}")
-                        self._save_to_cache(new_cache_path, cached_candles)
-                
+                self._migrate_legacy_cache(cache_path, cache_paths[0], is_legacy_format)
                 return filtered
             
-            # Старая логика: проверяем покрытие диапазона
-            covers_start = (start_time is None) or (cache_min <= start_time)
-            covers_end = (end_time is None) or (cache_max >= end_time)
+            # Проверяем покрытие диапазона: края кеша и (опционально) внутренние разрывы
+            missing_ranges, cached_candles = self._cache_coverage(entry, cache_path, start_time, end_time)
             
-            if covers_start and covers_end:
-                # Кеш полностью покрывает диапазон - используем только его
-                filtered = [
-                    c for c in cached_candles
-                    if (start_time is None or c.timestamp >= start_time) and
-                       (end_time is None or c.timestamp <= end_time)
-                ]
+            if not missing_ranges:
+                # Кеш полностью покрывает диапазон - читаем только строки окна
+                if cached_candles is not None:
+                    filtered = [
+                        c for c in cached_candles
+                        if (start_time is None or c.timestamp >= start_time) and
+                           (end_time is None or c.timestamp <= end_time)
+                    ]
+                else:
+                    filtered = self._load_from_cache(cache_path, start_time, end_time) or []
                 print(f"[CACHE OK] Using cached candles for {contract_address} ({len(filtered)} candles, range: {_format_datetime(cache_min)} to {_format_datetime(cache_max)})")
                 
                 # Миграция из старого формата в новый (если нужно)
-                if is_legacy_format and cache_path:
-                    new_cache_path = cache_paths[0]  # Новый формат
-                    if not new_cache_path.exists():
-                        print(f"[CACHE] Migrating cache from legacy format: {cache_path} -> {new_cache_path}")
-                        self._save_to_cache(new_cache_path, cached_candles)
-                
+                self._migrate_legacy_cache(cache_path, cache_paths[0], is_legacy_format)
                 return filtered
             else:
-                # Диапазон не покрыт полностью - перезагружаем полностью
-                missing_info = []
-                if not covers_start:
-                    missing_info.append(f"start (cache: {_format_datetime(cache_min)}, needed: {_format_datetime(start_time)})")
-                if not covers_end:
-                    missing_info.append(f"end (cache: {_format_datetime(cache_max)}, needed: {_format_datetime(end_time)})")
-                print(f"[CACHE WARNING] Incomplete coverage for {contract_address} (missing: {', '.join(missing_info)}), reloading from API")
+                # Диапазон не покрыт полностью - дозагружаем только недостающие части
+                missing_info = ", ".join(
+                    f"{_format_datetime(gap_start)} to {_format_datetime(gap_end)}" for gap_start, gap_end in missing_ranges
+                )
+                print(f"[CACHE WARNING] Incomplete coverage for {contract_address} (cache: {_format_datetime(cache_min)} to {_format_datetime(cache_max)}, missing: {missing_info}), fetching missing ranges from API")
+                # Для слияния с дозагрузкой нужен весь кеш
+                if cached_candles is None:
+                    cached_candles = self._load_from_cache(cache_path) or None
+                if cached_candles is None:
+                    missing_ranges = [(start_time, end_time)]
         else:
             # Кеша нет - загружаем все с нуля
             print(f"[CACHE ERROR] cache-miss {contract_address} -> API")
+            missing_ranges = [(start_time, end_time)]
         
-        # Загружаем свечи через API (полная перезагрузка для простоты)
-        # TODO: Оптимизировать - дозагружать только недостающие части
         candles: List[Candle] = []
-        now_ts = int(datetime.now(timezone.utc).timestamp())
 
         try:
             headers = {"User-Agent": "Mozilla/5.0 GeckoLoader"}
@@ -783,109 +1125,43 @@ class GeckoTerminalPriceLoader(PriceLoader):
             tf_endpoint, aggregate = tf_map[self.timeframe]
 
             # Получаем идентификатор пула (pool_id) по адресу контракта с retry
-            pool_id = self._fetch_pool_id(contract_address, headers)
+            pool_id = self._resolve_pool_id(contract_address, headers)
             pool_id = str(pool_id).strip()  # Нормализуем pool_id
 
-            # Определяем начальный timestamp для загрузки
-            # Если указан end_time, используем его, иначе текущее время
-            if end_time:
-                before_ts = int(end_time.timestamp())
-                # Проверяем, что timestamp не в будущем
-                if before_ts > now_ts:
-                    print(f"⚠️ Warning: end_time is in the future, using current time instead")
-                    before_ts = now_ts
-            else:
-                before_ts = now_ts
-            
-            # Проверяем, что timestamp не слишком старый (больше 6 месяцев назад API не возвращает данные)
-            six_months_ago = int((datetime.now(timezone.utc) - timedelta(days=180)).timestamp())
-            if before_ts < six_months_ago:
-                print(f"[WARNING] Warning: Requested timestamp is more than 6 months ago. GeckoTerminal API may not have data.")
-                print(f"   Requested: {before_ts} ({datetime.fromtimestamp(before_ts, tz=timezone.utc)})")
-                print(f"   Limit: {six_months_ago} ({datetime.fromtimestamp(six_months_ago, tz=timezone.utc)})")
-            
-            seen = set()        # для исключения дубликатов
-
-            # Загружаем свечи батчами по 1000 штук, двигаясь в прошлое
-            while True:
-                # Получаем батч свечей с retry
-                try:
-                    candles_raw = self._fetch_ohlcv_batch(pool_id, tf_endpoint, aggregate, before_ts, headers)
-                except HTTPError as e:
-                    # Если 404 - пул не найден или нет данных для этого таймфрейма
-                    if e.response and e.response.status_code == 404:
-                        print(f"[ERROR] Pool {pool_id} returned 404. Possible reasons:")
-                        print(f"   1. Pool was removed or deactivated")
-                        print(f"   2. Pool has no trading history")
-                        print(f"   3. Requested timeframe ({self.timeframe}) is not available")
-                        print(f"   4. Timestamp {before_ts} is too far in the past/future")
-                        # Пытаемся использовать кеш, если есть
-                        if cached_candles:
-                            print(f"[WARNING] Falling back to cached candles due to 404 error")
-                            return [
-                                c for c in cached_candles
-                                if (start_time is None or c.timestamp >= start_time) and
-                                   (end_time is None or c.timestamp <= end_time)
-                            ]
-                        raise
-                    else:
-                        raise
-                
-                if not candles_raw:
-                    break  # данных больше нет
-
-                # Преобразуем в объекты Candle и исключаем дубли
-                # Формат GeckoTerminal API: [timestamp, open, high, low, close, volume]
-                batch = []
-                for row in candles_raw:
-                    if row[0] not in seen:
-                        candle = Candle(
-                            timestamp=datetime.utcfromtimestamp(row[0]).replace(tzinfo=timezone.utc),
-                            open=float(row[1]),
-                            high=float(row[2]),
-                            low=float(row[3]),
-                            close=float(row[4]),
-                            volume=float(row[5]),
-                        )
-                        if validate_candle(candle, strict_validation=self.strict_validation):
-                            batch.append(candle)
-                seen.update(row[0] for row in candles_raw)
-                candles.extend(batch)
-
-                # Если получили непустой ответ, но все свечи уже были в seen (дубликаты),
-                # значит мы достигли конца данных - прерываем цикл
-                if candles_raw and not batch:
-                    print(f"[WARNING] All candles in batch were duplicates, stopping fetch")
-                    break
-
-                # Прерываем, если достигли нужной начальной даты
-                if start_time and batch and batch[-1].timestamp <= start_time:
-                    break
+            fetched: List[Candle] = []
+            report = CandleValidationReport(contract=contract_address)
+            for gap_start, gap_end in missing_ranges:
+                fetched.extend(self._fetch_range(pool_id, tf_endpoint, aggregate, gap_start, gap_end, headers, report))
+            print(f"[fetch] Total candles fetched: {len(fetched)} ({len(missing_ranges)} range(s))")
+            self._emit_validation_report(report)
 
-                # Продвигаемся дальше в прошлое
-                if batch:
-                    before_ts = int(batch[-1].timestamp.timestamp())
-                else:
-                    # Если batch пустой, но candles_raw не пустой (что не должно происходить после проверки выше),
-                    # все равно прерываем, чтобы избежать бесконечного цикла
-                    print(f"[WARNING] Empty batch but non-empty response, stopping to avoid infinite loop")
-                    break
-
-            candles.sort(key=lambda c: c.timestamp)  # сортировка по времени
-            print(f"[fetch] Total candles fetched: {len(candles)}")
+            # Объединяем с кешем (свежие свечи API заменяют кешированные с тем же timestamp)
+            candles = self._merge_candles(cached_candles or [], fetched)
             
-            # Сохраняем обновленный кеш в новом формате
-            new_cache_path = self._get_cache_path(contract_address)
-            self._save_to_cache(new_cache_path, candles)
+            # Сохраняем обновленный кеш в новом формате (дозагрузка - отдельным сегментом)
+            self._update_cache(contract_address, cache_path, cached_candles, fetched, candles)
 
         except RateLimitExceededError:
             # Rate limit exceeded в fail-fast режиме - пробрасываем дальше
             raise
+        except PoolNotFoundError as e:
+            # Пула нет (в т.ч. по кешу pool_ids) - запросов к API не делаем
+            print(f"[WARNING] {e}")
+            if cached_candles:
+                print(f"[WARNING] Falling back to cached candles")
+                return [
+                    c for c in cached_candles
+                    if (start_time is None or c.timestamp >= start_time) and
+                       (end_time is None or c.timestamp <= end_time)
+                ]
+            return []
         except HTTPError as e:
             # Детальная обработка HTTP ошибок
-            if e.response and e.response.status_code == 404:
+            if e.response is not None and e.response.status_code == 404:
                 print(f"[ERROR] HTTP 404: Pool or OHLCV data not found for {contract_address}")
                 print(f"   URL: {e.response.url if hasattr(e.response, 'url') else 'N/A'}")
+                # 404 на OHLCV (например, при дозагрузке разрыва) не означает мертвый пул:
+                # отрицательно кешируются только 404 на /pools и токен без пулов (_resolve_pool_id)
             else:
                 print(f"[ERROR] HTTP Error loading candles for {contract_address}: {e}")
             
@@ -918,6 +1194,158 @@ class GeckoTerminalPriceLoader(PriceLoader):
             if (start_time is None or c.timestamp >= start_time) and
                (end_time is None or c.timestamp <= end_time)
         ]
+
+    def _missing_ranges(
+        self,
+        cached_candles: List[Candle],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+    ) -> List[Tuple[Optional[datetime], Optional[datetime]]]:
+        """
+        Вычисляет диапазоны, которых нет в кеше (кеш отсортирован по timestamp).
+
+        - до cache_min, если start_time раньше начала кеша;
+        - после cache_max, если end_time позже конца кеша;
+        - внутренние разрывы длиннее internal_gap_minutes (если задан) внутри запрошенного окна.
+        Открытая граница (None) считается покрытой - как и раньше.
+
+        :return: Список (gap_start, gap_end) в порядке времени
+        """
+        cache_min = cached_candles[0].timestamp
+        cache_max = cached_candles[-1].timestamp
+        ranges: List[Tuple[Optional[datetime], Optional[datetime]]] = []
+
+        if start_time is not None and start_time < cache_min:
+            ranges.append((start_time, min(cache_min, end_time) if end_time is not None else cache_min))
+
+        if self.internal_gap_minutes is not None:
+            max_gap = timedelta(minutes=self.internal_gap_minutes)
+            timestamps = [c.timestamp for c in cached_candles]
+            lo = bisect.bisect_left(timestamps, start_time) if start_time is not None else 0
+            hi = bisect.bisect_right(timestamps, end_time) if end_time is not None else len(timestamps)
+            # Окно внутри кеша: включаем соседние свечи, чтобы увидеть разрыв на границе окна
+            lo = max(lo - 1, 0)
+            hi = min(hi + 1, len(timestamps))
+            for prev_ts, next_ts in zip(timestamps[lo:hi - 1], timestamps[lo + 1:hi]):
+                if next_ts - prev_ts > max_gap:
+                    ranges.append((prev_ts, next_ts))
+
+        if end_time is not None and end_time > cache_max:
+            ranges.append((max(cache_max, start_time) if start_time is not None else cache_max, end_time))
+
+        return ranges
+
+    def _fetch_range(
+        self,
+        pool_id: str,
+        tf_endpoint: str,
+        aggregate: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        headers: dict,
+        report: Optional[CandleValidationReport] = None,
+    ) -> List[Candle]:
+        """
+        Загружает свечи диапазона батчами по 1000, двигаясь от end_time в прошлое до start_time.
+
+        :param start_time: Начало диапазона (None = вся доступная история)
+        :param end_time: Конец диапазона (None = текущее время)
+        :param report: Отчет валидации контракта (счетчики отброшенных строк дополняются)
+        :return: Свечи (могут выходить за границы диапазона на часть батча)
+        """
+        now_ts = int(datetime.now(timezone.utc).timestamp())
+
+        # Определяем начальный timestamp для загрузки
+        # Если указан end_time, используем его, иначе текущее время
+        if end_time:
+            before_ts = int(end_time.timestamp())
+            # Проверяем, что timestamp не в будущем
+            if before_ts > now_ts:
+                print(f"⚠️ Warning: end_time is in the future, using current time instead")
+                before_ts = now_ts
+        else:
+            before_ts = now_ts
+        
+        # Проверяем, что timestamp не слишком старый (больше 6 месяцев назад API не возвращает данные)
+        six_months_ago = int((datetime.now(timezone.utc) - timedelta(days=180)).timestamp())
+        if before_ts < six_months_ago:
+            print(f"[WARNING] Warning: Requested timestamp is more than 6 months ago. GeckoTerminal API may not have data.")
+            print(f"   Requested: {before_ts} ({datetime.fromtimestamp(before_ts, tz=timezone.utc)})")
+            print(f"   Limit: {six_months_ago} ({datetime.fromtimestamp(six_months_ago, tz=timezone.utc)})")
+        
+        candles: List[Candle] = []
+        seen = set()        # для исключения дубликатов
+
+        # Загружаем свечи батчами по 1000 штук, двигаясь в прошлое
+        while True:
+            # Получаем батч свечей с retry
+            try:
+                candles_raw = self._fetch_ohlcv_batch(pool_id, tf_endpoint, aggregate, before_ts, headers)
+            except HTTPError as e:
+                # Если 404 - пул не найден или нет данных для этого таймфрейма
+                if e.response is not None and e.response.status_code == 404:
+                    print(f"[ERROR] Pool {pool_id} returned 404. Possible reasons:")
+                    print(f"   1. Pool was removed or deactivated")
+                    print(f"   2. Pool has no trading history")
+                    print(f"   3. Requested timeframe ({self.timeframe}) is not available")
+                    print(f"   4. Timestamp {before_ts} is too far in the past/future")
+                raise
+            
+            if not candles_raw:
+                break  # данных больше нет
+
+            batch = self._parse_ohlcv_rows(candles_raw, seen, report)
+            candles.extend(batch)
+
+            # Если получили непустой ответ, но все свечи уже были в seen (дубликаты),
+            # значит мы достигли конца данных - прерываем цикл
+            if candles_raw and not batch:
+                print(f"[WARNING] All candles in batch were duplicates, stopping fetch")
+                break
+
+            # Прерываем, если достигли нужной начальной даты
+            oldest = min(c.timestamp for c in batch)
+            if start_time and oldest <= start_time:
+                break
+
+            # Продвигаемся дальше в прошлое
+            before_ts = int(oldest.timestamp())
+
+        return candles
+
+    def _parse_ohlcv_rows(
+        self,
+        candles_raw: List,
+        seen: set,
+        report: Optional[CandleValidationReport] = None,
+    ) -> List[Candle]:
+        """
+        Преобразует строки ohlcv_list в объекты Candle, исключая дубли (seen обновляется).
+        Формат GeckoTerminal API: [timestamp, open, high, low, close, volume]
+        Валидация векторная (candle_validation); счетчики отброшенных строк добавляются в report.
+        """
+        fresh = [row for row in candles_raw if row[0] not in seen]
+        seen.update(row[0] for row in candles_raw)
+        series, batch_report = validate_ohlcv_rows(
+            fresh,
+            contract=report.contract if report is not None else "",
+            strict_validation=self.strict_validation,
+        )
+        if report is not None:
+            report.merge(batch_report)
+        return series.to_candles()
+
+    def _emit_validation_report(self, report: CandleValidationReport) -> None:
+        """Сохраняет отчет валидации контракта и печатает его, если были отброшены свечи."""
+        self.validation_reports[report.contract] = report
+        report.emit()
+
+    @staticmethod
+    def _merge_candles(cached: List[Candle], fetched: List[Candle]) -> List[Candle]:
+        """Объединяет кеш и новые свечи: дедупликация по timestamp (приоритет у fetched), сортировка."""
+        by_ts = {c.timestamp: c for c in cached}
+        by_ts.update((c.timestamp, c) for c in fetched)
+        return [by_ts[ts] for ts in sorted(by_ts)]
     
     def get_rate_limit_summary(self) -> dict:
         """
@@ -0,0 +1,277 @@
+"""
+Персистентный content-addressed кеш результатов стратегий (StrategyOutput).
+
+Ключ результата - хеш от:
+- сигнала (id, контракт, timestamp, extra - например total_supply для mcap features);
+- полей конфига стратегии (без имени: переименование стратегии не инвалидирует кеш);
+- отпечатка свечей окна сигнала (после нормализации/сортировки в BacktestRunner);
+- версии кода стратегий (хеш исходников backtester/domain + опциональная строка из конфига).
+
+Любое изменение входа дает новый ключ, поэтому инвалидация не нужна: старые записи
+просто перестают использоваться и удаляются prune (см. backtester/tools/result_cache.py).
+
+Хранилище - один SQLite-файл {cache_dir}/results.sqlite (WAL), безопасно для потоков
+и для нескольких процессов (process-пул BacktestRunner).
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..domain.candle_series import CandleSeries
+from ..domain.models import Candle, Signal, StrategyOutput
+
+
+DB_FILENAME = "results.sqlite"
+_SQL_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    code_version TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+)
+"""
+
+
+@lru_cache(maxsize=None)
+def source_code_version() -> str:
+    """Хеш исходников backtester/domain (логика стратегий): меняется при любой правке кода стратегий."""
+    domain_dir = Path(__file__).resolve().parent.parent / "domain"
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted(domain_dir.glob("*.py")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def strategy_fingerprint(strategy: Any) -> str:
+    """
+    Отпечаток стратегии: класс + поля конфига (кроме name).
+
+    :param strategy: Стратегия с dataclass-конфигом в .config
+    """
+    config = strategy.config
+    if dataclasses.is_dataclass(config):
+        fields = dataclasses.asdict(config)
+    else:
+        fields = dict(vars(config))
+    fields.pop("name", None)
+    payload = json.dumps(
+        {"class": f"{type(strategy).__module__}.{type(strategy).__qualname__}", "config": fields},
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def candles_fingerprint(candles: Sequence[Candle]) -> str:
+    """
+    Отпечаток окна свечей: timestamp + OHLCV всех свечей.
+    Для CandleSeries считается по массивам (те же байты, что и для эквивалентного List[Candle]).
+    """
+    if isinstance(candles, CandleSeries):
+        rows = np.column_stack((candles.ts.astype(np.float64), candles.open, candles.high,
+                                candles.low, candles.close, candles.volume))
+        return hashlib.blake2b(np.ascontiguousarray(rows, dtype=np.float64).tobytes(), digest_size=16).hexdigest()
+    values = array("d")
+    for c in candles:
+        values.extend((c.timestamp.timestamp(), c.open, c.high, c.low, c.close, c.volume))
+    return hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """
+    Кеш StrategyOutput по content-addressed ключам.
+
+    Ошибочные результаты (reason="error") не кешируются - они могут быть временными.
+    """
+
+    def __init__(self, cache_dir: str | Path, code_version: Optional[str] = None):
+        """
+        :param cache_dir: Директория кеша (создается при необходимости)
+        :param code_version: Дополнительная метка версии (например, из result_cache.code_version);
+                             объединяется с хешем исходников стратегий
+        """
+        self.cache_dir = Path(cache_dir)
+        self.code_version = source_code_version() + (f"-{code_version}" if code_version else "")
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @property
+    def db_path(self) -> Path:
+        return self.cache_dir / DB_FILENAME
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def make_key(self, signal: Signal, strategy_fp: str, candles_fp: str) -> str:
+        """
+        Ключ результата.
+
+        :param signal: Сигнал
+        :param strategy_fp: strategy_fingerprint(strategy)
+        :param candles_fp: candles_fingerprint(окно свечей сигнала)
+        """
+        parts = (
+            str(signal.id),
+            str(signal.contract_address),
+            signal.timestamp.isoformat(),
+            json.dumps(signal.extra or {}, sort_keys=True, default=repr),
+            strategy_fp,
+            candles_fp,
+            self.code_version,
+        )
+        return hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=20).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, StrategyOutput]:
+        """
+        Возвращает найденные результаты и обновляет их last_used_at.
+
+        :return: {key: StrategyOutput} только для найденных ключей
+        """
+        if not keys:
+            return {}
+        unique = list(dict.fromkeys(keys))
+        found: Dict[str, StrategyOutput] = {}
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            # Чанки: ограничение SQLite на число параметров запроса
+            for i in range(0, len(unique), _SQL_CHUNK):
+                chunk = unique[i:i + _SQL_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, payload FROM results WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, payload in rows:
+                    found[key] = pickle.loads(payload)
+                if rows:
+                    conn.execute(
+                        f"UPDATE results SET last_used_at = ? WHERE key IN ({','.join('?' * len(rows))})",
+                        [now, *(key for key, _ in rows)],
+                    )
+            conn.commit()
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, items: Sequence[Tuple[str, StrategyOutput]]) -> None:
+        """Сохраняет результаты (кроме reason="error") одной транзакцией."""
+        now = time.time()
+        rows = [
+            (key, self.code_version, pickle.dumps(out, protocol=pickle.HIGHEST_PROTOCOL), now, now)
+            for key, out in items
+            if out.reason != "error"
+        ]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)", rows)
+            conn.commit()
+            self.writes += len(rows)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Статистика обращений текущего процесса."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+    def record_stats(self, hits: int = 0, misses: int = 0, writes: int = 0) -> None:
+        """Добавляет статистику, собранную в другом процессе (воркеры process-пула)."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.writes += writes
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.writes = 0
+
+    def describe(self) -> Dict[str, Any]:
+        """Состояние хранилища: число записей, размер, записи текущей версии кода."""
+        with self._lock:
+            conn = self._connection()
+            entries, payload_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM results"
+            ).fetchone()
+            current = conn.execute(
+                "SELECT COUNT(*) FROM results WHERE code_version = ?", (self.code_version,)
+            ).fetchone()[0]
+        return {
+            "entries": int(entries),
+            "entries_current_version": int(current),
+            "payload_bytes": int(payload_bytes),
+            "file_bytes": self.db_path.stat().st_size if self.db_path.exists() else 0,
+        }
+
+    def prune(
+        self,
+        older_than_days: Optional[float] = None,
+        stale_versions: bool = False,
+        max_bytes: Optional[int] = None,
+    ) -> int:
+        """
+        Удаляет записи и сжимает файл.
+
+        :param older_than_days: Удалить записи, не использовавшиеся дольше N дней
+        :param stale_versions: Удалить записи других версий кода
+        :param max_bytes: Оставить не больше N байт payload (вытесняются давно не использовавшиеся)
+        :return: Количество удаленных записей
+        """
+        removed = 0
+        with self._lock:
+            conn = self._connection()
+            if stale_versions:
+                removed += conn.execute(
+                    "DELETE FROM results WHERE code_version != ?", (self.code_version,)
+                ).rowcount
+            if older_than_days is not None:
+                cutoff = time.time() - older_than_days * 86400.0
+                removed += conn.execute("DELETE FROM results WHERE last_used_at < ?", (cutoff,)).rowcount
+            if max_bytes is not None:
+                total = conn.execute("SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM results").fetchone()[0]
+                if total > max_bytes:
+                    doomed: List[str] = []
+                    for key, size in conn.execute(
+                        "SELECT key, LENGTH(payload) FROM results ORDER BY last_used_at ASC"
+                    ):
+                        if total <= max_bytes:
+                            break
+                        doomed.append(key)
+                        total -= size
+                    conn.executemany("DELETE FROM results WHERE key = ?", [(k,) for k in doomed])
+                    removed += len(doomed)
+            conn.commit()
+            conn.execute("VACUUM")
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
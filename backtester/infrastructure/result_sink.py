@@ -0,0 +1,229 @@
+"""
+Приемники (sink) результатов бэктеста для потокового режима.
+
+BacktestRunner.iter_results() отдает строки результатов по мере обработки сигналов,
+sink решает, где их держать:
+- ListResultSink - в памяти (эквивалент self.results);
+- SpillResultSink - сбрасывает строки на диск колоночными батчами по стратегиям,
+  в памяти остается только текущий батч каждой стратегии.
+
+Строка результата - dict формата BacktestRunner:
+{"signal_id", "contract_address", "strategy", "timestamp", "result": StrategyOutput, ...}
+"""
+from __future__ import annotations
+
+import pickle
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from ..domain.models import StrategyOutput
+
+
+# Поля StrategyOutput, которые хранятся отдельными колонками
+_OUTPUT_FIELDS = (
+    "entry_time",
+    "entry_price",
+    "exit_time",
+    "exit_price",
+    "pnl",
+    "reason",
+    "canonical_reason",
+    "meta",
+)
+# Обязательные ключи строки результата (остальные ключи уходят в колонку extra)
+_ROW_FIELDS = ("signal_id", "contract_address", "timestamp")
+
+
+class ResultSink:
+    """Базовый sink: принимает строки результатов, отдает их по стратегиям."""
+
+    def write(self, row: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Дописывает буферы (для дисковых sink)."""
+
+    def strategy_names(self) -> List[str]:
+        raise NotImplementedError
+
+    def iter_strategy(self, strategy_name: str) -> Iterator[Dict[str, Any]]:
+        """Строки одной стратегии в порядке записи (порядок сигналов)."""
+        raise NotImplementedError
+
+    def count(self, strategy_name: str) -> int:
+        raise NotImplementedError
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Все строки: стратегия за стратегией (в порядке имен)."""
+        for name in self.strategy_names():
+            yield from self.iter_strategy(name)
+
+    def results_by_strategy(self) -> "SinkResultsView":
+        """Ленивое отображение {strategy: List[row]} - строки стратегии читаются при обращении."""
+        return SinkResultsView(self)
+
+
+class SinkResultsView(Mapping):
+    """
+    Read-only Mapping {strategy_name: List[row]} поверх sink.
+    Список строк материализуется только для запрошенной стратегии.
+    """
+
+    def __init__(self, sink: ResultSink):
+        self._sink = sink
+
+    def __getitem__(self, strategy_name: str) -> List[Dict[str, Any]]:
+        if strategy_name not in self._sink.strategy_names():
+            raise KeyError(strategy_name)
+        return list(self._sink.iter_strategy(strategy_name))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sink.strategy_names())
+
+    def __len__(self) -> int:
+        return len(self._sink.strategy_names())
+
+    def __contains__(self, strategy_name: object) -> bool:
+        return strategy_name in self._sink.strategy_names()
+
+
+class ListResultSink(ResultSink):
+    """Sink в памяти (поведение по умолчанию, как self.results)."""
+
+    def __init__(self) -> None:
+        self._rows: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self._rows.setdefault(row["strategy"], []).append(row)
+
+    def strategy_names(self) -> List[str]:
+        return sorted(self._rows)
+
+    def iter_strategy(self, strategy_name: str) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._rows.get(strategy_name, [])))
+
+    def count(self, strategy_name: str) -> int:
+        return len(self._rows.get(strategy_name, []))
+
+
+def _encode_batch(rows: List[Dict[str, Any]]) -> Dict[str, list]:
+    """Строки -> колоночный батч (колонка = список значений)."""
+    columns: Dict[str, list] = {name: [] for name in _ROW_FIELDS + _OUTPUT_FIELDS + ("extra",)}
+    for row in rows:
+        for name in _ROW_FIELDS:
+            columns[name].append(row.get(name))
+        out: StrategyOutput = row["result"]
+        for name in _OUTPUT_FIELDS:
+            columns[name].append(getattr(out, name))
+        extra = {k: v for k, v in row.items() if k not in _ROW_FIELDS and k not in ("strategy", "result")}
+        columns["extra"].append(extra or None)
+    return columns
+
+
+def _decode_batch(strategy_name: str, columns: Dict[str, list]) -> Iterator[Dict[str, Any]]:
+    """Колоночный батч -> строки результатов."""
+    for i in range(len(columns["signal_id"])):
+        row: Dict[str, Any] = {
+            "signal_id": columns["signal_id"][i],
+            "contract_address": columns["contract_address"][i],
+            "strategy": strategy_name,
+            "timestamp": columns["timestamp"][i],
+            "result": StrategyOutput(**{name: columns[name][i] for name in _OUTPUT_FIELDS}),
+        }
+        extra = columns["extra"][i]
+        if extra:
+            row.update(extra)
+        yield row
+
+
+class SpillResultSink(ResultSink):
+    """
+    Дисковый sink: строки каждой стратегии копятся в буфере и при заполнении
+    сбрасываются в {spill_dir}/{strategy}.spill колоночным батчем (pickle-кадры подряд).
+
+    Пиковая память - batch_size строк на стратегию, независимо от числа сигналов.
+    Файлы временные: пересоздаются при создании sink, удаляются через cleanup().
+    """
+
+    def __init__(self, spill_dir: str | Path, batch_size: int = 1000):
+        """
+        :param spill_dir: Директория для spill-файлов (очищается при создании)
+        :param batch_size: Размер батча на стратегию (строк)
+        """
+        self.spill_dir = Path(spill_dir)
+        self.batch_size = max(1, int(batch_size))
+        if self.spill_dir.exists():
+            shutil.rmtree(self.spill_dir)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self._counts: Dict[str, int] = {}
+        self._paths: Dict[str, Path] = {}
+
+    def _path_for(self, strategy_name: str) -> Path:
+        path = self._paths.get(strategy_name)
+        if path is None:
+            # Имя файла: безопасная часть имени + порядковый номер (имена стратегий могут совпадать после очистки)
+            safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", strategy_name)[:80]
+            path = self.spill_dir / f"{len(self._paths):05d}_{safe}.spill"
+            self._paths[strategy_name] = path
+        return path
+
+    def _spill(self, strategy_name: str) -> None:
+        rows = self._buffers.get(strategy_name)
+        if not rows:
+            return
+        with open(self._path_for(strategy_name), "ab") as f:
+            pickle.dump(_encode_batch(rows), f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._buffers[strategy_name] = []
+
+    def write(self, row: Dict[str, Any]) -> None:
+        name = row["strategy"]
+        with self._lock:
+            buffer = self._buffers.setdefault(name, [])
+            buffer.append(row)
+            self._counts[name] = self._counts.get(name, 0) + 1
+            self._path_for(name)
+            if len(buffer) >= self.batch_size:
+                self._spill(name)
+
+    def flush(self) -> None:
+        with self._lock:
+            for name in list(self._buffers):
+                self._spill(name)
+
+    def strategy_names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._counts)
+
+    def count(self, strategy_name: str) -> int:
+        with self._lock:
+            return self._counts.get(strategy_name, 0)
+
+    def iter_strategy(self, strategy_name: str) -> Iterator[Dict[str, Any]]:
+        """Читает spill-файл стратегии батч за батчем (+ еще не сброшенный буфер)."""
+        with self._lock:
+            path: Optional[Path] = self._paths.get(strategy_name)
+            pending = list(self._buffers.get(strategy_name, []))
+        if path is not None and path.exists():
+            with open(path, "rb") as f:
+                while True:
+                    try:
+                        columns = pickle.load(f)
+                    except EOFError:
+                        break
+                    yield from _decode_batch(strategy_name, columns)
+        yield from pending
+
+    def cleanup(self) -> None:
+        """Удаляет spill-файлы."""
+        with self._lock:
+            self._buffers.clear()
+            self._counts.clear()
+            self._paths.clear()
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
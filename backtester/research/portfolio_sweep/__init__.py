@@ -0,0 +1,14 @@
+# backtester/research/portfolio_sweep/__init__.py
+# Portfolio sweep research module - grid of PortfolioConfig variants over fixed strategy outputs
+
+from .sweep_spec import PortfolioSweepSpec, PortfolioVariant, load_portfolio_sweep_spec
+from .sweep_engine import PortfolioSweepEngine, SUMMARY_STATS, load_strategy_results
+
+__all__ = [
+    "PortfolioSweepSpec",
+    "PortfolioVariant",
+    "load_portfolio_sweep_spec",
+    "PortfolioSweepEngine",
+    "SUMMARY_STATS",
+    "load_strategy_results",
+]
@@ -0,0 +1,163 @@
+# backtester/research/portfolio_sweep/sweep_engine.py
+# Portfolio sweep engine: PortfolioEngine.simulate для каждой пары (стратегия, вариант портфеля)
+# по уже посчитанным результатам стратегий
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from backtester.application.runner import build_portfolio_config
+from backtester.domain.models import StrategyOutput
+from backtester.domain.portfolio import PortfolioConfig, PortfolioEngine, PortfolioResult
+
+from .sweep_spec import PortfolioVariant
+
+
+# Метрики PortfolioStats в итоговой таблице
+SUMMARY_STATS = (
+    "final_balance_sol",
+    "total_return_pct",
+    "max_drawdown_pct",
+    "trades_executed",
+    "trades_skipped_by_risk",
+    "trades_skipped_by_reset",
+    "portfolio_reset_count",
+    "portfolio_reset_profit_count",
+    "portfolio_reset_capacity_count",
+    "portfolio_capacity_prune_count",
+)
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def load_strategy_results(path: str | Path) -> List[Dict[str, Any]]:
+    """
+    Загружает результаты стратегий из results.json (формат main.py --json-output).
+
+    :param path: Путь к results.json
+    :return: Строки результатов в формате BacktestRunner (result - StrategyOutput)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    rows: List[Dict[str, Any]] = []
+    for item in raw:
+        r = item["result"]
+        row = dict(item)
+        row["timestamp"] = _parse_time(item.get("timestamp"))
+        row["result"] = StrategyOutput(
+            entry_time=_parse_time(r.get("entry_time")),
+            entry_price=r.get("entry_price"),
+            exit_time=_parse_time(r.get("exit_time")),
+            exit_price=r.get("exit_price"),
+            pnl=float(r.get("pnl") or 0.0),
+            reason=r.get("reason"),
+            meta=r.get("meta") or {},
+        )
+        rows.append(row)
+    return rows
+
+
+def summarize_portfolio_result(result: PortfolioResult) -> Dict[str, Any]:
+    """Метрики SUMMARY_STATS из PortfolioResult."""
+    return {name: getattr(result.stats, name) for name in SUMMARY_STATS}
+
+
+# --- Process-pool воркеры (module-level, чтобы передаваться в ProcessPoolExecutor) ---
+
+_WORKER_RESULTS: Dict[str, List[Dict[str, Any]]] = {}
+_WORKER_CONFIGS: Dict[str, PortfolioConfig] = {}
+
+
+def _init_sweep_worker(by_strategy: Dict[str, List[Dict[str, Any]]], configs: Dict[str, PortfolioConfig]) -> None:
+    """Результаты стратегий и конфиги вариантов передаются в воркер один раз."""
+    global _WORKER_RESULTS, _WORKER_CONFIGS
+    _WORKER_RESULTS = by_strategy
+    _WORKER_CONFIGS = configs
+
+
+def _simulate_pair(pair: Tuple[str, str]) -> Dict[str, Any]:
+    """Симуляция одной пары (стратегия, вариант); диагностический вывод simulate подавляется."""
+    strategy_name, variant_name = pair
+    engine = PortfolioEngine(_WORKER_CONFIGS[variant_name])
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = engine.simulate(_WORKER_RESULTS[strategy_name], strategy_name=strategy_name)
+    return summarize_portfolio_result(result)
+
+
+class PortfolioSweepEngine:
+    """
+    Прогоняет сетку вариантов PortfolioConfig по фиксированным результатам стратегий.
+
+    Стратегии не пересчитываются: результаты один раз разбиваются по стратегиям,
+    затем каждая пара (стратегия, вариант) - отдельный PortfolioEngine.simulate.
+    При max_workers > 1 пары считаются в ProcessPoolExecutor (результаты и конфиги
+    передаются в воркер один раз, порядок строк таблицы детерминирован).
+    """
+
+    def __init__(self, global_config: Dict[str, Any], variants: Sequence[PortfolioVariant], max_workers: int = 1):
+        """
+        :param global_config: Базовый конфиг бэктеста (секции portfolio и backtest)
+        :param variants: Варианты портфеля (переопределения секции portfolio)
+        :param max_workers: Число процессов (1 = последовательно)
+        """
+        self.variants = list(variants)
+        self.max_workers = max(1, int(max_workers))
+        self.configs: Dict[str, PortfolioConfig] = {
+            v.name: build_portfolio_config(v.apply(global_config)) for v in self.variants
+        }
+
+    def run(self, results: Iterable[Dict[str, Any]], strategies: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Считает таблицу метрик по всем парам (стратегия, вариант).
+
+        :param results: Строки результатов стратегий (формат BacktestRunner)
+        :param strategies: Ограничить набор стратегий (по умолчанию - все)
+        :return: DataFrame: strategy, variant, параметры варианта, SUMMARY_STATS
+        """
+        by_strategy: Dict[str, List[Dict[str, Any]]] = {}
+        for row in results:
+            by_strategy.setdefault(row["strategy"], []).append(row)
+        names = sorted(by_strategy) if strategies is None else [n for n in strategies if n in by_strategy]
+        by_strategy = {name: by_strategy[name] for name in names}
+        pairs = [(name, v.name) for name in names for v in self.variants]
+
+        print(
+            f"[portfolio_sweep] {len(names)} strategies x {len(self.variants)} variants = {len(pairs)} simulations "
+            f"(max_workers={self.max_workers})"
+        )
+        if self.max_workers > 1 and len(pairs) > 1:
+            chunksize = max(1, len(pairs) // (self.max_workers * 8))
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_sweep_worker,
+                initargs=(by_strategy, self.configs),
+            ) as executor:
+                stats = list(executor.map(_simulate_pair, pairs, chunksize=chunksize))
+        else:
+            _init_sweep_worker(by_strategy, self.configs)
+            try:
+                stats = [_simulate_pair(pair) for pair in pairs]
+            finally:
+                _init_sweep_worker({}, {})
+
+        overrides = {v.name: v.overrides for v in self.variants}
+        param_keys = list(dict.fromkeys(key for v in self.variants for key in v.overrides))
+        rows = []
+        for (strategy_name, variant_name), pair_stats in zip(pairs, stats):
+            row: Dict[str, Any] = {"strategy": strategy_name, "variant": variant_name}
+            row.update({key: overrides[variant_name].get(key) for key in param_keys})
+            row.update(pair_stats)
+            rows.append(row)
+        return pd.DataFrame(rows, columns=["strategy", "variant", *param_keys, *SUMMARY_STATS])
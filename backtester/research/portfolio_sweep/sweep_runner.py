@@ -0,0 +1,103 @@
+# backtester/research/portfolio_sweep/sweep_runner.py
+# Portfolio sweep runner - CLI script for PortfolioConfig grid over saved strategy results
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path if running as script (before other imports)
+if not __package__:
+    project_root = Path(__file__).resolve().parent.parent.parent.parent
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+import argparse
+import time
+
+import yaml
+
+from backtester.research.portfolio_sweep.sweep_engine import PortfolioSweepEngine, load_strategy_results
+from backtester.research.portfolio_sweep.sweep_spec import load_portfolio_sweep_spec
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Portfolio Sweep - simulate a grid of portfolio configs over saved strategy results",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m backtester.research.portfolio_sweep.sweep_runner \\
+      --spec config/portfolio_sweep_example.yaml \\
+      --results output/results.json \\
+      --backtest-config config/backtest_example.yaml \\
+      --max-workers 8
+        """
+    )
+    parser.add_argument("--spec", type=str, required=True, help="Path to portfolio sweep spec YAML")
+    parser.add_argument(
+        "--results",
+        type=str,
+        required=True,
+        help="Path to saved strategy results (main.py --json-output, default output/results.json)",
+    )
+    parser.add_argument(
+        "--backtest-config",
+        type=str,
+        default="config/backtest_example.yaml",
+        help="Base backtest config: portfolio/backtest sections the grid is applied to (default: config/backtest_example.yaml)",
+    )
+    parser.add_argument(
+        "--strategy",
+        action="append",
+        default=None,
+        help="Simulate only this strategy (can be repeated). Default: all strategies in --results",
+    )
+    parser.add_argument("--max-workers", type=int, default=1, help="Worker processes (default: 1 = sequential)")
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="output/portfolio_sweep/",
+        help="Output directory for results (default: output/portfolio_sweep/)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main CLI entry point."""
+    args = parse_args()
+
+    results_path = Path(args.results)
+    if not results_path.exists():
+        print(f"[ERROR] Results file not found: {results_path}", file=sys.stderr)
+        sys.exit(1)
+
+    with open(args.backtest_config, "r", encoding="utf-8") as f:
+        global_config = yaml.safe_load(f) or {}
+
+    variants = load_portfolio_sweep_spec(args.spec).expand()
+    print(f"[portfolio_sweep] Spec {args.spec}: {len(variants)} portfolio variants")
+
+    results = load_strategy_results(results_path)
+    print(f"[portfolio_sweep] Loaded {len(results)} strategy results from {results_path}")
+
+    engine = PortfolioSweepEngine(global_config, variants, max_workers=args.max_workers)
+    started = time.perf_counter()
+    summary_df = engine.run(results, strategies=args.strategy)
+    print(f"[portfolio_sweep] Simulated {len(summary_df)} (strategy, variant) pairs in {time.perf_counter() - started:.1f}s")
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = output_dir / "portfolio_sweep_summary.csv"
+    summary_df.to_csv(summary_path, index=False)
+    print(f"[portfolio_sweep] Saved summary to {summary_path}")
+
+    print()
+    print("[portfolio_sweep] Top pairs by total return:")
+    top = summary_df.sort_values("total_return_pct", ascending=False, kind="stable").head(10)
+    print(top.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# backtester/research/portfolio_sweep/sweep_spec.py
+# Portfolio sweep spec: сетка параметров PortfolioConfig и ее развертка в варианты секции portfolio
+
+from __future__ import annotations
+
+import copy
+import itertools
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+from backtester.research.runner_sweep.sweep_spec import expand_grid_values
+
+
+# Защита от случайной развертки в огромную сетку
+DEFAULT_MAX_VARIANTS = 10_000
+
+
+def _set_dotted(target: Dict[str, Any], dotted_key: str, value: Any) -> None:
+    """Устанавливает значение по ключу вида "capacity_reset.prune_fraction" (создает вложенные dict)."""
+    parts = dotted_key.split(".")
+    node = target
+    for part in parts[:-1]:
+        child = node.get(part)
+        if not isinstance(child, dict):
+            child = {}
+            node[part] = child
+        node = child
+    node[parts[-1]] = value
+
+
+@dataclass
+class PortfolioVariant:
+    """
+    Один вариант портфельного конфига: переопределения секции portfolio.
+
+    Attributes:
+        name: Имя варианта (pf_0000, ...)
+        overrides: {ключ секции portfolio (через точку для вложенных): значение}
+    """
+    name: str
+    overrides: Dict[str, Any]
+
+    def apply(self, global_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Возвращает копию глобального конфига с переопределениями в секции portfolio.
+
+        :param global_config: Конфиг бэктеста (секции portfolio, backtest, ...)
+        """
+        config = copy.deepcopy(global_config)
+        portfolio = config.get("portfolio") or {}
+        config["portfolio"] = portfolio
+        for key, value in self.overrides.items():
+            _set_dotted(portfolio, key, value)
+        return config
+
+
+@dataclass
+class PortfolioSweepSpec:
+    """
+    Спецификация sweep по параметрам портфеля.
+
+    Attributes:
+        name_prefix: Префикс имен вариантов
+        base: Переопределения portfolio, общие для всех вариантов
+        grid: {ключ portfolio: список значений}; варианты - декартово произведение
+        max_variants: Максимальное число вариантов после развертки
+    """
+    name_prefix: str = "pf"
+    base: Dict[str, Any] = field(default_factory=dict)
+    grid: Dict[str, List[Any]] = field(default_factory=dict)
+    max_variants: int = DEFAULT_MAX_VARIANTS
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PortfolioSweepSpec":
+        """
+        Создает спецификацию из словаря (YAML).
+
+        Формат:
+            name_prefix: pf
+            base:
+              allocation_mode: fixed
+            grid:
+              profit_reset_multiple: [1.3, 1.5, 2.0]
+              percent_per_trade: {start: 0.01, stop: 0.03, step: 0.01}
+              max_open_positions: [50, 100]
+              capacity_reset.prune_fraction: [0.3, 0.5]
+        """
+        grid_data = data.get("grid", {}) or {}
+        if not isinstance(grid_data, dict):
+            raise ValueError("grid must be a mapping of portfolio keys to values")
+        spec = cls(
+            name_prefix=str(data.get("name_prefix", "pf")),
+            base=dict(data.get("base", {}) or {}),
+            grid={str(key): expand_grid_values(value, str(key)) for key, value in grid_data.items()},
+            max_variants=int(data.get("max_variants", DEFAULT_MAX_VARIANTS)),
+        )
+        empty = [key for key, values in spec.grid.items() if not values]
+        if empty:
+            raise ValueError(f"grid values must not be empty: {empty}")
+        return spec
+
+    def expand(self) -> List[PortfolioVariant]:
+        """
+        Разворачивает сетку в список вариантов (детерминированный порядок).
+
+        :raises ValueError: Если число вариантов превышает max_variants
+        """
+        keys = list(self.grid)
+        total = 1
+        for key in keys:
+            total *= len(self.grid[key])
+        if total > self.max_variants:
+            raise ValueError(f"Portfolio sweep expands to {total} variants, exceeds max_variants={self.max_variants}")
+
+        variants: List[PortfolioVariant] = []
+        for i, values in enumerate(itertools.product(*(self.grid[key] for key in keys))):
+            overrides = dict(self.base)
+            overrides.update(zip(keys, values))
+            variants.append(PortfolioVariant(name=f"{self.name_prefix}_{i:04d}", overrides=overrides))
+        return variants
+
+
+def load_portfolio_sweep_spec(path: str | Path) -> PortfolioSweepSpec:
+    """Загружает спецификацию portfolio sweep из YAML."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return PortfolioSweepSpec.from_dict(data)
@@ -0,0 +1,14 @@
+# backtester/research/runner_sweep/__init__.py
+# Runner sweep research module - parameter sweep of Runner ladders over signals
+
+from .sweep_spec import RunnerSweepSpec, load_sweep_spec, configs_to_strategy_entries
+from .sweep_engine import RunnerSweepEngine, RunnerSweepResult, SignalHitTable
+
+__all__ = [
+    "RunnerSweepSpec",
+    "load_sweep_spec",
+    "configs_to_strategy_entries",
+    "RunnerSweepEngine",
+    "RunnerSweepResult",
+    "SignalHitTable",
+]
@@ -0,0 +1,411 @@
+# backtester/research/runner_sweep/sweep_engine.py
+# Sweep engine: оценка тысяч Runner-конфигов по предрасчитанным таблицам первых достижений
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtester.domain.models import Signal
+from backtester.domain.runner_config import RunnerConfig, create_runner_config_from_dict
+from backtester.domain.runner_ladder import RunnerLadderEngine
+from backtester.infrastructure.candle_store import CandleArrays, load_candle_arrays
+from backtester.infrastructure.price_loader import PriceLoader
+
+from .sweep_spec import configs_to_strategy_entries
+
+
+# Коды причин выхода в колонке reason (канонические значения RunnerStrategy)
+REASON_CODES = ("ladder_tp", "time_stop")
+_REASON_LADDER_TP = 0
+_REASON_TIME_STOP = 1
+
+# Колонки таблицы результатов (одна строка = сигнал x конфиг)
+RESULT_COLUMNS: Dict[str, Any] = {
+    "signal_idx": np.int32,
+    "config_idx": np.int32,
+    "entry_ts": np.int64,
+    "exit_ts": np.int64,
+    "entry_price": np.float64,
+    "exit_price": np.float64,
+    "pnl": np.float64,
+    "realized_multiple": np.float64,
+    "levels_hit": np.int16,
+    "time_stop_triggered": np.bool_,
+    "reason": np.int8,
+}
+
+
+@dataclass(frozen=True)
+class _CompiledConfig:
+    """RunnerConfig, приведенный к примитивам для быстрого цикла оценки."""
+    levels: Tuple[Tuple[float, float], ...]  # ((xn, fraction), ...) в порядке симуляции
+    max_hold: Any
+    exit_on_first_tp: bool
+    allow_partial_fills: bool
+
+    @classmethod
+    def from_config(cls, config: RunnerConfig) -> "_CompiledConfig":
+        levels, fractions = RunnerLadderEngine.ladder_levels(config)
+        return cls(
+            levels=tuple(zip(levels, fractions)),
+            max_hold=RunnerLadderEngine.max_hold_minutes(config),
+            exit_on_first_tp=bool(getattr(config, "exit_on_first_tp", False)),
+            allow_partial_fills=bool(getattr(config, "allow_partial_fills", True)),
+        )
+
+
+@dataclass
+class SignalHitTable:
+    """
+    Предрасчитанная таблица первых достижений для одного сигнала.
+
+    Все индексы - позиции в отсортированном ряду свечей начиная с входа (ts[0] = entry).
+    Таблица считается один раз на сигнал для объединения xn и time stop всех конфигов.
+    """
+    signal_idx: int
+    entry_ts: int
+    entry_price: float
+    ts: np.ndarray  # epoch seconds, int64
+    close: np.ndarray
+    first_hit: Dict[float, int]  # xn -> индекс первой свечи с high >= entry * xn (n = не достигнут)
+    hold_cap: Dict[Any, int]  # time stop -> первая свеча, где удержание > time stop
+    stop_idx: Dict[Any, int]  # time stop -> первая свеча с timestamp >= entry + time stop
+    stop_reached: Dict[Any, bool]  # time stop -> дошли ли данные до момента time stop
+
+    @property
+    def n(self) -> int:
+        return int(len(self.ts))
+
+
+@dataclass
+class RunnerSweepResult:
+    """
+    Результат sweep: одна колоночная таблица (сигнал x конфиг) + справочники конфигов и сигналов.
+    """
+    configs: List[RunnerConfig]
+    signal_ids: List[str]
+    contracts: List[str]
+    columns: Dict[str, np.ndarray]
+    skipped_signals: int = 0
+
+    def __len__(self) -> int:
+        return int(len(self.columns["config_idx"]))
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Таблица результатов с именами стратегий, id сигналов и datetime-колонками."""
+        df = pd.DataFrame({name: self.columns[name] for name in RESULT_COLUMNS})
+        df.insert(0, "strategy", pd.Categorical.from_codes(df["config_idx"], categories=[c.name for c in self.configs]))
+        df.insert(1, "signal_id", np.asarray(self.signal_ids, dtype=object)[df["signal_idx"].to_numpy()])
+        df.insert(2, "contract_address", np.asarray(self.contracts, dtype=object)[df["signal_idx"].to_numpy()])
+        df["entry_time"] = pd.to_datetime(df["entry_ts"], unit="s", utc=True)
+        df["exit_time"] = pd.to_datetime(df["exit_ts"], unit="s", utc=True)
+        df["reason"] = pd.Categorical.from_codes(df["reason"], categories=list(REASON_CODES))
+        return df
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Агрегаты по конфигам (векторно, без группировки DataFrame).
+
+        :return: DataFrame по одной строке на конфиг, отсортирован по mean_pnl (desc)
+        """
+        k = len(self.configs)
+        config_idx = self.columns["config_idx"]
+        pnl = self.columns["pnl"]
+        trades = np.bincount(config_idx, minlength=k)
+        safe_trades = np.maximum(trades, 1)
+        sum_pnl = np.bincount(config_idx, weights=pnl, minlength=k)
+        wins = np.bincount(config_idx, weights=(pnl > 0).astype(np.float64), minlength=k)
+        tp = np.bincount(config_idx, weights=(self.columns["reason"] == _REASON_LADDER_TP).astype(np.float64), minlength=k)
+        time_stops = np.bincount(config_idx, weights=self.columns["time_stop_triggered"].astype(np.float64), minlength=k)
+        multiple = np.bincount(config_idx, weights=self.columns["realized_multiple"], minlength=k)
+
+        df = pd.DataFrame({
+            "strategy": [c.name for c in self.configs],
+            "take_profit_levels": [
+                " ".join(f"{level.xn:g}x{level.fraction:g}" for level in c.take_profit_levels)
+                for c in self.configs
+            ],
+            "time_stop_minutes": [c.time_stop_minutes for c in self.configs],
+            "exit_on_first_tp": [c.exit_on_first_tp for c in self.configs],
+            "trades": trades,
+            "sum_pnl": sum_pnl,
+            "mean_pnl": np.where(trades > 0, sum_pnl / safe_trades, np.nan),
+            "win_rate": np.where(trades > 0, wins / safe_trades, np.nan),
+            "ladder_tp_rate": np.where(trades > 0, tp / safe_trades, np.nan),
+            "time_stop_rate": np.where(trades > 0, time_stops / safe_trades, np.nan),
+            "mean_realized_multiple": np.where(trades > 0, multiple / safe_trades, np.nan),
+        })
+        return df.sort_values("mean_pnl", ascending=False, kind="stable").reset_index(drop=True)
+
+    def save(self, path: str | Path) -> Path:
+        """
+        Сохраняет таблицу в сжатый колоночный .npz (одна колонка = один массив).
+
+        :param path: Путь к файлу (.npz)
+        :return: Путь к сохраненному файлу
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            configs_json=np.array(json.dumps(configs_to_strategy_entries(self.configs))),
+            signal_ids=np.asarray(self.signal_ids, dtype=str),
+            contracts=np.asarray(self.contracts, dtype=str),
+            skipped_signals=np.array(self.skipped_signals),
+            **{name: self.columns[name] for name in RESULT_COLUMNS},
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "RunnerSweepResult":
+        """Загружает результат, сохраненный через save()."""
+        with np.load(path, allow_pickle=False) as data:
+            entries = json.loads(str(data["configs_json"]))
+            configs = [create_runner_config_from_dict(e["name"], e["params"]) for e in entries]
+            return cls(
+                configs=configs,
+                signal_ids=data["signal_ids"].tolist(),
+                contracts=data["contracts"].tolist(),
+                columns={name: data[name] for name in RESULT_COLUMNS},
+                skipped_signals=int(data["skipped_signals"]),
+            )
+
+
+class RunnerSweepEngine:
+    """
+    Оценивает набор RunnerConfig на наборе сигналов.
+
+    На каждый сигнал свечи загружаются один раз, и строится SignalHitTable:
+    первые достижения для объединения xn всех конфигов (один векторный searchsorted
+    по кумулятивному максимуму high) и индексы для всех различных time stop.
+    Дальше каждый конфиг - короткий цикл по своим уровням над целыми индексами.
+    Результаты совпадают с RunnerStrategy.on_signal на том же окне свечей.
+    """
+
+    def __init__(self, configs: Sequence[RunnerConfig]):
+        """
+        :param configs: Конфиги для оценки (порядок задает config_idx)
+        """
+        self.configs = list(configs)
+        self._compiled = [_CompiledConfig.from_config(c) for c in self.configs]
+        self._xn_levels = sorted({xn for c in self._compiled for xn, _ in c.levels})
+        self._max_holds = sorted({c.max_hold for c in self._compiled if c.max_hold})
+
+    @property
+    def horizon_minutes(self) -> int:
+        """Самый длинный time stop среди конфигов (сколько минут после сигнала нужно загрузить)."""
+        return int(max(self._max_holds)) if self._max_holds else 0
+
+    def build_table(self, signal_idx: int, signal: Signal, arrays: CandleArrays) -> Optional[SignalHitTable]:
+        """
+        Строит таблицу первых достижений для сигнала.
+
+        :param signal_idx: Индекс сигнала в результате
+        :param signal: Сигнал
+        :param arrays: Свечи контракта (отсортированы, без дублей), любой диапазон
+        :return: SignalHitTable или None, если после сигнала нет свечей / цена входа невалидна
+        """
+        window = arrays.slice_time(signal.timestamp, None)
+        if len(window) == 0:
+            return None
+        ts = np.asarray(window.ts, dtype=np.int64)
+        close = np.asarray(window.close, dtype=np.float64)
+        high = np.asarray(window.high, dtype=np.float64)
+
+        entry_ts = int(ts[0])
+        entry_price = float(close[0])
+        if not entry_price > 0:
+            return None
+
+        # Кумулятивный максимум high: первая свеча с high >= target - бинарный поиск (NaN не достигает цели)
+        high_cummax = np.fmax.accumulate(np.where(np.isnan(high), -np.inf, high))
+        targets = np.array([entry_price * xn for xn in self._xn_levels], dtype=np.float64)
+        hits = np.searchsorted(high_cummax, targets, side="left")
+        first_hit = dict(zip(self._xn_levels, hits.tolist()))
+
+        # Время удержания в минутах (как в RunnerLadderEngine): общее для всех time stop
+        hold_minutes = (ts - entry_ts) / 60.0
+        holds = np.asarray(self._max_holds, dtype=np.float64)
+        caps = np.searchsorted(hold_minutes, holds, side="right").tolist()
+        stops = np.searchsorted(hold_minutes, holds, side="left").tolist()
+        last_hold = float(hold_minutes[-1])
+
+        return SignalHitTable(
+            signal_idx=signal_idx,
+            entry_ts=entry_ts,
+            entry_price=entry_price,
+            ts=ts,
+            close=close,
+            first_hit=first_hit,
+            hold_cap=dict(zip(self._max_holds, caps)),
+            stop_idx=dict(zip(self._max_holds, stops)),
+            stop_reached={m: last_hold >= m for m in self._max_holds},
+        )
+
+    def evaluate_table(self, table: SignalHitTable) -> Dict[str, np.ndarray]:
+        """
+        Оценивает все конфиги на таблице сигнала.
+
+        Логика уровней, time stop и exit повторяет RunnerLadderEngine.simulate_path
+        и RunnerStrategy (exit_price = close свечи выхода, pnl = realized_pnl_pct / 100).
+
+        :return: Колонки RESULT_COLUMNS длиной len(configs)
+        """
+        k = len(self._compiled)
+        n = table.n
+        ts = table.ts
+        close = table.close
+        entry_price = table.entry_price
+        entry_ts = table.entry_ts
+        first_hit = table.first_hit
+
+        exit_ts = np.empty(k, dtype=np.int64)
+        exit_price_col = np.empty(k, dtype=np.float64)
+        pnl_col = np.empty(k, dtype=np.float64)
+        multiple_col = np.empty(k, dtype=np.float64)
+        levels_hit_col = np.empty(k, dtype=np.int16)
+        time_stop_col = np.empty(k, dtype=np.bool_)
+        reason_col = np.empty(k, dtype=np.int8)
+
+        for j, cfg in enumerate(self._compiled):
+            max_hold = cfg.max_hold
+            hold_cap = table.hold_cap[max_hold] if max_hold else n
+
+            total_fraction = 0.0
+            realized_multiple = 0.0
+            last_hit_idx = -1
+            hit_xns: List[float] = []
+            for i, (xn, fraction) in enumerate(cfg.levels):
+                if total_fraction >= 1.0:
+                    break
+                if cfg.exit_on_first_tp and i > 0 and hit_xns:
+                    break
+                if not cfg.allow_partial_fills and hit_xns:
+                    break
+                hit_idx = first_hit[xn]
+                if hit_idx >= hold_cap:
+                    continue
+                if xn not in hit_xns:
+                    hit_xns.append(xn)
+                if hit_idx > last_hit_idx:
+                    last_hit_idx = hit_idx
+                if (cfg.exit_on_first_tp and i == 0) or not cfg.allow_partial_fills:
+                    # Закрываем всё на этом уровне
+                    actual_fraction = 1.0 - total_fraction
+                    total_fraction = 1.0
+                    realized_multiple += xn * actual_fraction
+                else:
+                    actual_fraction = min(fraction, 1.0 - total_fraction)
+                    if actual_fraction > 0:
+                        total_fraction += actual_fraction
+                        realized_multiple += xn * actual_fraction
+                if cfg.exit_on_first_tp and i == 0:
+                    break
+                if not cfg.allow_partial_fills:
+                    break
+
+            has_levels_hit = last_hit_idx >= 0
+            is_fully_closed = total_fraction >= 1.0
+            time_stop_triggered = bool(max_hold) and not is_fully_closed and table.stop_reached[max_hold]
+
+            if is_fully_closed and has_levels_hit:
+                # Выход по последнему достигнутому уровню
+                exit_idx = last_hit_idx
+                exit_ts[j] = ts[last_hit_idx]
+            elif time_stop_triggered:
+                exit_idx = table.stop_idx[max_hold]
+                exit_ts[j] = entry_ts + int(round(max_hold * 60))
+            else:
+                # Данные закончились до time stop: выход по последней свече
+                exit_idx = n - 1
+                exit_ts[j] = ts[n - 1]
+            exit_price = float(close[exit_idx]) if exit_idx < n else float(close[n - 1])
+
+            if realized_multiple > 0:
+                realized_pnl_pct = (realized_multiple - 1.0) * 100.0
+            elif exit_price:
+                realized_pnl_pct = ((exit_price / entry_price) - 1.0) * 100.0
+            else:
+                realized_pnl_pct = 0.0
+
+            exit_price_col[j] = exit_price
+            pnl_col[j] = realized_pnl_pct / 100.0
+            if not has_levels_hit:
+                multiple_col[j] = exit_price / entry_price
+            else:
+                multiple_col[j] = realized_multiple if realized_multiple > 0 else 1.0
+            levels_hit_col[j] = len(hit_xns)
+            time_stop_col[j] = time_stop_triggered
+            if time_stop_triggered or not has_levels_hit:
+                reason_col[j] = _REASON_TIME_STOP
+            else:
+                reason_col[j] = _REASON_LADDER_TP
+
+        return {
+            "signal_idx": np.full(k, table.signal_idx, dtype=np.int32),
+            "config_idx": np.arange(k, dtype=np.int32),
+            "entry_ts": np.full(k, entry_ts, dtype=np.int64),
+            "exit_ts": exit_ts,
+            "entry_price": np.full(k, entry_price, dtype=np.float64),
+            "exit_price": exit_price_col,
+            "pnl": pnl_col,
+            "realized_multiple": multiple_col,
+            "levels_hit": levels_hit_col,
+            "time_stop_triggered": time_stop_col,
+            "reason": reason_col,
+        }
+
+    def run(
+        self,
+        signals: Sequence[Signal],
+        price_loader: PriceLoader,
+        after_minutes: Optional[int] = None,
+        progress_every: int = 100,
+    ) -> RunnerSweepResult:
+        """
+        Прогоняет sweep по сигналам.
+
+        :param signals: Сигналы
+        :param price_loader: Лоадер свечей (рекомендуется CachingPriceLoader для повторных контрактов)
+        :param after_minutes: Сколько минут после сигнала загружать (по умолчанию - самый длинный time stop)
+        :param progress_every: Печатать прогресс каждые N сигналов (0 = не печатать)
+        :return: RunnerSweepResult
+        """
+        horizon = int(after_minutes) if after_minutes is not None else self.horizon_minutes
+        chunks: List[Dict[str, np.ndarray]] = []
+        skipped = 0
+
+        for signal_idx, signal in enumerate(signals):
+            if progress_every and signal_idx % progress_every == 0:
+                print(f"[sweep] [{signal_idx}/{len(signals)}] evaluating {len(self.configs)} configs per signal...")
+            end_time: Optional[datetime] = signal.timestamp + timedelta(minutes=horizon)
+            try:
+                arrays = load_candle_arrays(price_loader, signal.contract_address, signal.timestamp, end_time)
+            except FileNotFoundError:
+                skipped += 1
+                continue
+            table = self.build_table(signal_idx, signal, arrays)
+            if table is None:
+                skipped += 1
+                continue
+            chunks.append(self.evaluate_table(table))
+
+        if chunks:
+            columns = {name: np.concatenate([c[name] for c in chunks]) for name in RESULT_COLUMNS}
+        else:
+            columns = {name: np.empty(0, dtype=dtype) for name, dtype in RESULT_COLUMNS.items()}
+
+        return RunnerSweepResult(
+            configs=self.configs,
+            signal_ids=[s.id for s in signals],
+            contracts=[s.contract_address for s in signals],
+            columns=columns,
+            skipped_signals=skipped,
+        )
@@ -0,0 +1,165 @@
+# backtester/research/runner_sweep/sweep_runner.py
+# Sweep runner - CLI script for Runner parameter sweep execution
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Add project root to path if running as script (before other imports)
+if not __package__:
+    project_root = Path(__file__).resolve().parent.parent.parent.parent
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+import argparse
+import time
+
+import yaml
+
+from backtester.infrastructure.candle_cache import CachingPriceLoader
+from backtester.infrastructure.candle_store import ColumnarPriceLoader
+from backtester.infrastructure.price_loader import CsvPriceLoader, GeckoTerminalPriceLoader, PriceLoader
+from backtester.infrastructure.signal_loader import CsvSignalLoader
+from backtester.research.runner_sweep.sweep_engine import RunnerSweepEngine
+from backtester.research.runner_sweep.sweep_spec import configs_to_strategy_entries, load_sweep_spec
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Runner Sweep - evaluate a grid of Runner ladder configs over signals",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m backtester.research.runner_sweep.sweep_runner \\
+      --spec config/runner_sweep_example.yaml \\
+      --signals signals/example_signals.csv \\
+      --candles-dir data/candles \\
+      --export-top 10
+        """
+    )
+    parser.add_argument("--spec", type=str, required=True, help="Path to sweep spec YAML")
+    parser.add_argument("--signals", type=str, required=True, help="Path to CSV file with signals")
+    parser.add_argument(
+        "--loader",
+        type=str,
+        default="csv",
+        choices=["csv", "store", "gecko"],
+        help="Price loader type: csv, store (columnar) or gecko (API) (default: csv)",
+    )
+    parser.add_argument(
+        "--candles-dir",
+        type=str,
+        default="data/candles",
+        help="Base directory for candles CSV files / Gecko cache (default: data/candles)",
+    )
+    parser.add_argument(
+        "--store-dir",
+        type=str,
+        default="data/candles/store",
+        help="Columnar store directory for --loader store (default: data/candles/store)",
+    )
+    parser.add_argument("--timeframe", type=str, default="1m", help="Price timeframe (default: 1m)")
+    parser.add_argument(
+        "--after-minutes",
+        type=int,
+        default=None,
+        help="Minutes after signal to load (default: longest time stop in the sweep)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=1024,
+        help="Candle cache budget in MB, 0 disables (default: 1024)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="output/runner_sweep/",
+        help="Output directory for results (default: output/runner_sweep/)",
+    )
+    parser.add_argument(
+        "--export-top",
+        type=int,
+        default=0,
+        help="Write top-N configs by mean pnl as strategies YAML (default: 0 = off)",
+    )
+    return parser.parse_args()
+
+
+def build_price_loader(args) -> PriceLoader:
+    """Creates price loader from CLI args (wrapped into candle cache if enabled)."""
+    price_loader: PriceLoader
+    if args.loader == "gecko":
+        price_loader = GeckoTerminalPriceLoader(cache_dir=args.candles_dir, timeframe=args.timeframe)
+    elif args.loader == "store":
+        price_loader = ColumnarPriceLoader(store_dir=args.store_dir, timeframe=args.timeframe)
+    else:
+        price_loader = CsvPriceLoader(candles_dir=args.candles_dir, timeframe=args.timeframe, base_dir=args.candles_dir)
+
+    if args.cache_max_mb and args.cache_max_mb > 0:
+        price_loader = CachingPriceLoader(
+            price_loader,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+            full_history=args.loader != "gecko",
+        )
+    return price_loader
+
+
+def main():
+    """Main CLI entry point."""
+    args = parse_args()
+
+    signals_path = Path(args.signals)
+    if not signals_path.exists():
+        print(f"[ERROR] Signals file not found: {signals_path}", file=sys.stderr)
+        sys.exit(1)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    spec = load_sweep_spec(args.spec)
+    configs = spec.expand()
+    print(f"[sweep] Spec {args.spec}: {len(configs)} configs")
+
+    signals = CsvSignalLoader(str(signals_path)).load_signals()
+    if not signals:
+        print("[ERROR] No signals found", file=sys.stderr)
+        sys.exit(1)
+    print(f"[sweep] Loaded {len(signals)} signals")
+
+    engine = RunnerSweepEngine(configs)
+    price_loader = build_price_loader(args)
+
+    started = time.perf_counter()
+    result = engine.run(signals, price_loader, after_minutes=args.after_minutes)
+    elapsed = time.perf_counter() - started
+    print(
+        f"[sweep] Evaluated {len(result)} signal x config rows in {elapsed:.1f}s "
+        f"(skipped signals: {result.skipped_signals})"
+    )
+
+    results_path = result.save(output_dir / "sweep_results.npz")
+    print(f"[sweep] Saved results table to {results_path}")
+
+    summary_df = result.summary()
+    summary_path = output_dir / "sweep_summary.csv"
+    summary_df.to_csv(summary_path, index=False)
+    print(f"[sweep] Saved per-config summary to {summary_path}")
+
+    print()
+    print("[sweep] Top configs by mean pnl:")
+    print(summary_df.head(10).to_string(index=False))
+
+    if args.export_top > 0:
+        top_names = set(summary_df["strategy"].head(args.export_top))
+        top_configs = [c for c in configs if c.name in top_names]
+        export_path = output_dir / "sweep_top_strategies.yaml"
+        with open(export_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(configs_to_strategy_entries(top_configs), f, sort_keys=False, allow_unicode=True)
+        print(f"[sweep] Exported top {len(top_configs)} configs to {export_path}")
+
+
+if __name__ == "__main__":
+    main()
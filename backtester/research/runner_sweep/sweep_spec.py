@@ -0,0 +1,212 @@
+# backtester/research/runner_sweep/sweep_spec.py
+# Sweep spec: описание сетки параметров Runner и ее развертка в RunnerConfig
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import yaml
+
+from backtester.domain.runner_config import RunnerConfig, create_runner_config_from_dict
+
+
+# Защита от случайной развертки в миллионы конфигов
+DEFAULT_MAX_CONFIGS = 100_000
+
+
+def expand_grid_values(value: Any, key: str) -> List[Any]:
+    """
+    Разворачивает значение параметра сетки в список.
+
+    Поддерживает:
+    - скаляр: 10080 -> [10080]
+    - список: [1440, 10080, null]
+    - диапазон: {start: 1.5, stop: 3.0, step: 0.5} -> [1.5, 2.0, 2.5, 3.0] (stop включительно)
+
+    :param value: Значение из YAML
+    :param key: Имя параметра (для сообщений об ошибках)
+    :return: Список значений
+    """
+    if isinstance(value, dict):
+        try:
+            start = float(value["start"])
+            stop = float(value["stop"])
+            step = float(value["step"])
+        except KeyError as e:
+            raise ValueError(f"Range for '{key}' must have start/stop/step, missing {e}") from e
+        if step <= 0:
+            raise ValueError(f"Range step for '{key}' must be > 0, got {step}")
+        count = int((stop - start) / step + 1e-9) + 1
+        # round() убирает накопленную погрешность float (1.5 + 3 * 0.1 и т.п.)
+        return [round(start + i * step, 10) for i in range(max(count, 0))]
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def _format_number(value: float) -> str:
+    """2.0 -> '2', 1.5 -> '1.5' (для имен конфигов)."""
+    return f"{value:g}"
+
+
+def _format_time_stop(minutes: Optional[int]) -> str:
+    """10080 -> '7d', 240 -> '4h', 90 -> '90m', None -> 'nots'."""
+    if minutes is None:
+        return "nots"
+    if minutes and minutes % 1440 == 0:
+        return f"{minutes // 1440}d"
+    if minutes and minutes % 60 == 0:
+        return f"{minutes // 60}h"
+    return f"{minutes}m"
+
+
+@dataclass
+class RunnerSweepSpec:
+    """
+    Спецификация sweep по параметрам Runner.
+
+    Attributes:
+        name_prefix: Префикс имен сгенерированных конфигов
+        levels: Допустимое число уровней в лестнице (например, [1, 2, 3])
+        xn: Значения xn; уровни лестницы - возрастающие комбинации из этого списка
+        fraction: Доли для всех уровней, кроме последнего (последний получает остаток до 1.0)
+        time_stop_minutes: Значения time stop (None = без явного time stop)
+        exit_on_first_tp: Значения exit_on_first_tp
+        base_params: Общие параметры стратегии (use_high_for_targets, allow_partial_fills, ...)
+        max_configs: Максимальное число конфигов после развертки
+    """
+    name_prefix: str = "Sweep"
+    levels: List[int] = field(default_factory=lambda: [2])
+    xn: List[float] = field(default_factory=lambda: [2.0, 3.0, 5.0])
+    fraction: List[float] = field(default_factory=lambda: [0.5])
+    time_stop_minutes: List[Optional[int]] = field(default_factory=lambda: [None])
+    exit_on_first_tp: List[bool] = field(default_factory=lambda: [False])
+    base_params: Dict[str, Any] = field(default_factory=dict)
+    max_configs: int = DEFAULT_MAX_CONFIGS
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunnerSweepSpec":
+        """
+        Создает спецификацию из словаря (YAML).
+
+        Формат:
+            name_prefix: Sweep
+            base:
+              use_high_for_targets: true
+              allow_partial_fills: true
+            take_profit_levels:
+              levels: [1, 2]
+              xn: {start: 2, stop: 10, step: 1}
+              fraction: [0.3, 0.5, 0.7]
+            time_stop_minutes: [1440, 10080]
+            exit_on_first_tp: [false]
+        """
+        tp = data.get("take_profit_levels", {}) or {}
+        spec = cls(
+            name_prefix=str(data.get("name_prefix", "Sweep")),
+            levels=[int(v) for v in expand_grid_values(tp.get("levels", [2]), "levels")],
+            xn=sorted({float(v) for v in expand_grid_values(tp.get("xn", [2.0, 3.0, 5.0]), "xn")}),
+            fraction=[float(v) for v in expand_grid_values(tp.get("fraction", [0.5]), "fraction")],
+            time_stop_minutes=[
+                None if v is None else int(v)
+                for v in expand_grid_values(data.get("time_stop_minutes", [None]), "time_stop_minutes")
+            ],
+            exit_on_first_tp=[bool(v) for v in expand_grid_values(data.get("exit_on_first_tp", [False]), "exit_on_first_tp")],
+            base_params=dict(data.get("base", {}) or {}),
+            max_configs=int(data.get("max_configs", DEFAULT_MAX_CONFIGS)),
+        )
+        if not spec.levels or min(spec.levels) < 1:
+            raise ValueError(f"take_profit_levels.levels must be >= 1, got {spec.levels}")
+        if not spec.xn or min(spec.xn) <= 0:
+            raise ValueError(f"take_profit_levels.xn must be > 0, got {spec.xn}")
+        if any(not 0.0 < f < 1.0 for f in spec.fraction):
+            raise ValueError(f"take_profit_levels.fraction must be in (0, 1), got {spec.fraction}")
+        return spec
+
+    def _ladders(self) -> List[List[Dict[str, float]]]:
+        """Все лестницы (списки уровней {xn, fraction}) из сетки."""
+        ladders: List[List[Dict[str, float]]] = []
+        for count in self.levels:
+            for xns in itertools.combinations(self.xn, count):
+                for fractions in itertools.product(self.fraction, repeat=count - 1):
+                    remainder = round(1.0 - sum(fractions), 10)
+                    if remainder <= 0:
+                        continue
+                    all_fractions = list(fractions) + [remainder]
+                    ladders.append([
+                        {"xn": float(xn), "fraction": float(fr)}
+                        for xn, fr in zip(xns, all_fractions)
+                    ])
+        return ladders
+
+    def expand(self) -> List[RunnerConfig]:
+        """
+        Разворачивает сетку в список RunnerConfig (с уникальными именами).
+
+        :return: Список RunnerConfig в детерминированном порядке
+        :raises ValueError: Если число конфигов превышает max_configs
+        """
+        ladders = self._ladders()
+        total = len(ladders) * len(self.time_stop_minutes) * len(self.exit_on_first_tp)
+        if total > self.max_configs:
+            raise ValueError(
+                f"Sweep expands to {total} configs, exceeds max_configs={self.max_configs}"
+            )
+
+        configs: List[RunnerConfig] = []
+        for ladder in ladders:
+            for time_stop in self.time_stop_minutes:
+                for exit_first in self.exit_on_first_tp:
+                    xn_part = "_".join(_format_number(level["xn"]) for level in ladder)
+                    fr_part = "_".join(str(int(round(level["fraction"] * 100))) for level in ladder)
+                    name = f"{self.name_prefix}_{xn_part}_f{fr_part}_{_format_time_stop(time_stop)}"
+                    if exit_first:
+                        name += "_first"
+                    params = dict(self.base_params)
+                    params.update({
+                        "take_profit_levels": ladder,
+                        "time_stop_minutes": time_stop,
+                        "exit_on_first_tp": exit_first,
+                    })
+                    configs.append(create_runner_config_from_dict(name, params))
+        return configs
+
+
+def load_sweep_spec(path: str | Path) -> RunnerSweepSpec:
+    """
+    Загружает спецификацию sweep из YAML файла.
+
+    :param path: Путь к YAML
+    :return: RunnerSweepSpec
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"Sweep spec must be a mapping, got {type(data).__name__}")
+    return RunnerSweepSpec.from_dict(data)
+
+
+def configs_to_strategy_entries(configs: Sequence[RunnerConfig]) -> List[Dict[str, Any]]:
+    """
+    Преобразует RunnerConfig в записи формата config/runner_baseline.yaml
+    (для прогона отобранных конфигов через main.py).
+    """
+    entries: List[Dict[str, Any]] = []
+    for config in configs:
+        entries.append({
+            "name": config.name,
+            "type": "RUNNER",
+            "params": {
+                "take_profit_levels": [
+                    {"xn": level.xn, "fraction": level.fraction} for level in config.take_profit_levels
+                ],
+                "time_stop_minutes": config.time_stop_minutes,
+                "use_high_for_targets": config.use_high_for_targets,
+                "exit_on_first_tp": config.exit_on_first_tp,
+                "allow_partial_fills": config.allow_partial_fills,
+            },
+        })
+    return entries
@@ -11,17 +11,25 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
+from ...domain.candle_series import as_candle_series
 from ...domain.models import Candle, Signal
+from ...infrastructure.feature_store import FeatureStore, SignalKey, feature_set_version, signal_key
 from ...infrastructure.price_loader import CsvPriceLoader
 from ...infrastructure.signal_loader import CsvSignalLoader
 
 
+# Набор признаков в FeatureStore; версию поднимать при изменении логики расчета
+SIGNAL_FEATURES_SET = "signal_features"
+SIGNAL_FEATURES_VERSION = "1"
+
+
 def load_signals(path: str | Path) -> pd.DataFrame:
     """
     Загружает сигналы из CSV файла и возвращает DataFrame.
@@ -60,7 +68,7 @@ def load_candles(contract: str, timeframe: str, candles_dir: str) -> List[Candle
 
 
 def get_entry_price(
-    candles: List[Candle],
+    candles: Sequence[Candle],
     signal_ts: datetime,
     mode: str = "t+1m"
 ) -> Optional[float]:
@@ -73,33 +81,38 @@ def get_entry_price(
     - fallback: если нет свечи для t+1m, пробует "t"
     - если всё равно нет — возвращает None
     
-    :param candles: Список свечей (должен быть отсортирован по timestamp)
+    :param candles: CandleSeries (уже отсортирован, используется как есть) или список свечей
     :param signal_ts: Время сигнала
     :param mode: Режим поиска ("t+1m" или "t")
     :return: Цена входа (close цена свечи) или None
     """
-    if not candles:
+    series = as_candle_series(candles)
+    if not len(series):
         return None
     
-    # Сортируем свечи по timestamp (на всякий случай)
-    sorted_candles = sorted(candles, key=lambda c: c.timestamp)
-    
     target_time = signal_ts
     if mode == "t+1m":
         target_time = signal_ts + timedelta(minutes=1)
     
-    # Ищем первую свечу с timestamp >= target_time
-    for candle in sorted_candles:
-        if candle.timestamp >= target_time:
-            return candle.close
+    # Первая свеча с timestamp >= target_time - бинарный поиск
+    idx = series.index_at_or_after(target_time)
+    if idx < len(series):
+        return float(series.close[idx])
     
     # Если не нашли для t+1m, пробуем fallback на "t"
     if mode == "t+1m":
-        return get_entry_price(candles, signal_ts, mode="t")
+        return get_entry_price(series, signal_ts, mode="t")
     
     return None
 
 
+def _epoch(dt: datetime) -> float:
+    """Epoch seconds (naive datetime считается UTC, дробные секунды сохраняются)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
 def compute_market_cap_proxy(entry_price: float, supply: float = 1_000_000_000) -> float:
     """
     Вычисляет прокси market cap.
@@ -116,7 +129,7 @@ def compute_market_cap_proxy(entry_price: float, supply: float = 1_000_000_000)
 
 
 def compute_max_xn(
-    candles: List[Candle],
+    candles: Sequence[Candle],
     entry_price: float,
     entry_time: datetime,
     horizon_minutes: int,
@@ -125,7 +138,7 @@ def compute_max_xn(
     """
     Вычисляет максимальный множитель цены (max_xn) и время до достижения уровней.
     
-    :param candles: Список свечей (должен быть отсортирован по timestamp)
+    :param candles: CandleSeries (уже отсортирован, используется как есть) или список свечей
     :param entry_price: Цена входа
     :param entry_time: Время входа
     :param horizon_minutes: Горизонт анализа в минутах
@@ -137,63 +150,69 @@ def compute_max_xn(
     if not candles or entry_price <= 0:
         return 0.0, {}
     
-    # Сортируем свечи по timestamp
-    sorted_candles = sorted(candles, key=lambda c: c.timestamp)
-    
-    # Определяем окно анализа
+    # Окно анализа [entry_time, entry_time + horizon] - срез отсортированного ряда
     end_time = entry_time + timedelta(minutes=horizon_minutes)
+    window = as_candle_series(candles).slice_time(entry_time, end_time)
     
-    # Фильтруем свечи в окне
-    window_candles = [
-        c for c in sorted_candles
-        if entry_time <= c.timestamp <= end_time
-    ]
-    
-    if not window_candles:
+    if not len(window):
         return 0.0, {}
     
     # Вычисляем max_xn
-    max_xn = 0.0
-    price_key = "high" if use_high else "close"
-    
-    for candle in window_candles:
-        price = candle.high if use_high else candle.close
-        if price > 0:
-            xn = price / entry_price
-            if xn > max_xn:
-                max_xn = xn
+    prices = window.high if use_high else window.close
+    positive = prices[prices > 0]
+    max_xn = float(positive.max() / entry_price) if positive.size else 0.0
     
-    # Вычисляем время до достижения уровней
+    # Время до достижения уровней: первая свеча с ценой >= цели - бинарный поиск
+    # по кумулятивному максимуму (все уровни одним searchsorted)
+    running_max = np.fmax.accumulate(np.where(np.isnan(prices), -np.inf, prices))
+    entry_epoch = _epoch(entry_time)
     levels = [2.0, 3.0, 5.0, 7.0, 10.0]
+    hit_indices = np.searchsorted(running_max, entry_price * np.asarray(levels), side='left')
     time_to_levels: Dict[str, Optional[int]] = {}
     
-    for level in levels:
-        target_price = entry_price * level
+    for level, hit_idx in zip(levels, hit_indices):
         time_to_level = None
-        
-        for candle in window_candles:
-            price = candle.high if use_high else candle.close
-            if price >= target_price:
-                # Вычисляем разницу в минутах
-                delta = candle.timestamp - entry_time
-                time_to_level = int(delta.total_seconds() / 60)
-                break
+        if hit_idx < len(window):
+            # Вычисляем разницу в минутах
+            time_to_level = int((int(window.ts[hit_idx]) - entry_epoch) / 60)
         
         time_to_levels[f"time_to_{int(level)}x_minutes"] = time_to_level
     
     return max_xn, time_to_levels
 
 
+def _parse_signal_timestamp(ts_value) -> Optional[datetime]:
+    """Timestamp сигнала как datetime (datetime или строка); None - невалидное значение."""
+    if isinstance(ts_value, datetime):
+        return ts_value
+    try:
+        ts = pd.Timestamp(ts_value)
+        # Check if timestamp is NaT
+        if ts is pd.NaT:
+            return None
+        dt = ts.to_pydatetime()
+    except (ValueError, TypeError):
+        return None
+    # Ensure we have a valid datetime (to_pydatetime can return NaT in some edge cases)
+    if dt is pd.NaT or not isinstance(dt, datetime):
+        return None
+    return dt
+
+
 def extract_signal_features(
     signals_df: pd.DataFrame,
     candles_dir: str,
     timeframe: str = "1m",
     entry_mode: str = "t+1m",
     horizon_days: int = 14,
-    use_high: bool = True
+    use_high: bool = True,
+    feature_store: Optional[FeatureStore] = None,
 ) -> pd.DataFrame:
     """
     Извлекает признаки для всех сигналов.
+    С feature_store признаки сигналов, посчитанные раньше с теми же параметрами, читаются из
+    хранилища (один запрос на все сигналы) без загрузки свечей; считаются только новые сигналы.
+    Сохраняются строки status="ok", у которых свечи покрывают весь горизонт (lived_minutes >= horizon).
     
     :param signals_df: DataFrame с сигналами (колонки: id, contract_address, timestamp)
     :param candles_dir: Базовая директория со свечами
@@ -201,85 +220,63 @@ def extract_signal_features(
     :param entry_mode: Режим поиска entry_price ("t+1m" или "t")
     :param horizon_days: Горизонт анализа в днях
     :param use_high: Использовать high цену для max_xn
+    :param feature_store: Хранилище признаков (None - всегда считать заново)
     :return: DataFrame с признаками сигналов
     """
     horizon_minutes = horizon_days * 24 * 60
+    store_version = feature_set_version(
+        SIGNAL_FEATURES_VERSION,
+        timeframe=timeframe,
+        entry_mode=entry_mode,
+        horizon_days=horizon_days,
+        use_high=use_high,
+    )
+    fresh: List[Tuple[SignalKey, Dict]] = []
     
     results = []
     
+    # Timestamp сигналов разбираем заранее: признаки прошлых прогонов читаются одним запросом
+    signal_times = {idx: _parse_signal_timestamp(signals_df.at[idx, "timestamp"]) for idx in signals_df.index}
+    stored_rows: Dict[SignalKey, Dict] = {}
+    if feature_store is not None:
+        store_keys = [
+            signal_key(signals_df.at[idx, "id"], str(signals_df.at[idx, "contract_address"]), signal_ts)
+            for idx, signal_ts in signal_times.items()
+            if signal_ts is not None
+        ]
+        stored_rows = feature_store.get_many(SIGNAL_FEATURES_SET, store_version, store_keys)
+    
     for idx, row in signals_df.iterrows():
         signal_id = signals_df.at[idx, "id"]
         contract = str(signals_df.at[idx, "contract_address"])
-        # Convert timestamp to datetime, handling both datetime and string types
-        ts_value = signals_df.at[idx, "timestamp"]
-        if isinstance(ts_value, datetime):
-            signal_ts: datetime = ts_value
-        else:
-            try:
-                ts = pd.Timestamp(ts_value)
-                # Check if timestamp is NaT
-                if ts is pd.NaT:
-                    # Skip rows with invalid timestamps
-                    results.append({
-                        "signal_id": signal_id,
-                        "contract_address": contract,
-                        "timestamp": None,
-                        "entry_time": None,
-                        "entry_price": None,
-                        "market_cap_proxy": None,
-                        "max_xn": None,
-                        "time_to_2x_minutes": None,
-                        "time_to_3x_minutes": None,
-                        "time_to_5x_minutes": None,
-                        "time_to_7x_minutes": None,
-                        "time_to_10x_minutes": None,
-                        "lived_minutes": None,
-                        "status": "invalid_timestamp",
-                        "error_message": "Invalid timestamp value"
-                    })
-                    continue
-                dt = ts.to_pydatetime()
-                # Ensure we have a valid datetime (to_pydatetime can return NaT in some edge cases)
-                if dt is pd.NaT or not isinstance(dt, datetime):
-                    results.append({
-                        "signal_id": signal_id,
-                        "contract_address": contract,
-                        "timestamp": None,
-                        "entry_time": None,
-                        "entry_price": None,
-                        "market_cap_proxy": None,
-                        "max_xn": None,
-                        "time_to_2x_minutes": None,
-                        "time_to_3x_minutes": None,
-                        "time_to_5x_minutes": None,
-                        "time_to_7x_minutes": None,
-                        "time_to_10x_minutes": None,
-                        "lived_minutes": None,
-                        "status": "invalid_timestamp",
-                        "error_message": "Invalid timestamp value"
-                    })
-                    continue
-                signal_ts = dt
-            except (ValueError, TypeError):
-                # Skip rows with invalid timestamps
-                results.append({
-                    "signal_id": signal_id,
-                    "contract_address": contract,
-                    "timestamp": None,
-                    "entry_time": None,
-                    "entry_price": None,
-                    "market_cap_proxy": None,
-                    "max_xn": None,
-                    "time_to_2x_minutes": None,
-                    "time_to_3x_minutes": None,
-                    "time_to_5x_minutes": None,
-                    "time_to_7x_minutes": None,
-                    "time_to_10x_minutes": None,
-                    "lived_minutes": None,
-                    "status": "invalid_timestamp",
-                    "error_message": "Invalid timestamp value"
-                })
-                continue
+        parsed_ts = signal_times[idx]
+        if parsed_ts is None:
+            # Skip rows with invalid timestamps
+            results.append({
+                "signal_id": signal_id,
+                "contract_address": contract,
+                "timestamp": None,
+                "entry_time": None,
+                "entry_price": None,
+                "market_cap_proxy": None,
+                "max_xn": None,
+                "time_to_2x_minutes": None,
+                "time_to_3x_minutes": None,
+                "time_to_5x_minutes": None,
+                "time_to_7x_minutes": None,
+                "time_to_10x_minutes": None,
+                "lived_minutes": None,
+                "status": "invalid_timestamp",
+                "error_message": "Invalid timestamp value"
+            })
+            continue
+        signal_ts: datetime = parsed_ts
+        
+        # Признаки, посчитанные в прошлых прогонах, берем из хранилища (свечи не читаем)
+        stored = stored_rows.get(signal_key(signal_id, contract, signal_ts))
+        if stored is not None:
+            results.append({**stored, "signal_id": signal_id})
+            continue
         
         # Загружаем свечи
         try:
@@ -304,7 +301,10 @@ def extract_signal_features(
             })
             continue
         
-        if not candles:
+        # Один отсортированный ряд на сигнал: entry / max_xn / lived_minutes - поиск по индексу
+        series = as_candle_series(candles)
+        
+        if not len(series):
             results.append({
                 "signal_id": signal_id,
                 "contract_address": contract,
@@ -325,7 +325,7 @@ def extract_signal_features(
             continue
         
         # Получаем entry_price
-        entry_price = get_entry_price(candles, signal_ts, mode=entry_mode)
+        entry_price = get_entry_price(series, signal_ts, mode=entry_mode)
         
         if entry_price is None:
             results.append({
@@ -354,29 +354,23 @@ def extract_signal_features(
         else:
             target_time = signal_ts
         
-        sorted_candles = sorted(candles, key=lambda c: c.timestamp)
-        for candle in sorted_candles:
-            if candle.timestamp >= target_time:
-                entry_time = candle.timestamp
-                break
+        entry_idx = series.index_at_or_after(target_time)
+        if entry_idx < len(series):
+            entry_time = series.timestamp_at(entry_idx)
         
         # Вычисляем market_cap_proxy
         market_cap_proxy = compute_market_cap_proxy(entry_price)
         
         # Вычисляем max_xn и time_to_xn
         max_xn, time_to_levels = compute_max_xn(
-            candles, entry_price, entry_time, horizon_minutes, use_high
+            series, entry_price, entry_time, horizon_minutes, use_high
         )
         
-        # Вычисляем lived_minutes (сколько минут есть свечей после entry)
-        last_candle_time = max(c.timestamp for c in candles)
-        if last_candle_time > entry_time:
-            delta = last_candle_time - entry_time
-            lived_minutes = int(delta.total_seconds() / 60)
-        else:
-            lived_minutes = 0
+        # Вычисляем lived_minutes (сколько минут есть свечей после entry): последняя свеча ряда
+        lived_seconds = int(series.ts[-1]) - _epoch(entry_time)
+        lived_minutes = int(lived_seconds / 60) if lived_seconds > 0 else 0
         
-        results.append({
+        row = {
             "signal_id": signal_id,
             "contract_address": contract,
             "timestamp": signal_ts,
@@ -392,7 +386,15 @@ def extract_signal_features(
             "lived_minutes": lived_minutes,
             "status": "ok",
             "error_message": None
-        })
+        }
+        results.append(row)
+        if feature_store is not None and lived_minutes >= horizon_minutes:
+            # Сохраняем только успешные строки с полным горизонтом: no_candles/no_entry/error и
+            # неполный горизонт (max_xn / time_to_Nx) могут измениться после дозагрузки свечей
+            fresh.append((signal_key(signal_id, contract, signal_ts), row))
+    
+    if feature_store is not None:
+        feature_store.put_many(SIGNAL_FEATURES_SET, store_version, fresh)
     
     return pd.DataFrame(results)
 
@@ -15,6 +15,7 @@ import argparse
 from pathlib import Path
 
 from .cap_thresholds import analyze_cap_thresholds, save_cap_threshold_report
+from ...infrastructure.feature_store import FeatureStore
 from .feature_extractor import extract_signal_features, load_signals
 from .filter_signals import (
     filter_signals,
@@ -94,6 +95,12 @@ def parse_args():
         default="output/signal_analysis",
         help="Директория для сохранения результатов (default: output/signal_analysis)"
     )
+    parser.add_argument(
+        "--feature-store",
+        type=str,
+        default=None,
+        help="Директория хранилища признаков (features.sqlite): посчитанные сигналы не пересчитываются (default: выключено)"
+    )
     
     return parser.parse_args()
 
@@ -118,6 +125,8 @@ def main():
     print(f"Runner XN threshold: {args.runner_xn_threshold}")
     print(f"Min market cap proxy: {args.min_market_cap_proxy}")
     print(f"Output dir: {args.output_dir}")
+    if args.feature_store:
+        print(f"Feature store: {args.feature_store}")
     print("=" * 60)
     
     # Шаг 1: Загружаем сигналы
@@ -134,7 +143,8 @@ def main():
         timeframe=args.timeframe,
         entry_mode=args.entry_mode,
         horizon_days=args.horizon_days,
-        use_high=use_high_bool
+        use_high=use_high_bool,
+        feature_store=FeatureStore(args.feature_store) if args.feature_store else None,
     )
     
     # Сохраняем features
@@ -5,7 +5,8 @@ from __future__ import annotations
 
 import warnings
 from datetime import datetime, timedelta
-from typing import Optional, Dict, cast
+from typing import Optional, Dict
+import numpy as np
 import pandas as pd
 
 from ...domain.models import Signal
@@ -53,8 +54,9 @@ class XNAnalyzer:
                 candles_df = candles_df.copy()
                 candles_df["timestamp"] = pd.to_datetime(candles_df["timestamp"], utc=True)
             
-            # Sort by timestamp for consistency
-            candles_df = candles_df.sort_values("timestamp").reset_index(drop=True)
+            # Sort by timestamp for consistency (already sorted frames are used as is)
+            if not candles_df["timestamp"].is_monotonic_increasing:
+                candles_df = candles_df.sort_values("timestamp").reset_index(drop=True)
             
             # Find first candle AFTER signal timestamp
             signal_time = signal.timestamp
@@ -110,22 +112,26 @@ class XNAnalyzer:
             # Calculate maximum XN achieved
             max_xn = max_price / entry_price if entry_price > 0 else 0.0
             
-            # Calculate time_to_xn for each XN level
+            # Calculate time_to_xn for each XN level.
+            # First hits come from a binary search over the running max of HIGH,
+            # so each level costs O(log n) instead of a scan over the candles.
+            relevant_candles = relevant_candles.reset_index(drop=True)
+            high = relevant_candles["high"].to_numpy(dtype=np.float64)
+            running_max = np.fmax.accumulate(np.where(np.isnan(high), -np.inf, high))
             time_to_xn: Dict[float, Optional[int]] = {}
             
             for xn_level in config.xn_levels:
                 target_price = entry_price * xn_level
                 
                 # Find first candle where HIGH >= target_price
-                reached_candles = cast(pd.DataFrame, relevant_candles[relevant_candles["high"] >= target_price])
+                hit_idx = int(np.searchsorted(running_max, target_price, side='left'))
                 
-                if reached_candles.empty:
+                if hit_idx >= len(running_max):
                     # XN level not reached
                     time_to_xn[xn_level] = None
                 else:
                     # First candle that reached the XN level
-                    first_reached = reached_candles.iloc[0]
-                    reached_time = first_reached["timestamp"]
+                    reached_time = relevant_candles["timestamp"].iloc[hit_idx]
                     if isinstance(reached_time, pd.Timestamp):
                         reached_time = reached_time.to_pydatetime()
                     
@@ -20,12 +20,29 @@ import pandas as pd
 import numpy as np
 
 from backtester.domain.models import Candle
+from backtester.infrastructure.feature_store import FeatureStore, feature_set_version, signal_key
 from backtester.infrastructure.signal_loader import CsvSignalLoader
 from backtester.infrastructure.price_loader import CsvPriceLoader, GeckoTerminalPriceLoader
 from backtester.research.xn_analysis.xn_models import XNAnalysisConfig, XNSignalResult, XNSummaryStats
 from backtester.research.xn_analysis.xn_analyzer import XNAnalyzer
 
 
+# Feature set for XN results in FeatureStore; bump the version when the analysis logic changes
+XN_FEATURES_SET = "xn_analysis"
+XN_FEATURES_VERSION = "1"
+
+
+def xn_store_version(config: XNAnalysisConfig) -> str:
+    """FeatureStore version of XN results for the given analysis parameters."""
+    return feature_set_version(
+        XN_FEATURES_VERSION,
+        holding_days=config.holding_days,
+        xn_levels=list(config.xn_levels),
+        price_timeframe=config.price_timeframe,
+        price_source=config.price_source,
+    )
+
+
 def resolve_candles_path(contract: str, timeframe: str, base_dir: str = "data/candles") -> Path | None:
     """
     Resolve path to candles CSV file, checking multiple possible locations.
@@ -300,6 +317,13 @@ def parse_args():
         help="Price loader type: csv (local files) or gecko (API) (default: csv)",
     )
     
+    parser.add_argument(
+        "--feature-store",
+        type=str,
+        default=None,
+        help="Feature store directory (features.sqlite): already analyzed signals are not recomputed (default: disabled)",
+    )
+    
     return parser.parse_args()
 
 
@@ -357,6 +381,19 @@ def main():
         print(f"[XN] Using GeckoTerminal price loader (cache: {args.candles_dir})")
     print()
     
+    # Results of previous runs with the same parameters (no candle loading for them)
+    feature_store = FeatureStore(args.feature_store) if args.feature_store else None
+    store_version = xn_store_version(config)
+    stored_results = {}
+    if feature_store is not None:
+        stored_results = feature_store.get_many(
+            XN_FEATURES_SET,
+            store_version,
+            [signal_key(s.id, s.contract_address, s.timestamp) for s in signals],
+        )
+        print(f"[XN] Feature store: {len(stored_results)}/{len(signals)} signals already analyzed")
+    fresh_results = []
+    
     # Analyze signals
     print(f"[XN] Analyzing {len(signals)} signals...")
     results: List[XNSignalResult] = []
@@ -366,6 +403,12 @@ def main():
     for i, signal in enumerate(signals, 1):
         print(f"[XN] [{i}/{len(signals)}] Analyzing signal {signal.id} ({signal.contract_address})...")
         
+        key = signal_key(signal.id, signal.contract_address, signal.timestamp)
+        if key in stored_results:
+            results.append(stored_results[key])
+            print(f"  ✓ Max XN: {stored_results[key].max_xn:.2f}x (feature store)")
+            continue
+        
         try:
             # Check if candles file exists (for CSV loader)
             if args.loader == "csv":
@@ -405,6 +448,7 @@ def main():
                 continue
             
             results.append(result)
+            fresh_results.append((key, result))
             print(f"  ✓ Max XN: {result.max_xn:.2f}x")
         
         except FileNotFoundError as e:
@@ -416,6 +460,9 @@ def main():
             print(f"  ❌ Error: {e}")
             continue
     
+    if feature_store is not None:
+        feature_store.put_many(XN_FEATURES_SET, store_version, fresh_results)
+    
     print()
     print(f"[XN] Analysis complete: {len(results)} results")
     
@@ -0,0 +1,264 @@
+"""
+Бенчмарк загрузки свечей: последовательный GeckoTerminalPriceLoader против
+конкурентного AsyncGeckoTerminalPriceLoader.prefetch на локальном stub-сервере GeckoTerminal
+с задержкой ответа и периодическими 429 (Retry-After).
+
+Run:
+    python -m backtester.tools.bench_gecko_prefetch --contracts 20 --latency-ms 50 --throttle-every 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from ..infrastructure.async_gecko_loader import AsyncGeckoTerminalPriceLoader
+from ..infrastructure.price_loader import GeckoTerminalPriceLoader
+
+
+def stub_contract(i: int) -> str:
+    return f"StubToken{i:06d}".ljust(44, "1")
+
+
+def stub_pool(contract_address: str) -> str:
+    return ("Pool" + contract_address[4:])[:44]
+
+
+class GeckoStubServer:
+    """
+    Локальный stub GeckoTerminal API (/tokens/{c}/pools и /pools/{p}/ohlcv/minute).
+
+    У каждого контракта - минутная серия из `minutes` свечей, заканчивающаяся час назад.
+    Каждый throttle_every-й запрос получает 429 с заголовком Retry-After.
+    """
+
+    def __init__(
+        self,
+        contracts: List[str],
+        minutes: int = 3000,
+        latency_ms: float = 0.0,
+        throttle_every: int = 0,
+        retry_after: float = 0.1,
+    ):
+        self.contracts = set(contracts)
+        self.pools = {stub_pool(c): c for c in contracts}
+        self.minutes = minutes
+        self.latency = latency_ms / 1000.0
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.series_end = int(datetime.now(timezone.utc).timestamp()) // 60 * 60 - 3600
+        self.requests = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def series_start(self) -> datetime:
+        return datetime.fromtimestamp(self.series_end - 60 * (self.minutes - 1), tz=timezone.utc)
+
+    def _row(self, ts: int) -> list:
+        price = 1.0 + (ts // 60) % 97 / 64.0
+        return [ts, price, price + 0.125, price - 0.125, price, 10.0]
+
+    def _respond(self, path: str):
+        """(status, body) для пути запроса."""
+        url = urlparse(path)
+        parts = url.path.strip("/").split("/")
+        if len(parts) >= 2 and parts[-1] == "pools" and parts[-2] in self.contracts:
+            pool = stub_pool(parts[-2])
+            return 200, {"data": [{"attributes": {"address": pool, "name": "STUB/SOL", "reserve_in_usd": "1000"}}]}
+        if len(parts) >= 3 and parts[-2] == "ohlcv" and parts[-3] in self.pools:
+            before = int(parse_qs(url.query)["before_timestamp"][0])
+            newest = min(before, self.series_end) // 60 * 60
+            oldest = self.series_end - 60 * (self.minutes - 1)
+            rows = [self._row(ts) for ts in range(newest, max(oldest, newest - 60 * 1000) - 1, -60) if ts >= oldest]
+            return 200, {"data": {"attributes": {"ohlcv_list": rows}}}
+        return 404, {"errors": [{"title": "Not Found"}]}
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive: пул соединений клиента переиспользует сокеты
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                    throttled = bool(stub.throttle_every) and stub.requests % stub.throttle_every == 0
+                    if throttled:
+                        stub.throttled += 1
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    if throttled:
+                        status, body, extra = 429, {"errors": [{"title": "Too Many Requests"}]}, {"Retry-After": str(stub.retry_after)}
+                    else:
+                        status, body = stub._respond(self.path)
+                        extra = {}
+                    payload = json.dumps(body).encode("utf-8")
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    for key, value in extra.items():
+                        self.send_header(key, value)
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "GeckoStubServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests = self.throttled = self.peak_in_flight = 0
+
+    def __enter__(self) -> "GeckoStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def run_benchmark(
+    contracts: int = 20,
+    minutes: int = 3000,
+    latency_ms: float = 50.0,
+    throttle_every: int = 25,
+    retry_after: float = 0.1,
+    max_concurrency: int = 8,
+    max_calls_per_minute: int = 6000,
+    verbose: bool = False,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Загружает одинаковые окна последовательным и async-загрузчиком в разные временные кеши.
+
+    :return: {"sequential": {...}, "async": {...}} - время, запросы, 429, свечи, пик одновременных запросов
+    """
+    names = [stub_contract(i) for i in range(contracts)]
+    rate_limit = {"enabled": True, "max_calls_per_minute": max_calls_per_minute, "on_429": "wait"}
+    results: Dict[str, Dict[str, float]] = {}
+
+    with GeckoStubServer(names, minutes, latency_ms, throttle_every, retry_after) as stub, \
+            tempfile.TemporaryDirectory() as tmp:
+        start = stub.series_start
+        end = start + timedelta(minutes=minutes - 1)
+        windows = [(name, start, end) for name in names]
+        log = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+        sequential = GeckoTerminalPriceLoader(
+            cache_dir=str(Path(tmp) / "sequential"), rate_limit_config=rate_limit, base_url=stub.url
+        )
+        stub.reset_counters()
+        started = time.perf_counter()
+        with log:
+            candles = sum(len(sequential.load_prices(name, s, e)) for name, s, e in windows)
+        results["sequential"] = {
+            "seconds": time.perf_counter() - started,
+            "requests": stub.requests,
+            "http_429": stub.throttled,
+            "candles": candles,
+            "peak_in_flight": stub.peak_in_flight,
+        }
+
+        prefetcher = AsyncGeckoTerminalPriceLoader(
+            cache_dir=str(Path(tmp) / "async"),
+            rate_limit_config=rate_limit,
+            base_url=stub.url,
+            max_concurrency=max_concurrency,
+        )
+        stub.reset_counters()
+        started = time.perf_counter()
+        log = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+        with log:
+            loaded = prefetcher.prefetch(windows)
+        results["async"] = {
+            "seconds": time.perf_counter() - started,
+            "requests": stub.requests,
+            "http_429": stub.throttled,
+            "candles": sum(loaded.values()),
+            "peak_in_flight": stub.peak_in_flight,
+        }
+        prefetcher.close()
+    return results
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark sequential vs concurrent GeckoTerminal candle loading against a local stub server",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m backtester.tools.bench_gecko_prefetch --contracts 20 --latency-ms 50
+  python -m backtester.tools.bench_gecko_prefetch --contracts 50 --throttle-every 10 --retry-after 0.5 --max-concurrency 16
+        """
+    )
+    parser.add_argument("--contracts", type=int, default=20, help="Number of stub contracts (default: 20)")
+    parser.add_argument("--minutes", type=int, default=3000, help="Candles per contract (default: 3000)")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Stub response latency, ms (default: 50)")
+    parser.add_argument("--throttle-every", type=int, default=25, help="Every N-th request gets 429, 0 = never (default: 25)")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After of 429 responses, s (default: 0.1)")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="Async loader concurrency (default: 8)")
+    parser.add_argument("--max-calls-per-minute", type=int, default=6000, help="Rate limit for both loaders (default: 6000)")
+    parser.add_argument("--verbose", action="store_true", help="Show loader logs")
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        contracts=args.contracts,
+        minutes=args.minutes,
+        latency_ms=args.latency_ms,
+        throttle_every=args.throttle_every,
+        retry_after=args.retry_after,
+        max_concurrency=args.max_concurrency,
+        max_calls_per_minute=args.max_calls_per_minute,
+        verbose=args.verbose,
+    )
+    print(f"{'mode':<12}{'seconds':>10}{'requests':>10}{'429':>6}{'candles':>10}{'peak':>6}")
+    for mode, stats in results.items():
+        print(
+            f"{mode:<12}{stats['seconds']:>10.2f}{stats['requests']:>10}{stats['http_429']:>6}"
+            f"{stats['candles']:>10}{stats['peak_in_flight']:>6}"
+        )
+    speedup = results["sequential"]["seconds"] / max(results["async"]["seconds"], 1e-9)
+    print(f"\n[bench] async prefetch speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Конвертер CSV-свечей в колоночное memory-mapped хранилище.
+
+Поддерживает те же форматы CSV-кеша, что и CsvPriceLoader.resolve_candles_path:
+    {csv-dir}/cached/{timeframe}/{contract}.csv
+    {csv-dir}/{contract}_{timeframe}.csv (legacy)
+
+Run:
+    python -m backtester.tools.build_candle_store --csv-dir data/candles --store-dir data/candles/store --timeframe 1m
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from ..infrastructure.candle_store import ColumnarCandleStore, convert_csv_to_store
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Convert CSV candles cache into columnar memory-mapped candle store",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m backtester.tools.build_candle_store \\
+      --csv-dir data/candles \\
+      --store-dir data/candles/store \\
+      --timeframe 1m
+        """
+    )
+    parser.add_argument(
+        "--csv-dir",
+        type=str,
+        required=True,
+        help="Base directory of CSV candles (same as price_loader.csv_base_dir)",
+    )
+    parser.add_argument(
+        "--store-dir",
+        type=str,
+        default="data/candles/store",
+        help="Target store directory (default: data/candles/store)",
+    )
+    parser.add_argument(
+        "--timeframe",
+        type=str,
+        default="1m",
+        help="Candles timeframe (default: 1m)",
+    )
+    parser.add_argument(
+        "--contract",
+        action="append",
+        default=None,
+        help="Convert only this contract (can be repeated). Default: all contracts found in --csv-dir",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Rewrite contracts that already exist in the store",
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.csv_dir).exists():
+        print(f"ERROR: CSV directory does not exist: {args.csv_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    store = ColumnarCandleStore(root=args.store_dir, timeframe=args.timeframe)
+    written = convert_csv_to_store(
+        csv_base_dir=args.csv_dir,
+        store=store,
+        contracts=args.contract,
+        overwrite=args.overwrite,
+    )
+
+    converted = sum(1 for n in written.values() if n >= 0)
+    candles_total = sum(n for n in written.values() if n > 0)
+    print(f"\n[store] Converted {converted}/{len(written)} contracts, {candles_total} candles -> {store.timeframe_dir}")
+
+
+if __name__ == "__main__":
+    main()
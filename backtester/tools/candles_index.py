@@ -0,0 +1,110 @@
+"""
+Обслуживание манифеста покрытия CSV-кеша свечей (candles_index.sqlite).
+
+Run:
+    python -m backtester.tools.candles_index rebuild --cache-dir data/candles/cached
+    python -m backtester.tools.candles_index show --cache-dir data/candles/cached --timeframe 1m
+    python -m backtester.tools.candles_index compact --cache-dir data/candles/cached
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from ..infrastructure.candle_index import DEFAULT_GAP_MINUTES, CandleCacheIndex, summarize_csv
+from ..infrastructure.candle_segments import compact_segments, list_segments
+
+
+def _print_entries(index: CandleCacheIndex, timeframe: str | None, contract: str | None) -> None:
+    entries = index.entries(timeframe)
+    if contract is not None:
+        entries = [e for e in entries if e.contract == contract]
+    for e in entries:
+        print(
+            f"{e.timeframe:>4}  {e.contract}  {e.min_time:%Y-%m-%d %H:%M} .. {e.max_time:%Y-%m-%d %H:%M}  "
+            f"rows={e.rows}  gaps={len(e.gaps)}  size={e.file_size}  hash={e.content_hash[:12]}"
+        )
+    total_rows = sum(e.rows for e in entries)
+    print(f"[candles_index] {len(entries)} entries, {total_rows} candles ({index.db_path})")
+
+
+def _compact(index: CandleCacheIndex, timeframes: list | None) -> None:
+    """Вливает сегменты дозагрузки в базовые файлы и обновляет записи манифеста."""
+    compacted = segments_total = 0
+    for contract, timeframe, path in index.scan_cache_files(timeframes):
+        segments = len(list_segments(path))
+        if not segments:
+            continue
+        rows = compact_segments(path)
+        entry = summarize_csv(contract, timeframe, path, index.gap_minutes)
+        if entry is not None:
+            index.put(entry)
+        compacted += 1
+        segments_total += segments
+        print(f"[candles_index] {timeframe} {contract}: {segments} segments -> {rows} candles")
+    print(f"[candles_index] Compacted {compacted} files ({segments_total} segments)")
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Rebuild, inspect or compact the CSV candle cache and its coverage manifest",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m backtester.tools.candles_index rebuild --cache-dir data/candles/cached
+  python -m backtester.tools.candles_index rebuild --cache-dir data/candles/cached --timeframe 1m
+  python -m backtester.tools.candles_index show --cache-dir data/candles/cached --contract <address>
+  python -m backtester.tools.candles_index compact --cache-dir data/candles/cached
+        """
+    )
+    parser.add_argument(
+        "command",
+        choices=["rebuild", "show", "compact"],
+        help="rebuild: re-index cache files; show: list entries; compact: merge append segments into base files",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="data/candles/cached",
+        help="Candle cache directory (data.candles_dir, default: data/candles/cached)",
+    )
+    parser.add_argument(
+        "--timeframe",
+        action="append",
+        default=None,
+        help="Only this timeframe (can be repeated). Default: all timeframes",
+    )
+    parser.add_argument("--contract", type=str, default=None, help="show: only this contract")
+    parser.add_argument(
+        "--gap-minutes",
+        type=int,
+        default=DEFAULT_GAP_MINUTES,
+        help=f"rebuild: record gaps longer than N minutes (default: {DEFAULT_GAP_MINUTES})",
+    )
+    args = parser.parse_args()
+
+    if not Path(args.cache_dir).exists():
+        print(f"ERROR: Cache directory does not exist: {args.cache_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    index = CandleCacheIndex(args.cache_dir, gap_minutes=args.gap_minutes)
+    if args.command == "rebuild":
+        stats = index.rebuild(args.timeframe)
+        print(
+            f"[candles_index] Indexed {stats['indexed']} files "
+            f"(empty: {stats['empty']}, failed: {stats['failed']}, removed stale: {stats['removed']})"
+        )
+    elif args.command == "compact":
+        _compact(index, args.timeframe)
+    else:
+        timeframes = args.timeframe or [None]
+        for timeframe in timeframes:
+            _print_entries(index, timeframe, args.contract)
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Обслуживание хранилища признаков сигналов (feature_store).
+
+Run:
+    python -m backtester.tools.feature_store stats --store-dir data/feature_store
+    python -m backtester.tools.feature_store export --store-dir data/feature_store --feature-set signal_features --version 1-... --output features.csv
+    python -m backtester.tools.feature_store drop --store-dir data/feature_store --feature-set trade_features
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from ..infrastructure.feature_store import FeatureStore
+
+
+def _print_stats(store: FeatureStore) -> None:
+    info = store.describe()
+    print(f"[feature_store] path: {store.db_path}")
+    for name, count in sorted(info["sets"].items()):
+        print(f"[feature_store] {name}: {count} signals")
+    print(f"[feature_store] file_mb: {info['file_bytes'] / (1024 * 1024):.2f}")
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Inspect, export and drop stored signal features",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m backtester.tools.feature_store stats --store-dir data/feature_store
+  python -m backtester.tools.feature_store export --feature-set xn_analysis --version 1-0123abcd --output xn.csv
+  python -m backtester.tools.feature_store drop --feature-set signal_features
+        """
+    )
+    parser.add_argument(
+        "command",
+        choices=["stats", "export", "drop"],
+        help="stats: list feature sets; export: write one set version to CSV; drop: remove rows",
+    )
+    parser.add_argument(
+        "--store-dir",
+        type=str,
+        default="data/feature_store",
+        help="Feature store directory (feature_store.dir, default: data/feature_store)",
+    )
+    parser.add_argument("--feature-set", type=str, default=None, help="Feature set name (see stats)")
+    parser.add_argument("--version", type=str, default=None, help="Feature set version (see stats)")
+    parser.add_argument("--output", type=str, default=None, help="CSV path for export")
+    parser.add_argument(
+        "--keep-version",
+        type=str,
+        default=None,
+        help="drop: keep rows of this version and remove the other versions",
+    )
+    args = parser.parse_args()
+
+    store = FeatureStore(args.store_dir)
+    if not store.db_path.exists():
+        print(f"[ERROR] Feature store not found: {store.db_path}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "export":
+        if not args.feature_set or not args.version or not args.output:
+            print("[ERROR] export needs --feature-set, --version and --output", file=sys.stderr)
+            sys.exit(2)
+        frame = store.read_frame(args.feature_set, args.version)
+        frame.to_csv(args.output, index=False)
+        print(f"[feature_store] Exported {len(frame)} signals to {args.output}")
+    elif args.command == "drop":
+        removed = store.delete(feature_set=args.feature_set, keep_version=args.keep_version)
+        print(f"[feature_store] Removed {removed} rows")
+
+    _print_stats(store)
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Кеш соответствия контракт -> pool_id GeckoTerminal (pool_ids.sqlite).
+
+Run:
+    python -m backtester.tools.resolve_pools resolve --signals signals/example_signals.csv --cache-dir data/candles/cached
+    python -m backtester.tools.resolve_pools show --cache-dir data/candles/cached
+    python -m backtester.tools.resolve_pools forget-missing --cache-dir data/candles/cached
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ..infrastructure.pool_cache import DEFAULT_NEGATIVE_TTL_HOURS, DEFAULT_POOL_TTL_DAYS, PoolIdCache
+from ..infrastructure.price_loader import GECKO_API_BASE_URL, GeckoTerminalPriceLoader, RateLimitExceededError
+from ..infrastructure.signal_loader import CsvSignalLoader
+
+
+def _resolve(args: argparse.Namespace) -> int:
+    """Разрешает pool_id для всех контрактов файла сигналов. :return: код выхода"""
+    if not args.signals:
+        print("ERROR: --signals is required for resolve", file=sys.stderr)
+        return 1
+    signals = CsvSignalLoader(args.signals).load_signals()
+    contracts = list(dict.fromkeys(s.contract_address for s in signals))
+    loader = GeckoTerminalPriceLoader(
+        cache_dir=args.cache_dir,
+        timeframe=args.timeframe,
+        base_url=args.base_url,
+        use_index=False,
+        pool_cache_ttl_days=args.ttl_days,
+        pool_negative_ttl_hours=args.negative_ttl_hours,
+    )
+    started = time.perf_counter()
+    try:
+        resolved = loader.resolve_pool_ids(contracts, refresh=args.refresh)
+    except RateLimitExceededError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    found = sum(1 for pool_id in resolved.values() if pool_id is not None)
+    stats = loader.pool_cache.summary() if loader.pool_cache is not None else {}
+    print(
+        f"[pools] {len(contracts)} contracts: {found} resolved, {len(contracts) - found} without pool "
+        f"(cache hits: {stats.get('hits', 0)}, negative hits: {stats.get('negative_hits', 0)}, "
+        f"API lookups: {stats.get('misses', 0)}) in {elapsed:.2f}s"
+    )
+    return 0
+
+
+def _show(cache: PoolIdCache, contract: str | None) -> None:
+    entries = cache.entries()
+    if contract is not None:
+        entries = [e for e in entries if e.contract == contract]
+    now = time.time()
+    for e in entries:
+        resolved_at = datetime.fromtimestamp(e.resolved_at, tz=timezone.utc)
+        state = "expired" if cache.is_expired(e, now) else "valid"
+        pool = e.pool_id if e.pool_id is not None else f"- ({e.detail})"
+        print(f"{e.contract}  {pool}  {resolved_at:%Y-%m-%d %H:%M}  {state}")
+    negative = sum(1 for e in entries if e.is_negative)
+    print(f"[pools] {len(entries)} entries, {negative} negative ({cache.db_path})")
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Resolve and inspect cached GeckoTerminal pool ids (pool_ids.sqlite)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m backtester.tools.resolve_pools resolve --signals signals/example_signals.csv
+  python -m backtester.tools.resolve_pools resolve --signals signals/example_signals.csv --refresh
+  python -m backtester.tools.resolve_pools show --cache-dir data/candles/cached --contract <address>
+  python -m backtester.tools.resolve_pools forget-missing --cache-dir data/candles/cached
+        """
+    )
+    parser.add_argument(
+        "command",
+        choices=["resolve", "show", "forget-missing"],
+        help="resolve: look up pools for a signals file; show: list entries; forget-missing: drop negative entries",
+    )
+    parser.add_argument("--signals", type=str, default=None, help="resolve: signals CSV file")
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="data/candles/cached",
+        help="Candle cache directory (data.candles_dir, default: data/candles/cached)",
+    )
+    parser.add_argument("--timeframe", type=str, default="1m", choices=["1m", "15m"], help="resolve: timeframe")
+    parser.add_argument("--refresh", action="store_true", help="resolve: query the API even for cached contracts")
+    parser.add_argument(
+        "--ttl-days",
+        type=float,
+        default=DEFAULT_POOL_TTL_DAYS,
+        help=f"Pool id lifetime in days (default: {DEFAULT_POOL_TTL_DAYS:g})",
+    )
+    parser.add_argument(
+        "--negative-ttl-hours",
+        type=float,
+        default=DEFAULT_NEGATIVE_TTL_HOURS,
+        help=f"Lifetime of 'no pool' entries in hours, 0 disables them (default: {DEFAULT_NEGATIVE_TTL_HOURS:g})",
+    )
+    parser.add_argument("--base-url", type=str, default=GECKO_API_BASE_URL, help="resolve: GeckoTerminal API base URL")
+    parser.add_argument("--contract", type=str, default=None, help="show: only this contract")
+    args = parser.parse_args()
+
+    if args.command == "resolve":
+        sys.exit(_resolve(args))
+
+    if not Path(args.cache_dir).exists():
+        print(f"ERROR: Cache directory does not exist: {args.cache_dir}", file=sys.stderr)
+        sys.exit(1)
+    cache = PoolIdCache(args.cache_dir, ttl_days=args.ttl_days, negative_ttl_hours=args.negative_ttl_hours)
+    if args.command == "forget-missing":
+        print(f"[pools] Removed {cache.forget_missing()} negative entries ({cache.db_path})")
+    else:
+        _show(cache, args.contract)
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Обслуживание персистентного кеша результатов стратегий (result_cache).
+
+Run:
+    python -m backtester.tools.result_cache stats --cache-dir data/result_cache
+    python -m backtester.tools.result_cache prune --cache-dir data/result_cache --stale-versions --older-than-days 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from ..infrastructure.result_cache import ResultCache
+
+
+def _print_stats(cache: ResultCache) -> None:
+    info = cache.describe()
+    print(f"[result_cache] path: {cache.db_path}")
+    print(f"[result_cache] code_version: {cache.code_version}")
+    print(f"[result_cache] entries: {info['entries']} (current code version: {info['entries_current_version']})")
+    print(f"[result_cache] payload_mb: {info['payload_bytes'] / (1024 * 1024):.2f}")
+    print(f"[result_cache] file_mb: {info['file_bytes'] / (1024 * 1024):.2f}")
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Inspect and prune the persistent strategy result cache",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python -m backtester.tools.result_cache stats --cache-dir data/result_cache
+  python -m backtester.tools.result_cache prune --cache-dir data/result_cache --stale-versions
+  python -m backtester.tools.result_cache prune --cache-dir data/result_cache --older-than-days 30 --max-mb 512
+        """
+    )
+    parser.add_argument("command", choices=["stats", "prune"], help="stats: show cache size; prune: remove entries")
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="data/result_cache",
+        help="Result cache directory (result_cache.dir, default: data/result_cache)",
+    )
+    parser.add_argument(
+        "--code-version",
+        type=str,
+        default=None,
+        help="Extra version label (result_cache.code_version) used to detect the current code version",
+    )
+    parser.add_argument(
+        "--stale-versions",
+        action="store_true",
+        help="Remove entries produced by other versions of strategy code",
+    )
+    parser.add_argument(
+        "--older-than-days",
+        type=float,
+        default=None,
+        help="Remove entries not used for more than N days",
+    )
+    parser.add_argument(
+        "--max-mb",
+        type=float,
+        default=None,
+        help="Keep at most N MB of results, evicting least recently used entries",
+    )
+    args = parser.parse_args()
+
+    cache = ResultCache(args.cache_dir, code_version=args.code_version)
+    if not cache.db_path.exists():
+        print(f"[ERROR] Result cache not found: {cache.db_path}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "prune":
+        if not args.stale_versions and args.older_than_days is None and args.max_mb is None:
+            print("[ERROR] prune needs at least one of --stale-versions, --older-than-days, --max-mb", file=sys.stderr)
+            sys.exit(2)
+        removed = cache.prune(
+            older_than_days=args.older_than_days,
+            stale_versions=args.stale_versions,
+            max_bytes=int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None,
+        )
+        print(f"[result_cache] Removed {removed} entries")
+
+    _print_stats(cache)
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@
 import argparse                         # Для обработки аргументов командной строки
 import json                             # Для сохранения результатов в формате JSON
 from pathlib import Path                # Удобная работа с путями к файлам и директориям
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from datetime import datetime
 from collections import defaultdict     # Для группировки результатов по стратегиям
 import yaml                             # Для загрузки YAML конфигураций
@@ -16,11 +16,16 @@ import sys                              # Для определения плат
 import pandas as pd                     # Для генерации summary CSV
 
 # Импорт основных компонентов бэктестера
-from backtester.application.runner import BacktestRunner  # Главный исполнитель бэктеста
+from backtester.application.runner import BacktestRunner, candle_window_for_config  # Главный исполнитель бэктеста
+from backtester.application.prefetch_planner import build_prefetch_plan, execute_prefetch_plan
 
 # Загрузчики сигналов и цен
 from backtester.infrastructure.signal_loader import CsvSignalLoader
-from backtester.infrastructure.price_loader import CsvPriceLoader, GeckoTerminalPriceLoader
+from backtester.infrastructure.price_loader import CsvPriceLoader, GeckoTerminalPriceLoader, GECKO_API_BASE_URL
+from backtester.infrastructure.async_gecko_loader import AsyncGeckoTerminalPriceLoader
+from backtester.infrastructure.candle_store import ColumnarPriceLoader
+from backtester.infrastructure.derived_candles import ResampledPriceLoader
+from backtester.infrastructure.result_sink import SpillResultSink
 
 # Reporter для генерации отчетов
 from backtester.infrastructure.reporter import Reporter
@@ -113,6 +118,11 @@ def parse_args():
         default=None,
         help="Execution profile для применения slippage (realistic/stress/custom). Переопределяет YAML конфиг."
     )
+    parser.add_argument(
+        "--no-result-cache",
+        action="store_true",
+        help="Не использовать персистентный кеш результатов стратегий (result_cache) - полный пересчет"
+    )
     parser.add_argument(
         "--reports-dir",
         type=str,
@@ -544,6 +554,39 @@ def select_top_strategies(
 
 
 
+def result_row_to_json(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Строка результата -> JSON-совместимый dict (формат results.json)."""
+    r = row["result"]
+    return {
+        **row,
+        "timestamp": row["timestamp"].isoformat() if isinstance(row["timestamp"], datetime) else row["timestamp"],
+        "result": {
+            "entry_time": r.entry_time.isoformat() if r.entry_time else None,
+            "entry_price": r.entry_price,
+            "exit_time": r.exit_time.isoformat() if r.exit_time else None,
+            "exit_price": r.exit_price,
+            "pnl": r.pnl,
+            "reason": r.reason,
+            "meta": r.meta,
+        },
+    }
+
+
+def write_results_json(output_path: Path, rows: Iterable[Dict[str, Any]]) -> None:
+    """
+    Пишет results.json построчно (без сборки всего списка в памяти).
+    Формат совпадает с json.dump(list, indent=2).
+    """
+    with output_path.open("w", encoding="utf-8") as f:
+        first = True
+        for row in rows:
+            item = json.dumps(result_row_to_json(row), indent=2)
+            f.write("[\n" if first else ",\n")
+            f.write("\n".join("  " + line for line in item.splitlines()))
+            first = False
+        f.write("[]" if first else "\n]")
+
+
 def main():
     args = parse_args()  # Получаем аргументы запуска
 
@@ -557,36 +600,86 @@ def main():
         backtest_cfg["portfolio"]["execution_profile"] = args.execution_profile
         print(f"[config] Overriding execution_profile to: {args.execution_profile}")
     
+    if args.no_result_cache:
+        backtest_cfg["result_cache"] = {**(backtest_cfg.get("result_cache") or {}), "enabled": False}
+        print("[config] Result cache disabled (--no-result-cache)")
+    
     data_cfg = backtest_cfg.get("data", {})
 
     # Извлекаем настройки загрузки свечей
     candles_dir = data_cfg.get("candles_dir", "data/candles")
     timeframe = data_cfg.get("timeframe", "1m")
+    # derive_from_1m: лоадер работает с 1m, старший таймфрейм агрегируется на лету (кеш в derived_dir)
+    derive_from_1m = bool(data_cfg.get("derive_from_1m", False)) and timeframe != "1m"
+    source_timeframe = "1m" if derive_from_1m else timeframe
 
     # Загружаем сигналы из CSV
     signal_loader = CsvSignalLoader(args.signals)
     signals = signal_loader.load_signals()  # Загружаем один раз для использования в Reporter
     signal_map = {s.id: s for s in signals}  # Создаем карту для быстрого доступа
 
-    # Выбираем загрузчик цен: либо Gecko API, либо CSV
-    if data_cfg.get("loader", "csv") == "gecko":
+    # Загружаем стратегии (до лоадера: окно свечей для prefetch считается по их time stop)
+    strategies = load_strategies(args.strategies_config)
+    # То же окно, что вычислит BacktestRunner (data.auto_window)
+    window_before_minutes, window_after_minutes = candle_window_for_config(strategies, data_cfg)
+
+    # Выбираем загрузчик цен: Gecko API, колоночное хранилище или CSV
+    loader_type = data_cfg.get("loader", "csv")
+    prefetch_cfg = data_cfg.get("prefetch") or {}
+    if loader_type == "gecko":
         rate_limit_config = data_cfg.get("rate_limit", {})
-        price_loader = GeckoTerminalPriceLoader(
+        gecko_kwargs = dict(
             cache_dir=candles_dir,
-            timeframe=timeframe,
-            rate_limit_config=rate_limit_config
+            timeframe=source_timeframe,
+            rate_limit_config=rate_limit_config,
+            base_url=data_cfg.get("gecko_base_url", GECKO_API_BASE_URL),
+            internal_gap_minutes=data_cfg.get("internal_gap_minutes"),
+            max_cache_segments=int(data_cfg.get("cache_max_segments", 16)),
+            pool_cache_ttl_days=data_cfg.get("pool_cache_ttl_days", 30),
+            pool_negative_ttl_hours=data_cfg.get("pool_negative_ttl_hours", 24),
+        )
+        if prefetch_cfg.get("enabled", False):
+            price_loader = AsyncGeckoTerminalPriceLoader(
+                max_concurrency=int(prefetch_cfg.get("max_concurrency", 8)),
+                **gecko_kwargs,
+            )
+        else:
+            price_loader = GeckoTerminalPriceLoader(**gecko_kwargs)
+    elif loader_type == "store":
+        # Колоночное memory-mapped хранилище (см. backtester.tools.build_candle_store)
+        price_loader = ColumnarPriceLoader(
+            store_dir=data_cfg.get("store_dir", "data/candles/store"),
+            timeframe=source_timeframe,
         )
     else:
         # Для CsvPriceLoader: base_dir можно указать в конфиге или использовать candles_dir как fallback
         csv_base_dir = data_cfg.get("price_loader", {}).get("csv_base_dir") or candles_dir
         price_loader = CsvPriceLoader(
             candles_dir=candles_dir,
-            timeframe=timeframe,
+            timeframe=source_timeframe,
             base_dir=csv_base_dir
         )
 
-    # Загружаем стратегии
-    strategies = load_strategies(args.strategies_config)
+    # План загрузки строится для любого загрузчика: окна сигналов объединяются по контрактам,
+    # сводка показывает объем свечей запуска (и покрытие кешем, если загрузчик его сообщает)
+    prefetch_plan = build_prefetch_plan(
+        signals,
+        before_minutes=window_before_minutes,
+        after_minutes=window_after_minutes,
+        merge_gap_minutes=int(prefetch_cfg.get("merge_gap_minutes", 0)),
+    )
+    print(prefetch_plan.summary(price_loader))
+    if loader_type == "gecko" and prefetch_cfg.get("enabled", False):
+        # Конкурентная загрузка из сети (дисковый кеш) до запуска стратегий
+        execute_prefetch_plan(prefetch_plan, price_loader)
+
+    if derive_from_1m:
+        price_loader = ResampledPriceLoader(
+            price_loader,
+            timeframe,
+            cache_dir=data_cfg.get("derived_dir") or str(Path(candles_dir) / "derived"),
+        )
+        print(f"[data] Timeframe {timeframe} is derived from 1m candles")
 
     # Создаем Reporter для генерации отчетов
     # Жестко фиксируем reports_dir: CLI аргумент имеет приоритет, затем YAML, затем дефолт
@@ -619,6 +712,8 @@ def main():
     # Получаем настройки параллельной обработки
     runtime_cfg = backtest_cfg.get("runtime", {})
     parallel = runtime_cfg.get("parallel", False)
+    executor = runtime_cfg.get("executor", "thread")  # "thread" или "process"
+    streaming = bool(runtime_cfg.get("streaming", False))  # потоковый режим: результаты через spill на диск
     
     # Определяем дефолт для max_workers в зависимости от платформы
     if args.max_workers is not None:
@@ -641,23 +736,49 @@ def main():
         global_config=backtest_cfg,
         parallel=parallel,
         max_workers=max_workers,
+        executor=executor,
     )
 
-    # Запуск стратегий
-    results = runner.run(include_skipped_attempts=True)  # v1.9: включаем skipped attempts для portfolio events
-    print(f"Backtest finished. Results count: {len(results)}")
+    # Прогрев кеша загрузчика, которым пользуется runner (CachingPriceLoader при data.cache_max_mb):
+    # один load на объединенный интервал плана вместо загрузки на каждый сигнал
+    warmed = execute_prefetch_plan(prefetch_plan, runner.price_loader)
+    print(f"[prefetch] Warmed {len(warmed)} contracts, {sum(warmed.values())} candles")
 
-    # Группируем результаты по стратегиям
-    results_by_strategy = defaultdict(list)
-    
-    for row in results:
-        # Добавляем информацию о сигнале для Reporter
-        signal = signal_map.get(row["signal_id"])
-        if signal:
-            row["source"] = signal.source
-            row["narrative"] = signal.narrative
-        
-        results_by_strategy[row["strategy"]].append(row)
+    # Запуск стратегий
+    result_sink: Optional[SpillResultSink] = None
+    if streaming:
+        # Потоковый режим: строки уходят в колоночные spill-файлы по стратегиям, self.results не растет
+        result_sink = SpillResultSink(
+            Path(reports_dir) / "_spill",
+            batch_size=int(runtime_cfg.get("spill_batch_size", 1000)),
+        )
+        for row in runner.iter_results(include_skipped_attempts=True):  # v1.9: включаем skipped attempts
+            # Добавляем информацию о сигнале для Reporter
+            signal = signal_map.get(row["signal_id"])
+            if signal:
+                row["source"] = signal.source
+                row["narrative"] = signal.narrative
+            result_sink.write(row)
+        result_sink.flush()
+        # Ленивое отображение: строки стратегии читаются с диска при обращении
+        results_by_strategy = result_sink.results_by_strategy()
+        results_count = sum(result_sink.count(name) for name in result_sink.strategy_names())
+        print(f"Backtest finished (streaming). Results count: {results_count}")
+    else:
+        results = runner.run(include_skipped_attempts=True)  # v1.9: включаем skipped attempts для portfolio events
+        print(f"Backtest finished. Results count: {len(results)}")
+
+        # Группируем результаты по стратегиям
+        results_by_strategy = defaultdict(list)
+        
+        for row in results:
+            # Добавляем информацию о сигнале для Reporter
+            signal = signal_map.get(row["signal_id"])
+            if signal:
+                row["source"] = signal.source
+                row["narrative"] = signal.narrative
+            
+            results_by_strategy[row["strategy"]].append(row)
 
     # Сохраняем таблицы сделок для всех стратегий
     for strategy_name, strategy_results in results_by_strategy.items():
@@ -687,15 +808,20 @@ def main():
 
     # Печатаем краткий результат для каждой стратегии
     print("\n📈 Strategy-level Summary:")
-    for row in results:
-        r = row["result"]
-        print(f"🔁 {row['strategy']} → entry: {r.entry_price}, exit: {r.exit_price}, pnl: {round(r.pnl * 100, 2)}%, reason: {r.reason}")
+    if result_sink is not None:
+        # В потоковом режиме строк слишком много для построчного вывода - только количество по стратегиям
+        for strategy_name in result_sink.strategy_names():
+            print(f"🔁 {strategy_name} → results: {result_sink.count(strategy_name)}")
+    else:
+        for row in results:
+            r = row["result"]
+            print(f"🔁 {row['strategy']} → entry: {r.entry_price}, exit: {r.exit_price}, pnl: {round(r.pnl * 100, 2)}%, reason: {r.reason}")
 
     # Запускаем портфельную симуляцию
     print("\n" + "="*60)
     print("💼 PORTFOLIO SIMULATION")
     print("="*60)
-    portfolio_results = runner.run_portfolio()
+    portfolio_results = runner.run_portfolio(sink=result_sink)
 
     # Определяем стратегии для генерации отчетов после портфельной симуляции
     if args.report_mode == "top":
@@ -769,35 +895,15 @@ def main():
         output_path = Path(args.json_output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Сериализация результатов в JSON
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(
-                [
-                    {
-                        **{
-                            **row,
-                            "timestamp": row["timestamp"].isoformat() if isinstance(row["timestamp"], datetime) else row["timestamp"],
-                            "result": {
-                                "entry_time": r.entry_time.isoformat() if r.entry_time else None,
-                                "entry_price": r.entry_price,
-                                "exit_time": r.exit_time.isoformat() if r.exit_time else None,
-                                "exit_price": r.exit_price,
-                                "pnl": r.pnl,
-                                "reason": r.reason,
-                                "meta": r.meta,
-                            },
-                        }
-                    }
-                    for row in results
-                    for r in [row["result"]]
-                ],
-                f,
-                indent=2
-            )
+        # Сериализация результатов в JSON (построчно; в потоковом режиме - стратегия за стратегией)
+        write_results_json(output_path, result_sink.iter_rows() if result_sink is not None else results)
         print(f"\n📤 Saved JSON output to {output_path}")
     except Exception as e:
         print(f"⚠️ Failed to save JSON output: {e}")
 
+    if result_sink is not None:
+        result_sink.cleanup()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,104 @@
+"""
+Tests for the signal-driven prefetch planner: union of signal windows per contract.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from backtester.application.prefetch_planner import PrefetchInterval, build_prefetch_plan, execute_prefetch_plan
+from backtester.domain.models import Candle, Signal
+from backtester.infrastructure.candle_cache import CachingPriceLoader
+from backtester.infrastructure.price_loader import GeckoTerminalPriceLoader
+
+
+BASE_TIME = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+
+def _signal(i: int, contract: str, minute: int) -> Signal:
+    return Signal(
+        id=f"s{i}",
+        contract_address=contract,
+        timestamp=BASE_TIME + timedelta(minutes=minute),
+        source="test",
+        narrative="",
+    )
+
+
+class RecordingLoader:
+    def __init__(self):
+        self.calls = []
+
+    def load_prices(self, contract_address, start_time=None, end_time=None) -> List[Candle]:
+        self.calls.append((contract_address, start_time, end_time))
+        return [Candle(timestamp=start_time, open=1.0, high=1.0, low=1.0, close=1.0, volume=1.0)]
+
+
+def test_overlapping_windows_are_merged_per_contract():
+    signals = [
+        _signal(0, "AAA", 100),
+        _signal(1, "AAA", 130),   # пересекается с первым окном
+        _signal(2, "BBB", 100),
+        _signal(3, "AAA", 500),   # отдельный интервал
+        _signal(4, "AAA", 110),
+    ]
+    plan = build_prefetch_plan(signals, before_minutes=10, after_minutes=60)
+
+    assert plan.intervals == [
+        PrefetchInterval("AAA", BASE_TIME + timedelta(minutes=90), BASE_TIME + timedelta(minutes=190), 3),
+        PrefetchInterval("AAA", BASE_TIME + timedelta(minutes=490), BASE_TIME + timedelta(minutes=560), 1),
+        PrefetchInterval("BBB", BASE_TIME + timedelta(minutes=90), BASE_TIME + timedelta(minutes=160), 1),
+    ]
+    assert plan.contracts == 2
+    assert plan.window_count == 5
+    assert plan.window_minutes == 5 * 70
+    assert plan.total_minutes == 100 + 70 + 70
+
+    # Разрыв 300 минут между интервалами AAA закрывается при merge_gap_minutes >= 300
+    merged = build_prefetch_plan(signals, before_minutes=10, after_minutes=60, merge_gap_minutes=300)
+    assert [i.signal_count for i in merged.intervals] == [4, 1]
+
+
+def test_execute_plan_issues_one_load_per_interval():
+    signals = [_signal(i, "AAA", 100 + i) for i in range(10)]
+    plan = build_prefetch_plan(signals, before_minutes=10, after_minutes=60)
+    loader = RecordingLoader()
+
+    loaded = execute_prefetch_plan(plan, loader)  # type: ignore[arg-type]
+
+    assert loader.calls == [("AAA", BASE_TIME + timedelta(minutes=90), BASE_TIME + timedelta(minutes=169))]
+    assert loaded == {"AAA": 1}
+
+
+def test_execute_plan_warms_caching_loader():
+    signals = [_signal(0, "AAA", 100), _signal(1, "AAA", 120), _signal(2, "BBB", 100)]
+    plan = build_prefetch_plan(signals, before_minutes=10, after_minutes=60)
+    inner = RecordingLoader()
+    loader = CachingPriceLoader(inner, max_bytes=1 << 20, full_history=False)  # type: ignore[arg-type]
+
+    execute_prefetch_plan(plan, loader)
+    assert len(inner.calls) == 2
+
+    # Окна сигналов после прогрева - срезы кеша, без обращений к inner
+    for sig in signals:
+        loader.load_arrays(sig.contract_address, sig.timestamp - timedelta(minutes=10), sig.timestamp + timedelta(minutes=60))
+    assert len(inner.calls) == 2
+    assert loader.get_cache_summary()["hits"] == 3
+
+
+def test_summary_reports_cache_coverage(tmp_path):
+    loader = GeckoTerminalPriceLoader(cache_dir=str(tmp_path), rate_limit_config={"enabled": False})
+    cached = [
+        Candle(timestamp=BASE_TIME + timedelta(minutes=m), open=1.0, high=1.0, low=1.0, close=1.0, volume=1.0)
+        for m in range(0, 151)
+    ]
+    loader._save_to_cache(loader._get_cache_path("AAA"), cached)
+
+    # AAA: 100 минут, из них в кеше 60 (90..150); BBB без кеша: 100 минут
+    plan = build_prefetch_plan(
+        [_signal(0, "AAA", 100), _signal(1, "BBB", 100)], before_minutes=10, after_minutes=90
+    )
+    assert plan.cache_coverage(loader) == 60 / 200
+    summary = plan.summary(loader)
+    assert "2 contracts" in summary
+    assert "200 candle minutes" in summary
+    assert "cache coverage 30.0%" in summary
+    assert "cache coverage n/a" in plan.summary(RecordingLoader())  # type: ignore[arg-type]
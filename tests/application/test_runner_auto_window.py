@@ -0,0 +1,138 @@
+"""
+Tests for strategy-aware candle window sizing in BacktestRunner (data.auto_window).
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+from backtester.application.runner import BacktestRunner, candle_window_for_config, required_candle_window
+from backtester.domain.models import Signal
+from backtester.domain.runner_config import create_runner_config_from_dict
+from backtester.domain.runner_strategy import RunnerStrategy
+from backtester.infrastructure.price_loader import CsvPriceLoader
+
+
+BASE_TIME = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+
+class ListSignalLoader:
+    def __init__(self, signals: List[Signal]):
+        self.signals = signals
+
+    def load_signals(self) -> List[Signal]:
+        return list(self.signals)
+
+
+class RecordingLoader(CsvPriceLoader):
+    """CsvPriceLoader, запоминающий запрошенные окна."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = []
+
+    def load_arrays(self, contract_address, start_time=None, end_time=None):
+        self.requests.append((contract_address, start_time, end_time))
+        return super().load_arrays(contract_address, start_time, end_time)
+
+
+def _write_candles(path: Path, minutes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["timestamp,open,high,low,close,volume"]
+    price = 1.0
+    for i in minutes:
+        price *= 1.01
+        ts = (BASE_TIME + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        lines.append(f"{ts},{price},{price * 1.02},{price * 0.98},{price},{100 + i}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _strategy(name: str, time_stop_minutes) -> RunnerStrategy:
+    return RunnerStrategy(create_runner_config_from_dict(name, {
+        "take_profit_levels": [{"xn": 10.0, "fraction": 1.0}],
+        "time_stop_minutes": time_stop_minutes,
+    }))
+
+
+def _run(tmp_path: Path, strategies, auto_window: bool, signal_minute: int = 100):
+    base = tmp_path / "candles"
+    if not base.exists():
+        # Разрыв в данных AAA: после минуты 200 свечей нет до минуты 400
+        _write_candles(base / "cached" / "1m" / "AAA.csv", list(range(0, 200)) + list(range(400, 900)))
+        _write_candles(base / "cached" / "1m" / "BBB.csv", range(0, 900))
+    loader = RecordingLoader(candles_dir=str(base), timeframe="1m", base_dir=str(base))
+    signals = [
+        Signal(id="a", contract_address="AAA", timestamp=BASE_TIME + timedelta(minutes=signal_minute), source="t", narrative=""),
+        Signal(id="b", contract_address="BBB", timestamp=BASE_TIME + timedelta(minutes=signal_minute), source="t", narrative=""),
+    ]
+    runner = BacktestRunner(
+        signal_loader=ListSignalLoader(signals),  # type: ignore[arg-type]
+        price_loader=loader,
+        reporter=None,
+        strategies=strategies,
+        global_config={"data": {"before_minutes": 120, "after_minutes": 600, "auto_window": auto_window}},
+    )
+    results = runner.run()
+    return runner, loader, [(r["signal_id"], r["strategy"], r["result"]) for r in results]
+
+
+def test_required_candle_window_is_clamped_by_config():
+    strategies = [_strategy("R30", 30), _strategy("R90", 90)]
+    assert required_candle_window(strategies, 120, 600) == (60, 90)
+    assert required_candle_window(strategies, 10, 45) == (10, 45)
+    # Стратегия без time stop держит позицию до конца данных - окно из конфига
+    assert required_candle_window(strategies + [_strategy("R_inf", None)], 120, 600) == (60, 600)
+    assert required_candle_window([], 120, 600) == (120, 600)
+
+
+def test_auto_window_loads_less_and_keeps_results(tmp_path):
+    strategies = [_strategy("R30", 30), _strategy("R90", 90)]
+    runner, loader, auto_rows = _run(tmp_path, strategies, auto_window=True)
+    assert (runner.window_before_minutes, runner.window_after_minutes) == (60, 90)
+
+    signal_time = BASE_TIME + timedelta(minutes=100)
+    bbb_requests = [r for r in loader.requests if r[0] == "BBB"]
+    assert bbb_requests == [("BBB", signal_time - timedelta(minutes=60), signal_time + timedelta(minutes=90))]
+    # AAA: time stop (минута 190) попадает на свечу, окна хватает
+    assert len([r for r in loader.requests if r[0] == "AAA"]) == 1
+
+    _, _, full_rows = _run(tmp_path, strategies, auto_window=False)
+    assert auto_rows == full_rows
+
+
+def test_auto_window_falls_back_to_config_window_on_data_gap(tmp_path):
+    # Сигнал на минуте 150: time stop 90 -> минута 240 попадает в разрыв AAA (200..400)
+    strategies = [_strategy("R90", 90)]
+    _, loader, auto_rows = _run(tmp_path, strategies, auto_window=True, signal_minute=150)
+    signal_time = BASE_TIME + timedelta(minutes=150)
+    aaa_ends = [r[2] for r in loader.requests if r[0] == "AAA"]
+    assert aaa_ends == [signal_time + timedelta(minutes=90), signal_time + timedelta(minutes=600)]
+
+    _, _, full_rows = _run(tmp_path, strategies, auto_window=False, signal_minute=150)
+    assert auto_rows == full_rows
+
+
+def test_auto_window_is_off_by_default():
+    runner = BacktestRunner(
+        signal_loader=ListSignalLoader([]),  # type: ignore[arg-type]
+        price_loader=None,  # type: ignore[arg-type]
+        reporter=None,
+        strategies=[_strategy("R30", 30)],
+        global_config={"data": {"before_minutes": 120, "after_minutes": 600}},
+    )
+    assert (runner.window_before_minutes, runner.window_after_minutes) == (120, 600)
+
+
+def test_candle_window_for_config_matches_runner():
+    strategies = [_strategy("R30", 30)]
+    for data_cfg in ({"before_minutes": 120, "after_minutes": 600},
+                     {"before_minutes": 120, "after_minutes": 600, "auto_window": True}):
+        runner = BacktestRunner(
+            signal_loader=ListSignalLoader([]),  # type: ignore[arg-type]
+            price_loader=None,  # type: ignore[arg-type]
+            reporter=None,
+            strategies=strategies,
+            global_config={"data": dict(data_cfg)},
+        )
+        window = candle_window_for_config(strategies, data_cfg)
+        assert window == (runner.window_before_minutes, runner.window_after_minutes)
+    assert window == (60, 30)
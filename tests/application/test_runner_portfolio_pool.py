@@ -0,0 +1,75 @@
+"""
+Tests for BacktestRunner.run_portfolio: per-strategy partitioning and process-pool simulation
+must give the same PortfolioResult as the sequential path.
+"""
+from datetime import datetime, timedelta, timezone
+
+from backtester.application.runner import BacktestRunner
+from backtester.domain.models import StrategyOutput
+from backtester.infrastructure.result_sink import ListResultSink
+
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _results(n_strategies: int = 4, n_signals: int = 30):
+    rows = []
+    for i in range(n_signals):
+        ts = BASE_TIME + timedelta(hours=i)
+        for k in range(n_strategies):
+            pnl = ((i * 7 + k * 3) % 11 - 4) / 10.0
+            rows.append({
+                "signal_id": f"s{i}",
+                "contract_address": f"C{i % 5}",
+                "strategy": f"S{k}",
+                "timestamp": ts,
+                "result": StrategyOutput(
+                    entry_time=ts,
+                    entry_price=1.0,
+                    exit_time=ts + timedelta(hours=1 + 2 * k, minutes=30),
+                    exit_price=1.0 + pnl,
+                    pnl=pnl,
+                    reason="ladder_tp" if pnl > 0 else "time_stop",
+                ),
+            })
+    return rows
+
+
+def _runner(parallel: bool, executor: str = "thread") -> BacktestRunner:
+    runner = BacktestRunner(
+        signal_loader=None,  # type: ignore[arg-type]
+        price_loader=None,  # type: ignore[arg-type]
+        reporter=None,
+        strategies=[],
+        global_config={"portfolio": {"initial_balance_sol": 10.0, "percent_per_trade": 0.1, "max_open_positions": 3}},
+        parallel=parallel,
+        max_workers=2,
+        executor=executor,
+    )
+    runner.results = _results()
+    return runner
+
+
+def _summary(portfolio):
+    return [
+        (name, r.stats.final_balance_sol, r.stats.trades_executed, r.stats.trades_skipped_by_risk, len(r.positions))
+        for name, r in portfolio.items()
+    ]
+
+
+def test_process_pool_matches_sequential():
+    expected = _runner(parallel=False).run_portfolio()
+    actual = _runner(parallel=True).run_portfolio()
+    assert list(actual) == ["S0", "S1", "S2", "S3"]
+    assert _summary(actual) == _summary(expected)
+    assert _runner(parallel=False, executor="process").run_portfolio().keys() == expected.keys()
+
+
+def test_sink_path_matches_list_path():
+    runner = _runner(parallel=True)
+    sink = ListResultSink()
+    for row in runner.results:
+        sink.write(row)
+    expected = _summary(_runner(parallel=False).run_portfolio())
+    runner.results = []
+    assert _summary(runner.run_portfolio(sink=sink)) == expected
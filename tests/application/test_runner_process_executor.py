@@ -0,0 +1,138 @@
+"""
+Tests for BacktestRunner runtime.executor=process: results and counters must match sequential mode.
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+import pytest
+
+import backtester.application.runner as runner_module
+from backtester.application.runner import BacktestRunner
+from backtester.domain.models import Signal
+from backtester.domain.runner_config import create_runner_config_from_dict
+from backtester.domain.runner_strategy import RunnerStrategy
+from backtester.infrastructure.candle_cache import CachingPriceLoader
+from backtester.infrastructure.price_loader import CsvPriceLoader, GeckoTerminalPriceLoader
+
+
+BASE_TIME = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+
+class ListSignalLoader:
+    def __init__(self, signals: List[Signal]):
+        self.signals = signals
+
+    def load_signals(self) -> List[Signal]:
+        return list(self.signals)
+
+
+def _write_candles(path: Path, rows: int, pump_at: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["timestamp,open,high,low,close,volume"]
+    price = 1.0
+    for i in range(rows):
+        price *= 1.6 if i == pump_at else 1.001
+        ts = (BASE_TIME + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        lines.append(f"{ts},{price},{price * 1.05},{price * 0.97},{price},{100 + i}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _make_runner(tmp_path: Path, executor: str, parallel: bool = False) -> BacktestRunner:
+    base = tmp_path / "candles"
+    for n, contract in enumerate(["AAA", "BBB", "CCC"]):
+        _write_candles(base / "cached" / "1m" / f"{contract}.csv", rows=600, pump_at=100 + 50 * n)
+
+    signals = []
+    for i in range(9):
+        contract = ["AAA", "BBB", "CCC", "MISSING"][i % 4]
+        signals.append(Signal(
+            id=f"s{i}",
+            contract_address=contract,
+            timestamp=BASE_TIME + timedelta(minutes=20 + 31 * i),
+            source="test",
+            narrative="",
+        ))
+
+    strategies = [
+        RunnerStrategy(create_runner_config_from_dict("R_2_3", {
+            "take_profit_levels": [{"xn": 1.5, "fraction": 0.5}, {"xn": 2.0, "fraction": 0.5}],
+            "time_stop_minutes": 120,
+        })),
+        RunnerStrategy(create_runner_config_from_dict("R_first", {
+            "take_profit_levels": [{"xn": 1.3, "fraction": 1.0}],
+            "time_stop_minutes": 60,
+            "exit_on_first_tp": True,
+        })),
+    ]
+    return BacktestRunner(
+        signal_loader=ListSignalLoader(signals),  # type: ignore[arg-type]
+        price_loader=CsvPriceLoader(candles_dir=str(base), timeframe="1m", base_dir=str(base)),
+        reporter=None,
+        strategies=strategies,
+        global_config={"data": {"before_minutes": 10, "after_minutes": 180}},
+        parallel=parallel,
+        max_workers=2,
+        executor=executor,
+    )
+
+
+def _counters(runner: BacktestRunner):
+    return (runner.signals_processed, runner.signals_skipped_no_candles, runner.signals_skipped_corrupt_candles)
+
+
+@pytest.mark.parametrize("include_skipped", [False, True])
+def test_process_executor_matches_sequential(tmp_path, include_skipped):
+    sequential = _make_runner(tmp_path, executor="thread")
+    expected = sequential.run(include_skipped_attempts=include_skipped)
+
+    pooled = _make_runner(tmp_path, executor="process")
+    actual = pooled.run(include_skipped_attempts=include_skipped)
+
+    assert [(r["signal_id"], r["strategy"]) for r in actual] == [(r["signal_id"], r["strategy"]) for r in expected]
+    assert [r["result"] for r in actual] == [r["result"] for r in expected]
+    assert _counters(pooled) == _counters(sequential)
+    assert sequential.signals_skipped_no_candles == 2
+
+
+def test_thread_executor_counters_match_sequential(tmp_path):
+    sequential = _make_runner(tmp_path, executor="thread")
+    sequential.run()
+    threaded = _make_runner(tmp_path, executor="thread", parallel=True)
+    threaded.run()
+    assert _counters(threaded) == _counters(sequential)
+
+
+def test_unknown_executor_rejected(tmp_path):
+    with pytest.raises(ValueError, match="executor"):
+        _make_runner(tmp_path, executor="fibers")
+
+
+def test_unpicklable_loader_falls_back_to_threads(tmp_path):
+    runner = _make_runner(tmp_path, executor="process")
+    runner.price_loader = GeckoTerminalPriceLoader(cache_dir=str(tmp_path / "gecko"))
+    assert runner._can_use_process_pool() is False
+    assert runner.parallel is True
+
+
+def test_contract_group_swaps_loader_in_global_config(tmp_path, monkeypatch):
+    runner = _make_runner(tmp_path, executor="thread")
+    base_loader = runner.price_loader
+    seen = []
+    strategy = runner.strategies[0]
+    original_on_signal = strategy.on_signal
+
+    def recording_on_signal(data):
+        seen.append(data.global_params["_price_loader"])
+        return original_on_signal(data)
+
+    monkeypatch.setattr(strategy, "on_signal", recording_on_signal)
+    monkeypatch.setattr(runner, "_evaluate_runner_batch", lambda data, skip: {})
+    monkeypatch.setattr(runner_module, "_WORKER_RUNNER", runner)
+
+    signals = [sig for sig in runner.signal_loader.load_signals() if sig.contract_address == "AAA"]
+    runner_module._process_contract_group(list(enumerate(signals)), False)
+
+    assert seen and all(isinstance(loader, CachingPriceLoader) and loader is not base_loader for loader in seen)
+    assert runner.price_loader is base_loader
+    assert runner.global_config["_price_loader"] is base_loader
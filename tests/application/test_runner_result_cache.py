@@ -0,0 +1,123 @@
+"""
+Tests for BacktestRunner result_cache: re-runs reuse cached StrategyOutput and evaluate only new keys.
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+from backtester.application.runner import BacktestRunner
+from backtester.domain.models import Signal
+from backtester.domain.runner_config import create_runner_config_from_dict
+from backtester.domain.runner_strategy import RunnerStrategy
+from backtester.infrastructure.price_loader import CsvPriceLoader
+
+
+BASE_TIME = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+
+class ListSignalLoader:
+    def __init__(self, signals: List[Signal]):
+        self.signals = signals
+
+    def load_signals(self) -> List[Signal]:
+        return list(self.signals)
+
+
+def _write_candles(path: Path, rows: int, pump_at: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["timestamp,open,high,low,close,volume"]
+    price = 1.0
+    for i in range(rows):
+        price *= 1.6 if i == pump_at else 1.001
+        ts = (BASE_TIME + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        lines.append(f"{ts},{price},{price * 1.05},{price * 0.97},{price},{100 + i}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _strategy(name: str, xn: float) -> RunnerStrategy:
+    return RunnerStrategy(create_runner_config_from_dict(name, {
+        "take_profit_levels": [{"xn": xn, "fraction": 1.0}],
+        "time_stop_minutes": 90,
+    }))
+
+
+def _make_runner(tmp_path: Path, strategies, n_signals: int = 6, executor: str = "thread", cache: bool = True):
+    base = tmp_path / "candles"
+    if not base.exists():
+        for n, contract in enumerate(["AAA", "BBB"]):
+            _write_candles(base / "cached" / "1m" / f"{contract}.csv", rows=600, pump_at=90 + 70 * n)
+    signals = [
+        Signal(
+            id=f"s{i}",
+            contract_address=["AAA", "BBB", "MISSING"][i % 3],
+            timestamp=BASE_TIME + timedelta(minutes=20 + 41 * i),
+            source="test",
+            narrative="",
+        )
+        for i in range(n_signals)
+    ]
+    return BacktestRunner(
+        signal_loader=ListSignalLoader(signals),  # type: ignore[arg-type]
+        price_loader=CsvPriceLoader(candles_dir=str(base), timeframe="1m", base_dir=str(base)),
+        reporter=None,
+        strategies=strategies,
+        global_config={
+            "data": {"before_minutes": 10, "after_minutes": 120},
+            "result_cache": {"enabled": cache, "dir": str(tmp_path / "result_cache")},
+        },
+        max_workers=2,
+        executor=executor,
+    )
+
+
+def _rows(results):
+    return [(r["signal_id"], r["strategy"], r["result"]) for r in results]
+
+
+def test_rerun_is_served_from_cache(tmp_path):
+    strategies = [_strategy("R_15", 1.5), _strategy("R_2", 2.0)]
+    first = _make_runner(tmp_path, strategies)
+    expected = first.run(include_skipped_attempts=True)
+    assert first.result_cache.get_stats() == {"hits": 0, "misses": 8, "writes": 8}
+
+    second = _make_runner(tmp_path, strategies)
+    assert _rows(second.run(include_skipped_attempts=True)) == _rows(expected)
+    assert second.result_cache.get_stats() == {"hits": 8, "misses": 0, "writes": 0}
+    assert (second.signals_processed, second.signals_skipped_no_candles) == (first.signals_processed, first.signals_skipped_no_candles)
+
+    uncached = _make_runner(tmp_path, strategies, cache=False)
+    assert uncached.result_cache is None
+    assert _rows(uncached.run(include_skipped_attempts=True)) == _rows(expected)
+
+
+def test_only_new_strategies_and_signals_are_evaluated(tmp_path):
+    _make_runner(tmp_path, [_strategy("R_15", 1.5)], n_signals=6).run()
+
+    # Новая стратегия + новые сигналы; переименование старой не инвалидирует ее результаты
+    runner = _make_runner(tmp_path, [_strategy("Renamed_15", 1.5), _strategy("R_3", 3.0)], n_signals=9)
+    results = runner.run()
+    # 6 сигналов с данными: 4 старых (R_15 из кеша), 2 новых; R_3 считается везде
+    assert runner.result_cache.get_stats() == {"hits": 4, "misses": 8, "writes": 8}
+
+    reference = _make_runner(tmp_path, [_strategy("Renamed_15", 1.5), _strategy("R_3", 3.0)], n_signals=9, cache=False)
+    assert _rows(results) == _rows(reference.run())
+
+
+def test_changed_candles_invalidate_entries(tmp_path):
+    strategies = [_strategy("R_15", 1.5)]
+    _make_runner(tmp_path, strategies).run()
+    _write_candles(tmp_path / "candles" / "cached" / "1m" / "AAA.csv", rows=600, pump_at=300)
+
+    runner = _make_runner(tmp_path, strategies)
+    results = runner.run()
+    assert runner.result_cache.get_stats()["hits"] == 2  # BBB не менялся
+    assert _rows(results) == _rows(_make_runner(tmp_path, strategies, cache=False).run())
+
+
+def test_process_pool_uses_cache(tmp_path):
+    strategies = [_strategy("R_15", 1.5), _strategy("R_2", 2.0)]
+    expected = _make_runner(tmp_path, strategies).run()
+
+    runner = _make_runner(tmp_path, strategies, executor="process")
+    assert _rows(runner.run()) == _rows(expected)
+    assert runner.result_cache.get_stats() == {"hits": 8, "misses": 0, "writes": 0}
@@ -0,0 +1,114 @@
+"""
+Tests for BacktestRunner streaming mode: iter_results/run_streaming must match run(),
+portfolio over a spill sink must match portfolio over self.results.
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from backtester.application.runner import BacktestRunner
+from backtester.domain.models import Signal
+from backtester.domain.runner_config import create_runner_config_from_dict
+from backtester.domain.runner_strategy import RunnerStrategy
+from backtester.infrastructure.price_loader import CsvPriceLoader
+from backtester.infrastructure.result_sink import SpillResultSink
+
+
+BASE_TIME = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+
+class ListSignalLoader:
+    def __init__(self, signals: List[Signal]):
+        self.signals = signals
+
+    def load_signals(self) -> List[Signal]:
+        return list(self.signals)
+
+
+def _write_candles(path: Path, rows: int, pump_at: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["timestamp,open,high,low,close,volume"]
+    price = 1.0
+    for i in range(rows):
+        price *= 1.6 if i == pump_at else 1.001
+        ts = (BASE_TIME + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        lines.append(f"{ts},{price},{price * 1.05},{price * 0.97},{price},{100 + i}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _make_runner(tmp_path: Path, executor: str = "thread", parallel: bool = False) -> BacktestRunner:
+    base = tmp_path / "candles"
+    for n, contract in enumerate(["AAA", "BBB"]):
+        _write_candles(base / "cached" / "1m" / f"{contract}.csv", rows=600, pump_at=80 + 60 * n)
+
+    signals = [
+        Signal(
+            id=f"s{i}",
+            contract_address=["AAA", "BBB", "MISSING"][i % 3],
+            timestamp=BASE_TIME + timedelta(minutes=15 + 37 * i),
+            source="test",
+            narrative="",
+        )
+        for i in range(8)
+    ]
+    strategies = [
+        RunnerStrategy(create_runner_config_from_dict("R_2_3", {
+            "take_profit_levels": [{"xn": 1.5, "fraction": 0.5}, {"xn": 2.0, "fraction": 0.5}],
+            "time_stop_minutes": 120,
+        })),
+        RunnerStrategy(create_runner_config_from_dict("R_first", {
+            "take_profit_levels": [{"xn": 1.3, "fraction": 1.0}],
+            "time_stop_minutes": 60,
+            "exit_on_first_tp": True,
+        })),
+    ]
+    return BacktestRunner(
+        signal_loader=ListSignalLoader(signals),  # type: ignore[arg-type]
+        price_loader=CsvPriceLoader(candles_dir=str(base), timeframe="1m", base_dir=str(base)),
+        reporter=None,
+        strategies=strategies,
+        global_config={"data": {"before_minutes": 10, "after_minutes": 180}},
+        parallel=parallel,
+        max_workers=2,
+        executor=executor,
+    )
+
+
+def _key(row):
+    return (row["signal_id"], row["strategy"])
+
+
+@pytest.mark.parametrize("executor,parallel", [("thread", False), ("thread", True), ("process", False)])
+def test_iter_results_matches_run(tmp_path, executor, parallel):
+    expected = _make_runner(tmp_path).run(include_skipped_attempts=True)
+
+    streaming = _make_runner(tmp_path, executor=executor, parallel=parallel)
+    actual = list(streaming.iter_results(include_skipped_attempts=True))
+
+    # Порядок - порядок сигналов, как в последовательном run()
+    assert [_key(r) for r in actual] == [_key(r) for r in expected]
+    assert [r["result"] for r in actual] == [r["result"] for r in expected]
+    assert streaming.results == []
+    assert streaming.signals_skipped_no_candles == 2
+
+
+def test_run_streaming_spill_and_portfolio_match_run(tmp_path):
+    reference = _make_runner(tmp_path)
+    expected = reference.run(include_skipped_attempts=True)
+    expected_portfolio = reference.run_portfolio()
+
+    streaming = _make_runner(tmp_path)
+    sink = streaming.run_streaming(SpillResultSink(tmp_path / "spill", batch_size=3), include_skipped_attempts=True)
+
+    assert sink.strategy_names() == ["R_2_3", "R_first"]
+    for name in sink.strategy_names():
+        assert list(sink.iter_strategy(name)) == [r for r in expected if r["strategy"] == name]
+
+    portfolio = streaming.run_portfolio(sink=sink)
+    assert set(portfolio) == set(expected_portfolio)
+    for name, result in portfolio.items():
+        assert result.stats.final_balance_sol == expected_portfolio[name].stats.final_balance_sol
+        assert result.stats.trades_executed == expected_portfolio[name].stats.trades_executed
+        assert len(result.positions) == len(expected_portfolio[name].positions)
@@ -0,0 +1,128 @@
+"""
+Тесты CandleSeries: колоночный ряд свечей, срезы-представления и совместимость с List[Candle].
+"""
+import random
+import statistics
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from backtester.domain.candle_series import CandleSeries
+from backtester.domain.models import Candle, Signal, StrategyInput
+from backtester.domain.runner_config import create_runner_config_from_dict
+from backtester.domain.runner_strategy import RunnerStrategy
+from backtester.domain.trade_features import calc_window_features
+from backtester.infrastructure.result_cache import candles_fingerprint
+
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _candles(n, start=BASE_TIME, seed=7):
+    rng = random.Random(seed)
+    price = 1.0
+    candles = []
+    for i in range(n):
+        close = price * (1 + rng.uniform(-0.05, 0.08))
+        candles.append(Candle(
+            timestamp=start + timedelta(minutes=i),
+            open=price,
+            high=max(price, close) * 1.01,
+            low=min(price, close) * 0.99,
+            close=close,
+            volume=rng.uniform(0, 1000),
+        ))
+        price = close
+    return candles
+
+
+def test_slice_time_is_inclusive_view():
+    series = CandleSeries.from_candles(_candles(100))
+
+    window = series.slice_time(BASE_TIME + timedelta(minutes=10), BASE_TIME + timedelta(minutes=20))
+
+    assert len(window) == 11
+    assert window.timestamp_at(0) == BASE_TIME + timedelta(minutes=10)
+    assert window.timestamp_at(-1) == BASE_TIME + timedelta(minutes=20)
+    assert np.shares_memory(window.close, series.close)
+    # Дробные секунды в границах не сдвигают срез
+    assert series.slice_time(BASE_TIME + timedelta(minutes=10, microseconds=1))[0].timestamp == BASE_TIME + timedelta(minutes=11)
+    assert len(series.slice_time(BASE_TIME + timedelta(minutes=200))) == 0
+
+
+def test_sequence_compatibility():
+    candles = _candles(30)
+    series = CandleSeries.from_candles(candles)
+
+    assert list(series) == candles
+    assert series[-1] == candles[-1]
+    assert series[5:8].to_candles() == candles[5:8]
+    assert series[::10].to_candles() == candles[::10]
+    assert candles[3] in series
+    with pytest.raises(IndexError):
+        series[30]
+
+
+def test_from_candles_normalizes_like_runner():
+    msk = timezone(timedelta(hours=3))
+    candles = [
+        Candle(timestamp=datetime(2024, 1, 1, 12, 2), open=3, high=3, low=3, close=3, volume=3),  # naive = UTC
+        Candle(timestamp=datetime(2024, 1, 1, 15, 0, tzinfo=msk), open=1, high=1, low=1, close=1, volume=1),
+        Candle(timestamp=BASE_TIME + timedelta(minutes=1), open=2, high=2, low=2, close=2, volume=2),
+        Candle(timestamp=BASE_TIME + timedelta(minutes=1), open=9, high=9, low=9, close=9, volume=9),  # дубль
+    ]
+
+    series = CandleSeries.from_candles(candles)
+
+    assert [c.timestamp for c in series] == [BASE_TIME + timedelta(minutes=m) for m in range(3)]
+    assert series.close.tolist() == [1.0, 2.0, 3.0]
+
+
+def test_sorted_input_is_not_resorted():
+    ts = np.arange(5, dtype=np.int64) * 60 + 1_700_000_000
+    ohlcv = np.vstack([np.arange(5, dtype=np.float64)] * 5)
+
+    series = CandleSeries.from_arrays(ts, ohlcv)
+    assert np.shares_memory(series.ts, ts)
+    assert np.shares_memory(series.close, ohlcv)
+
+    shuffled = CandleSeries.from_arrays(ts[[3, 0, 4, 1, 2, 0]], ohlcv[:, [3, 0, 4, 1, 2, 0]])
+    assert shuffled.ts.tolist() == ts.tolist()
+    assert shuffled.close.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def _reference_window_features(candles, entry_time, entry_price, w):
+    """Построчный расчет фич одного окна (как до перехода на CandleSeries)."""
+    window = [c for c in candles if entry_time - timedelta(minutes=w) <= c.timestamp < entry_time]
+    returns = [(b.close - a.close) / a.close for a, b in zip(window, window[1:]) if a.close > 0]
+    return {
+        f"vol_sum_{w}m": sum(c.volume for c in window),
+        f"range_pct_{w}m": (max(c.high for c in window) - min(c.low for c in window)) / entry_price,
+        f"volat_{w}m": statistics.stdev(returns),
+    }
+
+
+def test_consumers_match_list_input():
+    signal = Signal(id="s1", contract_address="TOKEN", timestamp=BASE_TIME + timedelta(minutes=60, seconds=30),
+                    source="test", narrative="")
+    candles = _candles(480)
+    series = CandleSeries.from_candles(candles)
+    config = create_runner_config_from_dict("runner", {
+        "take_profit_levels": [{"xn": 1.5, "fraction": 0.5}, {"xn": 3.0, "fraction": 0.5}],
+        "time_stop_minutes": 240,
+        "use_high_for_targets": True,
+    })
+    strategy = RunnerStrategy(config)
+
+    from_list = strategy.on_signal(StrategyInput(signal=signal, candles=candles, global_params={}))
+    from_series = strategy.on_signal(StrategyInput(signal=signal, candles=series, global_params={}))
+
+    assert from_series == from_list
+    entry = BASE_TIME + timedelta(minutes=61)
+    expected = {}
+    for w in (5, 15, 60):
+        expected.update(_reference_window_features(candles, entry, 1.3, w))
+    # Суффиксные суммы складывают в другом порядке - равенство с точностью до округления
+    assert calc_window_features(series, entry, 1.3) == pytest.approx(expected, rel=1e-12)
+    assert candles_fingerprint(series) == candles_fingerprint(candles)
@@ -1 +1,146 @@
+"""
+Equivalence tests: vectorized RunnerLadderEngine vs the reference row-by-row engine.
 
+The array-based kernel must return a RunnerTradeResult identical to the legacy
+iterrows implementation (tests/helpers/runner_ladder_reference.py).
+"""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.domain.runner_config import RunnerConfig, RunnerTakeProfitLevel
+from backtester.domain.runner_ladder import LadderPath, RunnerLadderEngine
+from tests.helpers.runner_ladder_reference import ReferenceRunnerLadderEngine
+
+
+T0 = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _config(levels, **kwargs) -> RunnerConfig:
+    return RunnerConfig(
+        name="test",
+        type="RUNNER",
+        params={},
+        take_profit_levels=[RunnerTakeProfitLevel(xn=xn, fraction=fr) for xn, fr in levels],
+        **kwargs,
+    )
+
+
+def _df(highs, closes=None, step_minutes=1, start=T0) -> pd.DataFrame:
+    closes = closes if closes is not None else highs
+    return pd.DataFrame({
+        "timestamp": [start + timedelta(minutes=i * step_minutes) for i in range(len(highs))],
+        "open": closes,
+        "high": highs,
+        "low": closes,
+        "close": closes,
+        "volume": [1.0] * len(highs),
+    })
+
+
+def _assert_same(entry_time, entry_price, df, config):
+    expected = ReferenceRunnerLadderEngine.simulate(entry_time, entry_price, df, config)
+    actual = RunnerLadderEngine.simulate(entry_time, entry_price, df, config)
+    assert actual == expected
+    assert type(actual.exit_time) is type(expected.exit_time)
+    if expected.exit_time is not None:
+        assert actual.exit_time.tzinfo == expected.exit_time.tzinfo
+    assert list(actual.levels_hit) == list(expected.levels_hit)
+    assert list(actual.fractions_exited) == list(expected.fractions_exited)
+    return actual
+
+
+CONFIGS = {
+    "three_levels": _config([(2.0, 0.4), (5.0, 0.4), (10.0, 0.2)]),
+    "time_stop_short": _config([(2.0, 0.5), (3.0, 0.5)], time_stop_minutes=5),
+    "time_stop_zero": _config([(2.0, 0.5), (3.0, 0.5)], time_stop_minutes=0),
+    "exit_on_first_tp": _config([(2.0, 0.3), (3.0, 0.7)], exit_on_first_tp=True, time_stop_minutes=60),
+    "no_partial_fills": _config([(2.0, 0.3), (3.0, 0.7)], allow_partial_fills=False),
+    "unsorted_levels": _config([(5.0, 0.5), (2.0, 0.5)], time_stop_minutes=30),
+    "overfilled_fractions": _config([(1.5, 0.8), (2.0, 0.8), (3.0, 0.8)]),
+    "default_levels": _config([]),
+    "single_level": _config([(2.0, 0.5)], time_stop_minutes=10),
+}
+
+
+@pytest.mark.parametrize("name", sorted(CONFIGS))
+@pytest.mark.parametrize("highs", [
+    [1.0, 1.5, 2.1, 2.5, 5.5, 11.0, 3.0],     # hits all default levels
+    [1.0, 1.2, 1.1, 1.3, 1.0, 0.9, 1.05],     # never hits
+    [1.0, 3.5, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0],  # spike then flat
+    [1.0] * 4 + [float("nan")] + [2.5] * 3,    # NaN high is ignored
+])
+def test_fixture_paths_match_reference(name, highs):
+    _assert_same(T0, 1.0, _df(highs), CONFIGS[name])
+
+
+@pytest.mark.parametrize("name", sorted(CONFIGS))
+def test_time_stop_reached_by_data(name):
+    # 20 candles: time stop (5/10/30/60 min) lies inside the data for most configs
+    highs = [1.0] * 8 + [2.2] + [1.0] * 11
+    _assert_same(T0, 1.0, _df(highs), CONFIGS[name])
+
+
+def test_unsorted_dataframe_matches_reference():
+    df = _df([1.0, 1.2, 2.5, 3.1, 1.0, 6.0]).sample(frac=1.0, random_state=7)
+    _assert_same(T0, 1.0, df, CONFIGS["three_levels"])
+
+
+def test_empty_dataframe_returns_no_data():
+    empty = pd.DataFrame(columns=["timestamp", "open", "high", "low", "close", "volume"])
+    result = _assert_same(T0, 1.0, empty, CONFIGS["three_levels"])
+    assert result.reason == "no_data"
+
+
+def test_entry_after_first_candle_and_gaps():
+    times = [T0 + timedelta(minutes=m) for m in (0, 1, 2, 30, 31, 90, 200)]
+    df = pd.DataFrame({
+        "timestamp": times,
+        "open": 1.0, "low": 1.0, "volume": 1.0,
+        "high": [1.0, 1.1, 1.0, 1.9, 2.05, 3.2, 1.0],
+        "close": [1.0, 1.05, 1.0, 1.8, 2.0, 3.0, 0.9],
+    })
+    for config in CONFIGS.values():
+        _assert_same(T0 + timedelta(minutes=1), 1.05, df, config)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_paths_match_reference(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 400))
+    log_returns = rng.normal(0.0, 0.05, size=n)
+    log_returns[rng.integers(0, n)] += rng.uniform(0.0, 2.0)  # occasional pump
+    close = np.exp(np.cumsum(log_returns))
+    high = close * (1.0 + rng.uniform(0.0, 0.2, size=n))
+    # random gaps between candles
+    minutes = np.cumsum(rng.integers(1, 4, size=n))
+    df = pd.DataFrame({
+        "timestamp": [T0 + timedelta(minutes=int(m)) for m in minutes],
+        "open": close, "high": high, "low": close * 0.9, "close": close, "volume": 1.0,
+    })
+
+    xns = sorted(rng.choice([1.2, 1.5, 2.0, 3.0, 5.0, 10.0], size=int(rng.integers(1, 4)), replace=False))
+    fractions = rng.dirichlet(np.ones(len(xns)))
+    time_stop = [None, 0, 15, 60, 240][int(rng.integers(0, 5))]
+    config = _config(
+        list(zip(xns, fractions.tolist())),
+        time_stop_minutes=time_stop,
+        exit_on_first_tp=bool(rng.integers(0, 2)),
+        allow_partial_fills=bool(rng.integers(0, 4)),
+    )
+    entry_idx = int(rng.integers(0, n))
+    entry_time = df["timestamp"].iloc[entry_idx].to_pydatetime()
+    entry_price = float(close[entry_idx])
+    _assert_same(entry_time, entry_price, df.iloc[entry_idx:].reset_index(drop=True), config)
+
+
+def test_ladder_path_is_reusable_across_configs():
+    df = _df([1.0, 1.5, 2.1, 2.5, 5.5, 11.0, 3.0])
+    path = LadderPath.from_dataframe(df)
+    for config in CONFIGS.values():
+        expected = ReferenceRunnerLadderEngine.simulate(T0, 1.0, df, config)
+        assert RunnerLadderEngine.simulate_path(T0, 1.0, path, config) == expected
+    # targets shared by several configs are searched once
+    assert path._hit_index_cache[2.0] == 2
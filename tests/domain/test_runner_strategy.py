@@ -159,3 +159,47 @@ def test_runner_strategy_no_levels_hit(runner_strategy, sample_signal):
     # realized_multiple = 140 / 100 = 1.4
     assert result.meta["realized_multiple"] == pytest.approx(1.4, rel=1e-3)
     assert len(result.meta["levels_hit"]) == 0  # Уровни не достигнуты
+    # Максимум за всю сделку не передается в портфель: prune на current_time не должен видеть будущее
+    assert "max_xn" not in result.meta
+
+
+def _batch_candles(signal_time, seed):
+    import random
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for i in range(-30, 300):
+        price *= 1.0 + rng.gauss(0.0, 0.03) + (0.5 if i == 40 else 0.0)
+        candles.append(Candle(
+            timestamp=signal_time + timedelta(minutes=i),
+            open=price, high=price * (1.0 + rng.random() * 0.1), low=price * 0.95,
+            close=price, volume=1000.0 + i,
+        ))
+    rng.shuffle(candles)
+    return candles
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_runner_strategy_batch_matches_on_signal(sample_signal, seed):
+    """Батч-оценка нескольких конфигов дает те же StrategyOutput, что и on_signal по одному."""
+    configs = [
+        {"take_profit_levels": [{"xn": 1.5, "fraction": 0.5}, {"xn": 2.0, "fraction": 0.5}], "time_stop_minutes": 60},
+        {"take_profit_levels": [{"xn": 2.0, "fraction": 0.4}, {"xn": 3.0, "fraction": 0.6}], "time_stop_minutes": None},
+        {"take_profit_levels": [{"xn": 1.5, "fraction": 1.0}], "time_stop_minutes": 30, "exit_on_first_tp": True},
+        {"take_profit_levels": [{"xn": 1.2, "fraction": 0.3}, {"xn": 5.0, "fraction": 0.7}], "time_stop_minutes": 120},
+    ]
+    strategies = [
+        RunnerStrategy(create_runner_config_from_dict(f"runner_{i}", params))
+        for i, params in enumerate(configs)
+    ]
+    data = StrategyInput(signal=sample_signal, candles=_batch_candles(sample_signal.timestamp, seed), global_params={})
+
+    batch = RunnerStrategy.on_signal_batch(strategies, data)
+    assert batch == [strategy.on_signal(data) for strategy in strategies]
+
+
+def test_runner_strategy_batch_no_candles(runner_strategy, sample_signal):
+    """Батч без свечей после сигнала возвращает no_entry для каждой стратегии."""
+    data = StrategyInput(signal=sample_signal, candles=[], global_params={})
+    outputs = RunnerStrategy.on_signal_batch([runner_strategy, runner_strategy], data)
+    assert [o.reason for o in outputs] == ["no_entry", "no_entry"]
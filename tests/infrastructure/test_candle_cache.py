@@ -0,0 +1,128 @@
+"""
+Tests for CachingPriceLoader (per-contract candle cache with byte-budget LRU eviction).
+"""
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional
+
+from backtester.application.runner import BacktestRunner
+from backtester.domain.models import Candle
+from backtester.infrastructure.candle_cache import CachingPriceLoader
+from backtester.infrastructure.price_loader import PriceLoader
+
+
+BASE_TIME = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+
+class CountingLoader(PriceLoader):
+    """Fake loader: 100 minute candles per contract, counts inner loads."""
+
+    def __init__(self, rows: int = 100):
+        self.rows = rows
+        self.calls: List[tuple] = []
+        self._lock = threading.Lock()
+
+    def load_prices(self, contract_address: str, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> List[Candle]:
+        with self._lock:
+            self.calls.append((contract_address, start_time, end_time))
+        candles = [
+            Candle(timestamp=BASE_TIME + timedelta(minutes=i), open=1.0 + i, high=2.0 + i, low=0.5 + i, close=1.5 + i, volume=10.0)
+            for i in range(self.rows)
+        ]
+        return [
+            c for c in candles
+            if (start_time is None or c.timestamp >= start_time) and (end_time is None or c.timestamp <= end_time)
+        ]
+
+
+def test_repeated_contract_is_served_from_cache():
+    inner = CountingLoader()
+    loader = CachingPriceLoader(inner, max_bytes=10 * 1024 * 1024)
+
+    start, end = BASE_TIME + timedelta(minutes=10), BASE_TIME + timedelta(minutes=20)
+    first = loader.load_prices("A", start, end)
+    second = loader.load_prices("A", BASE_TIME + timedelta(minutes=30), BASE_TIME + timedelta(minutes=40))
+
+    assert len(inner.calls) == 1
+    assert inner.calls[0] == ("A", None, None)  # full history on miss
+    assert first == inner.load_prices("A", start, end)
+    assert [c.timestamp for c in second] == [BASE_TIME + timedelta(minutes=i) for i in range(30, 41)]
+
+    summary = loader.get_cache_summary()
+    assert summary["hits"] == 1
+    assert summary["misses"] == 1
+    assert summary["evictions"] == 0
+
+
+def test_lru_eviction_by_byte_budget():
+    inner = CountingLoader()
+    # One contract = 100 rows * 6 columns * 8 bytes = 4800 bytes; budget fits two
+    loader = CachingPriceLoader(inner, max_bytes=10_000)
+
+    loader.load_prices("A")
+    loader.load_prices("B")
+    loader.load_prices("A")  # A becomes most recently used
+    loader.load_prices("C")  # evicts B
+
+    summary = loader.get_cache_summary()
+    assert summary["evictions"] == 1
+    assert summary["entries"] == 2
+    assert summary["bytes"] <= 10_000
+
+    loader.load_prices("A")
+    assert [c[0] for c in inner.calls] == ["A", "B", "C"]
+    loader.load_prices("B")
+    assert [c[0] for c in inner.calls] == ["A", "B", "C", "B"]
+
+
+def test_range_mode_extends_coverage():
+    inner = CountingLoader()
+    loader = CachingPriceLoader(inner, max_bytes=10 * 1024 * 1024, full_history=False)
+
+    loader.load_prices("A", BASE_TIME + timedelta(minutes=10), BASE_TIME + timedelta(minutes=20))
+    loader.load_prices("A", BASE_TIME + timedelta(minutes=12), BASE_TIME + timedelta(minutes=18))
+    assert len(inner.calls) == 1
+
+    candles = loader.load_prices("A", BASE_TIME + timedelta(minutes=15), BASE_TIME + timedelta(minutes=30))
+    assert len(inner.calls) == 2
+    assert inner.calls[1] == ("A", BASE_TIME + timedelta(minutes=10), BASE_TIME + timedelta(minutes=30))
+    assert len(candles) == 16
+
+
+def test_concurrent_misses_load_contract_once():
+    inner = CountingLoader()
+    loader = CachingPriceLoader(inner, max_bytes=10 * 1024 * 1024)
+
+    threads = [threading.Thread(target=loader.load_prices, args=("A",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(inner.calls) == 1
+    summary = loader.get_cache_summary()
+    assert summary["misses"] == 1
+    assert summary["hits"] == 7
+
+
+def test_runner_wraps_loader_when_cache_budget_configured():
+    inner = CountingLoader()
+    runner = BacktestRunner(
+        signal_loader=None,  # type: ignore[arg-type]
+        price_loader=inner,
+        reporter=None,
+        strategies=[],
+        global_config={"data": {"cache_max_mb": 16}},
+    )
+    assert isinstance(runner.price_loader, CachingPriceLoader)
+    assert runner.price_loader.inner is inner
+    assert runner.global_config["_price_loader"] is runner.price_loader
+
+    plain = BacktestRunner(
+        signal_loader=None,  # type: ignore[arg-type]
+        price_loader=inner,
+        reporter=None,
+        strategies=[],
+        global_config={"data": {}},
+    )
+    assert plain.price_loader is inner
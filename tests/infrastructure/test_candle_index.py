@@ -0,0 +1,116 @@
+"""
+Тесты манифеста покрытия CSV-кеша свечей (CandleCacheIndex) и его использования в GeckoTerminalPriceLoader.
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pandas as pd
+
+from backtester.domain.models import Candle
+from backtester.infrastructure.candle_index import CandleCacheIndex, CandleIndexEntry
+from backtester.infrastructure.price_loader import GeckoTerminalPriceLoader
+
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _candles(minutes):
+    return [
+        Candle(timestamp=BASE_TIME + timedelta(minutes=m), open=1.0, high=1.5, low=0.5, close=1.0, volume=1.0)
+        for m in minutes
+    ]
+
+
+def _loader(cache_dir):
+    return GeckoTerminalPriceLoader(cache_dir=str(cache_dir), rate_limit_config={"enabled": False})
+
+
+def test_save_to_cache_updates_index(tmp_path):
+    loader = _loader(tmp_path)
+    minutes = list(range(0, 100)) + list(range(300, 400))  # разрыв 200 минут
+    loader._save_to_cache(loader._get_cache_path("AAA"), _candles(minutes))
+
+    entry = CandleCacheIndex(tmp_path).get("AAA", "1m")
+    assert entry is not None
+    assert entry.min_time == BASE_TIME
+    assert entry.max_time == BASE_TIME + timedelta(minutes=399)
+    assert entry.rows == 200
+    assert entry.gaps == [
+        (int((BASE_TIME + timedelta(minutes=99)).timestamp()), int((BASE_TIME + timedelta(minutes=300)).timestamp()))
+    ]
+    assert entry.matches_file(loader._get_cache_path("AAA"))
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_coverage_checks_do_not_parse_csv(tmp_path):
+    loader = _loader(tmp_path)
+    loader._save_to_cache(loader._get_cache_path("AAA"), _candles(range(50)))
+
+    with patch("backtester.infrastructure.candle_index.pd.read_csv") as read_csv, \
+            patch("backtester.infrastructure.price_loader.pd.read_csv") as loader_read_csv:
+        assert loader.cached_range("AAA") == (BASE_TIME, BASE_TIME + timedelta(minutes=49))
+        assert loader._is_cache_fresh(loader._get_cache_path("AAA")) is False  # 2025-01-01 старше max_cache_age_days
+        assert loader.cached_range("MISSING") is None
+    read_csv.assert_not_called()
+    loader_read_csv.assert_not_called()
+
+
+def test_covered_range_decided_by_manifest_and_reads_only_window(tmp_path):
+    loader = GeckoTerminalPriceLoader(
+        cache_dir=str(tmp_path), rate_limit_config={"enabled": False}, internal_gap_minutes=120,
+    )
+    loader._save_to_cache(loader._get_cache_path("AAA"), _candles([*range(100), *range(400, 500)]))
+    start, end = BASE_TIME + timedelta(minutes=10), BASE_TIME + timedelta(minutes=20)
+
+    with patch("backtester.infrastructure.candle_index.pd.read_csv") as read_csv, \
+            patch("backtester.infrastructure.price_loader.pd.read_csv") as loader_read_csv:
+        entry, path, _ = loader._find_cache_entry("AAA")
+        assert loader._cache_coverage(entry, path, start, end) == ([], None)
+        # Разрыв 99 -> 400 длиннее internal_gap_minutes: виден по манифесту без чтения файла
+        assert loader._cache_coverage(entry, path, start, BASE_TIME + timedelta(minutes=450)) == (
+            [(BASE_TIME + timedelta(minutes=99), BASE_TIME + timedelta(minutes=400))], None,
+        )
+    read_csv.assert_not_called()
+    loader_read_csv.assert_not_called()
+
+    with patch.object(loader, "_load_from_cache", wraps=loader._load_from_cache) as load, \
+            patch.object(loader, "_fetch_range") as fetch:
+        candles = loader.load_prices("AAA", start, end)
+    assert [c.timestamp for c in candles] == [BASE_TIME + timedelta(minutes=m) for m in range(10, 21)]
+    load.assert_called_once_with(path, start, end)
+    fetch.assert_not_called()
+
+
+def test_external_file_change_refreshes_entry(tmp_path):
+    loader = _loader(tmp_path)
+    path = loader._get_cache_path("AAA")
+    loader._save_to_cache(path, _candles(range(50)))
+
+    # Файл перезаписан в обход загрузчика - запись устарела и пересчитывается по timestamp-ам
+    pd.DataFrame({
+        "timestamp": [(BASE_TIME + timedelta(minutes=m)).isoformat() for m in range(10, 500)],
+        "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0,
+    }).to_csv(path, index=False)
+
+    assert loader.cached_range("AAA") == (BASE_TIME + timedelta(minutes=10), BASE_TIME + timedelta(minutes=499))
+    assert CandleCacheIndex(tmp_path).get("AAA", "1m").rows == 490
+
+
+def test_rebuild_indexes_new_and_legacy_files(tmp_path):
+    loader = _loader(tmp_path)
+    loader._save_to_cache(loader._get_cache_path("AAA"), _candles(range(30)))
+    legacy = tmp_path / "BBB_1m.csv"
+    pd.DataFrame({
+        "timestamp": [(BASE_TIME + timedelta(minutes=m)).isoformat() for m in range(20)],
+        "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0,
+    }).to_csv(legacy, index=False)
+
+    index = CandleCacheIndex(tmp_path)
+    index.put(CandleIndexEntry(
+        contract="GONE", timeframe="1m", path=str(tmp_path / "1m" / "GONE.csv"), min_ts=0, max_ts=60, rows=2,
+    ))
+    stats = index.rebuild()
+
+    assert stats == {"indexed": 2, "empty": 0, "failed": 0, "removed": 1}
+    assert [(e.contract, e.rows) for e in index.entries()] == [("AAA", 30), ("BBB", 20)]
+    assert index.get("BBB", "1m").path == str(legacy)
@@ -0,0 +1,151 @@
+"""
+Тесты сегментного append-only кеша свечей: дозагрузка пишет только новые свечи,
+читатели объединяют базу и сегменты, компакция и атомарная запись.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from backtester.domain.models import Candle
+from backtester.infrastructure.candle_index import CandleCacheIndex
+from backtester.infrastructure.candle_segments import (
+    append_segment,
+    cache_digest,
+    compact_segments,
+    list_segments,
+    read_cache_frame,
+    segments_dir,
+    write_atomic,
+)
+from backtester.infrastructure.price_loader import CsvPriceLoader, GeckoTerminalPriceLoader
+
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _candles(minutes, price=1.0):
+    return [
+        Candle(timestamp=BASE_TIME + timedelta(minutes=m), open=price, high=price + 0.5, low=price / 2, close=price, volume=1.0)
+        for m in minutes
+    ]
+
+
+def _loader(cache_dir, **kwargs):
+    return GeckoTerminalPriceLoader(cache_dir=str(cache_dir), rate_limit_config={"enabled": False}, **kwargs)
+
+
+def _refresh(loader, contract, fetched):
+    """Дозагрузка как в load_prices: merge с кешем + _update_cache."""
+    cached, cache_path, _ = loader._find_cache(contract)
+    merged = loader._merge_candles(cached or [], fetched)
+    loader._update_cache(contract, cache_path, cached, fetched, merged)
+    return merged
+
+
+def test_refresh_appends_only_new_candles(tmp_path):
+    loader = _loader(tmp_path)
+    path = loader._get_cache_path("AAA")
+    loader._save_to_cache(path, _candles(range(5000)))
+    base_bytes = path.read_bytes()
+
+    # Ответ API перекрывает кеш (старые свечи без изменений) + 60 новых минут
+    merged = _refresh(loader, "AAA", _candles(range(4500, 5060)))
+
+    assert path.read_bytes() == base_bytes  # базовый файл не переписан
+    segments = list_segments(path)
+    assert len(segments) == 1
+    assert len(segments[0].read_text().splitlines()) == 1 + 60
+
+    assert loader._load_from_cache(path) == merged
+    entry = CandleCacheIndex(tmp_path).get("AAA", "1m")
+    assert entry.rows == 5060
+    assert entry.matches_file(path)
+    assert entry.content_hash == cache_digest(path)
+
+
+def test_later_segment_overrides_base(tmp_path):
+    loader = _loader(tmp_path)
+    path = loader._get_cache_path("AAA")
+    loader._save_to_cache(path, _candles(range(10)))
+    _refresh(loader, "AAA", _candles([5], price=2.0))
+
+    df = read_cache_frame(path)
+    assert len(df) == 10
+    assert df["close"].tolist() == [1.0] * 5 + [2.0] + [1.0] * 4
+
+    # CsvPriceLoader читает тот же кеш прозрачно
+    csv_loader = CsvPriceLoader(candles_dir=str(tmp_path), base_dir=str(tmp_path))
+    assert [c.close for c in csv_loader.load_prices("AAA")] == [1.0] * 5 + [2.0] + [1.0] * 4
+
+
+def test_segments_are_compacted_past_limit(tmp_path):
+    loader = _loader(tmp_path, max_cache_segments=2)
+    path = loader._get_cache_path("AAA")
+    loader._save_to_cache(path, _candles(range(10)))
+    for start in (10, 20):
+        _refresh(loader, "AAA", _candles(range(start, start + 10)))
+    assert len(list_segments(path)) == 2
+
+    merged = _refresh(loader, "AAA", _candles(range(30, 40)))
+
+    assert list_segments(path) == []
+    assert not segments_dir(path).exists()
+    assert loader._load_from_cache(path) == merged
+    entry = CandleCacheIndex(tmp_path).get("AAA", "1m")
+    assert entry.rows == 40
+    assert entry.matches_file(path)
+    assert entry.content_hash == cache_digest(path)
+
+
+def test_full_save_drops_stale_segments(tmp_path):
+    loader = _loader(tmp_path)
+    path = loader._get_cache_path("AAA")
+    loader._save_to_cache(path, _candles(range(10)))
+    _refresh(loader, "AAA", _candles(range(10, 20)))
+
+    loader._save_to_cache(path, _candles(range(5)))
+
+    assert list_segments(path) == []
+    assert len(loader._load_from_cache(path)) == 5
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / "AAA.csv"
+    write_atomic(path, b"old")
+    with patch("backtester.infrastructure.candle_segments.os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            write_atomic(path, b"new")
+    assert path.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["AAA.csv"]
+
+
+def test_concurrent_appends_get_unique_sequence_numbers(tmp_path):
+    path = tmp_path / "1m" / "AAA.csv"
+    write_atomic(path, b"timestamp,open,high,low,close,volume\n")
+    barrier = threading.Barrier(12)
+
+    def writer(minute):
+        barrier.wait()
+        ts = (BASE_TIME + timedelta(minutes=minute)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        append_segment(path, f"timestamp,open,high,low,close,volume\n{ts},1,1,1,1,{minute}\n".encode("utf-8"))
+
+    def slow_write(target, data):
+        # Медленная запись расширяет окно между выбором номера и появлением сегмента
+        time.sleep(0.02)
+        write_atomic(target, data)
+
+    threads = [threading.Thread(target=writer, args=(m,)) for m in range(12)]
+    with patch("backtester.infrastructure.candle_segments.write_atomic", slow_write):
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    seqs = [int(p.name.split("-", 1)[0]) for p in list_segments(path)]
+    assert seqs == list(range(1, 13))
+    assert compact_segments(path) == 12
+    assert sorted(read_cache_frame(path)["volume"].tolist()) == list(range(12))
+    assert list_segments(path) == []
@@ -0,0 +1,135 @@
+"""
+Tests for the columnar memory-mapped candle store (ColumnarCandleStore / ColumnarPriceLoader).
+"""
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from backtester.infrastructure.candle_store import (
+    CandleArrays,
+    ColumnarCandleStore,
+    ColumnarPriceLoader,
+    convert_csv_to_store,
+    discover_csv_contracts,
+)
+from backtester.infrastructure.price_loader import CsvPriceLoader
+
+
+BASE_TIME = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+
+def _write_csv(path: Path, rows: int, price: float = 1.0) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["timestamp,open,high,low,close,volume"]
+    for i in range(rows):
+        ts = (BASE_TIME + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        p = price + i * 0.01
+        lines.append(f"{ts},{p},{p + 0.05},{p - 0.05},{p + 0.01},{1000 + i}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def csv_base(tmp_path):
+    base = tmp_path / "candles"
+    _write_csv(base / "cached" / "1m" / "TOKEN_A.csv", rows=120)
+    _write_csv(base / "TOKEN_B_1m.csv", rows=30, price=2.0)
+    return base
+
+
+def test_discover_csv_contracts_finds_cached_and_legacy_layouts(csv_base):
+    assert discover_csv_contracts(str(csv_base), "1m") == ["TOKEN_A", "TOKEN_B"]
+
+
+def test_store_loader_matches_csv_loader(csv_base, tmp_path):
+    store = ColumnarCandleStore(root=str(tmp_path / "store"), timeframe="1m")
+    written = convert_csv_to_store(str(csv_base), store)
+    assert written == {"TOKEN_A": 120, "TOKEN_B": 30}
+
+    csv_loader = CsvPriceLoader(candles_dir=str(csv_base), timeframe="1m", base_dir=str(csv_base))
+    store_loader = ColumnarPriceLoader(store_dir=str(tmp_path / "store"), timeframe="1m")
+
+    start = BASE_TIME + timedelta(minutes=10)
+    end = BASE_TIME + timedelta(minutes=50)
+    for contract in ("TOKEN_A", "TOKEN_B"):
+        expected = csv_loader.load_prices(contract, start_time=start, end_time=end)
+        actual = store_loader.load_prices(contract, start_time=start, end_time=end)
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            assert a.timestamp == e.timestamp
+            assert a.timestamp.tzinfo is not None
+            assert (a.open, a.high, a.low, a.close, a.volume) == (e.open, e.high, e.low, e.close, e.volume)
+
+
+def test_time_range_is_zero_copy_slice(csv_base, tmp_path):
+    store = ColumnarCandleStore(root=str(tmp_path / "store"), timeframe="1m")
+    convert_csv_to_store(str(csv_base), store, contracts=["TOKEN_A"])
+    loader = ColumnarPriceLoader(store_dir=str(tmp_path / "store"), timeframe="1m")
+
+    full = loader.store.read("TOKEN_A")
+    assert full is not None
+    window = loader.load_arrays("TOKEN_A", BASE_TIME + timedelta(minutes=5), BASE_TIME + timedelta(minutes=9))
+
+    assert len(window) == 5
+    assert np.shares_memory(window.high, full.high)
+    assert np.shares_memory(window.ts, full.ts)
+
+
+def test_missing_contract_returns_empty(tmp_path):
+    loader = ColumnarPriceLoader(store_dir=str(tmp_path / "store"), timeframe="1m")
+    assert loader.load_prices("NOPE") == []
+
+
+def test_from_candles_sorts_and_dedups_keep_first():
+    from backtester.domain.models import Candle
+
+    t0 = BASE_TIME
+    candles = [
+        Candle(timestamp=t0 + timedelta(minutes=2), open=3, high=3, low=3, close=3, volume=3),
+        Candle(timestamp=t0, open=1, high=1, low=1, close=1, volume=1),
+        Candle(timestamp=t0 + timedelta(minutes=2), open=9, high=9, low=9, close=9, volume=9),
+    ]
+    arrays = CandleArrays.from_candles(candles)
+    assert arrays.ts.tolist() == [int(t0.timestamp()), int(t0.timestamp()) + 120]
+    assert arrays.close.tolist() == [1.0, 3.0]
+
+
+def test_converter_drops_invalid_rows(tmp_path):
+    base = tmp_path / "candles"
+    path = base / "cached" / "1m" / "BAD.csv"
+    path.parent.mkdir(parents=True)
+    path.write_text(
+        "timestamp,open,high,low,close,volume\n"
+        "2024-01-01T00:00:00Z,1.0,1.1,0.9,1.0,10\n"
+        "2024-01-01T00:01:00Z,1.0,0.5,0.9,1.0,10\n"
+        "2024-01-01T00:02:00Z,1.0,1.1,0.9,1.0,10\n"
+    )
+    store = ColumnarCandleStore(root=str(tmp_path / "store"), timeframe="1m")
+    assert convert_csv_to_store(str(base), store) == {"BAD": 2}
+
+
+def test_write_is_single_file_and_legacy_pair_is_validated(tmp_path):
+    store = ColumnarCandleStore(root=str(tmp_path / "store"), timeframe="1m")
+    tf_dir = tmp_path / "store" / "1m"
+    tf_dir.mkdir(parents=True)
+    ts = np.array([int(BASE_TIME.timestamp()) + 60 * i for i in range(4)], dtype=np.int64)
+    ohlcv = np.ones((5, 4))
+
+    # Старый формат: пара файлов разной длины (прерванная запись) - промах, а не выход за границы
+    np.save(tf_dir / "OLD.ts.npy", ts)
+    np.save(tf_dir / "OLD.ohlcv.npy", ohlcv[:, :3])
+    assert store.read("OLD") is None
+    np.save(tf_dir / "OLD.ohlcv.npy", ohlcv)
+    assert store.read("OLD").ts.tolist() == ts.tolist()
+
+    # Перезапись - один файл со всеми колонками, файлы старого формата удаляются
+    arrays = CandleArrays(ts=ts[:2], open=ohlcv[0, :2], high=ohlcv[1, :2], low=ohlcv[2, :2],
+                          close=ohlcv[3, :2] * 2, volume=ohlcv[4, :2])
+    store.write("OLD", arrays)
+    assert sorted(p.name for p in tf_dir.iterdir()) == ["OLD.candles.npy"]
+    reread = store.read("OLD")
+    assert reread.ts.dtype == np.int64
+    assert reread.ts.tolist() == ts[:2].tolist()
+    assert reread.close.tolist() == [2.0, 2.0]
+    assert store.contracts() == ["OLD"]
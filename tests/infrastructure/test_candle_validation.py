@@ -0,0 +1,117 @@
+"""
+Тесты векторной валидации свечей: отчет по правилам, strict-режим, нормализация
+(UTC, сортировка, дедупликация) в CsvPriceLoader и GeckoTerminalPriceLoader.
+"""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.infrastructure.candle_validation import (
+    CandleValidationReport,
+    InvalidCandlesError,
+    validate_candle_arrays,
+    validate_ohlcv_rows,
+)
+from backtester.infrastructure.price_loader import CsvPriceLoader, GeckoTerminalPriceLoader
+
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+T0 = int(BASE_TIME.timestamp())
+
+
+def _ohlcv(rows):
+    return np.array(rows, dtype=np.float64).T
+
+
+def test_rows_are_counted_by_first_failed_rule():
+    ts = np.array([T0 + 60 * i for i in range(7)], dtype=np.float64)
+    ts[6] = np.nan
+    ohlcv = _ohlcv([
+        [1.0, 1.5, 0.5, 1.2, 10.0],     # ok
+        [np.nan, 1.5, 0.5, 1.2, 10.0],  # non_finite
+        [-1.0, 0.4, 0.5, 1.2, 10.0],    # non_positive_price (и high < low)
+        [1.0, 0.4, 0.5, 0.45, 10.0],    # high_below_low
+        [1.0, 1.5, 1.1, 1.2, 10.0],     # low_above_open_close
+        [1.0, 1.5, 0.5, 1.2, -1.0],     # negative_volume
+        [1.0, 1.5, 0.5, 1.2, 10.0],     # bad_timestamp
+    ])
+
+    series, report = validate_candle_arrays(ts, ohlcv, contract="AAA")
+
+    assert len(series) == 1
+    assert report.rows_in == 7 and report.rows_out == 1
+    assert report.dropped == {
+        "bad_timestamp": 1,
+        "non_finite": 1,
+        "non_positive_price": 1,
+        "high_below_low": 1,
+        "low_above_open_close": 1,
+        "negative_volume": 1,
+    }
+    assert report.first_issue.startswith("non_finite at 2025-01-01T00:01:00+00:00")
+
+    with pytest.raises(InvalidCandlesError, match="non_positive_price=1"):
+        validate_candle_arrays(ts, ohlcv, contract="AAA", strict_validation=True)
+
+
+def test_sort_and_dedup_keep_first_are_not_errors():
+    rows = [
+        [T0 + 120, 3, 3, 3, 3, 1],
+        [T0, 1, 1, 1, 1, 1],
+        [T0 + 120, 9, 9, 9, 9, 1],
+    ]
+    series, report = validate_ohlcv_rows(rows, contract="AAA", strict_validation=True)
+
+    assert series.ts.tolist() == [T0, T0 + 120]
+    assert series.close.tolist() == [1.0, 3.0]
+    assert report.dropped == {"duplicate_timestamp": 1}
+    assert report.rows_invalid == 0
+
+
+def test_csv_loader_normalizes_and_reports(tmp_path, capsys):
+    path = tmp_path / "AAA_1m.csv"
+    pd.DataFrame({
+        "timestamp": [
+            "2025-01-01T03:02:00+03:00",  # = 00:02 UTC
+            "2025-01-01T00:00:00+00:00",
+            "2025-01-01T00:01:00+00:00",
+            "2025-01-01T00:03:00+00:00",
+            "2025-01-01T00:04:00+00:00",
+        ],
+        "open": [1.0, 1.0, 1.0, "bad", 1.0],
+        "high": [1.5, 1.5, 1.5, 1.5, 0.1],
+        "low": [0.5, 0.5, 0.5, 0.5, 0.5],
+        "close": [1.2, 1.2, 1.2, 1.2, 1.2],
+        "volume": [1.0, 1.0, 1.0, 1.0, 1.0],
+    }).to_csv(path, index=False)
+    loader = CsvPriceLoader(candles_dir=str(tmp_path), base_dir=str(tmp_path))
+
+    candles = loader.load_prices("AAA", start_time=BASE_TIME, end_time=BASE_TIME + timedelta(minutes=10))
+
+    assert [c.timestamp for c in candles] == [BASE_TIME + timedelta(minutes=m) for m in range(3)]
+    report = loader.validation_reports["AAA"]
+    assert report.dropped == {"non_finite": 1, "high_below_low": 1}
+    warnings = [line for line in capsys.readouterr().out.splitlines() if "[validation]" in line]
+    assert len(warnings) == 1
+
+    strict = CsvPriceLoader(candles_dir=str(tmp_path), base_dir=str(tmp_path), strict_validation=True)
+    with pytest.raises(InvalidCandlesError):
+        strict.load_prices("AAA")
+
+
+def test_gecko_batches_accumulate_into_one_report(tmp_path):
+    loader = GeckoTerminalPriceLoader(cache_dir=str(tmp_path), rate_limit_config={"enabled": False})
+    report = CandleValidationReport(contract="AAA")
+    seen: set = set()
+    first = loader._parse_ohlcv_rows([[T0 + 60, 1, 2, 0.5, 1, 5], [T0, 1, 2, 0.5, 1, -5]], seen, report)
+    second = loader._parse_ohlcv_rows([[T0 + 60, 1, 2, 0.5, 1, 5], [T0 - 60, 0, 2, 0.5, 1, 5]], seen, report)
+
+    assert [c.timestamp for c in first] == [BASE_TIME + timedelta(minutes=1)]
+    assert second == []
+    assert report.rows_in == 3
+    assert report.dropped == {"negative_volume": 1, "non_positive_price": 1}
+
+    loader._emit_validation_report(report)
+    assert loader.validation_reports["AAA"] is report
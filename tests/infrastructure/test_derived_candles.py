@@ -0,0 +1,121 @@
+"""
+Tests for on-the-fly timeframe derivation from 1m candles (resample_series / ResampledPriceLoader).
+"""
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from backtester.domain.candle_resample import resample_series, timeframe_seconds
+from backtester.domain.candle_series import CandleSeries
+from backtester.infrastructure.derived_candles import ResampledPriceLoader
+from backtester.infrastructure.price_loader import CsvPriceLoader
+
+
+BASE_TIME = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+T0 = int(BASE_TIME.timestamp())
+
+
+def _write_csv(path: Path, rows: int, price: float = 1.0) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["timestamp,open,high,low,close,volume"]
+    for i in range(rows):
+        ts = (BASE_TIME + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        p = price + i * 0.01
+        lines.append(f"{ts},{p},{p + 0.05},{p - 0.05},{p + 0.01},{1000 + i}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _series(minutes):
+    ts = np.array([T0 + 60 * m for m in minutes], dtype=np.int64)
+    n = len(minutes)
+    base = np.arange(1, n + 1, dtype=np.float64)
+    return CandleSeries(
+        ts=ts, open=base, high=base + 0.5, low=base - 0.5, close=base + 0.1, volume=np.full(n, 10.0)
+    )
+
+
+def test_timeframe_seconds():
+    assert timeframe_seconds("1m") == 60
+    assert timeframe_seconds("15m") == 900
+    assert timeframe_seconds("4h") == 4 * 3600
+    assert timeframe_seconds("30m") == 1800
+    with pytest.raises(ValueError):
+        timeframe_seconds("15x")
+    with pytest.raises(ValueError):
+        timeframe_seconds("0m")
+
+
+def test_resample_aggregates_ohlcv_per_bucket():
+    # Минуты 0..6 и 12: корзины 5m -> [0..4], [5, 6], [10..14] (только 12)
+    series = _series([0, 1, 2, 3, 4, 5, 6, 12])
+
+    out = resample_series(series, "5m")
+
+    assert out.ts.tolist() == [T0, T0 + 300, T0 + 600]
+    assert out.open.tolist() == [1.0, 6.0, 8.0]
+    assert out.close.tolist() == pytest.approx([5.1, 7.1, 8.1])
+    assert out.high.tolist() == [5.5, 7.5, 8.5]
+    assert out.low.tolist() == [0.5, 5.5, 7.5]
+    assert out.volume.tolist() == [50.0, 20.0, 10.0]
+
+
+def test_resample_empty_series():
+    assert len(resample_series(CandleSeries.empty(), "1h")) == 0
+
+
+def test_resampled_loader_matches_direct_resample_and_slices(tmp_path):
+    base = tmp_path / "candles"
+    _write_csv(base / "cached" / "1m" / "TOKEN.csv", rows=120)
+    source = CsvPriceLoader(candles_dir=str(base), timeframe="1m", base_dir=str(base))
+    loader = ResampledPriceLoader(source, "15m", cache_dir=tmp_path / "derived")
+
+    full = loader.load_arrays("TOKEN")
+    expected = resample_series(source.load_arrays("TOKEN"), "15m")
+    assert len(full) == 8
+    np.testing.assert_array_equal(full.ts, expected.ts)
+    np.testing.assert_array_equal(full.to_dataframe().values, expected.to_dataframe().values)
+
+    window = loader.load_prices(
+        "TOKEN", start_time=BASE_TIME + timedelta(minutes=15), end_time=BASE_TIME + timedelta(minutes=45)
+    )
+    assert [c.timestamp for c in window] == [BASE_TIME + timedelta(minutes=m) for m in (15, 30, 45)]
+
+
+def test_derived_cache_is_reused_and_invalidated_by_source_change(tmp_path):
+    base = tmp_path / "candles"
+    csv_path = base / "cached" / "1m" / "TOKEN.csv"
+    _write_csv(csv_path, rows=120)
+    source = CsvPriceLoader(candles_dir=str(base), timeframe="1m", base_dir=str(base))
+    cache_dir = tmp_path / "derived"
+
+    first = ResampledPriceLoader(source, "1h", cache_dir=cache_dir)
+    assert len(first.load_arrays("TOKEN")) == 2
+    assert first.rebuilds == 1
+    assert (cache_dir / "1h" / "TOKEN.source").exists()
+
+    # Новый экземпляр читает агрегат с диска
+    second = ResampledPriceLoader(source, "1h", cache_dir=cache_dir)
+    assert len(second.load_arrays("TOKEN")) == 2
+    assert second.rebuilds == 0
+
+    # 1m-ряд изменился -> агрегат пересчитывается
+    _write_csv(csv_path, rows=240)
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert len(second.load_arrays("TOKEN")) == 4
+    assert second.rebuilds == 1
+
+
+def test_missing_contract_returns_empty(tmp_path):
+    source = CsvPriceLoader(candles_dir=str(tmp_path), timeframe="1m", base_dir=str(tmp_path))
+    loader = ResampledPriceLoader(source, "5m", cache_dir=tmp_path / "derived")
+    assert loader.load_prices("NOPE") == []
+
+
+def test_timeframe_must_be_multiple_of_source(tmp_path):
+    source = CsvPriceLoader(candles_dir=str(tmp_path), timeframe="5m", base_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        ResampledPriceLoader(source, "7m", source_timeframe="5m")
@@ -0,0 +1,178 @@
+"""
+Tests for FeatureStore (persistent per-signal features) and its consumers:
+signal quality feature extraction and BacktestRunner trade features.
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+from backtester.application.runner import BacktestRunner
+from backtester.domain import trade_features
+from backtester.domain.models import Signal
+from backtester.domain.runner_config import create_runner_config_from_dict
+from backtester.domain.runner_strategy import RunnerStrategy
+from backtester.infrastructure.feature_store import FeatureStore, feature_set_version, signal_key
+from backtester.infrastructure.price_loader import CsvPriceLoader
+from backtester.research.signal_quality import feature_extractor
+
+
+BASE_TIME = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+
+class ListSignalLoader:
+    def __init__(self, signals: List[Signal]):
+        self.signals = signals
+
+    def load_signals(self) -> List[Signal]:
+        return list(self.signals)
+
+
+def _write_candles(path: Path, rows: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["timestamp,open,high,low,close,volume"]
+    price = 1.0
+    for i in range(rows):
+        price *= 1.5 if i == 150 else 1.002
+        ts = (BASE_TIME + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        lines.append(f"{ts},{price},{price * 1.04},{price * 0.97},{price},{100 + i}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_store_roundtrip_checks_signal_timestamp(tmp_path):
+    store = FeatureStore(tmp_path / "store")
+    key = signal_key("s1", "AAA", BASE_TIME)
+    moved = signal_key("s1", "AAA", BASE_TIME + timedelta(minutes=1))
+    version = feature_set_version("1", horizon_days=14)
+
+    store.put_many("set", version, [(key, {"max_xn": 2.5}), (signal_key("s2", "BBB", BASE_TIME), {"max_xn": 1.0})])
+
+    assert store.get_many("set", version, [key, moved]) == {key: {"max_xn": 2.5}}
+    assert store.get_many("set", feature_set_version("1", horizon_days=7), [key]) == {}
+    assert store.get_stats() == {"hits": 1, "misses": 2, "writes": 2}
+
+    frame = store.read_frame("set", version)
+    assert frame["signal_id"].tolist() == ["s1", "s2"]
+    assert frame["max_xn"].tolist() == [2.5, 1.0]
+
+    # Отпечаток свечей - часть ключа: другие свечи окна - промах
+    with_fp = signal_key("s1", "AAA", BASE_TIME, "fp1")
+    store.put_many("set", version, [(with_fp, {"max_xn": 3.0})])
+    assert store.get_many("set", version, [with_fp, signal_key("s1", "AAA", BASE_TIME, "fp2")]) == {with_fp: {"max_xn": 3.0}}
+    store.put_many("set", version, [(key, {"max_xn": 2.5})])
+
+    assert store.delete("set", keep_version=version) == 0
+    assert store.delete("set") == 2
+    assert store.describe()["sets"] == {}
+
+
+def test_extract_signal_features_computes_only_new_signals(tmp_path, monkeypatch):
+    base = tmp_path / "candles"
+    _write_candles(base / "cached" / "1m" / "AAA.csv", rows=1500)
+    store = FeatureStore(tmp_path / "store")
+    signals_df = pd.DataFrame([
+        {"id": "s1", "contract_address": "AAA", "timestamp": BASE_TIME + timedelta(minutes=10)},
+        {"id": "s2", "contract_address": "MISSING", "timestamp": BASE_TIME + timedelta(minutes=10)},
+    ])
+
+    loads = []
+
+    def counting_load_candles(contract, timeframe, candles_dir):
+        loads.append(contract)
+        return CsvPriceLoader(candles_dir=candles_dir, timeframe=timeframe, base_dir=candles_dir).load_prices(contract)
+
+    monkeypatch.setattr(feature_extractor, "load_candles", counting_load_candles)
+
+    first = feature_extractor.extract_signal_features(signals_df, str(base), horizon_days=1, feature_store=store)
+    assert loads == ["AAA", "MISSING"]
+    assert first["status"].tolist() == ["ok", "no_candles"]
+    assert store.get_stats() == {"hits": 0, "misses": 2, "writes": 1}
+
+    # Повторный прогон: s1 из хранилища, no_candles пересчитывается (свечи могли появиться);
+    # s3 - свечей меньше горизонта (1 день), строка не сохраняется
+    more = pd.concat([signals_df, pd.DataFrame([
+        {"id": "s3", "contract_address": "AAA", "timestamp": BASE_TIME + timedelta(minutes=200)},
+    ])], ignore_index=True)
+    second = feature_extractor.extract_signal_features(more, str(base), horizon_days=1, feature_store=store)
+    assert loads == ["AAA", "MISSING", "MISSING", "AAA"]
+    assert second.iloc[:2].equals(first)
+    assert second["status"].tolist() == ["ok", "no_candles", "ok"]
+    assert second["lived_minutes"].iloc[2] < 24 * 60
+    assert store.get_stats()["writes"] == 1
+
+    feature_extractor.extract_signal_features(more, str(base), horizon_days=1, feature_store=store)
+    assert loads[4:] == ["MISSING", "AAA"]
+
+
+def test_runner_reuses_stored_trade_features(tmp_path, monkeypatch):
+    base = tmp_path / "candles"
+    _write_candles(base / "cached" / "1m" / "AAA.csv", rows=400)
+    signals = [
+        Signal(id=f"s{i}", contract_address="AAA", timestamp=BASE_TIME + timedelta(minutes=70 + 30 * i),
+               source="test", narrative="")
+        for i in range(3)
+    ]
+    strategy = RunnerStrategy(create_runner_config_from_dict("R", {
+        "take_profit_levels": [{"xn": 1.3, "fraction": 1.0}],
+        "time_stop_minutes": 60,
+    }))
+    config = {"data": {"before_minutes": 60, "after_minutes": 120}, "feature_store": {"enabled": True, "dir": str(tmp_path / "store")}}
+
+    def run():
+        runner = BacktestRunner(
+            signal_loader=ListSignalLoader(signals),  # type: ignore[arg-type]
+            price_loader=CsvPriceLoader(candles_dir=str(base), timeframe="1m", base_dir=str(base)),
+            reporter=None,
+            strategies=[strategy],
+            global_config=dict(config),
+        )
+        return runner, [row["result"] for row in runner.run()]
+
+    runner, first = run()
+    assert runner.feature_store is not None
+    assert runner.feature_store.get_stats()["writes"] == 3
+
+    def fail(*args, **kwargs):
+        raise AssertionError("window features must come from the feature store")
+
+    monkeypatch.setattr(trade_features, "calc_window_features", fail)
+    runner, second = run()
+    assert second == first
+    assert runner.feature_store.get_stats() == {"hits": 3, "misses": 0, "writes": 0}
+    assert "vol_sum_60m" in second[0].meta
+
+
+def test_runner_feature_store_misses_when_pre_entry_candles_change(tmp_path):
+    base = tmp_path / "candles"
+    candles_path = base / "cached" / "1m" / "AAA.csv"
+    _write_candles(candles_path, rows=400)
+    signals = [Signal(id="s0", contract_address="AAA", timestamp=BASE_TIME + timedelta(minutes=70),
+                      source="test", narrative="")]
+    strategy = RunnerStrategy(create_runner_config_from_dict("R", {
+        "take_profit_levels": [{"xn": 1.3, "fraction": 1.0}],
+        "time_stop_minutes": 60,
+    }))
+    config = {"data": {"before_minutes": 60, "after_minutes": 120}, "feature_store": {"enabled": True, "dir": str(tmp_path / "store")}}
+
+    def run():
+        runner = BacktestRunner(
+            signal_loader=ListSignalLoader(signals),  # type: ignore[arg-type]
+            price_loader=CsvPriceLoader(candles_dir=str(base), timeframe="1m", base_dir=str(base)),
+            reporter=None,
+            strategies=[strategy],
+            global_config=dict(config),
+        )
+        return runner, runner.run()[0]["result"]
+
+    run()
+    # Исправленный объем свечи до входа (минута 40): сохраненные признаки не подходят
+    lines = candles_path.read_text().splitlines()
+    fields = lines[41].split(",")
+    fields[-1] = "99999"
+    lines[41] = ",".join(fields)
+    candles_path.write_text("\n".join(lines) + "\n")
+
+    runner, result = run()
+    assert runner.feature_store.get_stats() == {"hits": 0, "misses": 1, "writes": 1}
+    assert result.meta["vol_sum_60m"] > 99999
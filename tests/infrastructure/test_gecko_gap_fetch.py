@@ -0,0 +1,139 @@
+"""
+Тесты инкрементальной дозагрузки GeckoTerminalPriceLoader: из API запрашиваются
+только диапазоны, которых нет в кеше (локальный фейковый HTTP-сервер вместо GeckoTerminal).
+"""
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from backtester.infrastructure.price_loader import GeckoTerminalPriceLoader
+
+
+CONTRACT = "TokenAddr111111111111111111111111111111111"
+POOL_ID = "PoolAddr1111111111111111111111111111111111111"[:44]
+
+# Минутная серия: 3000 свечей, заканчивается час назад (API не отдает будущее)
+SERIES_END = int(datetime.now(timezone.utc).timestamp()) // 60 * 60 - 3600
+SERIES = [SERIES_END - 60 * i for i in range(3000)]  # по убыванию, как отдает GeckoTerminal
+
+
+def _row(ts):
+    # Цены точно представимы в float - CSV-кеш не вносит погрешность округления
+    price = 1.0 + (ts // 60) % 97 / 64.0
+    return [ts, price, price + 0.125, price - 0.125, price, 10.0]
+
+
+class _FakeGecko(BaseHTTPRequestHandler):
+    ohlcv_requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.endswith(f"/tokens/{CONTRACT}/pools"):
+            body = {"data": [{"attributes": {"address": POOL_ID, "name": "T/SOL", "reserve_in_usd": "1000"}}]}
+        elif url.path.endswith(f"/pools/{POOL_ID}/ohlcv/minute"):
+            before = int(parse_qs(url.query)["before_timestamp"][0])
+            type(self).ohlcv_requests.append(before)
+            rows = [_row(ts) for ts in SERIES if ts <= before][:1000]
+            body = {"data": {"attributes": {"ohlcv_list": rows}}}
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_gecko():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeGecko)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _FakeGecko.ohlcv_requests = []
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _dt(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def _make_loader(base_url, cache_dir, **kwargs):
+    return GeckoTerminalPriceLoader(
+        cache_dir=str(cache_dir),
+        rate_limit_config={"enabled": False},
+        base_url=base_url,
+        **kwargs,
+    )
+
+
+def test_extended_range_fetches_only_missing_tail(fake_gecko, tmp_path):
+    start = _dt(SERIES[-1])
+    first_end = _dt(SERIES[1500])
+    loader = _make_loader(fake_gecko, tmp_path / "incremental")
+
+    first = loader.load_prices(CONTRACT, start, first_end)
+    assert len(first) == 1500
+    first_requests = len(_FakeGecko.ohlcv_requests)
+
+    _FakeGecko.ohlcv_requests = []
+    extended = loader.load_prices(CONTRACT, start, _dt(SERIES_END))
+    assert len(extended) == 3000
+    # Загружен только хвост (1500 минут), а не вся история заново
+    assert len(_FakeGecko.ohlcv_requests) < first_requests + 1
+    assert min(_FakeGecko.ohlcv_requests) >= SERIES[1500] - 60 * 1000
+
+    # Повторный запрос того же окна полностью обслуживается кешем
+    _FakeGecko.ohlcv_requests = []
+    assert loader.load_prices(CONTRACT, start, _dt(SERIES_END)) == extended
+    assert _FakeGecko.ohlcv_requests == []
+
+    # Результат совпадает с загрузкой всего диапазона с нуля
+    full = _make_loader(fake_gecko, tmp_path / "full").load_prices(CONTRACT, start, _dt(SERIES_END))
+    assert extended == full
+
+
+def test_extended_start_fetches_only_missing_head(fake_gecko, tmp_path):
+    loader = _make_loader(fake_gecko, tmp_path)
+    loader.load_prices(CONTRACT, _dt(SERIES[1000]), _dt(SERIES_END))
+
+    _FakeGecko.ohlcv_requests = []
+    candles = loader.load_prices(CONTRACT, _dt(SERIES[2000]), _dt(SERIES_END))
+    assert len(candles) == 2001
+    # Пагинация началась от начала кеша, а не от end_time
+    assert max(_FakeGecko.ohlcv_requests) <= SERIES[1000]
+
+
+def test_internal_gap_refilled_when_enabled(fake_gecko, tmp_path):
+    start, end = _dt(SERIES[999]), _dt(SERIES_END)
+    loader = _make_loader(fake_gecko, tmp_path, internal_gap_minutes=30)
+    loader.load_prices(CONTRACT, start, end)
+
+    # Вырезаем из кеша 120 минут в середине
+    cache_path = loader._get_cache_path(CONTRACT)
+    cached = loader._load_from_cache(cache_path)
+    holed = [c for c in cached if not (_dt(SERIES[600]) <= c.timestamp <= _dt(SERIES[481]))]
+    loader._save_to_cache(cache_path, holed)
+
+    _FakeGecko.ohlcv_requests = []
+    candles = loader.load_prices(CONTRACT, start, end)
+    assert len(candles) == 1000
+    assert len(_FakeGecko.ohlcv_requests) == 1
+
+    # Без internal_gap_minutes внутренние разрывы не дозагружаются
+    loader._save_to_cache(cache_path, holed)
+    _FakeGecko.ohlcv_requests = []
+    plain = _make_loader(fake_gecko, tmp_path).load_prices(CONTRACT, start, end)
+    assert len(plain) == 880
+    assert _FakeGecko.ohlcv_requests == []
@@ -0,0 +1,155 @@
+"""
+Тесты кеша pool_id (pool_ids.sqlite): повторные загрузки не запрашивают /pools,
+TTL, отрицательное кеширование 404 / "нет пулов" и массовое разрешение по списку контрактов.
+"""
+import json
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+
+from backtester.infrastructure.async_gecko_loader import AsyncGeckoTerminalPriceLoader
+from backtester.infrastructure.pool_cache import PoolIdCache
+from backtester.infrastructure.price_loader import GeckoTerminalPriceLoader
+
+
+GOOD = "GoodToken1111111111111111111111111111111111"
+EMPTY = "EmptyToken111111111111111111111111111111111"
+GONE = "GoneToken1111111111111111111111111111111111"
+NO_OHLCV = "NoOhlcvToken11111111111111111111111111111111"
+POOL_ID = "PoolAddr1111111111111111111111111111111111111"[:44]
+NO_OHLCV_POOL = "QuietPool111111111111111111111111111111111111"[:44]
+
+SERIES_END = int(datetime.now(timezone.utc).timestamp()) // 60 * 60 - 3600
+
+
+class _FakeGecko(BaseHTTPRequestHandler):
+    pool_requests: Counter = Counter()
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.endswith("/pools") and "/tokens/" in path:
+            contract = path.split("/tokens/")[1].split("/")[0]
+            type(self).pool_requests[contract] += 1
+            if contract == GOOD:
+                body = {"data": [{"attributes": {"address": POOL_ID, "name": "T/SOL", "reserve_in_usd": "1000"}}]}
+            elif contract == NO_OHLCV:
+                # Живой пул, но /ohlcv отвечает 404 (нет данных за диапазон)
+                body = {"data": [{"attributes": {"address": NO_OHLCV_POOL, "name": "Q/SOL", "reserve_in_usd": "10"}}]}
+            elif contract == EMPTY:
+                body = {"data": []}
+            else:
+                body = None
+        elif path.endswith(f"/pools/{POOL_ID}/ohlcv/minute"):
+            rows = [[SERIES_END - 60 * i, 1.0, 1.5, 0.5, 1.0, 10.0] for i in range(10)]
+            body = {"data": {"attributes": {"ohlcv_list": rows}}}
+        else:
+            body = None
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_gecko():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeGecko)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _FakeGecko.pool_requests = Counter()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _make_loader(base_url, cache_dir, **kwargs):
+    return GeckoTerminalPriceLoader(
+        cache_dir=str(cache_dir),
+        rate_limit_config={"enabled": False},
+        base_url=base_url,
+        max_retries=1,
+        **kwargs,
+    )
+
+
+def test_pool_id_is_resolved_once_across_loader_instances(fake_gecko, tmp_path):
+    start = datetime.fromtimestamp(SERIES_END - 600, tz=timezone.utc)
+
+    first = _make_loader(fake_gecko, tmp_path).load_prices(GOOD, start, start + timedelta(minutes=5))
+    # Новый экземпляр, другой (непокрытый кешем свечей) диапазон: пул берется из pool_ids.sqlite
+    second_loader = _make_loader(fake_gecko, tmp_path)
+    second = second_loader.load_prices(GOOD, start - timedelta(hours=1), start + timedelta(minutes=10))
+
+    assert first and second
+    assert _FakeGecko.pool_requests[GOOD] == 1
+    assert second_loader.pool_cache.summary()["hits"] == 1
+
+
+def test_missing_pools_are_cached_negatively(fake_gecko, tmp_path, capsys):
+    loader = _make_loader(fake_gecko, tmp_path)
+
+    resolved = loader.resolve_pool_ids([GOOD, EMPTY, GONE, GOOD])
+    assert resolved == {GOOD: POOL_ID, EMPTY: None, GONE: None}
+
+    # Повторно (в т.ч. через load_prices) к API за мертвыми контрактами не ходим
+    again = _make_loader(fake_gecko, tmp_path)
+    assert again.resolve_pool_ids([GOOD, EMPTY, GONE]) == resolved
+    assert again.load_prices(GONE) == []
+    assert _FakeGecko.pool_requests == Counter({GOOD: 1, EMPTY: 1, GONE: 1})
+    assert again.pool_cache.summary() == {"hits": 1, "negative_hits": 3, "misses": 0}
+    assert "Traceback" not in capsys.readouterr().out
+
+    # refresh игнорирует кеш; отключенное отрицательное кеширование - каждый раз запрос
+    again.resolve_pool_ids([GONE], refresh=True)
+    no_negative = _make_loader(fake_gecko, tmp_path / "other", pool_negative_ttl_hours=0)
+    no_negative.resolve_pool_ids([GONE])
+    no_negative.resolve_pool_ids([GONE])
+    assert _FakeGecko.pool_requests[GONE] == 4
+
+
+def test_ohlcv_404_keeps_pool_resolvable(fake_gecko, tmp_path):
+    start = datetime.fromtimestamp(SERIES_END - 600, tz=timezone.utc)
+    loader = _make_loader(fake_gecko, tmp_path)
+    assert loader.load_prices(NO_OHLCV, start, start + timedelta(minutes=5)) == []
+
+    async_loader = AsyncGeckoTerminalPriceLoader(
+        cache_dir=str(tmp_path), rate_limit_config={"enabled": False}, base_url=fake_gecko, max_retries=1,
+    )
+    async_loader.prefetch([(NO_OHLCV, start - timedelta(hours=1), start)])
+
+    # 404 на OHLCV не попадает в отрицательный кеш: пул по-прежнему разрешается из pool_ids.sqlite
+    again = _make_loader(fake_gecko, tmp_path)
+    assert again.resolve_pool_ids([NO_OHLCV]) == {NO_OHLCV: NO_OHLCV_POOL}
+    assert again.pool_cache.summary() == {"hits": 1, "negative_hits": 0, "misses": 0}
+    assert _FakeGecko.pool_requests[NO_OHLCV] == 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = PoolIdCache(tmp_path, ttl_days=1, negative_ttl_hours=1)
+    cache.put("A", "poolA")
+    cache.put_missing("B", "pools 404")
+    assert cache.get("A").pool_id == "poolA"
+    assert cache.get("B").is_negative
+
+    later = time.time() + 2 * 3600
+    assert [cache.is_expired(e, later) for e in cache.entries()] == [False, True]
+    with cache._connection() as conn:
+        conn.execute("UPDATE pool_ids SET resolved_at = resolved_at - ?", (2 * 86400,))
+    assert cache.get("A") is None and cache.get("B") is None
+    assert cache.summary() == {"hits": 1, "negative_hits": 1, "misses": 2}
+    assert cache.forget_missing() == 1
+    assert [e.contract for e in cache.entries()] == ["A"]
+    cache.close()
@@ -0,0 +1,99 @@
+"""
+Tests for the persistent strategy result cache.
+"""
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from backtester.domain.models import Candle, Signal, StrategyOutput
+from backtester.domain.runner_config import create_runner_config_from_dict
+from backtester.domain.runner_strategy import RunnerStrategy
+from backtester.infrastructure.result_cache import (
+    ResultCache,
+    candles_fingerprint,
+    strategy_fingerprint,
+)
+
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _runner(name: str, xn: float = 2.0) -> RunnerStrategy:
+    return RunnerStrategy(create_runner_config_from_dict(name, {
+        "take_profit_levels": [{"xn": xn, "fraction": 1.0}],
+        "time_stop_minutes": 60,
+    }))
+
+
+def _candles(n: int = 5, bump: float = 0.0):
+    return [
+        Candle(timestamp=BASE_TIME + timedelta(minutes=i), open=1.0, high=1.1 + bump, low=0.9, close=1.0, volume=10.0)
+        for i in range(n)
+    ]
+
+
+def _output(pnl: float, reason: str = "tp") -> StrategyOutput:
+    return StrategyOutput(
+        entry_time=BASE_TIME, entry_price=1.0, exit_time=BASE_TIME + timedelta(minutes=5),
+        exit_price=1.0 + pnl, pnl=pnl, reason=reason, meta={"k": [1, 2]},
+    )
+
+
+def test_fingerprints_ignore_name_but_track_params_and_candles():
+    assert strategy_fingerprint(_runner("A")) == strategy_fingerprint(_runner("B"))
+    assert strategy_fingerprint(_runner("A")) != strategy_fingerprint(_runner("A", xn=3.0))
+    assert candles_fingerprint(_candles()) == candles_fingerprint(_candles())
+    assert candles_fingerprint(_candles()) != candles_fingerprint(_candles(bump=0.01))
+    assert candles_fingerprint(_candles()) != candles_fingerprint(_candles(n=6))
+
+
+def test_put_get_round_trip_and_stats(tmp_path):
+    cache = ResultCache(tmp_path)
+    signal = Signal(id="s1", contract_address="C", timestamp=BASE_TIME, source="t", narrative="")
+    key_a = cache.make_key(signal, "fa", "c1")
+    key_b = cache.make_key(signal, "fb", "c1")
+    assert key_a != key_b
+    assert cache.make_key(signal, "fa", "c2") != key_a
+    # extra (total_supply -> mcap features в meta) входит в ключ
+    with_supply = Signal(id="s1", contract_address="C", timestamp=BASE_TIME, source="t", narrative="",
+                         extra={"total_supply": 5e8})
+    assert cache.make_key(with_supply, "fa", "c1") != key_a
+
+    cache.put_many([(key_a, _output(0.5)), (key_b, _output(0.0, reason="error"))])
+    found = cache.get_many([key_a, key_b])
+    assert found == {key_a: _output(0.5)}
+    assert cache.get_stats() == {"hits": 1, "misses": 1, "writes": 1}
+
+    # Новый экземпляр (следующий запуск) видит те же данные
+    cache.close()
+    assert ResultCache(tmp_path).get_many([key_a]) == {key_a: _output(0.5)}
+
+
+def test_code_version_label_changes_keys(tmp_path):
+    signal = Signal(id="s1", contract_address="C", timestamp=BASE_TIME, source="t", narrative="")
+    assert ResultCache(tmp_path).make_key(signal, "f", "c") != ResultCache(tmp_path, code_version="v2").make_key(signal, "f", "c")
+
+
+def test_prune_by_version_age_and_size(tmp_path):
+    old = ResultCache(tmp_path, code_version="old")
+    old.put_many([(f"old{i}", _output(0.1 * i)) for i in range(3)])
+    old.close()
+
+    cache = ResultCache(tmp_path)
+    cache.put_many([(f"new{i}", _output(0.1 * i)) for i in range(4)])
+    assert cache.describe()["entries"] == 7
+
+    assert cache.prune(stale_versions=True) == 3
+    assert cache.describe()["entries"] == cache.describe()["entries_current_version"] == 4
+
+    # new0 не использовался давно - удаляется по возрасту
+    conn = cache._connection()
+    conn.execute("UPDATE results SET last_used_at = ? WHERE key = 'new0'", (time.time() - 10 * 86400,))
+    conn.commit()
+    assert cache.prune(older_than_days=5) == 1
+
+    one_entry = cache.describe()["payload_bytes"] // 3
+    cache.get_many(["new3"])  # new3 - самый свежий, должен пережить вытеснение по размеру
+    assert cache.prune(max_bytes=one_entry) == 2
+    assert set(cache.get_many(["new1", "new2", "new3"])) == {"new3"}
+    assert os.path.exists(cache.db_path)
@@ -0,0 +1,92 @@
+"""
+Tests for result sinks: spill round-trip must give back the same rows in write order.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backtester.domain.models import StrategyOutput
+from backtester.infrastructure.result_sink import ListResultSink, SpillResultSink
+
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _row(i: int, strategy: str, with_extra: bool = False):
+    entry = BASE_TIME + timedelta(minutes=i)
+    row = {
+        "signal_id": f"s{i}",
+        "contract_address": f"C{i % 3}",
+        "strategy": strategy,
+        "timestamp": entry,
+        "result": StrategyOutput(
+            entry_time=entry if i % 4 else None,
+            entry_price=1.0 + i if i % 4 else None,
+            exit_time=entry + timedelta(minutes=30) if i % 4 else None,
+            exit_price=1.5 + i if i % 4 else None,
+            pnl=0.01 * i,
+            reason="tp" if i % 2 else "no_entry",
+            meta={"levels_hit": {"2.0": entry.isoformat()}, "i": i},
+        ),
+    }
+    if with_extra:
+        row["source"] = "tg"
+        row["narrative"] = f"n{i}"
+    return row
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 1000])
+def test_spill_round_trip_preserves_rows_and_order(tmp_path, batch_size):
+    sink = SpillResultSink(tmp_path / "spill", batch_size=batch_size)
+    written = {"A/B": [], "C": []}
+    for i in range(10):
+        for name in written:
+            row = _row(i, name, with_extra=i % 2 == 0)
+            written[name].append(row)
+            sink.write(row)
+
+    # До flush часть строк еще в буфере - чтение должно их учитывать
+    assert list(sink.iter_strategy("C")) == written["C"]
+    sink.flush()
+
+    assert sink.strategy_names() == ["A/B", "C"]
+    assert sink.count("A/B") == 10
+    for name, rows in written.items():
+        assert list(sink.iter_strategy(name)) == rows
+
+    view = sink.results_by_strategy()
+    assert set(view) == {"A/B", "C"}
+    assert "missing" not in view
+    assert view["A/B"] == written["A/B"]
+    with pytest.raises(KeyError):
+        view["missing"]
+
+    sink.cleanup()
+    assert not (tmp_path / "spill").exists()
+
+
+def test_spill_reconstructs_canonical_reason_and_meta(tmp_path):
+    sink = SpillResultSink(tmp_path / "spill", batch_size=1)
+    row = _row(1, "R")
+    sink.write(row)
+    restored = next(sink.iter_strategy("R"))["result"]
+    assert restored.canonical_reason == row["result"].canonical_reason
+    assert restored.meta == row["result"].meta
+
+
+def test_spill_dir_is_recreated(tmp_path):
+    first = SpillResultSink(tmp_path / "spill", batch_size=1)
+    first.write(_row(0, "R"))
+    second = SpillResultSink(tmp_path / "spill", batch_size=1)
+    assert second.strategy_names() == []
+    assert list(second.iter_strategy("R")) == []
+
+
+def test_list_sink_groups_by_strategy():
+    sink = ListResultSink()
+    rows = [_row(i, "AB"[i % 2]) for i in range(6)]
+    for row in rows:
+        sink.write(row)
+    assert sink.strategy_names() == ["A", "B"]
+    assert list(sink.iter_strategy("A")) == rows[0::2]
+    assert list(sink.iter_rows()) == rows[0::2] + rows[1::2]
@@ -0,0 +1,119 @@
+"""
+Tests for portfolio sweep: spec expansion, results.json round-trip and equality with run_portfolio.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backtester.application.runner import BacktestRunner, build_portfolio_config
+from backtester.domain.models import StrategyOutput
+from backtester.research.portfolio_sweep import (
+    PortfolioSweepEngine,
+    PortfolioSweepSpec,
+    SUMMARY_STATS,
+    load_strategy_results,
+)
+
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+BASE_CONFIG = {
+    "portfolio": {
+        "initial_balance_sol": 10.0,
+        "allocation_mode": "dynamic",
+        "percent_per_trade": 0.1,
+        "max_open_positions": 3,
+        "capacity_reset": {"enabled": True, "window_type": "signals", "window_size": 5, "max_blocked_ratio": 0.4},
+    },
+}
+
+
+def _results(n_signals: int = 40):
+    rows = []
+    for i in range(n_signals):
+        ts = BASE_TIME + timedelta(hours=i)
+        for k, name in enumerate(["A", "B"]):
+            pnl = ((i * 5 + k * 3) % 9 - 3) / 5.0
+            rows.append({
+                "signal_id": f"s{i}",
+                "contract_address": f"C{i % 4}",
+                "strategy": name,
+                "timestamp": ts,
+                "result": StrategyOutput(
+                    entry_time=ts,
+                    entry_price=1.0,
+                    exit_time=ts + timedelta(hours=2 + 3 * k),
+                    exit_price=1.0 + pnl,
+                    pnl=pnl,
+                    reason="ladder_tp" if pnl > 0 else "time_stop",
+                ),
+            })
+    return rows
+
+
+def test_spec_expands_dotted_keys_and_base():
+    spec = PortfolioSweepSpec.from_dict({
+        "base": {"allocation_mode": "fixed"},
+        "grid": {
+            "percent_per_trade": {"start": 0.01, "stop": 0.03, "step": 0.01},
+            "capacity_reset.prune_fraction": [0.3, 0.5],
+        },
+    })
+    variants = spec.expand()
+    assert [v.name for v in variants][:2] == ["pf_0000", "pf_0001"]
+    assert len(variants) == 6
+    assert variants[1].overrides == {"allocation_mode": "fixed", "percent_per_trade": 0.01, "capacity_reset.prune_fraction": 0.5}
+
+    config = variants[1].apply(BASE_CONFIG)
+    assert config["portfolio"]["capacity_reset"]["prune_fraction"] == 0.5
+    assert config["portfolio"]["capacity_reset"]["window_size"] == 5
+    assert "prune_fraction" not in BASE_CONFIG["portfolio"]["capacity_reset"]
+    assert build_portfolio_config(config).prune_fraction == 0.5
+
+    with pytest.raises(ValueError, match="max_variants"):
+        PortfolioSweepSpec.from_dict({"grid": {"max_open_positions": list(range(20))}, "max_variants": 10}).expand()
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_sweep_matches_run_portfolio_per_variant(max_workers):
+    variants = PortfolioSweepSpec.from_dict({
+        "grid": {"max_open_positions": [2, 5], "profit_reset_enabled": [True], "profit_reset_multiple": [1.2, 2.0]},
+    }).expand()
+    results = _results()
+    table = PortfolioSweepEngine(BASE_CONFIG, variants, max_workers=max_workers).run(results)
+
+    assert list(table.columns[:2]) == ["strategy", "variant"]
+    assert len(table) == 2 * len(variants)
+    assert set(SUMMARY_STATS) <= set(table.columns)
+
+    for variant in variants:
+        runner = BacktestRunner(
+            signal_loader=None,  # type: ignore[arg-type]
+            price_loader=None,  # type: ignore[arg-type]
+            reporter=None,
+            strategies=[],
+            global_config=variant.apply(BASE_CONFIG),
+        )
+        runner.results = results
+        for name, p_result in runner.run_portfolio().items():
+            row = table[(table["strategy"] == name) & (table["variant"] == variant.name)].iloc[0]
+            assert row["final_balance_sol"] == p_result.stats.final_balance_sol
+            assert row["trades_executed"] == p_result.stats.trades_executed
+            assert row["trades_skipped_by_risk"] == p_result.stats.trades_skipped_by_risk
+            assert row["portfolio_reset_count"] == p_result.stats.portfolio_reset_count
+            assert row["max_open_positions"] == variant.overrides["max_open_positions"]
+
+    # Сетка должна реально различать варианты
+    assert table["trades_skipped_by_risk"].nunique() > 1
+
+
+def test_load_strategy_results_round_trip(tmp_path):
+    import main
+
+    rows = _results(n_signals=3)
+    path = tmp_path / "results.json"
+    main.write_results_json(path, rows)
+    loaded = load_strategy_results(path)
+    assert [r["result"] for r in loaded] == [r["result"] for r in rows]
+    assert [r["timestamp"] for r in loaded] == [r["timestamp"] for r in rows]
+    assert json.loads(path.read_text())[0]["strategy"] == "A"
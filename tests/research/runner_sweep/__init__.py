@@ -0,0 +1 @@
+# tests/research/runner_sweep/__init__.py
@@ -0,0 +1,122 @@
+"""
+Tests for Runner sweep engine: results must match RunnerStrategy.on_signal on the same candles
+"""
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+import numpy as np
+import pytest
+
+from backtester.domain.models import Candle, Signal, StrategyInput
+from backtester.domain.runner_strategy import RunnerStrategy
+from backtester.infrastructure.candle_store import CandleArrays
+from backtester.infrastructure.price_loader import PriceLoader
+from backtester.research.runner_sweep import RunnerSweepEngine, RunnerSweepResult, RunnerSweepSpec
+
+
+BASE_TIME = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+
+class RandomWalkLoader(PriceLoader):
+    """Fake loader: seeded random walk with pumps per contract (1m candles, 3 days)."""
+
+    def __init__(self, minutes: int = 3 * 1440):
+        self.minutes = minutes
+        self._series = {}
+
+    def _arrays(self, contract: str) -> CandleArrays:
+        if contract not in self._series:
+            rng = np.random.default_rng(zlib.crc32(contract.encode()))
+            returns = rng.normal(0.0, 0.01, self.minutes)
+            returns[rng.integers(0, self.minutes, 3)] += rng.uniform(0.2, 0.8, 3)
+            close = 100.0 * np.exp(np.cumsum(returns))
+            high = close * (1.0 + rng.uniform(0.0, 0.05, self.minutes))
+            high[rng.integers(0, self.minutes, 5)] = np.nan
+            ts = int(BASE_TIME.timestamp()) + 60 * np.arange(self.minutes, dtype=np.int64)
+            self._series[contract] = CandleArrays(ts=ts, open=close, high=high, low=close * 0.97, close=close, volume=np.ones(self.minutes))
+        return self._series[contract]
+
+    def load_arrays(self, contract_address, start_time=None, end_time=None) -> CandleArrays:
+        return self._arrays(contract_address).slice_time(start_time, end_time)
+
+    def load_prices(self, contract_address: str, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> List[Candle]:
+        return self.load_arrays(contract_address, start_time, end_time).to_candles()
+
+
+def _signals() -> List[Signal]:
+    signals = []
+    for i in range(8):
+        signals.append(Signal(
+            id=f"sig{i}",
+            contract_address=f"TOKEN_{i % 4}",
+            timestamp=BASE_TIME + timedelta(minutes=37 * i + 5),
+            source="test",
+            narrative="",
+        ))
+    return signals
+
+
+def _spec() -> RunnerSweepSpec:
+    return RunnerSweepSpec.from_dict({
+        "take_profit_levels": {"levels": [1, 2], "xn": [1.1, 1.3, 1.6, 2.0], "fraction": [0.3, 0.6]},
+        "time_stop_minutes": [0, 60, 720, None],
+        "exit_on_first_tp": [False, True],
+    })
+
+
+def test_sweep_matches_runner_strategy():
+    loader = RandomWalkLoader()
+    signals = _signals()
+    configs = _spec().expand()
+    configs[0].allow_partial_fills = False  # один конфиг без частичных выходов
+    engine = RunnerSweepEngine(configs)
+
+    result = engine.run(signals, loader, after_minutes=1440, progress_every=0)
+    assert len(result) == len(signals) * len(configs)
+    df = result.to_dataframe()
+
+    for sig in signals:
+        candles = loader.load_prices(sig.contract_address, sig.timestamp, sig.timestamp + timedelta(minutes=1440))
+        data = StrategyInput(signal=sig, candles=candles, global_params={})
+        rows = df[df["signal_id"] == sig.id].set_index("strategy")
+        for config in configs:
+            expected = RunnerStrategy(config).on_signal(data)
+            row = rows.loc[config.name]
+            assert row["pnl"] == expected.pnl, config.name
+            assert row["exit_price"] == expected.exit_price, config.name
+            assert row["exit_time"].to_pydatetime() == expected.exit_time, config.name
+            assert row["entry_time"].to_pydatetime() == expected.entry_time
+            assert row["reason"] == expected.canonical_reason, config.name
+            assert bool(row["time_stop_triggered"]) == expected.meta["time_stop_triggered"], config.name
+            assert row["realized_multiple"] == expected.meta["realized_multiple"], config.name
+            assert row["levels_hit"] == len(expected.meta["levels_hit"]), config.name
+
+
+def test_signals_without_candles_are_skipped():
+    loader = RandomWalkLoader(minutes=10)
+    late = Signal(id="late", contract_address="TOKEN_0", timestamp=BASE_TIME + timedelta(days=1), source="t", narrative="")
+    engine = RunnerSweepEngine(_spec().expand())
+    result = engine.run([late], loader, progress_every=0)
+    assert len(result) == 0
+    assert result.skipped_signals == 1
+
+
+def test_save_load_and_summary(tmp_path):
+    loader = RandomWalkLoader()
+    configs = _spec().expand()
+    result = RunnerSweepEngine(configs).run(_signals(), loader, after_minutes=720, progress_every=0)
+
+    path = result.save(tmp_path / "sweep.npz")
+    restored = RunnerSweepResult.load(path)
+    assert [c.name for c in restored.configs] == [c.name for c in configs]
+    assert restored.signal_ids == result.signal_ids
+    for name, column in result.columns.items():
+        np.testing.assert_array_equal(restored.columns[name], column)
+
+    summary = restored.summary()
+    assert len(summary) == len(configs)
+    assert (summary["trades"] == len(_signals())).all()
+    df = restored.to_dataframe()
+    best = summary.iloc[0]
+    assert best["mean_pnl"] == pytest.approx(df[df["strategy"] == best["strategy"]]["pnl"].mean())
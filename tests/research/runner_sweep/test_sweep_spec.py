@@ -0,0 +1,68 @@
+"""
+Tests for Runner sweep spec expansion
+"""
+import pytest
+
+from backtester.domain.runner_config import RunnerConfig
+from backtester.research.runner_sweep import RunnerSweepSpec, configs_to_strategy_entries
+
+
+def test_expand_ladders_time_stops_and_flags():
+    spec = RunnerSweepSpec.from_dict({
+        "name_prefix": "S",
+        "take_profit_levels": {"levels": [1, 2], "xn": [2, 3, 5], "fraction": [0.5, 0.7]},
+        "time_stop_minutes": [1440, None],
+        "exit_on_first_tp": [False, True],
+    })
+    configs = spec.expand()
+
+    # 1 level: 3 ladders; 2 levels: C(3,2)=3 x 2 fractions = 6 ladders; x 2 time stops x 2 flags
+    assert len(configs) == (3 + 6) * 2 * 2
+    assert all(isinstance(c, RunnerConfig) for c in configs)
+    assert len({c.name for c in configs}) == len(configs)
+
+    for c in configs:
+        assert sum(level.fraction for level in c.take_profit_levels) == pytest.approx(1.0)
+        xns = [level.xn for level in c.take_profit_levels]
+        assert xns == sorted(xns)
+
+    by_name = {c.name: c for c in configs}
+    cfg = by_name["S_2_5_f70_30_1d_first"]
+    assert cfg.time_stop_minutes == 1440
+    assert cfg.exit_on_first_tp is True
+    assert [(l.xn, l.fraction) for l in cfg.take_profit_levels] == [(2.0, 0.7), (5.0, 0.3)]
+    assert "S_3_f100_nots" in by_name
+
+
+def test_range_values_and_overfilled_fractions_skipped():
+    spec = RunnerSweepSpec.from_dict({
+        "take_profit_levels": {
+            "levels": [3],
+            "xn": {"start": 2, "stop": 4, "step": 1},
+            "fraction": {"start": 0.4, "stop": 0.6, "step": 0.1},
+        },
+    })
+    assert spec.xn == [2.0, 3.0, 4.0]
+    assert spec.fraction == [0.4, 0.5, 0.6]
+    # Пары долей с суммой >= 1.0 не дают остатка для последнего уровня
+    fractions = [tuple(l.fraction for l in c.take_profit_levels[:2]) for c in spec.expand()]
+    assert fractions == [(0.4, 0.4), (0.4, 0.5), (0.5, 0.4)]
+
+
+def test_max_configs_guard():
+    spec = RunnerSweepSpec.from_dict({
+        "take_profit_levels": {"levels": [1], "xn": [2, 3, 5]},
+        "max_configs": 2,
+    })
+    with pytest.raises(ValueError, match="max_configs"):
+        spec.expand()
+
+
+def test_strategy_entries_roundtrip():
+    from backtester.domain.runner_config import create_runner_config_from_dict
+
+    configs = RunnerSweepSpec.from_dict({"time_stop_minutes": [10080]}).expand()
+    entries = configs_to_strategy_entries(configs)
+    restored = [create_runner_config_from_dict(e["name"], e["params"]) for e in entries]
+    assert [(c.name, c.take_profit_levels, c.time_stop_minutes) for c in restored] == \
+        [(c.name, c.take_profit_levels, c.time_stop_minutes) for c in configs]
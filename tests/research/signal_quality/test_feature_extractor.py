@@ -316,3 +316,18 @@ class TestMaxXN:
 
 
 
+    
+    def test_max_xn_series_matches_unsorted_list(self):
+        """CandleSeries (отсортированный ряд) дает тот же результат, что и неотсортированный список."""
+        from backtester.domain.candle_series import CandleSeries
+        
+        entry_time = datetime(2025, 1, 1, 12, 0, 30, tzinfo=timezone.utc)
+        candles = [
+            Candle(timestamp=entry_time + timedelta(minutes=m, seconds=30), open=1.0, high=h, low=0.9, close=1.0, volume=1.0)
+            for m, h in [(40, 5.5), (3, 2.2), (90, 11.0), (15, 3.1), (0, 1.0)]
+        ]
+        series = CandleSeries.from_candles(candles)
+        
+        assert compute_max_xn(series, 1.0, entry_time, 60) == compute_max_xn(candles, 1.0, entry_time, 60)
+        assert compute_max_xn(series, 1.0, entry_time, 60)[1]["time_to_5x_minutes"] == 40
+        assert get_entry_price(series, entry_time) == get_entry_price(candles, entry_time)
@@ -155,3 +155,23 @@ def test_strategy_blueprint_generated_basic(runner_strategy, sample_signal):
     assert blueprint.final_exit is not None  # Позиция полностью закрыта
     assert blueprint.max_xn_reached == pytest.approx(10.0, rel=1e-6)  # Максимальный достигнутый уровень
 
+
+
+def test_blueprint_first_hits_match_linear_scan(runner_strategy, sample_signal):
+    """Первое достижение уровня по кумулятивному максимуму совпадает с построчным проходом (NaN не достигает цели)."""
+    base_time = sample_signal.timestamp
+    highs = [100.0, 150.0, float("nan"), 210.0, 120.0, 90.0, 520.0, 300.0, 990.0, 1000.0]
+    candles = [
+        Candle(timestamp=base_time + timedelta(minutes=i), open=100.0, high=h, low=50.0, close=100.0, volume=1.0)
+        for i, h in enumerate(highs)
+    ]
+
+    blueprint = runner_strategy.on_signal_blueprint(StrategyInput(signal=sample_signal, candles=candles, global_params={}))
+
+    expected = []
+    for xn in (2.0, 5.0, 10.0):
+        first = next((c for c in candles if c.high >= 100.0 * xn), None)
+        if first is not None:
+            expected.append((first.timestamp, xn))
+    assert [(pe.timestamp, pe.xn) for pe in blueprint.partial_exits] == expected
+    assert blueprint.final_exit is not None and blueprint.final_exit.timestamp == base_time + timedelta(minutes=9)
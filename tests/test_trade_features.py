@@ -1 +1,87 @@
+"""
+Tests for trade window features (WindowFeatureEngine / calc_window_features / shared_window_features).
+"""
+import random
+import statistics
+from datetime import datetime, timedelta, timezone
 
+import pytest
+
+from backtester.domain.candle_series import CandleSeries
+from backtester.domain.models import Candle, Signal, StrategyInput
+from backtester.domain.trade_features import (
+    WindowFeatureEngine,
+    calc_window_features,
+    shared_window_features,
+)
+
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _candles(n, seed=3, gaps=()):
+    rng = random.Random(seed)
+    price = 1.0
+    candles = []
+    for i in range(n):
+        if i in gaps:
+            continue
+        close = price * (1 + rng.uniform(-0.05, 0.08))
+        if i % 17 == 0:
+            close = 0.0  # prev_close <= 0: пара пропускается
+        candles.append(Candle(
+            timestamp=BASE_TIME + timedelta(minutes=i),
+            open=price,
+            high=max(price, close) * 1.01,
+            low=min(price, close) * 0.99,
+            close=close,
+            volume=rng.uniform(0, 1000),
+        ))
+        price = close or 1.0
+    return candles
+
+
+def _reference(candles, entry_time, entry_price, w):
+    window = [c for c in candles if entry_time - timedelta(minutes=w) <= c.timestamp < entry_time]
+    if not window:
+        return {f"vol_sum_{w}m": 0.0, f"range_pct_{w}m": 0.0, f"volat_{w}m": 0.0}
+    returns = [(b.close - a.close) / a.close for a, b in zip(window, window[1:]) if a.close > 0]
+    return {
+        f"vol_sum_{w}m": sum(c.volume for c in window),
+        f"range_pct_{w}m": (max(c.high for c in window) - min(c.low for c in window)) / entry_price,
+        f"volat_{w}m": statistics.stdev(returns) if len(returns) >= 2 else 0.0,
+    }
+
+
+@pytest.mark.parametrize("entry_minute", [0, 1, 2, 3, 40, 90, 241])
+def test_engine_matches_row_by_row_reference(entry_minute):
+    candles = _candles(240, gaps=set(range(50, 80)))
+    series = CandleSeries.from_candles(candles)
+    entry = BASE_TIME + timedelta(minutes=entry_minute)
+    windows = (1, 2, 5, 15, 30, 60, 120)
+
+    expected = {}
+    for w in windows:
+        expected.update(_reference(candles, entry, 1.7, w))
+
+    engine = WindowFeatureEngine(series, entry, max(windows))
+    assert engine.features(windows, 1.7) == pytest.approx(expected, rel=1e-9, abs=1e-12)
+    assert calc_window_features(candles, entry, 1.7, windows) == pytest.approx(expected, rel=1e-9, abs=1e-12)
+    with pytest.raises(ValueError):
+        engine.window(121, 1.7)
+
+
+def test_shared_window_features_computed_once_per_signal():
+    candles = _candles(120)
+    signal = Signal(id="s", contract_address="T", timestamp=BASE_TIME + timedelta(minutes=70), source="t", narrative="")
+    data = StrategyInput(signal=signal, candles=CandleSeries.from_candles(candles), global_params={})
+    entry = BASE_TIME + timedelta(minutes=70)
+
+    first = shared_window_features(data, entry, 1.2)
+    first["vol_sum_5m"] = -1.0  # копия: кеш не портится
+    second = shared_window_features(data, entry, 1.2)
+
+    assert len(data.feature_cache) == 1
+    assert second == calc_window_features(data.candles, entry, 1.2)
+    shared_window_features(data, entry, 1.2, (5, 240))
+    assert len(data.feature_cache) == 2